@@ -4,6 +4,7 @@ Diagnostic Endpoints for System Health and Troubleshooting
 Provides deep system introspection for both developers and users:
 - MCP tool availability with live probes
 - Query pipeline tracing with failure points
+- Per-stage pipeline latency percentiles
 - Database connection pool health
 - LangGraph agent state inspection
 - Component status aggregation
@@ -24,6 +25,7 @@ from app.services.diagnostic_service import (
     get_mcp_tool_status,
     probe_mcp_tools,
     get_query_pipeline_traces,
+    get_stage_latency_stats,
     get_connection_pool_health,
     get_langgraph_state_history,
     get_system_diagnostics_summary
@@ -62,6 +64,18 @@ class QueryPipelineTrace(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class StageLatencyStats(BaseModel):
+    """Rolling latency percentiles for one pipeline stage"""
+    count: int
+    failures: int
+    window: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
 class ConnectionPoolHealth(BaseModel):
     """Database connection pool health metrics"""
     database: str
@@ -193,6 +207,24 @@ async def get_query_pipeline_trace(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/query-pipeline-latency", response_model=Dict[str, StageLatencyStats])
+async def get_query_pipeline_latency(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Get per-stage pipeline latency percentiles
+
+    Percentiles (p50/p95/p99) cover the most recent samples of each stage
+    (understand, retrieve_context, generate_sql, execute, format_results, ...).
+    Lifetime distributions are exported as amil_pipeline_stage_duration_seconds.
+    """
+    try:
+        return await get_stage_latency_stats()
+    except Exception as e:
+        logger.error(f"Failed to get pipeline latency stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/connection-pools", response_model=List[ConnectionPoolHealth])
 async def get_connection_pools_health(
     current_user: Dict[str, Any] = Depends(require_developer_role)
@@ -1,13 +1,74 @@
-from fastapi import APIRouter, Request, Response, HTTPException
+import asyncio
+
+from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import StreamingResponse
 import httpx
 from app.core.config import settings
 from app.core.doris_client import doris_client
+from app.core.proxy_http_client import get_proxy_http_pool
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Request headers worth forwarding to the MCP server (SSE resume + content negotiation)
+_FORWARDED_REQUEST_HEADERS = ("accept", "content-type", "last-event-id", "mcp-session-id")
+# Response headers worth passing back; hop-by-hop headers are left to the ASGI server
+_FORWARDED_RESPONSE_HEADERS = ("cache-control", "mcp-session-id")
+
+
+def _forward_headers(request: Request) -> dict:
+    return {k: v for k, v in request.headers.items() if k.lower() in _FORWARDED_REQUEST_HEADERS}
+
+
+def _passthrough_headers(resp: httpx.Response) -> dict:
+    headers = {k: v for k, v in resp.headers.items() if k.lower() in _FORWARDED_RESPONSE_HEADERS}
+    # Disable reverse-proxy buffering so events reach the browser immediately
+    headers["X-Accel-Buffering"] = "no"
+    return headers
+
+
+async def _open_upstream_stream(method: str, target_url: str, request: Request, content=None):
+    """Send a request on the shared pool and return (upstream_key, streaming response)"""
+    pool = get_proxy_http_pool()
+    client = await pool.get_client(target_url)
+    upstream = pool.request_started(target_url)
+    try:
+        upstream_request = client.build_request(
+            method,
+            target_url,
+            params=request.query_params,
+            headers=_forward_headers(request),
+            content=content,
+        )
+        resp = await client.send(upstream_request, stream=True)
+        return upstream, resp
+    except Exception:
+        pool.request_finished(upstream, "error")
+        raise
+
+
+async def _relay(upstream: str, resp: httpx.Response, on_error_event: bool = False):
+    """Relay upstream bytes as they arrive, releasing the pooled connection afterwards"""
+    pool = get_proxy_http_pool()
+    streamed = 0
+    status = "success"
+    try:
+        async for chunk in resp.aiter_raw():
+            streamed += len(chunk)
+            yield chunk
+    except Exception as e:
+        status = "error"
+        logger.error(f"Proxy stream error from {upstream}: {e}")
+        if on_error_event:
+            yield f"event: error\ndata: {str(e)}\n\n".encode()
+    finally:
+        # Account first: a client disconnect cancels the generator, and the
+        # close below must not be able to skip the in-flight bookkeeping
+        pool.request_finished(upstream, status, streamed)
+        await asyncio.shield(resp.aclose())
+
+
 @router.get("/sse")
 async def proxy_sse(request: Request):
     """
@@ -18,18 +79,25 @@ async def proxy_sse(request: Request):
         raise HTTPException(status_code=503, detail="Doris MCP disabled")
 
     target_url = doris_client.sse_url
-    
-    async def stream_generator():
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                async with client.stream("GET", target_url) as resp:
-                    async for line in resp.aiter_lines():
-                        yield f"{line}\n"
-            except Exception as e:
-                logger.error(f"SSE Proxy error: {e}")
-                yield f"event: error\ndata: {str(e)}\n\n"
-
-    return StreamingResponse(stream_generator(), media_type="text/event-stream")
+
+    try:
+        upstream, resp = await _open_upstream_stream("GET", target_url, request)
+    except Exception as e:
+        logger.error(f"SSE Proxy error: {e}")
+        # The exception name is unbound once the except block ends
+        message = str(e)
+
+        async def error_stream():
+            yield f"event: error\ndata: {message}\n\n"
+
+        return StreamingResponse(error_stream(), media_type="text/event-stream")
+
+    return StreamingResponse(
+        _relay(upstream, resp, on_error_event=True),
+        status_code=resp.status_code,
+        media_type=resp.headers.get("content-type", "text/event-stream"),
+        headers=_passthrough_headers(resp),
+    )
 
 @router.post("/messages")
 async def proxy_messages(request: Request):
@@ -40,12 +108,16 @@ async def proxy_messages(request: Request):
         raise HTTPException(status_code=503, detail="Doris MCP disabled")
 
     target_url = doris_client.messages_url
-    body = await request.json()
-
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.post(target_url, json=body)
-            return Response(content=resp.content, status_code=resp.status_code, media_type=resp.headers.get("content-type"))
-        except Exception as e:
-            logger.error(f"Message Proxy error: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+
+    try:
+        upstream, resp = await _open_upstream_stream("POST", target_url, request, content=request.stream())
+    except Exception as e:
+        logger.error(f"Message Proxy error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        _relay(upstream, resp),
+        status_code=resp.status_code,
+        media_type=resp.headers.get("content-type"),
+        headers=_passthrough_headers(resp),
+    )
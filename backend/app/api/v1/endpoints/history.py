@@ -51,8 +51,7 @@ async def undo_query(
             "status": "success",
             "message": "Undo successful",
             "state": previous_state,
-            "can_undo": await QueryHistoryService.can_undo(request.session_id),
-            "can_redo": await QueryHistoryService.can_redo(request.session_id)
+            **await QueryHistoryService.get_undo_redo_status(request.session_id),
         }
         
     except Exception as e:
@@ -84,8 +83,7 @@ async def redo_query(
             "status": "success",
             "message": "Redo successful",
             "state": next_state,
-            "can_undo": await QueryHistoryService.can_undo(request.session_id),
-            "can_redo": await QueryHistoryService.can_redo(request.session_id)
+            **await QueryHistoryService.get_undo_redo_status(request.session_id),
         }
         
     except Exception as e:
@@ -113,8 +111,7 @@ async def get_history(
             "status": "success",
             "history": history,
             "count": len(history),
-            "can_undo": await QueryHistoryService.can_undo(request.session_id),
-            "can_redo": await QueryHistoryService.can_redo(request.session_id)
+            **await QueryHistoryService.get_undo_redo_status(request.session_id),
         }
         
     except Exception as e:
@@ -158,8 +155,7 @@ async def get_history_status(
     try:
         return {
             "status": "success",
-            "can_undo": await QueryHistoryService.can_undo(session_id),
-            "can_redo": await QueryHistoryService.can_redo(session_id)
+            **await QueryHistoryService.get_undo_redo_status(session_id),
         }
         
     except Exception as e:
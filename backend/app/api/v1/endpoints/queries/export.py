@@ -0,0 +1,116 @@
+
+import asyncio
+import logging
+import os
+from typing import Dict, Any
+
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.core.exceptions import AuthorizationException, ValidationException
+from app.core.rbac import rbac_manager, Role
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from .models import ExportRequest
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Keep references so fallback exports are not garbage-collected mid-run
+_background_exports: set = set()
+
+
+async def _get_owned_job(export_id: str, user: dict) -> Dict[str, Any]:
+    job = await ExportService.get_job(export_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job.get("user_id") != user["username"] and user["role"] != Role.ADMIN:
+        raise HTTPException(status_code=403, detail="Not authorized to access this export")
+    return job
+
+
+async def _dispatch_export(export_id: str) -> str:
+    """Run in a Celery worker when available, otherwise on this event loop"""
+    from app.core.celery_fallback import celery_fallback_handler
+
+    if await asyncio.to_thread(celery_fallback_handler.is_celery_available):
+        try:
+            from app.tasks.report_tasks import export_query_results
+            export_query_results.delay(export_id)
+            return "celery"
+        except Exception as e:
+            logger.warning(f"Celery export submission failed, running in-process: {e}")
+
+    task = asyncio.create_task(ExportService.run_export(export_id))
+    _background_exports.add(task)
+    task.add_done_callback(_background_exports.discard)
+    return "in_process"
+
+
+@router.post("/export")
+async def create_export(
+    request: ExportRequest,
+    user: dict = Depends(rbac_manager.get_current_user)
+) -> Dict[str, Any]:
+    """
+    Start a streaming export of an executed query's full result set
+
+    The query's approved SQL is replayed through a streaming cursor and
+    written batch by batch; poll /export/{export_id} or subscribe to
+    /export/{export_id}/events for progress, then download from
+    /export/{export_id}/download.
+    """
+    try:
+        job = await ExportService.create_job(
+            query_id=request.query_id,
+            fmt=request.format,
+            user_id=user["username"],
+            user_role=user["role"].value,
+            file_name=request.file_name,
+        )
+    except AuthorizationException as e:
+        raise HTTPException(status_code=403, detail=e.message)
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    runner = await _dispatch_export(job["export_id"])
+    logger.info(f"Export {job['export_id']} ({job['format']}) dispatched via {runner}")
+    return {**ExportService.public_view(job), "runner": runner}
+
+
+@router.get("/export/{export_id}")
+async def get_export_status(
+    export_id: str,
+    user: dict = Depends(rbac_manager.get_current_user)
+) -> Dict[str, Any]:
+    """Current export job status and progress"""
+    job = await _get_owned_job(export_id, user)
+    return ExportService.public_view(job)
+
+
+@router.get("/export/{export_id}/events")
+async def stream_export_progress(
+    export_id: str,
+    user: dict = Depends(rbac_manager.get_current_user)
+):
+    """Server-Sent Events stream of export progress"""
+    await _get_owned_job(export_id, user)
+    return StreamingResponse(
+        ExportService.stream_progress(export_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/export/{export_id}/download")
+async def download_export(
+    export_id: str,
+    user: dict = Depends(rbac_manager.get_current_user)
+):
+    """Download a completed export file"""
+    job = await _get_owned_job(export_id, user)
+    if job.get("status") != "completed":
+        raise HTTPException(status_code=409, detail=f"Export is {job.get('status')}")
+    path = job.get("file_path")
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="Export file has expired")
+    return FileResponse(path, media_type=EXPORT_FORMATS[job["format"]], filename=job["file_name"])
@@ -1,5 +1,5 @@
 from typing import Dict, Any, Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Constants
 MAX_QUERY_LENGTH = 10000
@@ -100,6 +100,12 @@ class ReportRequest(BaseModel):
     title: Optional[str] = None
     user_queries: Optional[list[str]] = None
 
+class ExportRequest(BaseModel):
+    """Request model for streaming large-result exports of an executed query"""
+    query_id: str = Field(..., pattern=r"^[a-zA-Z0-9_\-]+$")
+    format: str = "csv"  # csv, parquet, xlsx
+    file_name: Optional[str] = None
+
 class VisualizationRequest(BaseModel):
     """Request model for generating Python-based visualizations"""
     columns: list[str]
@@ -110,6 +116,7 @@ class VisualizationRequest(BaseModel):
     show_mean: Optional[bool] = True  # Show mean line on bar/line charts
     show_peaks: Optional[bool] = False  # Annotate peak values
     color_scheme: Optional[str] = None  # Custom color scheme
+    max_points: Optional[int] = Field(default=None, ge=100, le=200000)  # Override VIZ_MAX_POINTS
     
     class Config:
         str_strip_whitespace = True
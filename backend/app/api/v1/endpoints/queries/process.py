@@ -174,11 +174,7 @@ async def process_query_with_orchestrator(
         if result.get("trace_id"):
             try:
                 state_manager = await get_query_state_manager()
-                metadata = await state_manager.get_query_metadata(query_id)
-                if metadata:
-                    async with state_manager._metadata_lock:
-                        if query_id in state_manager._query_metadata:
-                            state_manager._query_metadata[query_id].trace_id = result.get("trace_id")
+                await state_manager.set_trace_id(query_id, result.get("trace_id"))
             except Exception:
                 pass
         
@@ -1,4 +1,5 @@
 
+import asyncio
 import logging
 import base64
 from typing import Dict, Any, Optional
@@ -7,6 +8,7 @@ from fastapi import APIRouter, HTTPException, Depends
 
 from app.services.report_generation_service import ReportGenerationService
 from app.services.visualization_service import VisualizationService
+from app.core.config import settings
 from app.core.rbac import rbac_manager
 from .models import ReportRequest, VisualizationRequest
 
@@ -63,8 +65,11 @@ async def generate_visualization(
     if not request.columns or not request.rows:
         raise HTTPException(status_code=400, detail="Columns and rows are required")
     
-    if len(request.rows) > 10000:
-        raise HTTPException(status_code=400, detail="Too many rows for visualization (max 10000)")
+    if len(request.rows) > settings.VIZ_MAX_INPUT_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many rows for visualization (max {settings.VIZ_MAX_INPUT_ROWS})"
+        )
     
     try:
         hints = {
@@ -73,12 +78,15 @@ async def generate_visualization(
             "color_scheme": request.color_scheme,
         }
         
-        result = VisualizationService.generate_chart(
+        # Chart building and downsampling are CPU-bound; keep the event loop free
+        result = await asyncio.to_thread(
+            VisualizationService.generate_chart,
             columns=request.columns,
             rows=request.rows,
             chart_type=request.chart_type,
             title=request.title,
-            hints=hints
+            hints=hints,
+            max_points=request.max_points,
         )
         
         return result
@@ -1,6 +1,6 @@
 
 from fastapi import APIRouter
-from . import direct, process, approval, history, status, reporting, cancel
+from . import direct, process, approval, history, status, reporting, cancel, export
 
 router = APIRouter()
 
@@ -17,6 +17,9 @@ router.include_router(process.router, tags=["Queries - Orchestrator"])
 # Approval
 router.include_router(approval.router, tags=["Queries - Approval"])
 
+# Export (registered before /{query_id} routes)
+router.include_router(export.router, tags=["Queries - Export"])
+
 # History & Status
 router.include_router(history.router, tags=["Queries - History"])
 router.include_router(status.router, tags=["Queries - Status"])
@@ -87,7 +87,8 @@ async def stream_query_state(
         Automatically cancels the query if client disconnects.
         """
         try:
-            async for message in state_manager.subscribe(query_id):
+            last_event_id = request.headers.get("last-event-id")
+            async for message in state_manager.subscribe(query_id, last_event_id=last_event_id):
                 # Check if client disconnected
                 if await request.is_disconnected():
                     logger.warning(f"Client disconnected from SSE stream for query {query_id[:8]}...")
@@ -183,7 +183,12 @@ def create_application() -> FastAPI:
         if hasattr(app.state, "startup_errors") and app.state.startup_errors:
             health_status["warnings"] = app.state.startup_errors
             health_status["status"] = "degraded"
-        
+
+        # Per-initializer startup timings (deferred ones may still be running)
+        startup_scheduler = getattr(app.state, "startup_scheduler", None)
+        if startup_scheduler is not None:
+            health_status["startup"] = startup_scheduler.report()
+
         return health_status
     
     # Prometheus metrics endpoint
@@ -11,8 +11,13 @@ Handles asynchronous background tasks:
 
 import logging
 from celery import Celery
-from celery.signals import task_prerun, task_postrun, task_failure
-from kombu import serializer
+from celery.signals import (
+    task_prerun,
+    task_postrun,
+    task_failure,
+    worker_process_init,
+    worker_process_shutdown,
+)
 
 from app.core.config import settings
 
@@ -91,6 +96,32 @@ celery_app.conf.update(
 
 # ==================== SIGNAL HANDLERS ====================
 
+@worker_process_init.connect
+def worker_process_init_handler(**kwargs):
+    """
+    Start the worker-resident event loop in each child process
+
+    The SQLcl pool and Redis connection initialize in the background so the
+    handler returns within worker_proc_alive_timeout; the first task waits
+    for them.
+    """
+    from app.core.celery_worker_runtime import start_worker_runtime
+
+    try:
+        start_worker_runtime()
+    except Exception as e:
+        # Tasks start the runtime lazily if this fails
+        logger.error(f"Worker runtime initialization failed: {e}")
+
+
+@worker_process_shutdown.connect
+def worker_process_shutdown_handler(**kwargs):
+    """Drain the worker-resident SQLcl pool before the child exits"""
+    from app.core.celery_worker_runtime import stop_worker_runtime
+
+    stop_worker_runtime()
+
+
 @task_prerun.connect
 def task_prerun_handler(sender=None, task_id=None, task=None, args=None, kwargs=None, **extra):
     """Log task start"""
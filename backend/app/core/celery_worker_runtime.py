@@ -0,0 +1,192 @@
+"""
+Celery Worker Runtime
+
+Long-lived async resources owned by each Celery worker process:
+- One persistent asyncio event loop running in a dedicated thread, so task
+  bodies stop paying asyncio.run() loop setup/teardown per await and
+  loop-bound resources (SQLcl response pump, Redis connections) survive
+  between tasks
+- A worker-resident SQLcl process pool, initialized once on worker start
+  instead of spawning (and leaking) a JVM per task
+- A Redis client owned by the runtime loop. The module-level
+  ``redis_client`` is left untouched so code outside the runtime never
+  shares a connection pool across event loops
+- Graceful drain on worker shutdown
+
+Startup runs in the background: the worker_process_init handler returns
+immediately (well inside worker_proc_alive_timeout) and the first task
+waits for the SQLcl pool and Redis connection to come up.
+
+Tasks submit coroutines with ``get_worker_runtime().run(coro)`` and reach
+Redis through ``get_worker_runtime().redis``.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Dict, Optional
+
+from app.core.config import settings
+from app.core.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+class CeleryWorkerRuntime:
+    """Persistent event loop and SQLcl pool for one worker process"""
+
+    def __init__(self, pool_size: Optional[int] = None, init_pool: bool = True):
+        self.pool_size = pool_size or settings.celery_sqlcl_pool_size
+        self.init_pool = init_pool
+        self.sqlcl_pool = None
+        self.redis = RedisClient()
+        self.tasks_run = 0
+        self._startup_future: Optional[Future] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        # A runtime inherited across fork has a dead loop thread; treat it as stopped
+        return self._loop is not None and self._pid == os.getpid() and self._loop.is_running()
+
+    def start(self, wait: bool = True) -> None:
+        """
+        Start the loop thread and begin initializing worker-resident resources
+
+        Args:
+            wait: Block until the SQLcl pool and Redis are up. Worker signal
+                handlers pass False; run() waits before the first task.
+        """
+        with self._lock:
+            if not self.started:
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                self._ready = False
+                ready = threading.Event()
+
+                def _run_loop():
+                    asyncio.set_event_loop(self._loop)
+                    self._loop.call_soon(ready.set)
+                    self._loop.run_forever()
+
+                self._thread = threading.Thread(target=_run_loop, name="celery-worker-loop", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._startup_future = asyncio.run_coroutine_threadsafe(self._startup(), self._loop)
+            startup = self._startup_future
+        if wait:
+            self._wait_ready(startup)
+
+    def _wait_ready(self, startup: Future) -> None:
+        # _startup handles its own failures, so this only waits
+        startup.result()
+        if not self._ready:
+            self._ready = True
+            logger.info(
+                f"Celery worker runtime started (pid={self._pid}, "
+                f"sqlcl_pool={'ready' if self.sqlcl_pool else 'unavailable'})"
+            )
+
+    async def _startup(self) -> None:
+        try:
+            await self.redis.connect()
+        except Exception as e:
+            logger.warning(f"Worker Redis connection failed, caching disabled: {e}")
+
+        if not self.init_pool:
+            return
+        from app.core.sqlcl_pool import SQLclProcessPool
+
+        try:
+            pool = SQLclProcessPool(pool_size=self.pool_size, process_timeout=settings.sqlcl_timeout)
+            if await pool.initialize():
+                self.sqlcl_pool = pool
+                return
+        except Exception as e:
+            logger.error(f"Worker SQLcl pool initialization error: {e}")
+        logger.warning("Worker SQLcl pool failed to initialize; tasks will use one-off clients")
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the worker loop and block until it completes"""
+        if not (self._ready and self.started):
+            self.start()
+        future: Future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            result = future.result(timeout)
+        except BaseException:
+            # Soft time limits and timeouts must not leave the coroutine running
+            future.cancel()
+            raise
+        self.tasks_run += 1
+        return result
+
+    def stop(self, drain_timeout: int = 30) -> None:
+        """Drain the SQLcl pool, close Redis and stop the loop thread"""
+        with self._lock:
+            if not self.started:
+                return
+            loop = self._loop
+            try:
+                if self._startup_future is not None:
+                    # Let a background startup finish so its pool gets drained
+                    self._startup_future.result(drain_timeout)
+                asyncio.run_coroutine_threadsafe(self._shutdown(drain_timeout), loop).result(drain_timeout + 10)
+            except Exception as e:
+                logger.error(f"Celery worker runtime shutdown error: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            if self._thread:
+                self._thread.join(timeout=5)
+            loop.close()
+            self._loop = None
+            self._thread = None
+            self._ready = False
+            self._startup_future = None
+            self.sqlcl_pool = None
+            logger.info(f"Celery worker runtime stopped after {self.tasks_run} task(s)")
+
+    async def _shutdown(self, drain_timeout: int) -> None:
+        if self.sqlcl_pool:
+            await self.sqlcl_pool.shutdown(drain_timeout=drain_timeout)
+
+        try:
+            await self.redis.disconnect()
+        except Exception as e:
+            logger.warning(f"Worker Redis disconnect failed: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "pid": self._pid,
+            "started": self.started,
+            "ready": self._ready,
+            "tasks_run": self.tasks_run,
+            "sqlcl_pool": self.sqlcl_pool.get_status() if self.sqlcl_pool else None,
+        }
+
+
+# Global worker runtime instance (started lazily or from worker signals)
+_worker_runtime: Optional[CeleryWorkerRuntime] = None
+
+
+def get_worker_runtime() -> CeleryWorkerRuntime:
+    """Return this process's worker runtime, creating it on first use"""
+    global _worker_runtime
+    if _worker_runtime is None:
+        _worker_runtime = CeleryWorkerRuntime()
+    return _worker_runtime
+
+
+def start_worker_runtime() -> None:
+    """Start worker-resident resources in the background (worker process start)"""
+    get_worker_runtime().start(wait=False)
+
+
+def stop_worker_runtime() -> None:
+    """Drain worker-resident resources (worker process shutdown)"""
+    if _worker_runtime is not None:
+        _worker_runtime.stop()
@@ -78,6 +78,11 @@ class AppSettings(BaseSettings):
     DORIS_DB_USER: str = Field(default="root", description="Doris Database User")
     DORIS_DB_PASSWORD: str = Field(default="", description="Doris Database Password")
     DORIS_DB_DATABASE: str = Field(default="demo", description="Doris Database Name")
+    DORIS_PROXY_MAX_CONNECTIONS: int = Field(default=100, ge=1, le=1000, description="Max pooled upstream connections for the Doris MCP proxy")
+    DORIS_PROXY_MAX_KEEPALIVE: int = Field(default=20, ge=0, le=1000, description="Max idle keep-alive connections for the Doris MCP proxy")
+    DORIS_PROXY_KEEPALIVE_EXPIRY: float = Field(default=30.0, ge=1.0, le=600.0, description="Idle keep-alive expiry (seconds) for the Doris MCP proxy")
+    DORIS_PROXY_CONNECT_TIMEOUT: float = Field(default=5.0, ge=0.5, le=60.0, description="Upstream connect timeout (seconds) for the Doris MCP proxy")
+    DORIS_PROXY_POOL_TIMEOUT: float = Field(default=10.0, ge=0.5, le=120.0, description="Wait for a free pooled connection (seconds) before failing")
     
     # PostgreSQL Configuration
     POSTGRES_ENABLED: bool = Field(default=False, description="Enable PostgreSQL integration")
@@ -91,12 +96,55 @@ class AppSettings(BaseSettings):
     POSTGRES_POOL_TIMEOUT: int = Field(default=30, ge=5, le=300, description="PostgreSQL pool connection timeout")
     POSTGRES_QUERY_TIMEOUT: int = Field(default=600, ge=30, le=3600, description="PostgreSQL query timeout")
     POSTGRES_READ_ONLY: bool = Field(default=True, description="Enforce read-only transactions for PostgreSQL")
+    POSTGRES_PREPARE_THRESHOLD: int = Field(default=5, ge=0, le=100, description="Executions of the same statement on a connection before it is prepared server-side (0 disables, e.g. behind PgBouncer transaction pooling)")
+    POSTGRES_BINARY_RESULTS: bool = Field(default=True, description="Fetch PostgreSQL result rows in binary format")
+    POSTGRES_MAX_RESULT_ROWS: int = Field(default=10000, ge=0, description="Display limit for interactive PostgreSQL results, enforced while fetching (0 disables)")
+    POSTGRES_FETCH_BATCH_SIZE: int = Field(default=1000, ge=1, le=100000, description="Rows fetched per round trip from PostgreSQL server-side cursors")
+    POSTGRES_VALIDATION_CACHE_SIZE: int = Field(default=1024, ge=0, le=100000, description="Distinct SQL texts remembered as validated read-only")
+
+    # Result Export Configuration
+    EXPORT_DIR: str = Field(default="/app/data/exports", description="Directory for streamed CSV/Parquet/XLSX exports")
+    EXPORT_BATCH_SIZE: int = Field(default=10000, ge=100, le=500000, description="Rows fetched and written per export batch")
+    EXPORT_MAX_ROWS: int = Field(default=50_000_000, ge=1000, description="Hard cap on rows written per export")
+    EXPORT_TTL_SECONDS: int = Field(default=86400, ge=600, le=604800, description="How long export jobs and files are kept")
+    DORIS_EXPORT_USER: str = Field(default="", description="Read-only Doris account for streamed exports (unset: Doris exports run through the normal query path)")
+    DORIS_EXPORT_PASSWORD: str = Field(default="", description="Password for DORIS_EXPORT_USER")
+
+    # Report Rendering Configuration (PDF/DOCX run in a process pool)
+    REPORT_RENDER_WORKERS: int = Field(default=2, ge=1, le=16, description="Processes rendering PDF/DOCX reports")
+    REPORT_RENDER_QUEUE_SIZE: int = Field(default=8, ge=0, le=256, description="Renders allowed to wait for a free render process")
+    REPORT_RENDER_TIMEOUT_SECONDS: int = Field(default=60, ge=5, le=600, description="Per-report render timeout")
+    REPORT_RENDER_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, ge=0, description="Memory budget for cached rendered reports (0 disables)")
+
+    # Chart Payload Configuration
+    VIZ_MAX_POINTS: int = Field(default=5000, ge=100, le=200000, description="Point budget per chart; larger series are downsampled server-side")
+    VIZ_MAX_INPUT_ROWS: int = Field(default=200000, ge=1000, le=5000000, description="Maximum rows accepted by the visualize endpoint")
+    
+    # Query Coalescing (identical concurrent executions share one database call)
+    QUERY_COALESCE_ENABLED: bool = Field(default=True, description="Coalesce identical in-flight SQL executions")
+    QUERY_COALESCE_LEASE_SECONDS: float = Field(default=10.0, ge=1.0, le=300.0, description="Cross-worker lease TTL, refreshed while the query runs")
+    QUERY_COALESCE_MAX_WAIT_SECONDS: float = Field(default=600.0, ge=1.0, le=3600.0, description="Longest a follower waits for another worker's result")
+    QUERY_COALESCE_RESULT_TTL_SECONDS: float = Field(default=30.0, ge=1.0, le=600.0, description="How long a shared result stays readable for followers")
+
+    # SQL Dialect Transpilation Cache
+    SQL_TRANSPILE_CACHE_ENABLED: bool = Field(default=True, description="Cache sqlglot dialect conversions by literal-normalized fingerprint")
+    SQL_TRANSPILE_CACHE_SIZE: int = Field(default=4096, ge=0, le=1_000_000, description="Maximum cached transpilation entries (0 disables)")
+
+    # Query Cost Estimate Cache
+    QUERY_COST_CACHE_ENABLED: bool = Field(default=True, description="Cache EXPLAIN PLAN cost estimates by statement text and schema version")
+    QUERY_COST_CACHE_SIZE: int = Field(default=2048, ge=0, le=1_000_000, description="Maximum cached cost estimates (0 disables)")
+    QUERY_COST_CACHE_TTL_SECONDS: int = Field(default=900, ge=1, le=86400, description="Lifetime of a cached cost estimate (bounds staleness after statistics changes)")
+
+    # Startup Configuration
+    STARTUP_PARALLEL_ENABLED: bool = Field(default=True, description="Start independent initializers concurrently")
+    STARTUP_DEFERRED_COMPONENTS: Union[str, List[str]] = Field(default=["semantic_index", "celery"], description="Initializers run after the application reports ready (comma-separated)")
     
     # SQLcl Configuration for STDIO MCP
     sqlcl_path: str = Field(default="sql", min_length=1, max_length=255, description="Path to SQLcl executable")
     sqlcl_args: List[str] = Field(default=["-mcp"], description="SQLcl command line arguments for MCP mode")
     sqlcl_timeout: int = Field(default=600, ge=30, le=3600, description="SQLcl subprocess timeout")
     sqlcl_max_processes: int = Field(default=2, ge=1, le=20, description="Maximum SQLcl processes in pool")
+    celery_sqlcl_pool_size: int = Field(default=1, ge=1, le=20, description="SQLcl processes kept resident in each Celery worker process")
     oracle_default_connection: str = Field(default="TestUserCSV", description="Default Oracle SQLcl connection name to use for executions")
     # Redis Configuration
     REDIS_HOST: str = Field(default="localhost", description="Redis host")
@@ -105,6 +153,7 @@ class AppSettings(BaseSettings):
     REDIS_SESSION_DB: int = Field(default=0, ge=0, le=15, description="Redis database for sessions")
     REDIS_CACHE_DB: int = Field(default=1, ge=0, le=15, description="Redis database for caching")
     REDIS_CELERY_DB: int = Field(default=2, ge=0, le=15, description="Redis database for Celery")
+    QUERY_STATE_SHARED_BACKEND: bool = Field(default=True, description="Share query state/SSE events across API workers via Redis Streams")
 
     # Celery Configuration (URLs constructed at runtime via properties)
     CELERY_BROKER_DB: int = Field(default=0, ge=0, le=15, description="Redis database for Celery broker")
@@ -280,6 +329,14 @@ class AppSettings(BaseSettings):
                 return [arg.strip().strip('"\'') for arg in v.split(",") if arg.strip()]
         return v if v else ["-mcp"]
 
+    @field_validator("STARTUP_DEFERRED_COMPONENTS", mode="before")
+    @classmethod
+    def validate_startup_deferred_components(cls, v) -> List[str]:
+        """Accept a comma-separated list of initializer names"""
+        if isinstance(v, str):
+            return [name.strip() for name in v.split(",") if name.strip()]
+        return v or []
+
     @field_validator("jwt_secret_key", "jwt_refresh_secret_key")
     @classmethod
     def validate_jwt_secret_key(cls, v: str) -> str:
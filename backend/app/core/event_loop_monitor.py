@@ -0,0 +1,83 @@
+"""
+Event Loop Lag Monitor
+
+Measures how late the event loop wakes a sleeping task: a background task
+sleeps for a fixed interval and records the overshoot. Sustained lag means
+something is running blocking work on the loop (CPU-bound rendering, sync
+I/O) and every concurrent request/SSE stream is stalled by that much.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from app.core.prometheus_metrics import event_loop_lag
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+LAG_WARNING_SECONDS = 0.5
+
+
+class EventLoopLagMonitor:
+    """Samples event loop scheduling delay into a bounded window"""
+
+    def __init__(self, interval: float = 0.1, window: int = 1024):
+        self.interval = interval
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled)
+            self._samples.append(lag)
+            if METRICS_AVAILABLE:
+                event_loop_lag.observe(lag)
+            if lag >= LAG_WARNING_SECONDS:
+                logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms")
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag statistics (milliseconds) over the sample window"""
+        if not self._samples:
+            return {"samples": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self._samples)
+        n = len(ordered)
+        return {
+            "samples": n,
+            "mean_ms": round(sum(ordered) / n * 1000, 3),
+            "p50_ms": round(ordered[(n - 1) // 2] * 1000, 3),
+            "p99_ms": round(ordered[min(n - 1, int(n * 0.99))] * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        }
+
+
+# Global monitor for the application event loop (started from lifespan)
+event_loop_monitor = EventLoopLagMonitor()
@@ -10,22 +10,22 @@ import logging
 from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from datetime import datetime
 
-try:
+from app.utils.lazy_imports import lazy_import, module_available
+
+# graphiti_core (and the LLM SDKs it pulls in) loads when a client is created
+graphiti_core = lazy_import("graphiti_core")
+falkordb_driver = lazy_import("graphiti_core.driver.falkordb_driver")
+gemini_reranker = lazy_import("graphiti_core.cross_encoder.gemini_reranker_client")
+# Gemini clients
+gemini_llm = lazy_import("graphiti_core.llm_client.gemini_client")
+gemini_embedder = lazy_import("graphiti_core.embedder.gemini")
+# Generic clients for Mistral/OpenRouter
+openai_generic_llm = lazy_import("graphiti_core.llm_client.openai_generic_client")
+GRAPHITI_AVAILABLE = module_available("graphiti_core")
+
+if TYPE_CHECKING:
     from graphiti_core import Graphiti
     from graphiti_core.driver.falkordb_driver import FalkorDriver
-    from graphiti_core.cross_encoder.gemini_reranker_client import GeminiRerankerClient
-    # Gemini clients
-    from graphiti_core.llm_client.gemini_client import GeminiClient, LLMConfig as GeminiLLMConfig
-    from graphiti_core.embedder.gemini import GeminiEmbedder, GeminiEmbedderConfig
-    # Generic clients for Mistral/OpenRouter
-    from graphiti_core.llm_client.openai_generic_client import OpenAIGenericClient, LLMConfig as OpenAIConfig
-    from graphiti_core.embedder.openai import OpenAIEmbedder, OpenAIEmbedderConfig
-    GRAPHITI_AVAILABLE = True
-except Exception:
-    GRAPHITI_AVAILABLE = False
-    # Provide dummy types for type checking
-    if TYPE_CHECKING:
-        from graphiti_core import Graphiti
 
 from app.core.config_manager import settings
 
@@ -76,8 +76,8 @@ class GraphitiClient:
                 "Graphiti is not installed. Run: uv add 'graphiti-core[falkordb,google-genai]'"
             )
 
-        self._graphiti: Optional[Graphiti] = None
-        self._driver: Optional[FalkorDriver] = None
+        self._graphiti: Optional["Graphiti"] = None
+        self._driver: Optional["FalkorDriver"] = None
         self._llm_provider = settings.GRAPHITI_LLM_PROVIDER
         self._embedding_provider = settings.GRAPHITI_EMBEDDING_PROVIDER
         
@@ -100,7 +100,7 @@ class GraphitiClient:
             falkordb_config = settings.falkordb_connection_config
             logger.info(f"Connecting to FalkorDB at {falkordb_config['host']}:{falkordb_config['port']}")
             
-            self._driver = FalkorDriver(
+            self._driver = falkordb_driver.FalkorDriver(
                 host=falkordb_config['host'],
                 port=falkordb_config['port'],
                 password=falkordb_config.get('password', None),
@@ -139,28 +139,28 @@ class GraphitiClient:
         logger.info("Initializing Graphiti with Google Gemini provider")
 
         # Configure Gemini LLM client
-        llm_config = GeminiLLMConfig(
+        llm_config = gemini_llm.LLMConfig(
             api_key=settings.GOOGLE_API_KEY,
             model=settings.GRAPHITI_LLM_MODEL  # Use configured model from settings
         )
-        llm_client = GeminiClient(config=llm_config)
+        llm_client = gemini_llm.GeminiClient(config=llm_config)
 
         # Configure Gemini embedder
-        embedder_config = GeminiEmbedderConfig(
+        embedder_config = gemini_embedder.GeminiEmbedderConfig(
             api_key=settings.GOOGLE_API_KEY,
             embedding_model=settings.GRAPHITI_EMBEDDING_MODEL,  # "text-embedding-004"
             embedding_dim=settings.GRAPHITI_EMBEDDING_DIMENSIONS  # 768
         )
-        embedder = GeminiEmbedder(config=embedder_config)
+        embedder = gemini_embedder.GeminiEmbedder(config=embedder_config)
 
         # Configure Gemini reranker
-        reranker_config = GeminiLLMConfig(
+        reranker_config = gemini_llm.LLMConfig(
             api_key=settings.GOOGLE_API_KEY,
             model=settings.GRAPHITI_LLM_MODEL  # Use same model for reranking
         )
-        reranker = GeminiRerankerClient(config=reranker_config)
+        reranker = gemini_reranker.GeminiRerankerClient(config=reranker_config)
 
-        return Graphiti(
+        return graphiti_core.Graphiti(
             graph_driver=self._driver,
             llm_client=llm_client,
             embedder=embedder,
@@ -176,17 +176,17 @@ class GraphitiClient:
         logger.info(f"Initializing Graphiti with Mistral provider (Model: {settings.GRAPHITI_LLM_MODEL})")
 
         # LLM Client (using Generic OpenAI-compatible client)
-        llm_config = OpenAIConfig(
+        llm_config = openai_generic_llm.LLMConfig(
             api_key=api_key,
             model=settings.GRAPHITI_LLM_MODEL,
             base_url="https://api.mistral.ai/v1"
         )
-        llm_client = OpenAIGenericClient(config=llm_config)
+        llm_client = openai_generic_llm.OpenAIGenericClient(config=llm_config)
 
         # Embedder
         embedder = await self._get_embedder()
 
-        return Graphiti(
+        return graphiti_core.Graphiti(
             graph_driver=self._driver,
             llm_client=llm_client,
             embedder=embedder
@@ -201,17 +201,17 @@ class GraphitiClient:
         logger.info(f"Initializing Graphiti with OpenRouter provider (Model: {settings.GRAPHITI_LLM_MODEL})")
 
         # LLM Client
-        llm_config = OpenAIConfig(
+        llm_config = openai_generic_llm.LLMConfig(
             api_key=api_key,
             model=settings.GRAPHITI_LLM_MODEL,
             base_url="https://openrouter.ai/api/v1"
         )
-        llm_client = OpenAIGenericClient(config=llm_config)
+        llm_client = openai_generic_llm.OpenAIGenericClient(config=llm_config)
 
         # Embedder
         embedder = await self._get_embedder()
 
-        return Graphiti(
+        return graphiti_core.Graphiti(
             graph_driver=self._driver,
             llm_client=llm_client,
             embedder=embedder
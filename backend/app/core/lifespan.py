@@ -38,6 +38,10 @@ async def _run_periodic_cleanup():
             if cleaned_metadata > 0 or cleaned_states > 0:
                 logger.info(f"Periodic cleanup: {cleaned_metadata} metadata, {cleaned_states} states removed")
             
+            # Remove export files whose jobs have expired
+            from app.services.export_service import ExportService
+            await asyncio.to_thread(ExportService.cleanup_expired_files)
+            
             # Clean up LangGraph checkpoints (every hour)
             if current_time - last_checkpoint_cleanup >= checkpoint_cleanup_interval:
                 try:
@@ -110,6 +114,7 @@ from app.core.observability import setup_observability
 from app.core.logging_config import setup_logging
 from app.core.client_registry import registry
 from app.core.graphiti_client import close_graphiti_client
+from app.core.startup_scheduler import StartupScheduler
 from app.core.initializers import (
     init_doris,
     init_postgres,
@@ -230,8 +235,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     logger.info("Starting Amila backend")
 
+    # Initializers declare their dependencies; independent ones start
+    # concurrently and non-critical ones can be deferred past readiness
+    scheduler = StartupScheduler(parallel=settings.STARTUP_PARALLEL_ENABLED)
+    deferred_components = set(settings.STARTUP_DEFERRED_COMPONENTS)
+    app.state.startup_scheduler = scheduler
+
+    def traced(name: str, func):
+        async def run():
+            async with startup_span(f"startup.{name}", metadata={"component": name}) as span:
+                result = await func()
+                span["output"] = {"status": "success" if result[0] else "error", "error": result[1]}
+                return result
+        return run
+
     # 1. Doris
-    if settings.DORIS_MCP_ENABLED:
+    async def start_doris():
         success, err = await init_doris()
         app.state.doris_initialized = success
         if not success:
@@ -239,69 +258,69 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             logger.warning(f"Doris init failed: {err}")
         else:
             logger.info("Doris MCP initialized successfully")
-    
+        return success, err
+
     # 1.5 PostgreSQL
-    if settings.POSTGRES_ENABLED:
-        async with startup_span("startup.postgres", metadata={"component": "postgres"}) as span:
-            success, err = await init_postgres()
-            app.state.postgres_initialized = success
-            span["output"] = {"status": "success" if success else "error", "error": err}
-            if not success:
-                startup_errors.append(f"PostgreSQL init failed: {err}")
-                logger.warning(f"PostgreSQL init failed: {err}")
-            else:
-                logger.info("PostgreSQL client initialized successfully")
+    async def start_postgres():
+        success, err = await init_postgres()
+        app.state.postgres_initialized = success
+        if not success:
+            startup_errors.append(f"PostgreSQL init failed: {err}")
+            logger.warning(f"PostgreSQL init failed: {err}")
+        else:
+            logger.info("PostgreSQL client initialized successfully")
+        return success, err
 
     # 2. Encryption Service
-    async with startup_span("startup.encryption", metadata={"component": "encryption"}) as span:
+    async def start_encryption():
         try:
             from app.core.encryption import get_encryption_service
             encryption_service = get_encryption_service()
             if encryption_service.is_enabled():
                 logger.info("Encryption service initialized and enabled")
-                span["output"] = {"status": "success", "enabled": True}
                 component_status["encryption"] = {"status": "success", "enabled": True}
             else:
                 logger.warning("Encryption service initialized but disabled (no key configured)")
-                span["output"] = {"status": "success", "enabled": False}
                 component_status["encryption"] = {"status": "success", "enabled": False}
+            return True, None
         except Exception as e:
             startup_errors.append(f"Encryption service failed: {e}")
-            span["output"] = {"status": "error", "error": str(e)}
             component_status["encryption"] = {"status": "error", "error": str(e)}
             logger.error(f"Encryption service initialization failed: {e}")
+            return False, str(e)
 
     # 3. Observability
-    async with startup_span("startup.observability", metadata={"component": "observability"}) as span:
+    async def start_observability():
         try:
             setup_observability()
-            span["output"] = {"status": "success"}
             component_status["observability"] = {"status": "success"}
+            return True, None
         except Exception as e:
             startup_errors.append(f"Observability failed: {e}")
-            span["output"] = {"status": "error", "error": str(e)}
             component_status["observability"] = {"status": "error", "error": str(e)}
+            return False, str(e)
 
     # 4. Redis
-    async with startup_span("startup.redis", metadata={"component": "redis"}) as span:
+    async def start_redis():
         success, err = await init_redis()
         status = "success" if success else "error"
-        span["output"] = {"status": status, "error": err}
         component_status["redis"] = {"status": status, "error": err}
         if not success: startup_errors.append(f"Redis failed: {err}")
+        return success, err
     
-    # 4.5 Check Celery worker availability
-    try:
-        from app.core.celery_fallback import celery_fallback_handler
-        from app.core.degraded_mode_manager import degraded_mode_manager, ComponentStatus
-        
-        if celery_fallback_handler.is_celery_available():
-            logger.info("Celery workers available")
-            degraded_mode_manager.update_component_status(
-                "celery",
-                ComponentStatus.OPERATIONAL
-            )
-        else:
+    # 4.5 Check Celery worker availability (blocking broker ping)
+    async def check_celery():
+        try:
+            from app.core.celery_fallback import celery_fallback_handler
+            from app.core.degraded_mode_manager import degraded_mode_manager, ComponentStatus
+            
+            if await asyncio.to_thread(celery_fallback_handler.is_celery_available):
+                logger.info("Celery workers available")
+                degraded_mode_manager.update_component_status(
+                    "celery",
+                    ComponentStatus.OPERATIONAL
+                )
+                return True, None
             logger.warning("Celery workers not available, using fallback execution")
             degraded_mode_manager.update_component_status(
                 "celery",
@@ -315,36 +334,50 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
                     "Review Celery worker logs"
                 ]
             )
-    except Exception as e:
-        logger.warning(f"Celery health check failed: {e}")
+            return False, "No workers available"
+        except Exception as e:
+            logger.warning(f"Celery health check failed: {e}")
+            return False, str(e)
 
-    # 4. Semantic Index
-    if component_status.get("redis", {}).get("status") == "success":
-        async with startup_span("startup.semantic_index", metadata={"component": "semantic_index"}) as span:
-            success, err = await init_semantic_index()
-            span["output"] = {"status": "success" if success else "error", "error": err}
-    
     # 5. Graphiti
-    async with startup_span("startup.graphiti", metadata={"component": "graphiti"}) as span:
+    async def start_graphiti():
         success, err = await init_graphiti()
         app.state.graphiti_initialized = success
-        span["output"] = {"status": "success" if success else "error", "error": err}
         if not success: startup_errors.append(f"Graphiti failed: {err}")
+        return success, err
 
     # 6. SQLcl Pool
-    async with startup_span("startup.sqlcl_pool", metadata={"component": "sqlcl_pool"}) as span:
+    async def start_sqlcl_pool():
         success, err = await init_sqlcl_pool()
-        span["output"] = {"status": "success" if success else "error", "error": err}
         if not success: startup_errors.append(f"SQLcl failed: {err}")
+        return success, err
 
     # 7. Orchestrator
-    async with startup_span("startup.langgraph", metadata={"component": "langgraph"}) as span:
+    async def start_orchestrator():
         success, err, cp_context = await init_orchestrator()
-        span["output"] = {"status": "success" if success else "error", "error": err}
         if success:
             app.state.checkpointer_context = cp_context
         else:
             startup_errors.append(f"Orchestrator failed: {err}")
+        return success, err
+
+    if settings.DORIS_MCP_ENABLED:
+        scheduler.add("doris", traced("doris", start_doris), deferred="doris" in deferred_components)
+    if settings.POSTGRES_ENABLED:
+        scheduler.add("postgres", traced("postgres", start_postgres), deferred="postgres" in deferred_components)
+    scheduler.add("encryption", traced("encryption", start_encryption))
+    scheduler.add("observability", traced("observability", start_observability))
+    scheduler.add("redis", traced("redis", start_redis))
+    scheduler.add("celery", check_celery, depends_on=("redis",), requires_success=False,
+                  deferred="celery" in deferred_components)
+    scheduler.add("semantic_index", traced("semantic_index", init_semantic_index), depends_on=("redis",),
+                  deferred="semantic_index" in deferred_components)
+    scheduler.add("graphiti", traced("graphiti", start_graphiti), deferred="graphiti" in deferred_components)
+    scheduler.add("sqlcl_pool", traced("sqlcl_pool", start_sqlcl_pool), deferred="sqlcl_pool" in deferred_components)
+    scheduler.add("langgraph", traced("langgraph", start_orchestrator))
+
+    await scheduler.run()
+    scheduler.log_summary(logger)
 
     # Finalize
     app.state.startup_errors = startup_errors
@@ -365,6 +398,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning(f"Failed to start cleanup task: {e}")
     
+    # Measure event loop responsiveness (blocking work shows up as lag)
+    try:
+        from app.core.event_loop_monitor import event_loop_monitor
+        event_loop_monitor.start()
+    except Exception as e:
+        logger.warning(f"Failed to start event loop lag monitor: {e}")
+    
     # Start background MCP probe task for diagnostics
     try:
         from app.services.diagnostic_service import start_mcp_probe_task
@@ -374,13 +414,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning(f"Failed to start MCP probe task: {e}")
 
+    # Non-critical initializers finish in the background after readiness
+    if scheduler.has_deferred():
+        async def run_deferred_startup():
+            await scheduler.run(deferred=True)
+            scheduler.log_summary(logger, deferred=True)
+
+        app.state.deferred_startup_task = asyncio.create_task(run_deferred_startup())
+        logger.info("Started deferred initializers in background")
+
     if trace_identifier and langfuse_helpers.get('update_trace'):
         try:
             langfuse_helpers['update_trace'](
                 trace_identifier,
                 output_data={
                     "status": "ready" if not startup_errors else "degraded",
-                    "warnings": startup_errors
+                    "warnings": startup_errors,
+                    "startup": scheduler.report(),
                 },
                 tags=["startup", "success" if not startup_errors else "warning"]
             )
@@ -402,6 +452,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception as e:
             logger.warning(f"Cleanup task cancellation error: {e}")
     
+    # Cancel deferred initializers that are still running
+    if getattr(app.state, "deferred_startup_task", None):
+        try:
+            app.state.deferred_startup_task.cancel()
+            await asyncio.wait_for(app.state.deferred_startup_task, timeout=5.0)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            pass
+        except Exception as e:
+            logger.warning(f"Deferred startup cancellation error: {e}")
+    
     # Cancel MCP probe task
     if hasattr(app.state, "mcp_probe_task") and app.state.mcp_probe_task:
         try:
@@ -412,6 +472,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception as e:
             logger.warning(f"MCP probe task cancellation error: {e}")
     
+    # Stop event loop lag monitor and report render processes
+    try:
+        from app.core.event_loop_monitor import event_loop_monitor
+        await event_loop_monitor.stop()
+    except Exception as e:
+        logger.warning(f"Event loop monitor shutdown error: {e}")
+    
+    try:
+        from app.core.report_render_pool import report_render_pool
+        await asyncio.to_thread(report_render_pool.shutdown)
+    except Exception as e:
+        logger.warning(f"Report render pool shutdown error: {e}")
+    
+    # Stop cross-worker query event pump
+    try:
+        from app.services.query_state_manager import get_query_state_manager
+        await (await get_query_state_manager()).shutdown()
+    except Exception as e:
+        logger.warning(f"Query state manager shutdown error: {e}")
+    
     # Cleanup checkpointer
     if hasattr(app.state, "checkpointer_context") and app.state.checkpointer_context:
         try:
@@ -425,6 +505,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception:
         pass
         
+    # Cleanup shared proxy HTTP clients (drains open SSE streams briefly)
+    try:
+        from app.core.proxy_http_client import proxy_http_pool
+        await proxy_http_pool.aclose()
+    except Exception as e:
+        logger.warning(f"Proxy HTTP pool shutdown error: {e}")
+
     # Cleanup Redis
     try:
         from app.core.redis_client import redis_client
@@ -0,0 +1,135 @@
+"""
+Plan estimate cache for the query cost estimator
+
+Every cost estimate costs several SQLcl round trips (EXPLAIN PLAN, read
+PLAN_TABLE, DBMS_XPLAN, cleanup) and the same statements are estimated again
+on repair, fallback and re-asks. Estimates are keyed by
+(connection, schema version, normalized statement):
+
+- The statement is the exact SQL text with whitespace outside literals
+  collapsed. Literal values stay in the key: the estimate gates blocking and
+  approval, and "FETCH FIRST 10 ROWS" must not reuse the cost of a cheaper
+  or narrower sibling. The cached execution plan therefore always shows the
+  caller's own predicates
+- The schema version is an in-process counter bumped whenever the schema
+  cache is invalidated; entries from older versions are never served and
+  age out of the LRU
+- Entries expire after QUERY_COST_CACHE_TTL_SECONDS, which bounds staleness
+  from optimizer statistics changes and from invalidations in other workers
+
+Values are stored as-is; callers copy mutable fields before handing them out.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.transpile_cache import scan_literals
+
+try:
+    from app.core.prometheus_metrics import query_cost_estimate_cache
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+CacheKey = Tuple[str, int, str]
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(sql: str) -> str:
+    """Statement with whitespace runs outside literals collapsed and trailing semicolons removed"""
+    sql = sql.strip().rstrip(";").rstrip()
+    literals, _ = scan_literals(sql)
+    parts = []
+    pos = 0
+    for start, end, text in literals:
+        parts.append(_WHITESPACE_RE.sub(" ", sql[pos:start]))
+        parts.append(text)
+        pos = end
+    parts.append(_WHITESPACE_RE.sub(" ", sql[pos:]))
+    return "".join(parts)
+
+
+class PlanEstimateCache:
+    """Bounded LRU of cost estimates with TTL and schema-version keys"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.max_entries = settings.QUERY_COST_CACHE_SIZE if max_entries is None else max_entries
+        self.ttl_seconds = settings.QUERY_COST_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.enabled = (settings.QUERY_COST_CACHE_ENABLED if enabled is None else enabled) and self.max_entries > 0
+        self.schema_version = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def key(self, sql: str, connection: str) -> CacheKey:
+        return (connection, self.schema_version, normalize_statement(sql))
+
+    def get(self, key: CacheKey) -> Any:
+        """Cached value for key, or None on a miss (expired entries are dropped)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._record("miss")
+                return None
+            self._entries.move_to_end(key)
+            self._record("hit")
+            return entry[1]
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        if not self.enabled or key[1] != self.schema_version:
+            # Schema changed while the estimate was running
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def bump_schema_version(self) -> int:
+        """Invalidate every cached estimate; called when the schema cache is invalidated"""
+        with self._lock:
+            self.schema_version += 1
+            self._entries.clear()
+            return self.schema_version
+
+    def _record(self, outcome: str) -> None:
+        self._stats["hits" if outcome == "hit" else "misses"] += 1
+        if METRICS_AVAILABLE:
+            query_cost_estimate_cache.labels(outcome=outcome).inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "schema_version": self.schema_version,
+            **self._stats,
+            "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else None,
+        }
+
+
+# Global instance
+plan_estimate_cache = PlanEstimateCache()
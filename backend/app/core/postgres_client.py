@@ -1,39 +1,63 @@
 """
 PostgreSQL Client with Connection Pooling
 Provides secure read-only access to PostgreSQL databases
+
+Session defaults (statement timeout, read-only transactions) are sent as
+startup options, and the pool runs RESET ALL whenever a connection is
+returned, so a query that changes a setting for the session (for example
+SELECT set_config('default_transaction_read_only', 'off', false)) cannot
+leak into later checkouts. Statements that repeat on
+a connection are prepared server-side by psycopg once they reach
+POSTGRES_PREPARE_THRESHOLD executions, and rows are transferred in binary
+format and built directly as lists. The request id is therefore carried in
+the transaction-local application_name (pg_stat_activity, log_line_prefix
+%a) rather than in the statement text.
+
+SELECT/VALUES queries with a row cap (the display limit for interactive
+results) and exports run through named server-side cursors and are fetched in
+batches, so the cap is enforced while fetching and large results never
+materialize in memory. Other allowed statements (SHOW, EXPLAIN, ...) cannot be
+declared as cursors; they run on the regular cursor and the cap is applied
+with fetchmany.
 """
 
 import logging
 import asyncio
 import re
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable, Tuple
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.exceptions import ExternalServiceException, ValidationException
+from app.utils.lazy_imports import lazy_import, module_available
 
 logger = logging.getLogger(__name__)
 
-# Try to import psycopg3
-try:
-    import psycopg
-    from psycopg_pool import AsyncConnectionPool
-    PSYCOPG_AVAILABLE = True
-except ImportError:
-    PSYCOPG_AVAILABLE = False
+# DECLARE ... CURSOR accepts only SELECT or VALUES (WITH ... SELECT and TABLE x are SELECTs)
+_CURSOR_QUERY_RE = re.compile(r"^(?:\s+|--[^\n]*\n|/\*.*?\*/|\()*(SELECT|VALUES|WITH|TABLE)\b", re.IGNORECASE | re.DOTALL)
+
+# Driver and SQL parser load when the client is first used, so deployments
+# without PostgreSQL never import them
+psycopg = lazy_import("psycopg")
+psycopg_pool = lazy_import("psycopg_pool")
+sqlglot = lazy_import("sqlglot")
+exp = lazy_import("sqlglot.expressions")
+PSYCOPG_AVAILABLE = module_available("psycopg") and module_available("psycopg_pool")
+if not PSYCOPG_AVAILABLE:
     logger.warning("psycopg3 not available - PostgreSQL integration disabled")
 
-# Try to import sqlglot
-try:
-    import sqlglot
-    from sqlglot import exp
-    SQLGLOT_AVAILABLE = True
-except ImportError:
-    SQLGLOT_AVAILABLE = False
+SQLGLOT_AVAILABLE = module_available("sqlglot")
+if not SQLGLOT_AVAILABLE:
     logger.warning("sqlglot not available - SQL validation will fallback to basic checks")
 
 
+def list_row(cursor) -> type:
+    """Row factory building each row as a list, the shape other DB services return"""
+    return list
+
+
 class PostgreSQLClient:
     """
     PostgreSQL client with async connection pooling
@@ -41,9 +65,12 @@ class PostgreSQLClient:
     """
     
     def __init__(self):
-        self._pool: Optional[AsyncConnectionPool] = None
+        self._pool: Optional["psycopg_pool.AsyncConnectionPool"] = None
         self._initialized = False
         self._lock = asyncio.Lock()
+        # SQL texts that already passed read-only validation (bounded LRU)
+        self._validated_sql: "OrderedDict[str, None]" = OrderedDict()
+        self._stats = {"queries": 0, "validation_cache_hits": 0, "connections_configured": 0}
         
     async def initialize(self):
         """Initialize connection pool"""
@@ -66,14 +93,17 @@ class PostgreSQLClient:
                     f"port={settings.POSTGRES_PORT} "
                     f"dbname={settings.POSTGRES_DATABASE} "
                     f"user={settings.POSTGRES_USER} "
-                    f"password={settings.POSTGRES_PASSWORD}"
+                    f"password={settings.POSTGRES_PASSWORD} "
+                    f"options='{self._session_options()}'"
                 )
                 
-                self._pool = AsyncConnectionPool(
+                self._pool = psycopg_pool.AsyncConnectionPool(
                     conninfo=conninfo,
                     min_size=settings.POSTGRES_POOL_MIN_SIZE,
                     max_size=settings.POSTGRES_POOL_MAX_SIZE,
                     timeout=settings.POSTGRES_POOL_TIMEOUT,
+                    configure=self._configure_connection,
+                    reset=self._reset_connection,
                     open=False # Don't open in constructor (deprecated)
                 )
                 
@@ -91,11 +121,37 @@ class PostgreSQLClient:
                 logger.error(f"Failed to initialize PostgreSQL pool: {e}")
                 raise ExternalServiceException(f"PostgreSQL pool initialization failed: {e}", service_name="postgres")
     
+    @staticmethod
+    def _session_options() -> str:
+        """
+        Startup options for every pooled connection. Read-only transactions
+        are the session default, which provides defense-in-depth against
+        write operations without a SET per checkout; RESET ALL restores
+        these values rather than the server defaults.
+        """
+        options = f"-c statement_timeout={settings.POSTGRES_QUERY_TIMEOUT * 1000}"
+        if settings.POSTGRES_READ_ONLY:
+            options += " -c default_transaction_read_only=on"
+        return options
+    
+    async def _configure_connection(self, conn) -> None:
+        """Set up psycopg-side options once when the pool opens a connection"""
+        threshold = settings.POSTGRES_PREPARE_THRESHOLD
+        conn.prepare_threshold = threshold if threshold > 0 else None
+        self._stats["connections_configured"] += 1
+    
+    @staticmethod
+    async def _reset_connection(conn) -> None:
+        """Drop session-level setting changes made by the last checkout"""
+        await conn.execute("RESET ALL")
+        # The pool discards connections not returned idle
+        await conn.commit()
+    
     @asynccontextmanager
     async def get_connection(self):
         """
-        Get connection from pool with transaction-level read-only enforcement.
-        This provides defense-in-depth against write operations.
+        Get a configured connection from the pool.
+        Sessions default to read-only transactions (see _session_options).
         """
         if not self._initialized:
             raise ExternalServiceException("PostgreSQL client not initialized", service_name="postgres")
@@ -104,16 +160,75 @@ class PostgreSQLClient:
             raise ExternalServiceException("Connection pool not available", service_name="postgres")
         
         async with self._pool.connection() as conn:
-            if settings.POSTGRES_READ_ONLY:
-                await conn.execute("SET TRANSACTION READ ONLY")
             yield conn
     
+    @staticmethod
+    async def _apply_request_settings(conn, request_id: str, timeout: Optional[int]) -> None:
+        """
+        Tag the current transaction with the request id and, for a non-default
+        timeout, override the statement timeout, in one round trip. Both are
+        transaction-local and reset when the connection returns to the pool.
+        """
+        query = "SELECT set_config('application_name', %s, true)"
+        params = [f"LLM Request {request_id}"[:63]]
+        if timeout and timeout != settings.POSTGRES_QUERY_TIMEOUT:
+            query += ", set_config('statement_timeout', %s, true)"
+            params.append(str(int(timeout) * 1000))
+        await conn.execute(query, params)
+    
+    @staticmethod
+    def _mark_query(sql: str, user_id: str, request_id: str) -> str:
+        """
+        Prefix the audit marker. With prepared statements enabled the request
+        id is left out, so repeated statements keep the same text and reuse the
+        connection's prepared statement; it is still recorded as the
+        application_name (see _apply_request_settings).
+        """
+        if settings.POSTGRES_PREPARE_THRESHOLD > 0:
+            return f"/* LLM Query - User: {user_id} */\n{sql}"
+        return f"/* LLM Query - User: {user_id}, Request: {request_id} */\n{sql}"
+    
+    @staticmethod
+    def _is_cursor_query(sql: str) -> bool:
+        """Whether sql can run as DECLARE ... CURSOR (SELECT or VALUES)"""
+        return _CURSOR_QUERY_RE.match(sql) is not None
+    
+    def _validate_readonly_cached(self, sql: str) -> None:
+        """Validate once per distinct SQL text; only successful validations are cached"""
+        if sql in self._validated_sql:
+            self._validated_sql.move_to_end(sql)
+            self._stats["validation_cache_hits"] += 1
+            return
+        self._validate_readonly_query(sql)
+        self._validated_sql[sql] = None
+        if len(self._validated_sql) > settings.POSTGRES_VALIDATION_CACHE_SIZE:
+            self._validated_sql.popitem(last=False)
+    
+    @staticmethod
+    def _text_fallback_columns(cur) -> List[int]:
+        """Columns whose type has no binary loader (enums, custom types) and arrive as raw bytes"""
+        if not cur.description or not settings.POSTGRES_BINARY_RESULTS:
+            return []
+        return [
+            i for i, column in enumerate(cur.description)
+            if cur.adapters.get_loader(column.type_code, psycopg.pq.Format.BINARY) is None
+        ]
+    
+    @staticmethod
+    def _decode_text_fallback(rows: List[list], fallback_columns: List[int]) -> None:
+        """Decode raw bytes of text-like columns fetched in binary format, in place"""
+        for index in fallback_columns:
+            for row in rows:
+                if isinstance(row[index], (bytes, bytearray, memoryview)):
+                    row[index] = bytes(row[index]).decode("utf-8", errors="replace")
+    
     async def execute_query(
         self,
         sql: str,
         user_id: str,
         request_id: str,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        max_rows: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Execute SQL query with read-only enforcement
@@ -123,6 +238,9 @@ class PostgreSQLClient:
             user_id: User ID for audit
             request_id: Request ID for tracing
             timeout: Query timeout in seconds
+            max_rows: Row cap; fetching stops at the cap (result marked
+                truncated). SELECT/VALUES queries are then streamed through a
+                server-side cursor
             
         Returns:
             Query result with columns and rows
@@ -130,33 +248,47 @@ class PostgreSQLClient:
         if not self._initialized:
             raise ExternalServiceException("PostgreSQL client not initialized", service_name="postgres")
         
+        if max_rows and self._is_cursor_query(sql):
+            return await self._execute_capped(sql, user_id, request_id, timeout, max_rows)
+        
         # Validate read-only if enforced
         if settings.POSTGRES_READ_ONLY:
-            self._validate_readonly_query(sql)
+            self._validate_readonly_cached(sql)
         
         # Add LLM marker
-        marked_sql = f"/* LLM Query - User: {user_id}, Request: {request_id} */\n{sql}"
+        marked_sql = self._mark_query(sql, user_id, request_id)
+        self._stats["queries"] += 1
         
         start_time = datetime.now(timezone.utc)
         
         try:
             async with self.get_connection() as conn:
-                # Set statement timeout
-                query_timeout = timeout or settings.POSTGRES_QUERY_TIMEOUT
-                await conn.execute(f"SET statement_timeout = {query_timeout * 1000}")
+                await self._apply_request_settings(conn, request_id, timeout)
                 
-                # Execute query
-                async with conn.cursor() as cur:
+                # Execute query; rows are built as lists for consistency with other DB services
+                async with conn.cursor(binary=settings.POSTGRES_BINARY_RESULTS, row_factory=list_row) as cur:
                     await cur.execute(marked_sql)
                     
-                    # Fetch results
-                    rows = await cur.fetchall()
+                    # Fetch results, stopping one row past the cap to detect truncation
+                    truncated = False
+                    if max_rows:
+                        result_rows = []
+                        while len(result_rows) <= max_rows:
+                            batch = await cur.fetchmany(
+                                min(settings.POSTGRES_FETCH_BATCH_SIZE, max_rows + 1 - len(result_rows))
+                            )
+                            if not batch:
+                                break
+                            result_rows.extend(batch)
+                        truncated = len(result_rows) > max_rows
+                        del result_rows[max_rows:]
+                    else:
+                        result_rows = await cur.fetchall()
                     
                     # Get column names
                     columns = [desc[0] for desc in cur.description] if cur.description else []
                     
-                    # Convert rows to list of lists for consistency with other DB services
-                    result_rows = [list(row) for row in rows]
+                    self._decode_text_fallback(result_rows, self._text_fallback_columns(cur))
                     
                     execution_time = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
                     
@@ -165,6 +297,7 @@ class PostgreSQLClient:
                         "columns": columns,
                         "rows": result_rows,
                         "row_count": len(result_rows),
+                        "truncated": truncated,
                         "execution_time_ms": execution_time
                     }
                     
@@ -183,7 +316,117 @@ class PostgreSQLClient:
         except Exception as e:
             logger.error(f"PostgreSQL query execution failed: {e}")
             raise ExternalServiceException(f"Query execution failed: {str(e)}")
-    
+
+    async def stream_query(
+        self,
+        sql: str,
+        user_id: str,
+        request_id: str,
+        batch_size: int = 10000,
+        timeout: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        on_describe: Optional[Callable[[List[Any]], None]] = None
+    ) -> AsyncIterator[Tuple[List[str], List[list]]]:
+        """
+        Stream query results through a server-side cursor
+
+        Rows are fetched batch_size at a time, so memory stays bounded
+        regardless of result size. The statement timeout applies per fetch.
+
+        Args:
+            sql: SQL query to execute
+            user_id: User ID for audit
+            request_id: Request ID for tracing (also names the cursor)
+            batch_size: Rows fetched per round trip
+            timeout: Per-statement timeout in seconds
+            max_rows: Stop after this many rows; no fetch asks for more than
+                the remaining budget. None streams the full result
+            on_describe: Called once with cursor.description (name, type_code,
+                precision, scale per column) before the first batch
+
+        Yields:
+            (columns, rows) for each fetched batch
+        """
+        if not self._initialized:
+            raise ExternalServiceException("PostgreSQL client not initialized", service_name="postgres")
+
+        if settings.POSTGRES_READ_ONLY:
+            self._validate_readonly_cached(sql)
+        if not self._is_cursor_query(sql):
+            raise ValidationException("Only SELECT or VALUES queries can be streamed")
+
+        marked_sql = f"/* LLM Query - User: {user_id}, Request: {request_id} */\n{sql}"
+        cursor_name = "stream_" + re.sub(r"[^a-zA-Z0-9_]", "_", request_id)[:48]
+
+        try:
+            async with self.get_connection() as conn:
+                await self._apply_request_settings(conn, request_id, timeout)
+
+                # Named cursor => DECLARE ... CURSOR inside the pooled transaction
+                async with conn.cursor(
+                    name=cursor_name, binary=settings.POSTGRES_BINARY_RESULTS, row_factory=list_row
+                ) as cur:
+                    await cur.execute(marked_sql)
+                    columns = [desc[0] for desc in cur.description] if cur.description else []
+                    if on_describe is not None:
+                        on_describe(list(cur.description or []))
+                    fallback_columns = self._text_fallback_columns(cur)
+                    remaining = max_rows
+                    while remaining is None or remaining > 0:
+                        rows = await cur.fetchmany(batch_size if remaining is None else min(batch_size, remaining))
+                        if not rows:
+                            break
+                        self._decode_text_fallback(rows, fallback_columns)
+                        if remaining is not None:
+                            remaining -= len(rows)
+                        yield columns, rows
+
+        except psycopg.errors.QueryCanceled:
+            logger.error(f"PostgreSQL stream canceled: {sql[:100]}")
+            raise ExternalServiceException("Query canceled due to timeout")
+        except psycopg.errors.InsufficientPrivilege as e:
+            logger.error(f"PostgreSQL permission denied: {e}")
+            raise ExternalServiceException("Insufficient privileges to execute query")
+        except psycopg.errors.SyntaxError as e:
+            logger.error(f"PostgreSQL syntax error: {e}")
+            raise ValidationException(f"SQL syntax error: {str(e)}")
+        except psycopg.Error as e:
+            logger.error(f"PostgreSQL stream failed: {e}")
+            raise ExternalServiceException(f"Query execution failed: {str(e)}")
+
+    async def _execute_capped(
+        self,
+        sql: str,
+        user_id: str,
+        request_id: str,
+        timeout: Optional[int],
+        max_rows: int
+    ) -> Dict[str, Any]:
+        """Collect at most max_rows rows from a server-side cursor, fetching one extra row to detect truncation"""
+        start_time = datetime.now(timezone.utc)
+        self._stats["queries"] += 1
+        columns: List[str] = []
+        result_rows: List[list] = []
+        async for columns, rows in self.stream_query(
+            sql, user_id, request_id,
+            batch_size=settings.POSTGRES_FETCH_BATCH_SIZE, timeout=timeout, max_rows=max_rows + 1
+        ):
+            result_rows.extend(rows)
+        
+        truncated = len(result_rows) > max_rows
+        if truncated:
+            del result_rows[max_rows:]
+            logger.info(f"PostgreSQL result for request {request_id} truncated at {max_rows} rows")
+        
+        return {
+            "status": "success",
+            "columns": columns,
+            "rows": result_rows,
+            "row_count": len(result_rows),
+            "truncated": truncated,
+            "execution_time_ms": (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+        }
+
     def _validate_readonly_query(self, sql: str):
         """
         Validate that query is read-only using AST parsing with sqlglot.
@@ -372,7 +615,12 @@ class PostgreSQLClient:
                             "healthy": True,
                             "latency_ms": latency,
                             "pool": pool_stats,
-                            "read_only": settings.POSTGRES_READ_ONLY
+                            "read_only": settings.POSTGRES_READ_ONLY,
+                            "execution": {
+                                "prepare_threshold": settings.POSTGRES_PREPARE_THRESHOLD,
+                                "binary_results": settings.POSTGRES_BINARY_RESULTS,
+                                **self._stats,
+                            }
                         }
                     else:
                         return {
@@ -150,6 +150,15 @@ node_duration = Histogram(
     registry=registry
 )
 
+# Query pipeline stage latency (fed by the diagnostic trace store)
+pipeline_stage_duration = Histogram(
+    'amil_pipeline_stage_duration_seconds',
+    'Query pipeline stage duration in seconds',
+    ['stage', 'status'],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+    registry=registry
+)
+
 # Repair/fallback counts
 repair_attempts = Counter(
     'amil_repair_attempts_total',
@@ -194,6 +203,116 @@ sqlcl_pool_busy = Gauge(
     registry=registry
 )
 
+# Upstream HTTP proxy (Doris MCP SSE/messages)
+proxy_upstream_requests = Counter(
+    'amil_proxy_upstream_requests_total',
+    'Proxied requests per upstream and outcome',
+    ['upstream', 'status'],
+    registry=registry
+)
+
+proxy_upstream_in_flight = Gauge(
+    'amil_proxy_upstream_in_flight',
+    'Proxied requests/streams currently open per upstream',
+    ['upstream'],
+    registry=registry
+)
+
+proxy_upstream_connections = Gauge(
+    'amil_proxy_upstream_connections',
+    'Pooled upstream connections per upstream and state',
+    ['upstream', 'state'],
+    registry=registry
+)
+
+proxy_upstream_bytes = Counter(
+    'amil_proxy_upstream_bytes_total',
+    'Bytes streamed back from each upstream',
+    ['upstream'],
+    registry=registry
+)
+
+# Report rendering (process pool) and event loop responsiveness
+report_render_duration = Histogram(
+    'amil_report_render_duration_seconds',
+    'Report document render time in the rendering pool',
+    ['format', 'status'],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+    registry=registry
+)
+
+report_render_cache = Counter(
+    'amil_report_render_cache_total',
+    'Rendered report cache lookups',
+    ['format', 'result'],
+    registry=registry
+)
+
+report_render_pending = Gauge(
+    'amil_report_render_pending',
+    'Report renders running or queued for the rendering pool',
+    registry=registry
+)
+
+event_loop_lag = Histogram(
+    'amil_event_loop_lag_seconds',
+    'Delay between scheduled and actual event loop wake-ups',
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+    registry=registry
+)
+
+query_coalesced = Counter(
+    'amil_query_coalesced_total',
+    'Identical concurrent SQL executions served by another in-flight execution',
+    ['database_type', 'outcome'],  # outcome: local_hit, redis_hit, lease_fallback
+    registry=registry
+)
+
+startup_step_duration = Gauge(
+    'amil_startup_step_duration_seconds',
+    'Duration of each application startup initializer',
+    ['component'],
+    registry=registry
+)
+
+sql_transpile_cache = Counter(
+    'amil_sql_transpile_cache_total',
+    'SQL dialect transpilation cache lookups',
+    ['source_dialect', 'target_dialect', 'outcome'],  # outcome: hit, exact_hit, miss
+    registry=registry
+)
+
+sql_transpile_cpu = Histogram(
+    'amil_sql_transpile_cpu_seconds',
+    'CPU time spent converting one statement between SQL dialects',
+    ['outcome'],  # hit (cache) or miss (sqlglot)
+    buckets=[0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+    registry=registry
+)
+
+query_cost_estimate_cache = Counter(
+    'amil_query_cost_estimate_cache_total',
+    'Query cost estimate cache lookups',
+    ['outcome'],  # hit, miss
+    registry=registry
+)
+
+query_cost_estimate_duration = Histogram(
+    'amil_query_cost_estimate_duration_seconds',
+    'Time to produce a query cost estimate',
+    ['outcome'],  # hit (cache), miss (EXPLAIN PLAN), unavailable
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+    registry=registry
+)
+
+time_to_approval = Histogram(
+    'amil_time_to_approval_seconds',
+    'Validation stage time until a query is routed to approval',
+    ['cost_estimate'],  # cache, explain, default (estimation unavailable)
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    registry=registry
+)
+
 # System info
 system_info = Info(
     'amil_system',
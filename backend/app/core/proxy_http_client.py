@@ -0,0 +1,156 @@
+"""
+Shared HTTP Client Pool for Upstream Proxies
+
+Provides one application-lifetime httpx.AsyncClient per upstream base URL so
+proxied MCP/SSE traffic reuses keep-alive connections instead of paying a
+TCP handshake (and an ephemeral port) per request.
+
+Features:
+- Bounded connection pool with keep-alive (limits from settings)
+- Per-upstream Prometheus metrics (requests, in-flight, bytes, pool state)
+- Graceful shutdown from the application lifespan
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from app.core.prometheus_metrics import (
+        proxy_upstream_bytes,
+        proxy_upstream_connections,
+        proxy_upstream_in_flight,
+        proxy_upstream_requests,
+    )
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+
+def upstream_key(url: str) -> str:
+    """Normalize a URL to its scheme://host:port upstream key"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class ProxyHTTPClientPool:
+    """Registry of long-lived AsyncClients keyed by upstream"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._requests: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    def _build_client(self, upstream: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.DORIS_PROXY_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DORIS_PROXY_MAX_KEEPALIVE,
+            keepalive_expiry=settings.DORIS_PROXY_KEEPALIVE_EXPIRY,
+        )
+        # No read timeout: SSE streams are long-lived by design
+        timeout = httpx.Timeout(
+            None,
+            connect=settings.DORIS_PROXY_CONNECT_TIMEOUT,
+            pool=settings.DORIS_PROXY_POOL_TIMEOUT,
+        )
+        return httpx.AsyncClient(base_url=upstream, limits=limits, timeout=timeout)
+
+    async def get_client(self, url: str) -> httpx.AsyncClient:
+        """Return the shared client for the upstream serving url"""
+        upstream = upstream_key(url)
+        client = self._clients.get(upstream)
+        if client is not None and not client.is_closed:
+            return client
+        async with self._lock:
+            client = self._clients.get(upstream)
+            if client is None or client.is_closed:
+                client = self._build_client(upstream)
+                self._clients[upstream] = client
+                self._closed = False
+                logger.info(f"Created pooled proxy client for {upstream}")
+            return client
+
+    def request_started(self, url: str) -> str:
+        """Record a request/stream opening against an upstream"""
+        upstream = upstream_key(url)
+        self._in_flight[upstream] = self._in_flight.get(upstream, 0) + 1
+        self._requests[upstream] = self._requests.get(upstream, 0) + 1
+        if METRICS_AVAILABLE:
+            proxy_upstream_in_flight.labels(upstream=upstream).inc()
+        return upstream
+
+    def request_finished(self, upstream: str, status: str, bytes_streamed: int = 0) -> None:
+        """Record a request/stream closing against an upstream"""
+        self._in_flight[upstream] = max(0, self._in_flight.get(upstream, 0) - 1)
+        if status == "error":
+            self._errors[upstream] = self._errors.get(upstream, 0) + 1
+        if METRICS_AVAILABLE:
+            proxy_upstream_in_flight.labels(upstream=upstream).dec()
+            proxy_upstream_requests.labels(upstream=upstream, status=status).inc()
+            if bytes_streamed:
+                proxy_upstream_bytes.labels(upstream=upstream).inc(bytes_streamed)
+        self._publish_pool_state(upstream)
+
+    def _pool_state(self, upstream: str) -> Dict[str, int]:
+        """Best-effort connection counts from the httpcore pool"""
+        client = self._clients.get(upstream)
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None) or []
+        idle = sum(1 for c in connections if getattr(c, "is_idle", lambda: False)())
+        return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+
+    def _publish_pool_state(self, upstream: str) -> None:
+        if not METRICS_AVAILABLE:
+            return
+        for state, count in self._pool_state(upstream).items():
+            proxy_upstream_connections.labels(upstream=upstream, state=state).set(count)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-upstream pool and request statistics for diagnostics"""
+        return {
+            upstream: {
+                "in_flight": self._in_flight.get(upstream, 0),
+                "requests_total": self._requests.get(upstream, 0),
+                "errors_total": self._errors.get(upstream, 0),
+                "connections": self._pool_state(upstream),
+                "closed": client.is_closed,
+            }
+            for upstream, client in self._clients.items()
+        }
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """Close all pooled clients, giving open streams a short grace period"""
+        if self._closed:
+            return
+        self._closed = True
+        deadline = asyncio.get_running_loop().time() + timeout
+        while any(self._in_flight.values()) and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.1)
+        async with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing proxy client: {e}")
+        logger.info(f"Closed {len(clients)} pooled proxy client(s)")
+
+
+# Global proxy client pool instance
+proxy_http_pool = ProxyHTTPClientPool()
+
+
+def get_proxy_http_pool() -> ProxyHTTPClientPool:
+    """Return the global proxy client pool"""
+    return proxy_http_pool
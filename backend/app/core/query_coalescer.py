@@ -0,0 +1,239 @@
+"""
+Query Coalescer (singleflight for SQL executions)
+
+Concurrent executions of the same statement against the same database
+share one database call instead of all missing the result cache and
+running N times:
+
+- In-process: the first caller for a key runs the query; callers arriving
+  while it is in flight await the same future
+- Across workers: the in-process leader takes a short Redis lease
+  (SET NX PX, refreshed while the query runs). Workers that find the lease
+  held poll for the leader's published result instead of executing. If the
+  lease disappears without a result (leader failed, crashed, or the result
+  was an error) the follower executes the query itself
+
+Redis layout:
+- sqlflight:lease:<key>  -> owner token, PX QUERY_COALESCE_LEASE_SECONDS
+- sqlflight:result:<key> -> JSON result, PX QUERY_COALESCE_RESULT_TTL_SECONDS
+
+Keys come from coalesce_key(database_type, connection, normalized_sql).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.utils.json_encoder import CustomJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+try:
+    from app.core.prometheus_metrics import query_coalesced
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+LEASE_PREFIX = "sqlflight:lease:"
+RESULT_PREFIX = "sqlflight:result:"
+POLL_INITIAL_SECONDS = 0.025
+POLL_MAX_SECONDS = 0.25
+
+# KEYS[1] lease; ARGV[1] owner token, ARGV[2] lease ms
+_REFRESH_LEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('PEXPIRE', KEYS[1], tonumber(ARGV[2]))
+end
+return 0
+"""
+
+# KEYS[1] lease, KEYS[2] result; ARGV[1] owner token, ARGV[2] payload ('' = none), ARGV[3] result ms
+_RELEASE_LEASE_LUA = """
+if ARGV[2] ~= '' then
+  redis.call('SET', KEYS[2], ARGV[2], 'PX', tonumber(ARGV[3]))
+end
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  redis.call('DEL', KEYS[1])
+end
+return 1
+"""
+
+
+def coalesce_key(database_type: str, connection_name: Optional[str], normalized_sql: str) -> str:
+    """Coalescing key for one statement on one database connection"""
+    raw = f"{database_type}:{connection_name or ''}:{normalized_sql}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _shareable(result: Any) -> bool:
+    """Only successful results are handed to other workers"""
+    return isinstance(result, dict) and result.get("status") == "success"
+
+
+class QueryCoalescer:
+    """Shares one execution between concurrent identical queries"""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        lease_seconds: Optional[float] = None,
+        max_wait_seconds: Optional[float] = None,
+        result_ttl_seconds: Optional[float] = None,
+    ):
+        self.enabled = settings.QUERY_COALESCE_ENABLED if enabled is None else enabled
+        self.lease_seconds = lease_seconds or settings.QUERY_COALESCE_LEASE_SECONDS
+        self.max_wait_seconds = max_wait_seconds or settings.QUERY_COALESCE_MAX_WAIT_SECONDS
+        self.result_ttl_seconds = result_ttl_seconds or settings.QUERY_COALESCE_RESULT_TTL_SECONDS
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {"executions": 0, "local_hits": 0, "redis_hits": 0, "lease_fallbacks": 0}
+
+    async def run(
+        self,
+        key: str,
+        execute: Callable[[], Awaitable[Dict[str, Any]]],
+        database_type: str = "unknown",
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Execute, or join an identical in-flight execution
+
+        Returns:
+            (result, coalesced) where coalesced is None when this call ran the
+            query, "local" when it shared an in-process execution and "redis"
+            when it received another worker's result
+        """
+        if not self.enabled:
+            return await execute(), None
+
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled():
+                    # The leader's request was cancelled, not ours: take over
+                    continue
+                raise
+            self._record("local", database_type)
+            return result, "local"
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, coalesced = await self._run_across_workers(key, execute, database_type)
+            future.set_result(result)
+            return result, coalesced
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Only coalesced waiters should see the error; avoid "never retrieved" warnings
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _run_across_workers(
+        self,
+        key: str,
+        execute: Callable[[], Awaitable[Dict[str, Any]]],
+        database_type: str,
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        lease_key, result_key = f"{LEASE_PREFIX}{key}", f"{RESULT_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        lease_ms = int(self.lease_seconds * 1000)
+        deadline = time.monotonic() + self.max_wait_seconds
+        delay = POLL_INITIAL_SECONDS
+
+        while True:
+            try:
+                if not redis_client.is_connected():
+                    break
+                if await redis_client.set_nx(lease_key, token, px=lease_ms):
+                    return await self._lead(lease_key, result_key, token, execute), None
+
+                # Another worker holds the lease: wait for its result
+                while time.monotonic() < deadline:
+                    payload, holder = await redis_client.mget([result_key, lease_key])
+                    if payload:
+                        self._record("redis", database_type)
+                        return json.loads(payload), "redis"
+                    if holder is None:
+                        break
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 1.5, POLL_MAX_SECONDS)
+                else:
+                    logger.warning(f"Coalesced query {key[:12]} still running after {self.max_wait_seconds}s; executing locally")
+                    break
+                # Lease released or expired without a shared result: try to lead
+                self._stats["lease_fallbacks"] += 1
+                if METRICS_AVAILABLE:
+                    query_coalesced.labels(database_type=database_type, outcome="lease_fallback").inc()
+            except Exception as e:
+                logger.warning(f"Query coalescing lease unavailable, executing locally: {e}")
+                break
+
+        self._stats["executions"] += 1
+        return await execute(), None
+
+    async def _lead(
+        self,
+        lease_key: str,
+        result_key: str,
+        token: str,
+        execute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        self._stats["executions"] += 1
+        heartbeat = asyncio.create_task(self._keep_lease(lease_key, token))
+        payload = ""
+        try:
+            result = await execute()
+            if _shareable(result):
+                payload = json.dumps(result, cls=CustomJSONEncoder)
+            return result
+        finally:
+            heartbeat.cancel()
+            try:
+                await redis_client.run_script(
+                    _RELEASE_LEASE_LUA,
+                    keys=[lease_key, result_key],
+                    args=[token, payload, int(self.result_ttl_seconds * 1000)],
+                )
+            except Exception as e:
+                logger.warning(f"Failed to release query coalescing lease: {e}")
+
+    async def _keep_lease(self, lease_key: str, token: str) -> None:
+        """Refresh the lease while the query runs so followers keep waiting"""
+        interval = self.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await redis_client.run_script(
+                    _REFRESH_LEASE_LUA, keys=[lease_key], args=[token, int(self.lease_seconds * 1000)]
+                )
+            except Exception as e:
+                logger.debug(f"Query coalescing lease refresh failed: {e}")
+
+    def _record(self, scope: str, database_type: str) -> None:
+        self._stats[f"{scope}_hits"] += 1
+        if METRICS_AVAILABLE:
+            query_coalesced.labels(database_type=database_type, outcome=f"{scope}_hit").inc()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "inflight": len(self._inflight),
+            **self._stats,
+        }
+
+
+# Global instance
+query_coalescer = QueryCoalescer()
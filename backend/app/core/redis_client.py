@@ -58,6 +58,8 @@ class RedisClient:
         self._vector_client: Optional[Redis] = None
         # Resilient wrapper for fault tolerance
         self._resilient_wrapper: Optional[ResilientRedisWrapper] = None
+        # Registered Lua scripts keyed by source (EVALSHA cache)
+        self._scripts: dict[str, Any] = {}
 
     def _require_client(self) -> Redis:
         """
@@ -811,6 +813,22 @@ class RedisClient:
             logger.error(f"Failed to delete key {key}: {e}")
             raise
 
+    async def set_nx(self, key: str, value: str, px: int) -> bool:
+        """SET key value NX PX; True when this call created the key.
+
+        Errors are raised so callers can apply their own degradation policy.
+        """
+        return bool(await self._require_client().set(key, value, nx=True, px=px))
+
+    async def mget(self, keys: list) -> list:
+        """Raw values for keys in one round trip (None for missing keys).
+
+        Errors are raised so callers can apply their own degradation policy.
+        """
+        if not keys:
+            return []
+        return await self._require_client().mget(keys)
+
     async def exists(self, key: str) -> bool:
         """Check if key exists with fallback"""
         if not self._resilient_wrapper:
@@ -858,6 +876,32 @@ class RedisClient:
             logger.error(f"Failed to ltrim {key}: {e}")
             return False
 
+    async def lrange(self, key: str, start: int, end: int) -> list:
+        """Return a range of list elements with error handling"""
+        try:
+            return await self._require_client().lrange(key, start, end)
+        except (RedisError, ExternalServiceException) as e:
+            logger.error(f"Failed to lrange {key}: {e}")
+            return []
+
+    async def llen(self, key: str) -> int:
+        """Return the list length with error handling"""
+        try:
+            return await self._require_client().llen(key)
+        except (RedisError, ExternalServiceException) as e:
+            logger.error(f"Failed to get llen for {key}: {e}")
+            return 0
+
+    # ==================== SET OPERATIONS ====================
+
+    async def smembers(self, key: str) -> set:
+        """Return all members of a set with error handling"""
+        try:
+            return await self._require_client().smembers(key)
+        except (RedisError, ExternalServiceException) as e:
+            logger.error(f"Failed to smembers {key}: {e}")
+            return set()
+
     # ==================== SORTED SET OPERATIONS ====================
 
     async def zadd(self, key: str, mapping: dict[str, float]) -> int:
@@ -917,6 +961,33 @@ class RedisClient:
             logger.error(f"Failed to zrevrange {key}: {e}")
             return []
 
+    # ==================== PIPELINE OPERATIONS ====================
+
+    def pipeline(self, transaction: bool = True):
+        """Return a pipeline on the main client (MULTI/EXEC when transaction is True).
+
+        Errors are raised so callers can apply their own degradation policy.
+        """
+        return self._require_client().pipeline(transaction=transaction)
+
+    # ==================== SCRIPTING OPERATIONS ====================
+
+    async def run_script(
+        self, script: str, keys: Optional[list] = None, args: Optional[list] = None
+    ) -> Any:
+        """Run a Lua script atomically on the main client.
+
+        Scripts are registered once per client and invoked via EVALSHA, falling
+        back to SCRIPT LOAD transparently when the server cache was flushed.
+        Errors are raised so callers can apply their own degradation policy.
+        """
+        client = self._require_client()
+        registered = self._scripts.get(script)
+        if registered is None or registered.registered_client is not client:
+            registered = client.register_script(script)
+            self._scripts[script] = registered
+        return await registered(keys=keys or [], args=args or [])
+
     # ==================== VECTOR / SEARCH OPERATIONS ====================
 
     async def ensure_vector_index(self, index_name: str, vector_field: str, dims: int) -> bool:
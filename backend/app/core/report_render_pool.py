@@ -0,0 +1,248 @@
+"""
+Report Rendering Pool
+
+Runs CPU-bound report rendering (WeasyPrint PDF, python-docx DOCX) in a
+bounded pool of worker processes so a multi-page render no longer blocks
+the FastAPI event loop (and every SSE stream / API call sharing it).
+
+Features:
+- Bounded concurrency (REPORT_RENDER_WORKERS) with a bounded wait queue;
+  renders beyond the queue are rejected instead of piling up
+- Each worker is its own single-process executor, so a render that exceeds
+  the per-render timeout terminates and replaces only that worker; renders
+  on the other workers keep running
+- LRU cache of rendered documents keyed by a content hash of the report
+  data, with identical concurrent renders coalesced onto one job. Anything
+  printed in the body (e.g. the "Generated on" stamp) must be part of the
+  report data so it is part of the key
+- Prometheus metrics (render duration, cache hits, pending renders)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceException
+
+logger = logging.getLogger(__name__)
+
+try:
+    from app.core.prometheus_metrics import (
+        report_render_cache,
+        report_render_duration,
+        report_render_pending,
+    )
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+# Per-render fields that change on every build and must not defeat the cache
+VOLATILE_REPORT_FIELDS = ("generated_at",)
+
+
+def report_content_hash(fmt: str, report_data: Dict[str, Any]) -> str:
+    """Stable hash of the format plus report content"""
+    content = {k: v for k, v in report_data.items() if k not in VOLATILE_REPORT_FIELDS}
+    payload = json.dumps(content, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{fmt}:{payload}".encode("utf-8")).hexdigest()
+
+
+class ReportRenderPool:
+    """Process pool with queue bound, timeouts and a rendered-document cache"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache_max_bytes: Optional[int] = None,
+    ):
+        self.max_workers = max_workers or settings.REPORT_RENDER_WORKERS
+        self.queue_size = settings.REPORT_RENDER_QUEUE_SIZE if queue_size is None else queue_size
+        self.timeout = timeout or settings.REPORT_RENDER_TIMEOUT_SECONDS
+        self.cache_max_bytes = settings.REPORT_RENDER_CACHE_MAX_BYTES if cache_max_bytes is None else cache_max_bytes
+        self._workers: List[Optional[ProcessPoolExecutor]] = [None] * self.max_workers
+        self._idle: Optional[asyncio.Queue] = None
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending = 0
+        self._stats = {"renders": 0, "cache_hits": 0, "coalesced": 0, "rejected": 0, "timeouts": 0, "failures": 0}
+
+    def _get_worker(self, index: int) -> ProcessPoolExecutor:
+        if self._workers[index] is None:
+            # spawn: forking a threaded server process is unsafe
+            self._workers[index] = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._workers[index]
+
+    def _get_idle(self) -> asyncio.Queue:
+        """Indexes of workers not running a render"""
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for index in range(self.max_workers):
+                self._idle.put_nowait(index)
+        return self._idle
+
+    def _recycle_worker(self, index: int) -> None:
+        """Terminate one worker process (a timed-out render cannot be cancelled otherwise)"""
+        executor, self._workers[index] = self._workers[index], None
+        if executor is None:
+            return
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        content = self._cache.get(key)
+        if content is not None:
+            self._cache.move_to_end(key)
+        return content
+
+    def _cache_put(self, key: str, content: bytes) -> None:
+        size = len(content)
+        if size > self.cache_max_bytes:
+            return
+        self._cache[key] = content
+        self._cache_bytes += size
+        while self._cache_bytes > self.cache_max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    def _set_pending(self, delta: int) -> None:
+        self._pending += delta
+        if METRICS_AVAILABLE:
+            report_render_pending.set(self._pending)
+
+    async def render(
+        self,
+        render_fn: Callable[[str, Dict[str, Any]], bytes],
+        fmt: str,
+        report_data: Dict[str, Any],
+    ) -> bytes:
+        """
+        Render a report document in the pool
+
+        Args:
+            render_fn: Module-level (picklable) function ``(fmt, report_data) -> bytes``
+            fmt: Output format, part of the cache key
+            report_data: Report content passed to the worker
+
+        Raises:
+            ExternalServiceException: Queue full, render timed out or worker crashed
+        """
+        key = report_content_hash(fmt, report_data)
+        cached = self._cache_get(key)
+        if METRICS_AVAILABLE:
+            report_render_cache.labels(format=fmt, result="hit" if cached is not None else "miss").inc()
+        if cached is not None:
+            self._stats["cache_hits"] += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        if self._pending >= self.max_workers + self.queue_size:
+            self._stats["rejected"] += 1
+            raise ExternalServiceException(
+                f"Report renderer busy ({self._pending} renders pending), retry shortly",
+                service_name="report_renderer",
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._set_pending(1)
+        try:
+            content = await self._run(render_fn, fmt, report_data)
+            if self.cache_max_bytes:
+                self._cache_put(key, content)
+            future.set_result(content)
+            return content
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Only coalesced waiters should see the error; avoid "never retrieved" warnings
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            self._set_pending(-1)
+
+    async def _run(self, render_fn: Callable, fmt: str, report_data: Dict[str, Any]) -> bytes:
+        loop = asyncio.get_running_loop()
+        idle = self._get_idle()
+        index = await idle.get()
+        start = time.perf_counter()
+        status = "success"
+        try:
+            task = loop.run_in_executor(self._get_worker(index), render_fn, fmt, report_data)
+            return await asyncio.wait_for(task, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            self._stats["timeouts"] += 1
+            logger.error(f"Report render ({fmt}) exceeded {self.timeout}s; restarting render process {index}")
+            self._recycle_worker(index)
+            raise ExternalServiceException(
+                f"Report rendering timed out after {self.timeout}s", service_name="report_renderer"
+            )
+        except BrokenProcessPool as e:
+            status = "error"
+            self._stats["failures"] += 1
+            self._recycle_worker(index)
+            raise ExternalServiceException(
+                f"Report render process failed: {e}", service_name="report_renderer"
+            )
+        except Exception:
+            status = "error"
+            self._stats["failures"] += 1
+            raise
+        finally:
+            idle.put_nowait(index)
+            self._stats["renders"] += 1
+            if METRICS_AVAILABLE:
+                report_render_duration.labels(format=fmt, status=status).observe(time.perf_counter() - start)
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self._cache_bytes = 0
+
+    def shutdown(self) -> None:
+        """Stop render processes (application shutdown)"""
+        executors = [executor for executor in self._workers if executor is not None]
+        self._workers = [None] * self.max_workers
+        for executor in executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if executors:
+            logger.info("Report render pool shut down")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "pending": self._pending,
+            "started": any(executor is not None for executor in self._workers),
+            "workers_started": sum(executor is not None for executor in self._workers),
+            "cache_entries": len(self._cache),
+            "cache_bytes": self._cache_bytes,
+            **self._stats,
+        }
+
+
+# Global rendering pool (processes are spawned on first render)
+report_render_pool = ReportRenderPool()
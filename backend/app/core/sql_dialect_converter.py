@@ -9,17 +9,16 @@ import re
 from typing import Optional, Dict, Any, List
 from enum import Enum
 
+from app.core.transpile_cache import transpile_cache
+from app.utils.lazy_imports import lazy_import, module_available
+
 logger = logging.getLogger(__name__)
 
-# Try to import sqlglot for robust transpilation
-try:
-    import sqlglot
-    from sqlglot import exp, parse_one
-    from sqlglot.errors import ParseError, ErrorLevel
-    SQLGLOT_AVAILABLE = True
-    logger.info("[OK] sqlglot library available for advanced SQL dialect conversion")
-except ImportError:
-    SQLGLOT_AVAILABLE = False
+# sqlglot is used for robust transpilation when installed; loaded on first conversion
+sqlglot = lazy_import("sqlglot")
+sqlglot_errors = lazy_import("sqlglot.errors")
+SQLGLOT_AVAILABLE = module_available("sqlglot")
+if not SQLGLOT_AVAILABLE:
     logger.warning("[WARN] sqlglot not installed - using basic dialect conversion only")
 
 
@@ -230,10 +229,15 @@ class SQLDialectConverter:
             if target_dialect == "doris":
                 target_dialect = "mysql"
             
-            # Parse SQL from source dialect
+            def transpile(statement: str) -> str:
+                ast = sqlglot.parse_one(statement, read=source_dialect, error_level=sqlglot_errors.ErrorLevel.WARN)
+                return ast.sql(dialect=target_dialect, pretty=False)
+
+            # Parse from the source dialect and generate the target dialect;
+            # recurring statements are served from the transpilation cache
             try:
-                ast = parse_one(sql, read=source_dialect, error_level=ErrorLevel.WARN)
-            except ParseError as e:
+                converted_sql = transpile_cache.transpile(sql, source_dialect, target_dialect, transpile)
+            except sqlglot_errors.ParseError as e:
                 if strict:
                     return ConversionResult(
                         sql=sql,
@@ -248,24 +252,20 @@ class SQLDialectConverter:
                     else:
                         return SQLDialectConverter._convert_to_oracle_regex(sql)
             
-            # Generate SQL in target dialect
-            converted_sql = ast.sql(dialect=target_dialect, pretty=False)
-            
-            # Check for unsupported features
-            if hasattr(ast, 'find_all'):
-                # Check for Oracle-specific features that may not translate well
-                if source_dialect == "oracle":
-                    # Check for CONNECT BY (hierarchical queries)
-                    if "CONNECT BY" in sql.upper():
-                        unsupported_features.append("CONNECT BY hierarchical queries")
-                    
-                    # Check for MODEL clause
-                    if "MODEL" in sql.upper():
-                        unsupported_features.append("MODEL clause")
-                    
-                    # Check for MERGE statement
-                    if "MERGE" in sql.upper():
-                        unsupported_features.append("MERGE statement")
+            # Check for Oracle-specific features that may not translate well
+            # (on the statement itself, so cached conversions report them too)
+            if source_dialect == "oracle":
+                # Check for CONNECT BY (hierarchical queries)
+                if "CONNECT BY" in sql.upper():
+                    unsupported_features.append("CONNECT BY hierarchical queries")
+                
+                # Check for MODEL clause
+                if "MODEL" in sql.upper():
+                    unsupported_features.append("MODEL clause")
+                
+                # Check for MERGE statement
+                if "MERGE" in sql.upper():
+                    unsupported_features.append("MERGE statement")
             
             success = len(errors) == 0
             if not success and not strict:
@@ -491,12 +491,12 @@ class SQLDialectConverter:
         warnings = []
         
         try:
-            ast = parse_one(sql, read=dialect_str, error_level=ErrorLevel.RAISE)
+            ast = sqlglot.parse_one(sql, read=dialect_str, error_level=sqlglot_errors.ErrorLevel.RAISE)
             return ConversionResult(
                 sql=sql,
                 success=True
             )
-        except ParseError as e:
+        except sqlglot_errors.ParseError as e:
             errors.append(f"SQL validation error: {str(e)}")
             return ConversionResult(
                 sql=sql,
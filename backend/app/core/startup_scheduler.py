@@ -0,0 +1,200 @@
+"""
+Dependency-aware startup scheduler
+
+Initializers declare the components they depend on. Every initializer whose
+dependencies have finished starts immediately, so independent components
+(Doris, PostgreSQL, Redis, Graphiti, SQLcl, orchestrator) come up
+concurrently and cold start approaches the slowest dependency chain rather
+than the sum of all initializers. Non-critical initializers can be marked
+deferred and run after the application reports ready.
+
+An initializer returns (success, error) like the functions in
+app.core.initializers; anything else counts as success. Raised exceptions
+are recorded as errors and never abort the rest of the startup.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from app.core.prometheus_metrics import startup_step_duration
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+
+@dataclass
+class StartupStep:
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    requires_success: bool = True
+    deferred: bool = False
+    # Filled in while running
+    status: str = "pending"
+    error: Optional[str] = None
+    start_ms: Optional[float] = None
+    duration_ms: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "error": self.error,
+            "deferred": self.deferred,
+            "depends_on": list(self.depends_on),
+            "start_ms": round(self.start_ms, 1) if self.start_ms is not None else None,
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+        }
+
+
+class StartupScheduler:
+    """
+    Runs registered initializers in dependency order, concurrently where possible
+
+    Usage:
+        scheduler = StartupScheduler()
+        scheduler.add("redis", init_redis)
+        scheduler.add("semantic_index", init_semantic_index, depends_on=("redis",), deferred=True)
+        await scheduler.run()                # critical initializers
+        ...                                  # application is ready
+        await scheduler.run(deferred=True)   # deferred initializers
+    """
+
+    def __init__(self, parallel: bool = True):
+        self.parallel = parallel
+        self._steps: Dict[str, StartupStep] = {}
+        self._origin: Optional[float] = None
+        self._phase_ms: Dict[str, float] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        depends_on: Tuple[str, ...] = (),
+        requires_success: bool = True,
+        deferred: bool = False,
+    ) -> None:
+        """
+        Register an initializer
+
+        Args:
+            name: Component name used in logs and the health report
+            func: Coroutine function returning (success, error, ...)
+            depends_on: Components that must finish before this one starts
+            requires_success: Skip this initializer when a dependency failed
+            deferred: Run after readiness instead of during startup
+        """
+        if name in self._steps:
+            raise ValueError(f"Startup step '{name}' already registered")
+        for dep in depends_on:
+            if dep not in self._steps:
+                raise ValueError(f"Startup step '{name}' depends on unknown step '{dep}'")
+            if self._steps[dep].deferred and not deferred:
+                raise ValueError(f"Startup step '{name}' cannot depend on deferred step '{dep}'")
+        # Dependencies must already be registered, so the graph stays acyclic
+        self._steps[name] = StartupStep(
+            name=name,
+            func=func,
+            depends_on=tuple(depends_on),
+            requires_success=requires_success,
+            deferred=deferred,
+        )
+
+    def has_deferred(self) -> bool:
+        return any(step.deferred and step.status == "pending" for step in self._steps.values())
+
+    def succeeded(self, name: str) -> bool:
+        step = self._steps.get(name)
+        return step is not None and step.status == "success"
+
+    async def run(self, deferred: bool = False) -> Dict[str, StartupStep]:
+        """Run every pending step of one phase and wait for all of them"""
+        phase = [s for s in self._steps.values() if s.deferred == deferred and s.status == "pending"]
+        if not phase:
+            return {}
+        if self._origin is None:
+            self._origin = time.perf_counter()
+        phase_start = time.perf_counter()
+
+        if self.parallel:
+            await asyncio.gather(*(self._run_step(step) for step in phase))
+        else:
+            # Registration order is a valid topological order
+            for step in phase:
+                await self._run_step(step)
+
+        self._phase_ms["deferred" if deferred else "critical"] = (time.perf_counter() - phase_start) * 1000
+        return {step.name: step for step in phase}
+
+    async def _run_step(self, step: StartupStep) -> None:
+        try:
+            for dep in step.depends_on:
+                await self._steps[dep].done.wait()
+            failed = [dep for dep in step.depends_on if self._steps[dep].status != "success"]
+            if failed and step.requires_success:
+                step.status = "skipped"
+                step.error = f"Dependency unavailable: {', '.join(failed)}"
+                logger.info(f"Startup step '{step.name}' skipped ({step.error})")
+                return
+
+            step.status = "running"
+            started = time.perf_counter()
+            step.start_ms = (started - self._origin) * 1000
+            try:
+                result = await step.func()
+                success, error = self._unpack(result)
+                step.status = "success" if success else "error"
+                step.error = error
+            except Exception as e:
+                logger.error(f"Startup step '{step.name}' raised: {e}", exc_info=True)
+                step.status = "error"
+                step.error = str(e)
+            finally:
+                step.duration_ms = (time.perf_counter() - started) * 1000
+                if METRICS_AVAILABLE:
+                    startup_step_duration.labels(component=step.name).set(step.duration_ms / 1000)
+        finally:
+            step.done.set()
+
+    @staticmethod
+    def _unpack(result: Any) -> Tuple[bool, Optional[str]]:
+        if isinstance(result, tuple) and result:
+            error = result[1] if len(result) > 1 else None
+            return bool(result[0]), str(error) if error else None
+        return True, None
+
+    def report(self) -> Dict[str, Any]:
+        """Per-initializer timings for logs and the health endpoint"""
+        finished = [s.duration_ms for s in self._steps.values() if s.duration_ms is not None]
+        return {
+            "parallel": self.parallel,
+            "critical_ms": round(self._phase_ms["critical"], 1) if "critical" in self._phase_ms else None,
+            "deferred_ms": round(self._phase_ms["deferred"], 1) if "deferred" in self._phase_ms else None,
+            "serial_ms": round(sum(finished), 1),
+            "steps": {name: step.as_dict() for name, step in self._steps.items()},
+        }
+
+    def log_summary(self, log: Optional[logging.Logger] = None, deferred: bool = False) -> None:
+        """Log one line per phase, slowest initializers first"""
+        log = log or logger
+        steps: List[StartupStep] = sorted(
+            (s for s in self._steps.values() if s.deferred == deferred and s.status != "pending"),
+            key=lambda s: s.duration_ms or 0,
+            reverse=True,
+        )
+        if not steps:
+            return
+        timings = ", ".join(
+            f"{s.name}={s.duration_ms:.0f}ms {s.status}" if s.duration_ms is not None else f"{s.name}={s.status}"
+            for s in steps
+        )
+        phase = "deferred" if deferred else "critical"
+        total = self._phase_ms.get(phase, 0.0)
+        serial = sum(s.duration_ms or 0 for s in steps)
+        log.info(f"Startup timings ({phase}, wall {total:.0f}ms vs serial {serial:.0f}ms): {timings}")
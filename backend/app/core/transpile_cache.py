@@ -0,0 +1,238 @@
+"""
+Transpilation cache for SQL dialect conversion
+
+sqlglot parse + generate costs milliseconds per statement and the same
+templates recur constantly with different literal values (generation,
+repair and fallback all convert again). Entries are keyed by
+(source dialect, target dialect, literal-normalized fingerprint):
+
+- On a miss the real SQL is transpiled. If the output carries exactly the
+  input literals in the same order, the output is stored as a template with
+  one slot per literal and any later statement with the same fingerprint is
+  served by re-binding its own literals into the template
+- If transpilation rewrote, dropped or reordered a literal (date format
+  masks, TRUNC units, ...) re-binding would be wrong, so the fingerprint is
+  marked exact-only and outputs are cached per exact statement instead
+
+String literals inside format-sensitive functions and literals that need
+dialect-specific escaping are kept verbatim in the fingerprint, because
+their value can change how the statement transpiles.
+
+The cache is a bounded LRU shared by all dialect pairs; hit ratio and
+per-statement transpile CPU are exported as metrics and via get_status().
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    from app.core.prometheus_metrics import sql_transpile_cache, sql_transpile_cpu
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+# Functions whose string arguments are formats/units that transpile differently per value
+FORMAT_FUNCTIONS = frozenset({
+    "TO_CHAR", "TO_DATE", "TO_TIMESTAMP", "TO_TIMESTAMP_TZ", "TO_NUMBER",
+    "TRUNC", "ROUND", "DATE_TRUNC", "DATE_PART", "DATE_FORMAT", "STR_TO_DATE",
+    "EXTRACT", "ADD_MONTHS", "NUMTODSINTERVAL", "NUMTOYMINTERVAL",
+})
+
+_TOKEN_RE = re.compile(
+    r"(?P<string>'(?:[^']|'')*')"
+    r"|(?P<quoted>\"[^\"]*\"|`[^`]*`)"
+    r"|(?P<comment>--[^\n]*|/\*.*?\*/)"
+    r"|(?P<func>[A-Za-z_][\w$#]*)\s*\("
+    r"|(?P<ident>[A-Za-z_:@][\w$#]*)"
+    r"|(?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<open>\()"
+    r"|(?P<close>\))",
+    re.DOTALL,
+)
+
+Literal = Tuple[int, int, str]  # start, end, text
+SLOT = "\x00"  # cannot occur in SQL text, unlike '?' bind markers
+_EXACT_ONLY = object()
+_STAT_KEYS = {"hit": "hits", "exact_hit": "exact_hits", "miss": "misses"}
+
+
+def scan_literals(sql: str) -> Tuple[List[Literal], List[bool]]:
+    """
+    Locate string and numeric literals
+
+    Returns:
+        (literals, bindable) where bindable[i] is False for literals whose value
+        may influence transpilation and so must stay part of the fingerprint
+    """
+    literals: List[Literal] = []
+    bindable: List[bool] = []
+    # One entry per open parenthesis: True when it opens a format-sensitive call
+    stack: List[bool] = []
+    format_depth = 0
+    for m in _TOKEN_RE.finditer(sql):
+        kind = m.lastgroup
+        if kind == "string":
+            text = m.group()
+            literals.append((m.start(), m.end(), text))
+            bindable.append(format_depth == 0 and "\\" not in text and "''" not in text[1:-1])
+        elif kind == "number":
+            literals.append((m.start(), m.end(), m.group()))
+            bindable.append(True)
+        elif kind == "func":
+            is_format = m.group("func").upper() in FORMAT_FUNCTIONS
+            stack.append(is_format)
+            format_depth += is_format
+        elif kind == "open":
+            stack.append(False)
+        elif kind == "close" and stack:
+            format_depth -= stack.pop()
+    return literals, bindable
+
+
+def fingerprint(sql: str) -> Tuple[str, List[Literal], List[bool]]:
+    """Statement with bindable literals replaced by SLOT, plus the scanned literals"""
+    literals, bindable = scan_literals(sql)
+    parts = []
+    pos = 0
+    for (start, end, _), slot in zip(literals, bindable):
+        if slot:
+            parts.append(sql[pos:start])
+            parts.append(SLOT)
+            pos = end
+    parts.append(sql[pos:])
+    return "".join(parts), literals, bindable
+
+
+class TranspileCache:
+    """Bounded LRU of transpiled statements with literal re-binding"""
+
+    def __init__(self, max_entries: Optional[int] = None, enabled: Optional[bool] = None):
+        self.max_entries = settings.SQL_TRANSPILE_CACHE_SIZE if max_entries is None else max_entries
+        self.enabled = (settings.SQL_TRANSPILE_CACHE_ENABLED if enabled is None else enabled) and self.max_entries > 0
+        self._entries: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "exact_hits": 0, "misses": 0, "evictions": 0}
+        self._cpu_ms = {"hit": 0.0, "miss": 0.0}
+
+    def transpile(
+        self,
+        sql: str,
+        source_dialect: str,
+        target_dialect: str,
+        convert: Callable[[str], str],
+    ) -> str:
+        """
+        Target-dialect SQL for `sql`, from the cache or by calling convert(sql)
+
+        Exceptions raised by convert propagate and nothing is cached.
+        """
+        if not self.enabled:
+            return convert(sql)
+
+        started = time.thread_time()
+        fp, literals, bindable = fingerprint(sql)
+        key = (source_dialect, target_dialect, fp)
+        exact_key = (source_dialect, target_dialect, "=" + sql)
+
+        with self._lock:
+            entry = self._get(key)
+            if entry is _EXACT_ONLY:
+                entry = self._get(exact_key)
+                outcome = "exact_hit"
+            else:
+                outcome = "hit"
+        if entry is not None and entry is not _EXACT_ONLY:
+            result = entry if outcome == "exact_hit" else self._bind(entry, literals, bindable)
+            self._record(outcome, source_dialect, target_dialect, started)
+            return result
+
+        converted = convert(sql)
+        template = self._template(converted, literals, bindable)
+        with self._lock:
+            if template is not None:
+                self._put(key, template)
+            else:
+                self._put(key, _EXACT_ONLY)
+                self._put(exact_key, converted)
+        self._record("miss", source_dialect, target_dialect, started)
+        return converted
+
+    @staticmethod
+    def _template(converted: str, literals: List[Literal], bindable: List[bool]) -> Optional[List[str]]:
+        """
+        Split the output around the slots of bindable literals
+
+        Returns None when the output literals differ from the input literals,
+        in which case the output cannot be reused for other literal values.
+        """
+        out_literals, _ = scan_literals(converted)
+        if [text for _, _, text in out_literals] != [text for _, _, text in literals]:
+            return None
+        segments = []
+        pos = 0
+        for (start, end, _), slot in zip(out_literals, bindable):
+            if slot:
+                segments.append(converted[pos:start])
+                pos = end
+        segments.append(converted[pos:])
+        return segments
+
+    @staticmethod
+    def _bind(segments: List[str], literals: List[Literal], bindable: List[bool]) -> str:
+        values = [text for (_, _, text), slot in zip(literals, bindable) if slot]
+        parts = [segments[0]]
+        for value, segment in zip(values, segments[1:]):
+            parts.append(value)
+            parts.append(segment)
+        return "".join(parts)
+
+    def _get(self, key: Tuple[str, str, str]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: Tuple[str, str, str], value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _record(self, outcome: str, source_dialect: str, target_dialect: str, started: float) -> None:
+        elapsed = time.thread_time() - started
+        kind = "miss" if outcome == "miss" else "hit"
+        self._stats[_STAT_KEYS[outcome]] += 1
+        self._cpu_ms[kind] += elapsed * 1000
+        if METRICS_AVAILABLE:
+            sql_transpile_cache.labels(
+                source_dialect=source_dialect, target_dialect=target_dialect, outcome=outcome
+            ).inc()
+            sql_transpile_cpu.labels(outcome=kind).observe(elapsed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        hits = self._stats["hits"] + self._stats["exact_hits"]
+        misses = self._stats["misses"]
+        lookups = hits + misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            **self._stats,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "avg_hit_cpu_ms": round(self._cpu_ms["hit"] / hits, 3) if hits else None,
+            "avg_miss_cpu_ms": round(self._cpu_ms["miss"] / misses, 3) if misses else None,
+        }
+
+
+# Global instance
+transpile_cache = TranspileCache()
@@ -25,6 +25,7 @@ from app.core.config import settings
 from app.core.client_registry import registry
 from app.core.redis_client import redis_client
 from app.core.error_normalizer import normalize_database_error
+from app.core.query_coalescer import coalesce_key, query_coalescer
 
 # SSE state management
 try:
@@ -70,7 +71,7 @@ async def execute_query_node(state: QueryState) -> QueryState:
             execution_result = result.get("execution_result", {})
             await record_query_pipeline_stage(
                 query_id=query_id,
-                stage="execution",
+                stage="execute",
                 status="completed",
                 entered_at=stage_start,
                 exited_at=stage_end,
@@ -86,7 +87,7 @@ async def execute_query_node(state: QueryState) -> QueryState:
             stage_end = datetime.now(timezone.utc)
             await record_query_pipeline_stage(
                 query_id=query_id,
-                stage="execution",
+                stage="execute",
                 status="failed",
                 entered_at=stage_start,
                 exited_at=stage_end,
@@ -177,15 +178,23 @@ async def _execute_query_node_inner(state: QueryState, span: dict) -> QueryState
         logger.info(f"  Session: {state.get('session_id', 'unknown')}")
 
         # Route execution through the shared DatabaseRouter so Oracle and Doris
-        # use the appropriate backend services.
-        mcp_result = await DatabaseRouter.execute_sql(
+        # use the appropriate backend services. Identical statements already
+        # running (here or on another worker) share that execution.
+        mcp_result, coalesced = await query_coalescer.run(
+            coalesce_key(db_type, connection_name, norm_sql),
+            lambda: DatabaseRouter.execute_sql(
+                database_type=db_type,
+                sql_query=state["sql_query"],
+                connection_name=connection_name,
+                user_id=state.get("user_id"),
+                user_role=state.get("user_role"),
+                request_id=state.get("query_id"),
+            ),
             database_type=db_type,
-            sql_query=state["sql_query"],
-            connection_name=connection_name,
-            user_id=state.get("user_id"),
-            user_role=state.get("user_role"),
-            request_id=state.get("query_id"),
         )
+        span["output"]["coalesced"] = coalesced
+        if coalesced:
+            logger.info(f"Shared result of an identical in-flight query ({coalesced})")
 
         logger.debug(
             f"Raw execution result keys: {list(mcp_result.keys()) if isinstance(mcp_result, dict) else type(mcp_result)}"
@@ -217,11 +226,13 @@ async def _execute_query_node_inner(state: QueryState, span: dict) -> QueryState
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
 
-            await redis_client.cache_query_result(
-                query_hash,
-                result,
-                result_size=result["row_count"]
-            )
+            # The execution that ran the query already cached it
+            if not coalesced:
+                await redis_client.cache_query_result(
+                    query_hash,
+                    result,
+                    result_size=result["row_count"]
+                )
 
             state["execution_result"] = result
             state["next_action"] = "format_results"
@@ -6,6 +6,8 @@ import logging
 import time
 from datetime import datetime, timezone
 
+import numpy as np
+
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 from app.orchestrator.state import QueryState
@@ -102,87 +104,44 @@ async def validate_results_node(state: QueryState) -> QueryState:
     except Exception as e:
         logger.debug(f"Failed to validate expected row count: {e}")
     
-    # Check 2: Null ratios per column
-    if rows and row_count > 0:
-        for col_idx, col_name in enumerate(columns):
-            def get_val(r, idx, name):
-                if isinstance(r, dict):
-                    return r.get(name)
-                return r[idx]
-            
-            null_count = sum(1 for row in rows if get_val(row, col_idx, col_name) is None or str(get_val(row, col_idx, col_name)).strip() == '')
-            null_ratio = null_count / row_count
-            
-            if null_ratio > 0.5:
-                validation_report["warnings"].append(f"Column '{col_name}' has {int(null_ratio*100)}% null values")
-                validation_report["recommendations"].append(f"Consider filtering out nulls in '{col_name}' or using NVL/COALESCE")
-    
-    # Check 3: Value distribution analysis (basic - check for single repeated value)
-    if rows and row_count > 10:  # Only for datasets with >10 rows
-        for col_idx, col_name in enumerate(columns):
-            def get_val(r, idx, name):
-                if isinstance(r, dict):
-                    return r.get(name)
-                return r[idx]
-                
-            values = [get_val(row, col_idx, col_name) for row in rows if get_val(row, col_idx, col_name) is not None]
-            if values:
-                unique_values = set(values)
-                if len(unique_values) == 1:
-                    validation_report["anomalies"].append(f"Column '{col_name}' has only one distinct value: {list(unique_values)[0]}")
-    
-    # Basic anomaly detection using z-score on numeric columns
-    try:
-        if rows and columns:
-            # Determine numeric columns by sampling
-            num_idxs = []
-            for idx in range(len(columns)):
-                col_name = columns[idx]
-                def get_val(r, i, n):
-                    if isinstance(r, dict):
-                        return r.get(n)
-                    return r[i]
-                try:
-                    # consider numeric if most values are numbers
-                    vals = [get_val(row, idx, col_name) for row in rows if get_val(row, idx, col_name) is not None]
-                    if not vals:
-                        continue
-                    numeric_vals = []
-                    for v in vals[:200]:
-                        try:
-                            numeric_vals.append(float(v))
-                        except Exception:
-                            numeric_vals = []
-                            break
-                    if numeric_vals:
-                        num_idxs.append(idx)
-                except Exception:
-                    continue
-            
-            for idx in num_idxs:
-                col_name = columns[idx]
-                vals = []
-                for r in rows:
-                    try:
-                        v = get_val(r, idx, col_name)
-                        if v is None:
-                            continue
-                        vals.append(float(v))
-                    except Exception:
-                        pass
-                if len(vals) >= 10:
-                    mean = sum(vals) / len(vals)
-                    var = sum((x - mean) ** 2 for x in vals) / len(vals)
-                    std = var ** 0.5
-                    if std > 0:
-                        # Count outliers beyond 3 std
-                        outliers = sum(1 for x in vals if abs(x - mean) > 3 * std)
-                        if outliers > 0:
-                            validation_report["anomalies"].append(
-                                f"Column '{columns[idx]}' has {outliers} potential outliers (z-score > 3)"
-                            )
-    except Exception:
-        pass
+    # Checks 2-4 run on a columnar view (one transpose, vectorized per column)
+    if rows and row_count > 0 and columns:
+        from app.services.anomaly_detection_service import dominant_value, numeric_view, to_columnar
+
+        for col_name, values in zip(columns, to_columnar(columns, rows)):
+            try:
+                not_null = values != None  # noqa: E711 - elementwise null test
+                non_null = values[not_null]
+
+                # Check 2: Null ratios per column (None or blank strings)
+                blank_count = sum(1 for v in non_null if isinstance(v, str) and not v.strip())
+                null_ratio = (values.size - non_null.size + blank_count) / row_count
+
+                if null_ratio > 0.5:
+                    validation_report["warnings"].append(f"Column '{col_name}' has {int(null_ratio*100)}% null values")
+                    validation_report["recommendations"].append(f"Consider filtering out nulls in '{col_name}' or using NVL/COALESCE")
+
+                # Check 3: Value distribution analysis (basic - check for single repeated value)
+                if row_count > 10 and non_null.size:
+                    top_value, top_count = dominant_value(non_null)
+                    if top_count == non_null.size:
+                        validation_report["anomalies"].append(f"Column '{col_name}' has only one distinct value: {top_value}")
+
+                # Check 4: Basic anomaly detection using z-score on numeric columns
+                numeric = numeric_view(non_null)
+                if numeric is not None:
+                    numeric = numeric[np.isfinite(numeric)]
+                    if numeric.size >= 10:
+                        std = numeric.std()
+                        if std > 0:
+                            # Count outliers beyond 3 std
+                            outliers = int(np.count_nonzero(np.abs(numeric - numeric.mean()) > 3 * std))
+                            if outliers > 0:
+                                validation_report["anomalies"].append(
+                                    f"Column '{col_name}' has {outliers} potential outliers (z-score > 3)"
+                                )
+            except Exception as e:
+                logger.debug(f"Column validation failed for {col_name}: {e}")
 
     # Store validation report in state
     state["result_analysis"] = validation_report
@@ -227,6 +186,7 @@ async def format_results_node(state: QueryState) -> QueryState:
     Also stores successful query patterns in the knowledge graph for future context retrieval.
     """
     logger.info(f"Formatting results...")
+    stage_start = datetime.now(timezone.utc)
     
     result = state["execution_result"]
     columns = result.get("columns", [])
@@ -361,6 +321,17 @@ User Pattern Episode (user:{user_id}):
     state["next_action"] = "end"
     logger.info(f"Results formatted: {visualization_hints}")
 
+    if state.get("query_id"):
+        from app.services.diagnostic_service import record_query_pipeline_stage
+        await record_query_pipeline_stage(
+            query_id=state["query_id"],
+            stage="format_results",
+            status="completed",
+            entered_at=stage_start,
+            exited_at=datetime.now(timezone.utc),
+            metadata={"row_count": row_count}
+        )
+
     # Stream lifecycle: finished with complete progress
     if ExecState:
         await emit_state_event(state, ExecState.FINISHED, {
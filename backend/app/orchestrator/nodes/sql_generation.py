@@ -71,9 +71,15 @@ async def generate_sql_node(state: QueryState) -> QueryState:
             
             # Record successful completion
             stage_end = datetime.now(timezone.utc)
+            # Error and clarification paths through set_state_error already marked this run failed
+            node = next((n for n in state.get("node_history") or [] if n.get("name") == "generate_sql"), None)
+            if node is None or node.get("status") != "failed":
+                await update_node_history(state, "generate_sql", "completed", thinking_steps=[
+                    {"id": "step-1", "content": "SQL query generated", "status": "completed", "timestamp": stage_end.isoformat()}
+                ])
             await record_query_pipeline_stage(
                 query_id=query_id,
-                stage="sql_generation",
+                stage="generate_sql",
                 status="completed",
                 entered_at=stage_start,
                 exited_at=stage_end,
@@ -89,7 +95,7 @@ async def generate_sql_node(state: QueryState) -> QueryState:
             stage_end = datetime.now(timezone.utc)
             await record_query_pipeline_stage(
                 query_id=query_id,
-                stage="sql_generation",
+                stage="generate_sql",
                 status="failed",
                 entered_at=stage_start,
                 exited_at=stage_end,
@@ -57,7 +57,7 @@ async def validate_query_node(state: QueryState) -> QueryState:
         stage_end = datetime.now(timezone.utc)
         await record_query_pipeline_stage(
             query_id=query_id,
-            stage="validation",
+            stage="validate",
             status="failed",
             entered_at=stage_start,
             exited_at=stage_end,
@@ -83,7 +83,7 @@ async def validate_query_node(state: QueryState) -> QueryState:
             stage_end = datetime.now(timezone.utc)
             await record_query_pipeline_stage(
                 query_id=query_id,
-                stage="validation",
+                stage="validate",
                 status="completed",
                 entered_at=stage_start,
                 exited_at=stage_end,
@@ -99,7 +99,7 @@ async def validate_query_node(state: QueryState) -> QueryState:
             stage_end = datetime.now(timezone.utc)
             await record_query_pipeline_stage(
                 query_id=query_id,
-                stage="validation",
+                stage="validate",
                 status="failed",
                 entered_at=stage_start,
                 exited_at=stage_end,
@@ -107,11 +107,24 @@ async def validate_query_node(state: QueryState) -> QueryState:
             )
             raise
 
+        if result.get("next_action") == "await_approval":
+            _observe_time_to_approval(result, stage_start, stage_end)
+
         # Expose final routing decision for observability
         span["output"]["next_action"] = result.get("next_action")
         return result
 
 
+def _observe_time_to_approval(state: QueryState, stage_start: datetime, stage_end: datetime) -> None:
+    """Record how long validation (including cost estimation) took to route a query to approval"""
+    source = (state.get("cost_estimate") or {}).get("source", "default")
+    try:
+        from app.core.prometheus_metrics import time_to_approval
+        time_to_approval.labels(cost_estimate=source).observe((stage_end - stage_start).total_seconds())
+    except ImportError:
+        pass
+
+
 async def _validate_query_node_inner(state: QueryState, span: dict) -> QueryState:
     """
     Node 3: Validate SQL query for security and syntax
@@ -219,7 +232,7 @@ async def _validate_query_node_inner(state: QueryState, span: dict) -> QueryStat
     if not validation_result.is_valid:
         logger.error(f"SQL validation failed: {validation_result.errors}")
         error_message = f"SQL validation failed: {'; '.join(validation_result.errors)}"
-        await set_state_error(state, "validation", error_message, {"errors": validation_result.errors})
+        await set_state_error(state, "validate", error_message, {"errors": validation_result.errors})
         state["next_action"] = "error"
         state["messages"].append(AIMessage(
             content=f" Query validation failed:\n" + "\n".join(f"- {err}" for err in validation_result.errors)
@@ -319,6 +332,7 @@ async def _validate_query_node_inner(state: QueryState, span: dict) -> QueryStat
             "full_scan_tables": cost_estimate.full_scan_tables,
             "warnings": cost_estimate.warnings,
             "recommendations": cost_estimate.recommendations,
+            "source": cost_estimate.source,
         }
         
         # Store execution plan for frontend visibility
@@ -330,6 +344,7 @@ async def _validate_query_node_inner(state: QueryState, span: dict) -> QueryStat
             "total_cost": cost_estimate.total_cost,
             "cardinality": cost_estimate.cardinality,
             "cost_level": cost_estimate.cost_level.value,
+            "source": cost_estimate.source,
         }
 
         if cost_estimate.warnings:
@@ -344,7 +359,7 @@ async def _validate_query_node_inner(state: QueryState, span: dict) -> QueryStat
                 f"Query blocked: Estimated cost too high ({int(cost_estimate.total_cost)}). "
                 f"Recommendations: {'; '.join(cost_estimate.recommendations[:2])}"
             )
-            await set_state_error(state, "validation", message, {
+            await set_state_error(state, "validate", message, {
                 "cost_level": cost_estimate.cost_level.value,
                 "total_cost": float(cost_estimate.total_cost),
             })
@@ -413,8 +428,9 @@ async def _validate_query_node_inner(state: QueryState, span: dict) -> QueryStat
     else:
         state["next_action"] = "error"
         message = f"Validation failed: {validation_result.errors}"
-        await set_state_error(state, "validation", message, {"errors": validation_result.errors})
+        await set_state_error(state, "validate", message, {"errors": validation_result.errors})
         logger.warning(message)
+        return state
 
     span["output"]["status"] = "success"
     
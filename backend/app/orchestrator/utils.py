@@ -38,6 +38,36 @@ async def emit_state_event(q_state: dict, new_state, metadata: dict | None = Non
         logger.debug("State emit skipped (manager unavailable)")
 
 
+# Nodes that record their own pipeline stage, with metadata, under their node name
+SELF_RECORDED_STAGES = frozenset({"generate_sql", "validate", "execute"})
+
+
+async def _record_node_stage(
+    state: dict,
+    node_name: str,
+    status: str,
+    start_time: str | None,
+    end_time: str,
+    error: str | None = None,
+) -> None:
+    """Feed a finished node run into the diagnostic pipeline trace store (best-effort)."""
+    if not start_time or not state.get("query_id") or node_name in SELF_RECORDED_STAGES:
+        return
+    try:
+        from app.services.diagnostic_service import record_query_pipeline_stage
+
+        await record_query_pipeline_stage(
+            query_id=state["query_id"],
+            stage=node_name,
+            status=status,
+            entered_at=datetime.fromisoformat(start_time),
+            exited_at=datetime.fromisoformat(end_time),
+            error_details=error,
+        )
+    except Exception:
+        logger.debug(f"Pipeline stage record skipped for {node_name}")
+
+
 async def update_node_history(
     state: dict,
     node_name: str,
@@ -69,7 +99,10 @@ async def update_node_history(
         # Update existing
         current = history[existing_idx]
         node_data["start_time"] = current.get("start_time")
-        if status == "in-progress" and not node_data["start_time"]:
+        # Re-entering a finished node (repair loops) starts a new run
+        if status == "in-progress" and (
+            not node_data["start_time"] or current.get("status") in ["completed", "failed"]
+        ):
             node_data["start_time"] = now
         if status in ["completed", "failed"]:
             node_data["end_time"] = now
@@ -79,6 +112,8 @@ async def update_node_history(
             node_data["thinking_steps"] = current["thinking_steps"]
             
         history[existing_idx] = node_data
+        if status in ["completed", "failed"] and current.get("status") == "in-progress":
+            await _record_node_stage(state, node_name, status, node_data["start_time"], now, error)
     else:
         # Add new
         if status == "in-progress":
@@ -2,19 +2,119 @@
 Enhanced Result Anomaly Detection Service
 
 Implements:
-- Z-score outlier detection for numeric columns
+- Z-score and IQR outlier detection for numeric columns
 - Temporal anomaly detection (comparing to historical baselines)
-- Statistical distribution analysis
+- Statistical distribution analysis (value concentration, null ratios)
 - Correlation with historical query results
+
+Column analysis is columnar and vectorized with NumPy: rows are transposed
+once, numeric columns are detected from a small sample and converted in one
+pass, and statistics run on float arrays. Large results are analyzed on an
+evenly spaced row sample under a per-call time budget.
 """
 
 import logging
-import statistics
-from typing import Dict, List, Any, Optional, Tuple
+import time
 from datetime import datetime, timezone
+from collections import Counter
+from itertools import zip_longest
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Rows analyzed per result; larger results use an evenly spaced sample
+MAX_ANALYSIS_ROWS = 100_000
+# Non-null values inspected to decide whether a column is numeric
+TYPE_INFERENCE_SAMPLE = 64
+# Wall-clock budget for analyze_query_results; remaining columns are skipped
+ANALYSIS_TIME_BUDGET_SECONDS = 0.5
+# Tukey fence multiplier for IQR outliers
+IQR_MULTIPLIER = 1.5
+# Sample size used to pick the candidate dominant value of a column
+CONCENTRATION_SAMPLE = 2048
+
+
+def to_columnar(columns: Sequence[str], rows: Sequence[Any]) -> List[np.ndarray]:
+    """
+    Transpose result rows into one object array per column
+
+    Handles list/tuple rows (ragged rows are padded with None) and dict rows.
+    """
+    if not rows:
+        return [np.empty(0, dtype=object) for _ in columns]
+    if isinstance(rows[0], dict):
+        transposed = [[r.get(name) if isinstance(r, dict) else None for r in rows] for name in columns]
+    else:
+        try:
+            # Rectangular rows: one C-level copy, columns are strided views
+            matrix = np.array(rows, dtype=object)
+            if matrix.ndim == 2 and matrix.shape[1] >= len(columns):
+                return [matrix[:, idx] for idx in range(len(columns))]
+        except ValueError:
+            pass
+        transposed = list(zip_longest(*rows, fillvalue=None))
+    arrays = []
+    for idx in range(len(columns)):
+        arr = np.empty(len(rows), dtype=object)
+        if idx < len(transposed):
+            arr[:] = transposed[idx]
+        arrays.append(arr)
+    return arrays
+
+
+def dominant_value(values: np.ndarray) -> Tuple[Any, int]:
+    """
+    Most frequent value of a non-null column and its exact count
+
+    Only a dominant value matters for concentration checks, and any value
+    holding most of the column is the mode of an evenly spaced sample, so the
+    candidate comes from a sample and is then counted exactly in one
+    vectorized comparison instead of hashing every row.
+    """
+    if values.size == 0:
+        return None, 0
+    step = max(1, values.size // CONCENTRATION_SAMPLE)
+    sample = values[::step].tolist()
+    try:
+        candidate = Counter(sample).most_common(1)[0][0]
+        return candidate, int(np.count_nonzero(values == candidate))
+    except TypeError:
+        # Unhashable cells (lists, dicts): compare string forms
+        as_text = np.array([str(v) for v in values], dtype=object)
+        candidate = Counter(as_text[::step].tolist()).most_common(1)[0][0]
+        return candidate, int(np.count_nonzero(as_text == candidate))
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def numeric_view(values: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Float view of a non-null object column, or None if it is not numeric
+
+    A small sample decides the column type so text columns never pay for a
+    full conversion. Unparseable entries in numeric columns become NaN.
+    """
+    if values.size == 0:
+        return None
+    sample = values[:TYPE_INFERENCE_SAMPLE]
+    parsed = sum(1 for v in sample if not np.isnan(_to_float(v)))
+    if parsed == 0 or parsed * 2 < len(sample):
+        return None
+    try:
+        # Fast path: ints, floats, Decimals and numeric strings convert in C
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter((_to_float(v) for v in values), dtype=np.float64, count=values.size)
+
 
 class AnomalyDetectionService:
     """Service for detecting anomalies in query results"""
@@ -22,35 +122,48 @@ class AnomalyDetectionService:
     # Z-score threshold for outlier detection
     Z_SCORE_THRESHOLD = 3.0
     
+    @staticmethod
+    def _as_array(values: Any) -> np.ndarray:
+        if isinstance(values, np.ndarray) and values.dtype == object:
+            return values
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = list(values)
+        return arr
+
     @staticmethod
     def detect_numeric_outliers(
         column_name: str,
-        values: List[Any],
+        values: Any,
         z_threshold: float = Z_SCORE_THRESHOLD
     ) -> Dict[str, Any]:
         """
-        Detect outliers using z-score analysis
+        Detect outliers using z-score and IQR analysis
         
         Args:
             column_name: Name of the column
-            values: List of numeric values
+            values: Column values (list or object array; nulls allowed)
             z_threshold: Z-score threshold (default: 3.0 standard deviations)
             
         Returns:
-            Dict with outlier analysis results
+            Dict with outlier analysis results (row_index refers to the input position)
         """
-        # Filter out None/null values
-        numeric_values = [float(v) for v in values if v is not None and str(v).replace('.', '', 1).replace('-', '', 1).isdigit()]
-        
-        if len(numeric_values) < 3:
-            return {
-                "has_outliers": False,
-                "reason": "Insufficient numeric data for outlier detection"
-            }
-        
         try:
-            mean = statistics.mean(numeric_values)
-            stdev = statistics.stdev(numeric_values)
+            arr = AnomalyDetectionService._as_array(values)
+            row_idx = np.flatnonzero(arr != None)  # noqa: E711 - elementwise null test
+            numeric = numeric_view(arr[row_idx])
+            if numeric is None:
+                return {"has_outliers": False, "reason": "Insufficient numeric data for outlier detection"}
+            finite = np.isfinite(numeric)
+            numeric, row_idx = numeric[finite], row_idx[finite]
+            
+            if numeric.size < 3:
+                return {
+                    "has_outliers": False,
+                    "reason": "Insufficient numeric data for outlier detection"
+                }
+            
+            mean = float(numeric.mean())
+            stdev = float(numeric.std(ddof=1))
             
             if stdev == 0:
                 return {
@@ -58,24 +171,36 @@ class AnomalyDetectionService:
                     "reason": "No variance in data (all values identical)"
                 }
             
-            # Calculate z-scores
-            outliers = []
-            for idx, value in enumerate(numeric_values):
-                z_score = abs((value - mean) / stdev)
-                if z_score > z_threshold:
-                    outliers.append({
-                        "row_index": idx,
-                        "value": value,
-                        "z_score": round(z_score, 2)
-                    })
+            z_scores = np.abs(numeric - mean) / stdev
+            outlier_pos = np.flatnonzero(z_scores > z_threshold)
+            outliers = [
+                {
+                    "row_index": int(row_idx[i]),
+                    "value": float(numeric[i]),
+                    "z_score": round(float(z_scores[i]), 2)
+                }
+                for i in outlier_pos[:10]  # Limit to first 10
+            ]
+            
+            q1, q3 = np.percentile(numeric, [25, 75])
+            iqr = q3 - q1
+            lower, upper = q1 - IQR_MULTIPLIER * iqr, q3 + IQR_MULTIPLIER * iqr
+            iqr_outlier_count = int(np.count_nonzero((numeric < lower) | (numeric > upper))) if iqr > 0 else 0
             
             return {
-                "has_outliers": len(outliers) > 0,
-                "outlier_count": len(outliers),
-                "outliers": outliers[:10],  # Limit to first 10
+                "has_outliers": outlier_pos.size > 0,
+                "outlier_count": int(outlier_pos.size),
+                "outliers": outliers,
                 "mean": round(mean, 2),
                 "std_dev": round(stdev, 2),
                 "threshold": z_threshold,
+                "iqr": {
+                    "q1": round(float(q1), 2),
+                    "q3": round(float(q3), 2),
+                    "lower_fence": round(float(lower), 2),
+                    "upper_fence": round(float(upper), 2),
+                    "outlier_count": iqr_outlier_count,
+                },
             }
             
         except Exception as e:
@@ -85,46 +210,39 @@ class AnomalyDetectionService:
     @staticmethod
     def detect_distribution_anomalies(
         column_name: str,
-        values: List[Any]
+        values: Any
     ) -> Dict[str, Any]:
         """
         Detect distribution anomalies (skewness, concentration)
         
         Args:
             column_name: Name of the column
-            values: List of values (any type)
+            values: Column values (list or object array; any type)
             
         Returns:
             Dict with distribution analysis
         """
-        # Filter out None values
-        non_null_values = [v for v in values if v is not None]
+        arr = AnomalyDetectionService._as_array(values)
+        non_null = arr[arr != None]  # noqa: E711 - elementwise null test
         
-        if len(non_null_values) < 3:
+        if non_null.size < 3:
             return {"anomalies": []}
         
         anomalies = []
         
         # Check for value concentration (>80% same value)
-        value_counts = {}
-        for v in non_null_values:
-            v_str = str(v)
-            value_counts[v_str] = value_counts.get(v_str, 0) + 1
+        top_value, top_count = dominant_value(non_null)
+        concentration = top_count / non_null.size
         
-        max_count = max(value_counts.values()) if value_counts else 0
-        max_value = max(value_counts, key=value_counts.get) if value_counts else None
-        concentration = max_count / len(non_null_values)
-        
-        if concentration > 0.8 and len(value_counts) > 1:
+        if concentration > 0.8 and top_count < non_null.size:
             anomalies.append({
                 "type": "high_concentration",
-                "description": f"Column '{column_name}' has {int(concentration*100)}% same value: {max_value}",
+                "description": f"Column '{column_name}' has {int(concentration*100)}% same value: {top_value}",
                 "severity": "medium",
             })
         
         # Check for sparse data (>50% nulls)
-        null_count = len(values) - len(non_null_values)
-        null_ratio = null_count / len(values) if values else 0
+        null_ratio = (arr.size - non_null.size) / arr.size
         
         if null_ratio > 0.5:
             anomalies.append({
@@ -241,7 +359,8 @@ class AnomalyDetectionService:
     def analyze_query_results(
         result: Dict[str, Any],
         columns: List[str],
-        rows: List[List[Any]]
+        rows: List[List[Any]],
+        time_budget: float = ANALYSIS_TIME_BUDGET_SECONDS,
     ) -> Dict[str, Any]:
         """
         Comprehensive anomaly analysis for query results
@@ -250,6 +369,7 @@ class AnomalyDetectionService:
             result: Query result metadata
             columns: Column names
             rows: Result rows
+            time_budget: Seconds to spend before skipping remaining columns
             
         Returns:
             Comprehensive anomaly report
@@ -257,23 +377,27 @@ class AnomalyDetectionService:
         if not rows or not columns:
             return {"anomalies": [], "warnings": []}
         
+        start = time.perf_counter()
         anomalies = []
         warnings = []
         
-        def get_val(r, idx, name):
-            if isinstance(r, dict):
-                return r.get(name)
-            try:
-                return r[idx]
-            except (IndexError, TypeError):
-                return None
-
+        sampled = len(rows) > MAX_ANALYSIS_ROWS
+        if sampled:
+            step = len(rows) / MAX_ANALYSIS_ROWS
+            rows = [rows[int(i * step)] for i in range(MAX_ANALYSIS_ROWS)]
+            warnings.append(f"Anomaly analysis used an evenly spaced sample of {MAX_ANALYSIS_ROWS:,} rows")
+        
+        column_arrays = to_columnar(columns, rows)
+        columns_analyzed = 0
+        
         # Analyze each column
-        for col_idx, col_name in enumerate(columns):
+        for col_name, values in zip(columns, column_arrays):
+            if time.perf_counter() - start > time_budget:
+                warnings.append(
+                    f"Anomaly analysis time budget reached; skipped {len(columns) - columns_analyzed} column(s)"
+                )
+                break
             try:
-                # Extract column values
-                values = [get_val(row, col_idx, col_name) for row in rows]
-                
                 # Run z-score outlier detection for numeric columns
                 outlier_result = AnomalyDetectionService.detect_numeric_outliers(col_name, values)
                 if outlier_result.get("has_outliers"):
@@ -287,14 +411,17 @@ class AnomalyDetectionService:
                 # Run distribution anomaly detection
                 dist_result = AnomalyDetectionService.detect_distribution_anomalies(col_name, values)
                 if dist_result.get("anomalies"):
-                    anomalies.extend(dist_result["anomalies"])
+                    anomalies.extend({"column": col_name, **a} for a in dist_result["anomalies"])
                     
             except Exception as e:
                 logger.debug(f"Anomaly analysis failed for column {col_name}: {e}")
-                continue
+            columns_analyzed += 1
         
         return {
             "anomalies": anomalies,
             "warnings": warnings,
-            "columns_analyzed": len(columns),
+            "columns_analyzed": columns_analyzed,
+            "rows_analyzed": len(rows),
+            "sampled": sampled,
+            "analysis_ms": round((time.perf_counter() - start) * 1000, 2),
         }
@@ -8,23 +8,144 @@ Provides reliable indicators connected to the deepest level of the system.
 import logging
 import asyncio
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Deque, Tuple
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from app.core.client_registry import registry
 from app.core.degraded_mode_manager import degraded_mode_manager
+from app.core.event_loop_monitor import event_loop_monitor
 from app.core.redis_client import redis_client
+from app.core.query_coalescer import query_coalescer
+from app.core.transpile_cache import transpile_cache
+from app.core.plan_estimate_cache import plan_estimate_cache
+from app.core.report_render_pool import report_render_pool
 from app.core.config import settings
+from app.utils.lazy_imports import lazy_load_times
+
+try:
+    from app.core.prometheus_metrics import pipeline_stage_duration
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Trace store sizing: queries kept in memory, stages kept per query, and the
+# rolling sample window used for per-stage percentiles
+MAX_TRACED_QUERIES = 1000
+MAX_STAGES_PER_QUERY = 200
+STAGE_LATENCY_WINDOW = 2048
+
+
+class PipelineTraceStore:
+    """
+    Fixed-capacity ring buffer of per-query pipeline traces
+
+    Each query occupies one slot, claimed when its first stage is recorded.
+    When the ring is full the slot at the write cursor - the query traced
+    longest ago - is overwritten, so append and eviction are both O(1).
+    """
+
+    def __init__(self, capacity: int = MAX_TRACED_QUERIES, max_stages: int = MAX_STAGES_PER_QUERY):
+        self._capacity = capacity
+        self._max_stages = max_stages
+        self._slots: List[Optional[str]] = [None] * capacity
+        self._cursor = 0
+        self._traces: Dict[str, Deque[Dict[str, Any]]] = {}
+
+    def append(self, query_id: str, trace: Dict[str, Any]) -> None:
+        traces = self._traces.get(query_id)
+        if traces is None:
+            evicted = self._slots[self._cursor]
+            if evicted is not None:
+                self._traces.pop(evicted, None)
+            self._slots[self._cursor] = query_id
+            self._cursor = (self._cursor + 1) % self._capacity
+            traces = self._traces[query_id] = deque(maxlen=self._max_stages)
+        traces.append(trace)
+
+    def get(self, query_id: str) -> List[Dict[str, Any]]:
+        return list(self._traces.get(query_id, ()))
+
+    def recent(self, limit: int) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Most recently started queries, oldest first"""
+        result = []
+        for offset in range(1, min(limit, self._capacity) + 1):
+            query_id = self._slots[(self._cursor - offset) % self._capacity]
+            if query_id is None:
+                break
+            result.append((query_id, list(self._traces[query_id])))
+        result.reverse()
+        return result
+
+    def clear(self) -> None:
+        self._slots = [None] * self._capacity
+        self._cursor = 0
+        self._traces.clear()
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class StageLatencyTracker:
+    """
+    Rolling per-stage latency samples
+
+    Recording is O(1) into a bounded window per stage; percentiles are
+    computed over the window when a snapshot is requested.
+    """
+
+    def __init__(self, window: int = STAGE_LATENCY_WINDOW):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._failures: Dict[str, int] = defaultdict(int)
+
+    def observe(self, stage: str, duration_ms: float, status: str) -> None:
+        self._samples[stage].append(duration_ms)
+        self._counts[stage] += 1
+        if status == "failed":
+            self._failures[stage] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for stage, samples in self._samples.items():
+            ordered = sorted(samples)
+            stats[stage] = {
+                "count": self._counts[stage],
+                "failures": self._failures[stage],
+                "window": len(ordered),
+                "mean_ms": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+                "p50_ms": round(_percentile(ordered, 50), 2),
+                "p95_ms": round(_percentile(ordered, 95), 2),
+                "p99_ms": round(_percentile(ordered, 99), 2),
+                "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+            }
+        return stats
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._counts.clear()
+        self._failures.clear()
+
+
 # In-memory storage for MCP tool status (with TTL)
 _mcp_tool_status: Dict[str, Dict[str, Any]] = {}
 _mcp_tool_status_lock = asyncio.Lock()
 
-# In-memory storage for query pipeline traces
-_query_pipeline_traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+# In-memory storage for query pipeline traces and stage latencies
+_query_pipeline_traces = PipelineTraceStore()
+_stage_latencies = StageLatencyTracker()
 _query_traces_lock = asyncio.Lock()
 
 
@@ -238,12 +359,13 @@ async def record_query_pipeline_stage(
             "metadata": metadata or {}
         }
         
-        _query_pipeline_traces[query_id].append(trace)
-        
-        # Keep only last 1000 queries in memory
-        if len(_query_pipeline_traces) > 1000:
-            oldest_key = min(_query_pipeline_traces.keys())
-            del _query_pipeline_traces[oldest_key]
+        _query_pipeline_traces.append(query_id, trace)
+
+        duration_ms = trace["duration_ms"]
+        if duration_ms is not None and status != "started":
+            _stage_latencies.observe(stage, duration_ms, status)
+            if METRICS_AVAILABLE:
+                pipeline_stage_duration.labels(stage=stage, status=status).observe(duration_ms / 1000)
 
 
 async def get_query_pipeline_traces(query_id: str) -> List[Dict[str, Any]]:
@@ -257,7 +379,18 @@ async def get_query_pipeline_traces(query_id: str) -> List[Dict[str, Any]]:
         List of pipeline stage traces
     """
     async with _query_traces_lock:
-        return _query_pipeline_traces.get(query_id, [])
+        return _query_pipeline_traces.get(query_id)
+
+
+async def get_stage_latency_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get rolling latency percentiles for each pipeline stage
+
+    Returns:
+        Mapping of stage name to count, failures, mean and p50/p95/p99/max (ms)
+    """
+    async with _query_traces_lock:
+        return _stage_latencies.snapshot()
 
 
 # ==================== Connection Pool Health ====================
@@ -306,7 +439,25 @@ async def get_connection_pool_health() -> List[Dict[str, Any]]:
             })
     except Exception as e:
         logger.error(f"Failed to get Doris pool health: {e}")
-    
+
+    # Shared HTTP proxy pools (one per upstream, e.g. Doris MCP SSE/messages)
+    try:
+        from app.core.proxy_http_client import proxy_http_pool
+        for upstream, stats in proxy_http_pool.get_stats().items():
+            connections = stats.get("connections", {})
+            pools.append({
+                "database": f"proxy:{upstream}",
+                "total_connections": connections.get("open", 0),
+                "active_connections": connections.get("active", 0),
+                "idle_connections": connections.get("idle", 0),
+                "wait_queue_depth": max(0, stats.get("in_flight", 0) - connections.get("open", 0)),
+                "acquisition_latency_ms": 0.0,
+                "connection_churn_rate": 0.0,
+                "potential_leaks": []
+            })
+    except Exception as e:
+        logger.error(f"Failed to get proxy pool health: {e}")
+
     return pools
 
 
@@ -395,7 +546,7 @@ async def get_system_diagnostics_summary() -> Dict[str, Any]:
     # Get recent failures
     recent_failures = []
     async with _query_traces_lock:
-        for query_id, traces in list(_query_pipeline_traces.items())[-10:]:
+        for query_id, traces in _query_pipeline_traces.recent(10):
             failed_stages = [t for t in traces if t["status"] == "failed"]
             if failed_stages:
                 recent_failures.append({
@@ -416,7 +567,14 @@ async def get_system_diagnostics_summary() -> Dict[str, Any]:
         "performance_metrics": {
             "avg_query_latency_ms": 0.0,
             "queries_per_minute": 0.0,
-            "error_rate": 0.0
+            "error_rate": 0.0,
+            "stage_latency_ms": await get_stage_latency_stats(),
+            "event_loop_lag_ms": event_loop_monitor.snapshot(),
+            "report_render_pool": report_render_pool.get_status(),
+            "query_coalescing": query_coalescer.get_status(),
+            "sql_transpile_cache": transpile_cache.get_status(),
+            "query_cost_estimate_cache": plan_estimate_cache.get_status(),
+            "lazy_imports_ms": lazy_load_times(),
         }
     }
 
@@ -0,0 +1,522 @@
+"""
+Export Service - Streaming large-result exports (CSV / Parquet / XLSX)
+
+Exports replay the validated SQL of a query the caller owns and that has
+already run through the orchestrator (validation, approval, RBAC); raw SQL
+is never accepted. The query is re-executed through a streaming cursor and
+the output file is written batch by batch, so memory stays constant
+regardless of result size:
+- PostgreSQL: server-side (named) cursor via postgres_client.stream_query
+- Doris: unbuffered MySQL-protocol cursor (aiomysql SSCursor) under the
+  dedicated DORIS_EXPORT_USER account; without it, the buffered path below
+- Oracle: SQLcl MCP returns whole results, so exports are buffered and
+  bounded by what a normal execution returns
+
+Column types come from the cursor description (or from every buffered
+value), so Parquet schemas never depend on what the first batch contains.
+
+Job state lives in Redis (export:job:<id>) so the API can report progress
+for exports running in a Celery worker. Files older than EXPORT_TTL_SECONDS
+are removed by cleanup_expired_files().
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import AuthorizationException, ExternalServiceException, ValidationException
+from app.core.redis_client import RedisClient, redis_client
+from app.utils.json_encoder import CustomJSONEncoder
+from app.utils.lazy_imports import lazy_import, module_available
+
+logger = logging.getLogger(__name__)
+
+# Format libraries are loaded by the first export that needs them
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+openpyxl = lazy_import("openpyxl")
+aiomysql = lazy_import("aiomysql")
+PYARROW_AVAILABLE = module_available("pyarrow")
+OPENPYXL_AVAILABLE = module_available("openpyxl")
+AIOMYSQL_AVAILABLE = module_available("aiomysql")
+
+JOB_KEY_PREFIX = "export:job:"
+EXPORT_FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet",
+                  "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+XLSX_MAX_ROWS_PER_SHEET = 1_048_575  # Excel row limit minus header
+
+
+class ExportColumn(NamedTuple):
+    """Column name plus a logical type: bool, int, float, decimal, date, timestamp, binary or string"""
+    name: str
+    kind: str = "string"
+    scale: Optional[int] = None  # decimal only; None when the database does not fix it
+
+
+# PostgreSQL type OIDs
+_PG_KINDS = {
+    16: "bool", 20: "int", 21: "int", 23: "int", 26: "int",
+    700: "float", 701: "float", 1700: "decimal",
+    1082: "date", 1114: "timestamp", 1184: "timestamp", 17: "binary",
+}
+# MySQL protocol FIELD_TYPE codes (Doris)
+_MYSQL_KINDS = {
+    0: "decimal", 246: "decimal",
+    1: "int", 2: "int", 3: "int", 8: "int", 9: "int", 13: "int",
+    4: "float", 5: "float",
+    7: "timestamp", 12: "timestamp", 10: "date", 14: "date",
+}
+
+
+def _infer_kind(values: List[Any]) -> str:
+    """Logical type covering every non-null value (string when they disagree)"""
+    kinds = set()
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            kinds.add("bool")
+        elif isinstance(value, int):
+            kinds.add("int")
+        elif isinstance(value, float):
+            kinds.add("float")
+        elif isinstance(value, Decimal):
+            kinds.add("decimal")
+        elif isinstance(value, datetime):
+            kinds.add("timestamp")
+        elif isinstance(value, date):
+            kinds.add("date")
+        else:
+            return "string"
+    if kinds <= {"int", "float"} and "float" in kinds:
+        return "float"
+    return kinds.pop() if len(kinds) == 1 else "string"
+
+
+# ==================== Writers ====================
+
+class _CSVExportWriter:
+    """Incremental CSV writer"""
+
+    def __init__(self, path: str, columns: List[ExportColumn]):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([c.name for c in columns])
+
+    def write_rows(self, rows: List[tuple]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetExportWriter:
+    """Row-group-per-batch Parquet writer; schema fixed up front from the column types"""
+
+    def __init__(self, path: str, columns: List[ExportColumn]):
+        self._schema = pa.schema([pa.field(c.name, self._arrow_type(c)) for c in columns])
+        self._kinds = [c.kind if c.kind != "decimal" or c.scale is not None else "string" for c in columns]
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    @staticmethod
+    def _arrow_type(column: ExportColumn):
+        if column.kind == "decimal":
+            # Unconstrained numerics vary in scale row to row; keep them exact as text
+            return pa.decimal128(38, column.scale) if column.scale is not None else pa.string()
+        return {
+            "bool": pa.bool_(), "int": pa.int64(), "float": pa.float64(),
+            "date": pa.date32(), "timestamp": pa.timestamp("us", tz="UTC"), "binary": pa.binary(),
+        }.get(column.kind, pa.string())
+
+    def write_rows(self, rows: List[tuple]) -> None:
+        arrays = []
+        for index, (field, kind) in enumerate(zip(self._schema, self._kinds)):
+            values = [row[index] for row in rows]
+            if kind == "string":
+                values = [None if v is None or isinstance(v, str) else str(v) for v in values]
+            elif kind == "float":
+                values = [None if v is None else float(v) for v in values]
+            elif kind == "timestamp":
+                values = [v.replace(tzinfo=timezone.utc) if isinstance(v, datetime) and v.tzinfo is None else v
+                          for v in values]
+            try:
+                arrays.append(pa.array(values, type=field.type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ValidationException(f"Column '{field.name}' has values not matching its type: {e}")
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _XLSXExportWriter:
+    """Write-only (streaming) XLSX writer; rolls over to a new sheet at the row limit"""
+
+    def __init__(self, path: str, columns: List[ExportColumn]):
+        self._path = path
+        self._columns = [c.name for c in columns]
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = None
+        self._sheet_rows = 0
+        self._sheet_count = 0
+        self._new_sheet()
+
+    def _new_sheet(self) -> None:
+        self._sheet_count += 1
+        self._sheet = self._workbook.create_sheet(title=f"Results {self._sheet_count}")
+        self._sheet.append(self._columns)
+        self._sheet_rows = 0
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if value is None or isinstance(value, (str, int, float, bool, Decimal)):
+            return value
+        if isinstance(value, datetime):
+            # Excel has no timezone support
+            return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+        if hasattr(value, "isoformat"):
+            return value
+        return str(value)
+
+    def write_rows(self, rows: List[tuple]) -> None:
+        for row in rows:
+            if self._sheet_rows >= XLSX_MAX_ROWS_PER_SHEET:
+                self._new_sheet()
+            self._sheet.append([self._cell(v) for v in row])
+            self._sheet_rows += 1
+
+    def close(self) -> None:
+        self._workbook.save(self._path)
+
+
+def _open_writer(fmt: str, path: str, columns: List[ExportColumn]):
+    if fmt == "csv":
+        return _CSVExportWriter(path, columns)
+    if fmt == "parquet":
+        return _ParquetExportWriter(path, columns)
+    return _XLSXExportWriter(path, columns)
+
+
+# ==================== Row Sources ====================
+# Each source yields (columns, rows) batches with typed ExportColumn entries
+
+async def _stream_postgres(job: Dict[str, Any], batch_size: int) -> AsyncIterator[Tuple[List[ExportColumn], List[tuple]]]:
+    from app.core.postgres_client import postgres_client
+
+    description: List[Any] = []
+    columns: Optional[List[ExportColumn]] = None
+    await postgres_client.initialize()
+    # Stop fetching one row past the export cap; that row lets the writer loop mark truncation
+    async for _, rows in postgres_client.stream_query(
+        job["sql"], user_id=job["user_id"], request_id=job["export_id"], batch_size=batch_size,
+        max_rows=settings.EXPORT_MAX_ROWS + 1, on_describe=description.extend
+    ):
+        if columns is None:
+            columns = [
+                ExportColumn(d.name, _PG_KINDS.get(d.type_code, "string"), getattr(d, "scale", None))
+                for d in description
+            ]
+        yield columns, rows
+
+
+async def _stream_doris(job: Dict[str, Any], batch_size: int) -> AsyncIterator[Tuple[List[ExportColumn], List[tuple]]]:
+    if not AIOMYSQL_AVAILABLE:
+        raise ExternalServiceException("aiomysql not installed - Doris exports unavailable", service_name="doris")
+
+    conn = await aiomysql.connect(
+        host=settings.DORIS_DB_HOST,
+        port=settings.DORIS_DB_PORT,
+        user=settings.DORIS_EXPORT_USER,
+        password=settings.DORIS_EXPORT_PASSWORD,
+        db=settings.DORIS_DB_DATABASE,
+        autocommit=True,
+    )
+    try:
+        # SSCursor reads rows off the socket as they are fetched instead of buffering the result
+        async with conn.cursor(aiomysql.SSCursor) as cur:
+            await cur.execute(f"/* LLM Export - User: {job['user_id']}, Request: {job['export_id']} */ {job['sql']}")
+            # description: (name, type_code, display_size, internal_size, precision, scale, null_ok)
+            columns = [
+                ExportColumn(d[0], _MYSQL_KINDS.get(d[1], "string"), d[5] if _MYSQL_KINDS.get(d[1]) == "decimal" else None)
+                for d in cur.description or []
+            ]
+            while True:
+                rows = await cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield columns, rows
+    finally:
+        conn.close()
+
+
+async def _stream_buffered(job: Dict[str, Any], batch_size: int) -> AsyncIterator[Tuple[List[ExportColumn], List[tuple]]]:
+    from app.services.database_router import DatabaseRouter
+
+    result = await DatabaseRouter.execute_sql(
+        database_type=job["database_type"],
+        sql_query=job["sql"],
+        user_id=job["user_id"],
+        request_id=job["export_id"],
+    )
+    if result.get("status") == "error":
+        raise ExternalServiceException(result.get("message") or "Query execution failed")
+    payload = result.get("results") or result
+    names, rows = payload.get("columns", []), payload.get("rows", [])
+    if rows and isinstance(rows[0], dict):
+        rows = [tuple(row.get(name) for name in names) for row in rows]
+    # The whole result is in memory already: type each column from all of its values
+    columns = [ExportColumn(name, _infer_kind([row[i] for row in rows])) for i, name in enumerate(names)]
+    for start in range(0, len(rows), batch_size):
+        yield columns, rows[start:start + batch_size]
+    if not rows:
+        yield columns, []
+
+
+def _select_source(database_type: str):
+    if database_type == "postgres":
+        return _stream_postgres
+    if database_type == "doris" and settings.DORIS_EXPORT_USER:
+        return _stream_doris
+    return _stream_buffered
+
+
+# ==================== Service ====================
+
+class ExportService:
+    """Streaming export jobs with Redis-backed progress"""
+
+    PROGRESS_POLL_SECONDS = 0.5
+
+    @staticmethod
+    def _job_key(export_id: str) -> str:
+        return f"{JOB_KEY_PREFIX}{export_id}"
+
+    @staticmethod
+    def _normalize_database_type(database_type: Optional[str]) -> str:
+        db = (database_type or "oracle").lower()
+        return "postgres" if db == "postgresql" else db
+
+    @staticmethod
+    async def _save_job(job: Dict[str, Any], redis: Optional[RedisClient] = None) -> None:
+        job["updated_at"] = datetime.now(timezone.utc).isoformat()
+        await (redis or redis_client).set(ExportService._job_key(job["export_id"]), job, ttl=settings.EXPORT_TTL_SECONDS)
+
+    @staticmethod
+    async def get_job(export_id: str, redis: Optional[RedisClient] = None) -> Optional[Dict[str, Any]]:
+        job = await (redis or redis_client).get(ExportService._job_key(export_id))
+        return job if isinstance(job, dict) else None
+
+    @staticmethod
+    async def _load_query_state(query_id: str) -> Optional[Dict[str, Any]]:
+        """Orchestrator checkpoint values for query_id, or None when unknown"""
+        from app.core.client_registry import registry
+
+        orchestrator = registry.get_query_orchestrator()
+        if not orchestrator:
+            raise ExternalServiceException("Query orchestrator not available")
+        snapshot = await orchestrator.aget_state({"configurable": {"thread_id": query_id}})
+        return dict(snapshot.values) if snapshot and snapshot.values else None
+
+    @staticmethod
+    async def create_job(
+        query_id: str,
+        fmt: str,
+        user_id: str,
+        user_role: str,
+        file_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Register an export of an executed query owned by the caller
+
+        The SQL is the query's validated, approved SQL from the orchestrator
+        state; it is re-checked against the caller's role before export.
+
+        Raises:
+            ValidationException: Unsupported format, unknown or unexecuted query
+            AuthorizationException: Query belongs to another user
+        """
+        from app.core.sql_validator import QueryType, validate_sql
+
+        fmt = (fmt or "csv").lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationException(f"Unsupported export format '{fmt}' (csv, parquet, xlsx)")
+        if fmt == "parquet" and not PYARROW_AVAILABLE:
+            raise ValidationException("Parquet export requires pyarrow")
+        if fmt == "xlsx" and not OPENPYXL_AVAILABLE:
+            raise ValidationException("XLSX export requires openpyxl")
+
+        state = await ExportService._load_query_state(query_id)
+        if not state:
+            raise ValidationException(f"Query {query_id} not found")
+        if state.get("user_id") != user_id and user_role != "admin":
+            raise AuthorizationException("You can only export your own queries")
+        execution_result = state.get("execution_result") or {}
+        sql = state.get("sql_query") or ""
+        if not sql or not execution_result or execution_result.get("status") == "error":
+            raise ValidationException("Only queries that were approved and executed successfully can be exported")
+
+        validation = validate_sql(sql, user_role)
+        if not validation.is_valid or validation.query_type != QueryType.SELECT:
+            raise ValidationException("Only valid SELECT queries can be exported")
+
+        export_id = f"exp_{uuid.uuid4().hex}"
+        base_name = re.sub(r"[^a-zA-Z0-9_\-]", "_", file_name or query_id)[:100]
+        job = {
+            "export_id": export_id,
+            "query_id": query_id,
+            "user_id": user_id,
+            "database_type": ExportService._normalize_database_type(state.get("database_type")),
+            "format": fmt,
+            "sql": sql,
+            "file_name": f"{base_name}.{fmt}",
+            "file_path": None,
+            "status": "queued",
+            "rows_written": 0,
+            "bytes_written": 0,
+            "error": None,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None,
+        }
+        await ExportService._save_job(job)
+        return job
+
+    @staticmethod
+    def cleanup_expired_files(now: Optional[float] = None) -> int:
+        """
+        Delete export files older than EXPORT_TTL_SECONDS
+
+        Job records expire from Redis after the same TTL, so nothing can
+        reference these files any more.
+
+        Returns:
+            Number of files removed
+        """
+        if not os.path.isdir(settings.EXPORT_DIR):
+            return 0
+        cutoff = (now or time.time()) - settings.EXPORT_TTL_SECONDS
+        removed = 0
+        with os.scandir(settings.EXPORT_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        if removed:
+            logger.info(f"Removed {removed} expired export files")
+        return removed
+
+    @staticmethod
+    async def run_export(export_id: str, redis: Optional[RedisClient] = None) -> Dict[str, Any]:
+        """
+        Execute an export job end to end, writing the file incrementally
+
+        Args:
+            export_id: Job created by create_job
+            redis: Client for job records; Celery workers pass the runtime's
+                own client (defaults to the module-level client)
+
+        Returns:
+            Final job record
+        """
+        job = await ExportService.get_job(export_id, redis)
+        if not job:
+            raise ValidationException(f"Export job {export_id} not found")
+
+        batch_size = settings.EXPORT_BATCH_SIZE
+        os.makedirs(settings.EXPORT_DIR, exist_ok=True)
+        path = os.path.join(settings.EXPORT_DIR, f"{export_id}.{job['format']}")
+        job.update(status="running", file_path=path)
+        await ExportService._save_job(job, redis)
+
+        source = _select_source(job["database_type"])
+
+        writer = None
+        rows_written = 0
+        try:
+            async for columns, rows in source(job, batch_size):
+                if writer is None:
+                    writer = _open_writer(job["format"], path, columns)
+                remaining = settings.EXPORT_MAX_ROWS - rows_written
+                if len(rows) > remaining:
+                    rows = rows[:remaining]
+                    job["truncated"] = True
+                if rows:
+                    # Format encoding is CPU-bound; keep the loop responsive
+                    await asyncio.to_thread(writer.write_rows, rows)
+                    rows_written += len(rows)
+                job.update(rows_written=rows_written, bytes_written=os.path.getsize(path) if os.path.exists(path) else 0)
+                await ExportService._save_job(job, redis)
+                if job.get("truncated"):
+                    logger.warning(f"Export {export_id} truncated at {rows_written} rows")
+                    break
+            if writer is None:
+                writer = _open_writer(job["format"], path, [])
+            await asyncio.to_thread(writer.close)
+            writer = None
+
+            job.update(
+                status="completed",
+                rows_written=rows_written,
+                bytes_written=os.path.getsize(path),
+                finished_at=datetime.now(timezone.utc).isoformat(),
+            )
+            logger.info(f"Export {export_id} completed: {rows_written} rows, {job['bytes_written']} bytes")
+        except Exception as e:
+            logger.error(f"Export {export_id} failed: {e}")
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            if os.path.exists(path):
+                os.remove(path)
+            job.update(status="failed", error=str(e), file_path=None,
+                       finished_at=datetime.now(timezone.utc).isoformat())
+        await ExportService._save_job(job, redis)
+        return job
+
+    @staticmethod
+    def public_view(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job fields safe to return to clients (no SQL text or server paths)"""
+        return {k: v for k, v in job.items() if k not in ("sql", "file_path")}
+
+    @staticmethod
+    async def stream_progress(export_id: str) -> AsyncIterator[str]:
+        """
+        SSE progress events until the export finishes
+
+        Yields:
+            'progress' events when row counts change, then one 'complete' or
+            'error' event
+        """
+        last_snapshot = None
+        while True:
+            job = await ExportService.get_job(export_id)
+            if not job:
+                yield f"event: error\ndata: {json.dumps({'message': 'Export not found'})}\n\n"
+                return
+            view = ExportService.public_view(job)
+            snapshot = (view["status"], view["rows_written"])
+            if snapshot != last_snapshot:
+                last_snapshot = snapshot
+                event = "progress"
+                if view["status"] == "completed":
+                    event = "complete"
+                elif view["status"] == "failed":
+                    event = "error"
+                yield f"event: {event}\ndata: {json.dumps(view, cls=CustomJSONEncoder)}\n\n"
+            if view["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(ExportService.PROGRESS_POLL_SECONDS)
@@ -1,6 +1,11 @@
 """
 Persistent Memory Service
 Stores and retrieves conversations, user preferences, learned mappings
+
+Writes go out as one MULTI/EXEC pipeline (document plus its indexes), reads
+resolve an index and then fetch its documents in one batched round trip, and
+mapping usage counters are updated server-side (HINCRBY on a per-mapping hash)
+instead of read-modify-writing the JSON document.
 """
 
 import logging
@@ -11,9 +16,48 @@ from datetime import datetime, timezone
 
 from app.core.redis_client import redis_client
 from app.core.config import settings
+from app.utils.json_encoder import CustomJSONEncoder
 
 logger = logging.getLogger(__name__)
 
+MEMORY_TTL_SECONDS = 7 * 24 * 3600
+MAX_CONVERSATION_INDEX = 500
+MAX_MAPPING_INDEX = 1000
+
+# KEYS[1] mapping document, KEYS[2] usage hash
+# ARGV[1] 1 on success else 0, ARGV[2] timestamp, ARGV[3] ttl
+# Returns the new usage count, or false if the mapping no longer exists
+_UPDATE_USAGE_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return false end
+if redis.call('EXISTS', KEYS[2]) == 0 then
+  -- Mapping stored before usage hashes existed: seed from the document
+  local ok, doc = pcall(cjson.decode, redis.call('GET', KEYS[1]))
+  local uc, sr = 0, 100
+  if ok and type(doc) == 'table' then
+    uc = tonumber(doc.usage_count) or 0
+    sr = tonumber(doc.success_rate) or 100
+  end
+  redis.call('HSET', KEYS[2], 'usage_count', uc, 'successes', math.floor(uc * sr / 100 + 0.5))
+end
+local count = redis.call('HINCRBY', KEYS[2], 'usage_count', 1)
+if ARGV[1] == '1' then redis.call('HINCRBY', KEYS[2], 'successes', 1) end
+redis.call('HSET', KEYS[2], 'last_used_at', ARGV[2])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+redis.call('EXPIRE', KEYS[2], tonumber(ARGV[3]))
+return count
+"""
+
+
+def _merge_usage(mapping: Dict[str, Any], usage_count: str, successes: str, last_used_at: str) -> Dict[str, Any]:
+    """Overlay server-side usage counters onto a mapping document"""
+    if usage_count:
+        uc = int(usage_count)
+        mapping["usage_count"] = uc
+        mapping["success_rate"] = (int(successes or 0) / uc * 100.0) if uc else 100.0
+    if last_used_at:
+        mapping["last_used_at"] = last_used_at
+    return mapping
+
 
 class PersistentMemoryService:
     """Service for persistent memory operations across sessions"""
@@ -53,14 +97,13 @@ class PersistentMemoryService:
         }
         
         try:
-            # Store conversation object
-            await redis_client.set(f"conv:{conversation_id}", payload, ttl=7*24*3600)
-            
-            # Index by user and session
-            await redis_client._client.lpush(f"user:{user_id}:conversations", conversation_id)
-            await redis_client._client.ltrim(f"user:{user_id}:conversations", 0, 499)
-            await redis_client._client.lpush(f"session:{session_id}:conversations", conversation_id)
-            await redis_client._client.ltrim(f"session:{session_id}:conversations", 0, 499)
+            # Document plus user/session indexes in one MULTI/EXEC
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.setex(f"conv:{conversation_id}", MEMORY_TTL_SECONDS, json.dumps(payload, cls=CustomJSONEncoder))
+            for index_key in (f"user:{user_id}:conversations", f"session:{session_id}:conversations"):
+                pipe.lpush(index_key, conversation_id)
+                pipe.ltrim(index_key, 0, MAX_CONVERSATION_INDEX - 1)
+            await pipe.execute()
             
             logger.info(f"Stored conversation in Redis: {conversation_id}")
             return conversation_id
@@ -78,11 +121,13 @@ class PersistentMemoryService:
         Retrieve user's conversation history from Redis
         """
         try:
-            ids = await redis_client._client.lrange(f"user:{user_id}:conversations", 0, max(0, limit-1))
+            conversation_ids = await redis_client.lrange(f"user:{user_id}:conversations", 0, max(1, limit) - 1)
+            payloads = await redis_client.mget([f"conv:{cid}" for cid in conversation_ids])
             conversations: List[Dict[str, Any]] = []
-            for cid in ids:
-                conv = await redis_client.get(f"conv:{cid}")
-                if not conv:
+            for raw in payloads or []:
+                try:
+                    conv = json.loads(raw)
+                except (TypeError, ValueError):
                     continue
                 if status_filter and conv.get("execution_status") != status_filter:
                     continue
@@ -120,11 +165,20 @@ class PersistentMemoryService:
             "metadata": metadata or {},
         }
         try:
-            await redis_client.set(f"mapping:{mapping_id}", item, ttl=7*24*3600)
-            await redis_client._client.sadd(f"mappings:concept:{concept.upper()}", mapping_id)
-            await redis_client._client.sadd(f"mappings:table:{table_name.upper()}", mapping_id)
-            await redis_client._client.lpush("mappings:index", mapping_id)
-            await redis_client._client.ltrim("mappings:index", 0, 999)
+            # Document, usage counters and indexes in one MULTI/EXEC
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.setex(f"mapping:{mapping_id}", MEMORY_TTL_SECONDS, json.dumps(item, cls=CustomJSONEncoder))
+            pipe.hset(f"mapping:{mapping_id}:usage", mapping={
+                "usage_count": 1,
+                "successes": 1,
+                "last_used_at": item["last_used_at"],
+            })
+            pipe.expire(f"mapping:{mapping_id}:usage", MEMORY_TTL_SECONDS)
+            pipe.sadd(f"mappings:concept:{concept.upper()}", mapping_id)
+            pipe.sadd(f"mappings:table:{table_name.upper()}", mapping_id)
+            pipe.lpush("mappings:index", mapping_id)
+            pipe.ltrim("mappings:index", 0, MAX_MAPPING_INDEX - 1)
+            await pipe.execute()
             logger.info(f"Stored learned mapping in Redis: {concept} -> {table_name}.{column_name}")
             return mapping_id
         except Exception as e:
@@ -141,19 +195,31 @@ class PersistentMemoryService:
         Retrieve learned mappings from Redis
         """
         try:
-            ids: List[str] = []
-            if concept:
-                ids = list(await redis_client._client.smembers(f"mappings:concept:{concept.upper()}"))
-            elif table_name:
-                ids = list(await redis_client._client.smembers(f"mappings:table:{table_name.upper()}"))
+            limit = max(1, limit)
+            if concept or table_name:
+                source = f"mappings:concept:{concept.upper()}" if concept else f"mappings:table:{table_name.upper()}"
+                mapping_ids = list(await redis_client.smembers(source))[:limit]
             else:
-                ids = await redis_client._client.lrange("mappings:index", 0, max(0, limit-1))
+                mapping_ids = await redis_client.lrange("mappings:index", 0, limit - 1)
+            if not mapping_ids:
+                return []
+            
+            # Documents and their usage hashes in one round trip
+            pipe = redis_client.pipeline(transaction=False)
+            for mapping_id in mapping_ids:
+                pipe.get(f"mapping:{mapping_id}")
+                pipe.hmget(f"mapping:{mapping_id}:usage", "usage_count", "successes", "last_used_at")
+            raw = await pipe.execute()
             
             mappings: List[Dict[str, Any]] = []
-            for mid in ids[:limit]:
-                m = await redis_client.get(f"mapping:{mid}")
-                if m:
-                    mappings.append(m)
+            for payload, usage in zip(raw[0::2], raw[1::2]):
+                if not payload:
+                    continue
+                try:
+                    m = json.loads(payload)
+                except (TypeError, ValueError):
+                    continue
+                mappings.append(_merge_usage(m, *(value or "" for value in usage)))
             
             # Sort by confidence desc then usage_count desc
             mappings.sort(key=lambda x: (x.get("confidence", 0), x.get("usage_count", 0)), reverse=True)
@@ -166,23 +232,18 @@ class PersistentMemoryService:
     async def update_mapping_usage(mapping_id: str, success: bool = True):
         """
         Increment usage count and update success rate for a mapping (Redis)
+        
+        Counters are incremented server-side, so concurrent updates never
+        lose increments.
         """
         try:
-            key = f"mapping:{mapping_id}"
-            m = await redis_client.get(key)
-            if not m:
+            count = await redis_client.run_script(
+                _UPDATE_USAGE_LUA,
+                keys=[f"mapping:{mapping_id}", f"mapping:{mapping_id}:usage"],
+                args=[1 if success else 0, datetime.now(timezone.utc).isoformat(), MEMORY_TTL_SECONDS],
+            )
+            if count is None:
                 return
-            m["usage_count"] = int(m.get("usage_count", 0)) + 1
-            sr = float(m.get("success_rate", 100.0))
-            uc = int(m["usage_count"])
-            if success:
-                # simple rolling success rate towards 100
-                sr = (sr * (uc - 1) + 100.0) / uc
-            else:
-                sr = (sr * (uc - 1)) / uc
-            m["success_rate"] = sr
-            m["last_used_at"] = datetime.now(timezone.utc).isoformat()
-            await redis_client.set(key, m, ttl=7*24*3600)
-            logger.debug(f"Updated mapping usage in Redis: {mapping_id}")
+            logger.debug(f"Updated mapping usage in Redis: {mapping_id} (usage_count={count})")
         except Exception as e:
             logger.error(f"Failed to update mapping usage in Redis: {e}")
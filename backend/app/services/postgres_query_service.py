@@ -53,7 +53,8 @@ class PostgresQueryService:
                 sql=sql_query,
                 user_id=user_id or "unknown",
                 request_id=request_id or "unknown",
-                timeout=timeout
+                timeout=timeout,
+                max_rows=settings.POSTGRES_MAX_RESULT_ROWS or None
             )
             
             execution_time = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
@@ -66,6 +67,7 @@ class PostgresQueryService:
                     "user_role": user_role,
                     "sql": sql_query[:500],
                     "row_count": result.get("row_count", 0),
+                    "truncated": result.get("truncated", False),
                     "execution_time_ms": execution_time,
                     "database": settings.POSTGRES_DATABASE,
                     "read_only": settings.POSTGRES_READ_ONLY
@@ -78,6 +80,7 @@ class PostgresQueryService:
                     "columns": result.get("columns", []),
                     "rows": result.get("rows", []),
                     "row_count": result.get("row_count", 0),
+                    "truncated": result.get("truncated", False),
                     "execution_time_ms": result.get("execution_time_ms", 0)
                 }
             }
@@ -1,19 +1,141 @@
 """
 Query Corrections Service
 Captures user SQL edits and learns from corrections
+
+Corrections are stored as JSON documents with an inverted keyword index
+(one sorted set per keyword, scored by creation time) so relevant examples
+are resolved server-side: one Lua call picks candidate ids from the indexes,
+a second reads exactly those documents (declared in KEYS) and ranks them.
+Applied counts live in a sorted set updated atomically with ZINCRBY; it only
+holds corrections present in the recent index, which is trimmed by age and
+size on every write.
 """
 
 import logging
 import json
+import re
 import uuid
 import difflib
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 
 from app.core.redis_client import redis_client
 from app.core.config import settings
+from app.utils.json_encoder import CustomJSONEncoder
 
 logger = logging.getLogger(__name__)
 
+CORRECTION_TTL_SECONDS = 14 * 24 * 3600
+RECENT_INDEX_KEY = "corrections:recent"
+APPLIED_INDEX_KEY = "corrections:applied"
+KEYWORD_INDEX_PREFIX = "corrections:kw:"
+MAX_RECENT_ENTRIES = 1000
+MAX_KEYWORD_ENTRIES = 500
+MAX_STORED_KEYWORDS = 32
+MAX_QUERY_KEYWORDS = 5
+CANDIDATE_CAP = 200
+
+_KEYWORD_PATTERN = re.compile(r"[A-Z0-9_]+")
+
+# KEYS[1] recent index, KEYS[2..] keyword indexes; ARGV[1] candidate cap
+# Returns up to cap (correction id, score) pairs, newest first
+_CANDIDATE_CORRECTIONS_LUA = """
+local cap = tonumber(ARGV[1])
+local raw
+if #KEYS > 1 then
+  local cmd = {'ZUNION', #KEYS - 1}
+  for i = 2, #KEYS do cmd[#cmd + 1] = KEYS[i] end
+  cmd[#cmd + 1] = 'AGGREGATE'
+  cmd[#cmd + 1] = 'MAX'
+  cmd[#cmd + 1] = 'WITHSCORES'
+  raw = redis.call(unpack(cmd))
+else
+  raw = redis.call('ZRANGE', KEYS[1], -cap, -1, 'WITHSCORES')
+end
+local out = {}
+for i = #raw - 1, 1, -2 do
+  if #out >= cap * 2 then break end
+  out[#out + 1] = raw[i]
+  out[#out + 1] = raw[i + 1]
+end
+return out
+"""
+
+# KEYS[1] recent index, KEYS[2] applied counts, KEYS[3..2+n] keyword indexes,
+# KEYS[3+n..] correction documents, one per candidate in ARGV order
+# ARGV[1] upper-cased intent ('' for any), ARGV[2] limit, ARGV[3] n,
+# ARGV[4..] candidate id, score pairs
+_RELEVANT_CORRECTIONS_LUA = """
+local indexes = 2 + tonumber(ARGV[3])
+local picked = {}
+for c = 0, (#ARGV - 3) / 2 - 1 do
+  local cid = ARGV[4 + 2 * c]
+  local payload = redis.call('GET', KEYS[indexes + 1 + c])
+  if not payload then
+    for k = 1, indexes do redis.call('ZREM', KEYS[k], cid) end
+  else
+    local ok, item = pcall(cjson.decode, payload)
+    if ok and type(item) == 'table' then
+      local keep = true
+      if ARGV[1] ~= '' and type(item.intent) == 'string' and item.intent ~= '' then
+        keep = string.find(string.upper(item.intent), ARGV[1], 1, true) ~= nil
+      end
+      if keep then
+        local applied = tonumber(redis.call('ZSCORE', KEYS[2], cid))
+        if not applied then applied = tonumber(item.applied_count) or 0 end
+        picked[#picked + 1] = {payload, applied, tonumber(ARGV[5 + 2 * c])}
+      end
+    end
+  end
+end
+table.sort(picked, function(a, b)
+  if a[2] ~= b[2] then return a[2] > b[2] end
+  return a[3] > b[3]
+end)
+local out = {}
+for i = 1, math.min(#picked, tonumber(ARGV[2])) do
+  out[#out + 1] = picked[i][1]
+  out[#out + 1] = tostring(picked[i][2])
+end
+return out
+"""
+
+# KEYS[1] correction document, KEYS[2] applied counts, KEYS[3] recent index
+# ARGV[1] correction id. Only indexed corrections are counted, which keeps
+# the applied set a subset of the (bounded) recent index
+_INCREMENT_APPLIED_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return false end
+if not redis.call('ZSCORE', KEYS[3], ARGV[1]) then return false end
+return redis.call('ZINCRBY', KEYS[2], 1, ARGV[1])
+"""
+
+# KEYS[1] recent index, KEYS[2] applied counts
+# ARGV[1] oldest score to keep, ARGV[2] max entries
+# Drops corrections past their TTL or beyond the newest max entries from both
+# sets; ZREMRANGEBYRANK is a hard cap for counts written before this bound
+_TRIM_INDEXES_LUA = """
+local max_entries = tonumber(ARGV[2])
+local removed = 0
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])
+local overflow = redis.call('ZRANGE', KEYS[1], 0, -(max_entries + 1))
+for _, ids in ipairs({expired, overflow}) do
+  for _, cid in ipairs(ids) do
+    removed = removed + redis.call('ZREM', KEYS[1], cid)
+    redis.call('ZREM', KEYS[2], cid)
+  end
+end
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -(max_entries + 1))
+return removed
+"""
+
+
+def _correction_key(correction_id: str) -> str:
+    return f"correction:{correction_id}"
+
+
+def _as_text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
 
 class QueryCorrectionsService:
     """Service for learning from user SQL corrections"""
@@ -52,6 +174,7 @@ class QueryCorrectionsService:
         # Compute diff summary
         diff_summary = QueryCorrectionsService._compute_diff(generated_sql, corrected_sql)
         
+        created = datetime.now(timezone.utc)
         item = {
             "correction_id": correction_id,
             "user_id": user_id,
@@ -64,23 +187,54 @@ class QueryCorrectionsService:
             "intent": intent,
             "success_after_correction": bool(success_after_correction),
             "applied_count": 0,
-            "created_at": None,
+            "created_at": created.isoformat(),
             "metadata": metadata or {},
         }
+        score = created.timestamp()
+        keywords = QueryCorrectionsService._extract_keywords(original_query, MAX_STORED_KEYWORDS)
         try:
-            # Store correction object
-            await redis_client.set(f"correction:{correction_id}", item, ttl=14*24*3600)
-            # Indexes
-            await redis_client._client.lpush("corrections:index", correction_id)
-            await redis_client._client.ltrim("corrections:index", 0, 999)
-            await redis_client._client.lpush(f"user:{user_id}:corrections", correction_id)
-            await redis_client._client.ltrim(f"user:{user_id}:corrections", 0, 999)
-            logger.info(f"Stored SQL correction in Redis: {correction_id}")
+            # Document, recency index and keyword postings in one MULTI/EXEC
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.setex(_correction_key(correction_id), CORRECTION_TTL_SECONDS, json.dumps(item, cls=CustomJSONEncoder))
+            pipe.zadd(RECENT_INDEX_KEY, {correction_id: score})
+            for kw in keywords:
+                kw_key = f"{KEYWORD_INDEX_PREFIX}{kw}"
+                pipe.zadd(kw_key, {correction_id: score})
+                pipe.zremrangebyrank(kw_key, 0, -(MAX_KEYWORD_ENTRIES + 1))
+                pipe.expire(kw_key, CORRECTION_TTL_SECONDS)
+            pipe.lpush(f"user:{user_id}:corrections", correction_id)
+            pipe.ltrim(f"user:{user_id}:corrections", 0, 999)
+            await pipe.execute()
+            # Expire aged-out and overflowing corrections from the recent and applied sets
+            await redis_client.run_script(
+                _TRIM_INDEXES_LUA,
+                keys=[RECENT_INDEX_KEY, APPLIED_INDEX_KEY],
+                args=[score - CORRECTION_TTL_SECONDS, MAX_RECENT_ENTRIES],
+            )
+            logger.info(f"Stored SQL correction in Redis: {correction_id} ({len(keywords)} keywords indexed)")
             return correction_id
         except Exception as e:
             logger.error(f"Failed to store correction in Redis: {e}")
             return correction_id
     
+    @staticmethod
+    def _extract_keywords(text: Optional[str], limit: int) -> List[str]:
+        """
+        Tokenize text into upper-cased index keywords (longer than 3 chars)
+        
+        Returns:
+            Unique keywords in order of first appearance, capped at limit
+        """
+        if not text:
+            return []
+        keywords: List[str] = []
+        for token in _KEYWORD_PATTERN.findall(text.upper()):
+            if len(token) > 3 and token not in keywords:
+                keywords.append(token)
+                if len(keywords) >= limit:
+                    break
+        return keywords
+    
     @staticmethod
     def _compute_diff(original: str, corrected: str) -> Dict[str, Any]:
         """
@@ -122,36 +276,32 @@ class QueryCorrectionsService:
         Returns:
             List of relevant correction examples
         """
-        where_clauses = ["success_after_correction = 1"]
-        
-        if original_query:
-            # Simple keyword matching - can be enhanced with embeddings
-            keywords = original_query.upper().split()[:5]
-            keyword_conditions = [f"UPPER(original_query) LIKE '%{kw}%'" for kw in keywords if len(kw) > 3]
-            if keyword_conditions:
-                where_clauses.append(f"({' OR '.join(keyword_conditions)})")
-        
-        if intent:
-            where_clauses.append(f"UPPER(intent) LIKE '%{intent.upper()}%'")
-        
-        where_clause = " AND ".join(where_clauses)
+        keywords = QueryCorrectionsService._extract_keywords(original_query, MAX_QUERY_KEYWORDS)
+        keyword_keys = [f"{KEYWORD_INDEX_PREFIX}{kw}" for kw in keywords]
         
         try:
-            # Get most recent corrections and filter in-memory
-            ids = await redis_client._client.lrange("corrections:index", 0, 199)
+            # Candidate selection, then intent filter and ranking, run server-side
+            candidates = await redis_client.run_script(
+                _CANDIDATE_CORRECTIONS_LUA,
+                keys=[RECENT_INDEX_KEY] + keyword_keys,
+                args=[CANDIDATE_CAP],
+            ) or []
+            ids = [_as_text(cid) for cid in candidates[0::2]]
+            if not ids:
+                return []
+            pairs: List[Any] = []
+            for cid, cand_score in zip(ids, candidates[1::2]):
+                pairs.extend([cid, cand_score])
+            raw = await redis_client.run_script(
+                _RELEVANT_CORRECTIONS_LUA,
+                keys=[RECENT_INDEX_KEY, APPLIED_INDEX_KEY] + keyword_keys + [_correction_key(cid) for cid in ids],
+                args=[(intent or "").upper(), max(int(limit), 0), len(keyword_keys)] + pairs,
+            )
             results: List[Dict[str, Any]] = []
-            
-            kws = []
-            if original_query:
-                kws = [kw for kw in original_query.upper().split() if len(kw) > 3][:5]
-            
-            for cid in ids:
-                item = await redis_client.get(f"correction:{cid}")
-                if not item:
-                    continue
-                if intent and item.get("intent") and intent.upper() not in str(item.get("intent", "")).upper():
-                    continue
-                if kws and not any(kw in str(item.get("original_query", "")).upper() for kw in kws):
+            for i in range(0, len(raw or []) - 1, 2):
+                try:
+                    item = json.loads(raw[i])
+                except (TypeError, ValueError):
                     continue
                 results.append({
                     "correction_id": item.get("correction_id"),
@@ -159,13 +309,10 @@ class QueryCorrectionsService:
                     "generated_sql": item.get("generated_sql"),
                     "corrected_sql": item.get("corrected_sql"),
                     "diff_summary": item.get("diff_summary", {}),
-                    "applied_count": int(item.get("applied_count", 0)),
+                    "applied_count": int(float(raw[i + 1])),
                     "created_at": item.get("created_at"),
                 })
-            
-            # Sort and limit
-            results.sort(key=lambda x: (x.get("applied_count", 0), ), reverse=True)
-            return results[:limit]
+            return results
         except Exception as e:
             logger.error(f"Failed to retrieve corrections from Redis: {e}")
             return []
@@ -176,12 +323,13 @@ class QueryCorrectionsService:
         Increment the applied count when a correction pattern is used
         """
         try:
-            key = f"correction:{correction_id}"
-            item = await redis_client.get(key)
-            if not item:
+            new_count = await redis_client.run_script(
+                _INCREMENT_APPLIED_LUA,
+                keys=[_correction_key(correction_id), APPLIED_INDEX_KEY, RECENT_INDEX_KEY],
+                args=[correction_id],
+            )
+            if new_count is None:
                 return
-            item["applied_count"] = int(item.get("applied_count", 0)) + 1
-            await redis_client.set(key, item, ttl=14*24*3600)
             logger.debug(f"Incremented applied count for correction in Redis: {correction_id}")
         except Exception as e:
             logger.error(f"Failed to increment applied count in Redis: {e}")
@@ -1,16 +1,31 @@
 """
 Query Cost Estimation Service
 Analyzes Oracle execution plans to estimate query cost and warn about expensive operations
+
+Each estimate explains the statement under its own PLAN_TABLE statement ID on
+a single SQLcl session (from the process pool when available), so concurrent
+estimates never see or delete each other's rows. Results are cached by the
+whitespace-normalized statement text, literals included, and schema version
+(see app.core.plan_estimate_cache).
 """
 
+import asyncio
 import logging
-import re
+import time
+import uuid
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 
 from app.core.client_registry import registry
 from app.core.config import settings
+from app.core.plan_estimate_cache import plan_estimate_cache
+
+try:
+    from app.core.prometheus_metrics import query_cost_estimate_duration
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +49,7 @@ class CostEstimate:
     warnings: List[str]
     recommendations: List[str]
     execution_plan: Optional[str] = None
+    source: str = "explain"  # explain, cache, or default when estimation failed
 
 
 class QueryCostEstimator:
@@ -56,6 +72,9 @@ class QueryCostEstimator:
         """
         Estimate query execution cost using EXPLAIN PLAN
         
+        Estimates are cached by statement text and schema version, so repeated
+        estimates of the same statement skip the database entirely.
+        
         Args:
             sql_query: SQL query to analyze
             connection_name: Database connection name
@@ -65,32 +84,76 @@ class QueryCostEstimator:
             CostEstimate with cost analysis and warnings
         """
         logger.info(f"Estimating query cost...")
+        started = time.perf_counter()
+        conn = connection_name or settings.oracle_default_connection
+        
+        key = plan_estimate_cache.key(sql_query, conn)
+        cached = plan_estimate_cache.get(key)
+        if cached is not None and (not include_plan or cached.execution_plan is not None):
+            QueryCostEstimator._observe("hit", started)
+            logger.info(f"Cost estimation served from cache: cost={int(cached.total_cost)}, level={cached.cost_level.value}")
+            return QueryCostEstimator._copy(cached, source="cache")
         
         try:
-            mcp_client = registry.get_mcp_client()
-            if not mcp_client:
-                logger.warning(f"MCP client unavailable for cost estimation")
-                return QueryCostEstimator._create_default_estimate()
-            
-            conn = connection_name or settings.oracle_default_connection
-            
-            # Step 1: Clean up previous explain plan data
-            cleanup_sql = "DELETE FROM PLAN_TABLE"
+            estimate = await QueryCostEstimator._explain(sql_query, conn, include_plan)
+        except Exception as e:
+            logger.error(f"Cost estimation failed: {e}")
+            estimate = None
+        
+        if estimate is None:
+            QueryCostEstimator._observe("unavailable", started)
+            return QueryCostEstimator._create_default_estimate()
+        
+        plan_estimate_cache.put(key, estimate)
+        QueryCostEstimator._observe("miss", started)
+        logger.info(f"Cost estimation complete: cost={int(estimate.total_cost)}, level={estimate.cost_level.value}")
+        return QueryCostEstimator._copy(estimate)
+    
+    @staticmethod
+    async def _explain(sql_query: str, conn: str, include_plan: bool) -> Optional[CostEstimate]:
+        """
+        Run EXPLAIN PLAN on one SQLcl session, preferring the process pool
+        
+        PLAN_TABLE rows are session-scoped, so every step of an estimate must
+        run on the same client. Each estimate writes under its own statement
+        ID, which keeps concurrent estimates on a shared session apart.
+        """
+        statement_id = f"amil_{uuid.uuid4().hex[:24]}"
+        
+        sqlcl_pool = registry.get_sqlcl_pool()
+        if sqlcl_pool:
             try:
-                await mcp_client.execute_sql(cleanup_sql, conn)
-            except Exception:
-                pass  # Table might not exist yet
-            
-            # Step 2: Execute EXPLAIN PLAN
-            explain_sql = f"EXPLAIN PLAN FOR {sql_query}"
-            explain_result = await mcp_client.execute_sql(explain_sql, conn)
-            
-            if explain_result.get("status") != "success":
-                logger.error(f"EXPLAIN PLAN execution failed")
-                return QueryCostEstimator._create_default_estimate()
-            
-            # Step 3: Query plan table for cost analysis
-            plan_query = """
+                async with sqlcl_pool.acquire(timeout=10) as client:
+                    return await QueryCostEstimator._explain_on(client, sql_query, conn, statement_id, include_plan)
+            except asyncio.TimeoutError:
+                logger.warning(f"Pool acquisition timed out for cost estimation, falling back to MCP client")
+            except Exception as e:
+                logger.warning(f"Pool cost estimation failed ({e}), falling back to MCP client")
+        
+        mcp_client = registry.get_mcp_client()
+        if not mcp_client:
+            logger.warning(f"MCP client unavailable for cost estimation")
+            return None
+        return await QueryCostEstimator._explain_on(mcp_client, sql_query, conn, statement_id, include_plan)
+    
+    @staticmethod
+    async def _explain_on(
+        client: Any,
+        sql_query: str,
+        conn: str,
+        statement_id: str,
+        include_plan: bool,
+    ) -> Optional[CostEstimate]:
+        """Explain, read and analyze the plan for statement_id, then remove its PLAN_TABLE rows"""
+        explain_sql = f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql_query}"
+        explain_result = await client.execute_sql(explain_sql, conn)
+        
+        if explain_result.get("status") != "success":
+            logger.error(f"EXPLAIN PLAN execution failed")
+            return None
+        
+        try:
+            plan_query = f"""
             SELECT 
                 operation,
                 options,
@@ -100,105 +163,122 @@ class QueryCostEstimator:
                 access_predicates,
                 filter_predicates
             FROM PLAN_TABLE
-            WHERE statement_id IS NULL
+            WHERE statement_id = '{statement_id}'
             ORDER BY id
             """
             
-            plan_result = await mcp_client.execute_sql(plan_query, conn)
+            plan_result = await client.execute_sql(plan_query, conn)
             
             if plan_result.get("status") != "success":
                 logger.error(f"Failed to retrieve execution plan")
-                return QueryCostEstimator._create_default_estimate()
+                return None
             
-            # Parse plan results
             rows = plan_result.get("results", {}).get("rows", [])
             
             if not rows:
                 logger.warning(f"No execution plan data found")
-                return QueryCostEstimator._create_default_estimate()
-            
-            # Analyze plan
-            total_cost = 0.0
-            total_cardinality = 0
-            full_scan_tables = []
-            warnings = []
-            recommendations = []
-            
-            def get_val(r, idx, name):
-                if isinstance(r, dict):
-                    return r.get(name)
-                try:
-                    return r[idx]
-                except (IndexError, TypeError):
-                    return None
-
-            for row in rows:
-                operation = get_val(row, 0, "operation") or ""
-                options = get_val(row, 1, "options") or ""
-                object_name = get_val(row, 2, "object_name") or ""
-                cost_val = get_val(row, 3, "cost")
-                card_val = get_val(row, 4, "cardinality")
-                
-                cost = float(cost_val) if cost_val else 0.0
-                cardinality = int(card_val) if card_val else 0
-                
-                # Accumulate total cost (take max cost from plan)
-                if cost > total_cost:
-                    total_cost = cost
-                
-                # Accumulate cardinality
-                total_cardinality += cardinality
-                
-                # Detect full table scans
-                if "TABLE ACCESS FULL" in operation:
-                    full_scan_tables.append(object_name)
-                    warnings.append(f"Full table scan detected on {object_name}")
-                    recommendations.append(f"Consider adding an index on {object_name}")
-                
-                # Detect Cartesian joins
-                if "CARTESIAN" in operation or "MERGE JOIN CARTESIAN" in operation:
-                    warnings.append("Cartesian join detected - may be very expensive")
-                    recommendations.append("Review join conditions to avoid Cartesian product")
-            
-            # Determine cost level
-            cost_level = QueryCostEstimator._classify_cost(total_cost)
-            
-            # Add cost-based warnings
-            if cost_level == CostLevel.HIGH:
-                warnings.append(f"High query cost: {int(total_cost)} (threshold: {QueryCostEstimator.COST_MEDIUM_THRESHOLD})")
-                recommendations.append("Consider optimizing joins or adding indexes")
-            elif cost_level == CostLevel.CRITICAL:
-                warnings.append(f"CRITICAL query cost: {int(total_cost)} (threshold: {QueryCostEstimator.COST_HIGH_THRESHOLD})")
-                recommendations.append("Query may time out or consume excessive resources")
-                recommendations.append("Consider breaking into smaller queries or adding filters")
-            
-            # Add cardinality warnings
-            if total_cardinality > QueryCostEstimator.CARDINALITY_HIGH_THRESHOLD:
-                warnings.append(f"Large result set expected: ~{total_cardinality} rows")
-                recommendations.append("Consider adding FETCH FIRST clause or more restrictive filters")
-            
-            # Get formatted execution plan if requested
-            execution_plan = None
+                return None
+            
+            estimate = QueryCostEstimator._analyze_plan(rows)
+            
             if include_plan:
-                execution_plan = await QueryCostEstimator._get_formatted_plan(conn)
-            
-            estimate = CostEstimate(
-                total_cost=total_cost,
-                cardinality=total_cardinality,
-                cost_level=cost_level,
-                has_full_table_scan=len(full_scan_tables) > 0,
-                full_scan_tables=full_scan_tables,
-                warnings=warnings,
-                recommendations=recommendations,
-                execution_plan=execution_plan,
-            )
-            
-            logger.info(f"Cost estimation complete: cost={int(total_cost)}, level={cost_level.value}")
+                estimate.execution_plan = await QueryCostEstimator._get_formatted_plan(client, conn, statement_id)
+            
             return estimate
+        
+        finally:
+            try:
+                await client.execute_sql(f"DELETE FROM PLAN_TABLE WHERE statement_id = '{statement_id}'", conn)
+            except Exception:
+                pass  # Session-scoped rows are discarded with the session anyway
+    
+    @staticmethod
+    def _analyze_plan(rows: List[Any]) -> CostEstimate:
+        """Derive cost, cardinality, warnings and recommendations from PLAN_TABLE rows"""
+        total_cost = 0.0
+        total_cardinality = 0
+        full_scan_tables = []
+        warnings = []
+        recommendations = []
+        
+        def get_val(r, idx, name):
+            if isinstance(r, dict):
+                return r.get(name)
+            try:
+                return r[idx]
+            except (IndexError, TypeError):
+                return None
+
+        for row in rows:
+            operation = get_val(row, 0, "operation") or ""
+            options = get_val(row, 1, "options") or ""
+            object_name = get_val(row, 2, "object_name") or ""
+            cost_val = get_val(row, 3, "cost")
+            card_val = get_val(row, 4, "cardinality")
             
-        except Exception as e:
-            logger.error(f"Cost estimation failed: {e}")
-            return QueryCostEstimator._create_default_estimate()
+            cost = float(cost_val) if cost_val else 0.0
+            cardinality = int(card_val) if card_val else 0
+            
+            # Accumulate total cost (take max cost from plan)
+            if cost > total_cost:
+                total_cost = cost
+            
+            # Accumulate cardinality
+            total_cardinality += cardinality
+            
+            # Detect full table scans
+            if "TABLE ACCESS FULL" in operation:
+                full_scan_tables.append(object_name)
+                warnings.append(f"Full table scan detected on {object_name}")
+                recommendations.append(f"Consider adding an index on {object_name}")
+            
+            # Detect Cartesian joins
+            if "CARTESIAN" in operation or "MERGE JOIN CARTESIAN" in operation:
+                warnings.append("Cartesian join detected - may be very expensive")
+                recommendations.append("Review join conditions to avoid Cartesian product")
+        
+        # Determine cost level
+        cost_level = QueryCostEstimator._classify_cost(total_cost)
+        
+        # Add cost-based warnings
+        if cost_level == CostLevel.HIGH:
+            warnings.append(f"High query cost: {int(total_cost)} (threshold: {QueryCostEstimator.COST_MEDIUM_THRESHOLD})")
+            recommendations.append("Consider optimizing joins or adding indexes")
+        elif cost_level == CostLevel.CRITICAL:
+            warnings.append(f"CRITICAL query cost: {int(total_cost)} (threshold: {QueryCostEstimator.COST_HIGH_THRESHOLD})")
+            recommendations.append("Query may time out or consume excessive resources")
+            recommendations.append("Consider breaking into smaller queries or adding filters")
+        
+        # Add cardinality warnings
+        if total_cardinality > QueryCostEstimator.CARDINALITY_HIGH_THRESHOLD:
+            warnings.append(f"Large result set expected: ~{total_cardinality} rows")
+            recommendations.append("Consider adding FETCH FIRST clause or more restrictive filters")
+        
+        return CostEstimate(
+            total_cost=total_cost,
+            cardinality=total_cardinality,
+            cost_level=cost_level,
+            has_full_table_scan=len(full_scan_tables) > 0,
+            full_scan_tables=full_scan_tables,
+            warnings=warnings,
+            recommendations=recommendations,
+        )
+    
+    @staticmethod
+    def _copy(estimate: CostEstimate, source: str = "explain") -> CostEstimate:
+        """Copy of a (possibly cached) estimate that callers may mutate freely"""
+        return replace(
+            estimate,
+            full_scan_tables=list(estimate.full_scan_tables),
+            warnings=list(estimate.warnings),
+            recommendations=list(estimate.recommendations),
+            source=source,
+        )
+    
+    @staticmethod
+    def _observe(outcome: str, started: float) -> None:
+        if METRICS_AVAILABLE:
+            query_cost_estimate_duration.labels(outcome=outcome).observe(time.perf_counter() - started)
     
     @staticmethod
     def _classify_cost(cost: float) -> CostLevel:
@@ -223,18 +303,15 @@ class QueryCostEstimator:
             full_scan_tables=[],
             warnings=["Cost estimation unavailable"],
             recommendations=[],
+            source="default",
         )
     
     @staticmethod
-    async def _get_formatted_plan(connection_name: str) -> Optional[str]:
-        """Get formatted execution plan using DBMS_XPLAN"""
+    async def _get_formatted_plan(client: Any, connection_name: str, statement_id: str) -> Optional[str]:
+        """Get formatted execution plan for statement_id using DBMS_XPLAN"""
         try:
-            mcp_client = registry.get_mcp_client()
-            if not mcp_client:
-                return None
-            
-            plan_query = "SELECT * FROM TABLE(DBMS_XPLAN.DISPLAY())"
-            result = await mcp_client.execute_sql(plan_query, connection_name)
+            plan_query = f"SELECT * FROM TABLE(DBMS_XPLAN.DISPLAY('PLAN_TABLE', '{statement_id}', 'TYPICAL'))"
+            result = await client.execute_sql(plan_query, connection_name)
             
             if result.get("status") == "success":
                 rows = result.get("results", {}).get("rows", [])
@@ -1,6 +1,13 @@
 """
 Query History Service
 Maintains query history stack in Redis for undo/redo functionality
+
+Push, undo and redo are single Lua scripts, so the SET/LPUSH/LTRIM/DEL
+sequences run atomically server-side and two tabs acting on the same session
+cannot interleave halfway through an operation. Scripts only touch the keys
+they are given: undo/redo move entry ids between the session lists and
+return the id, and the (immutable) history_entry documents are then read
+with MGET, as is the listing.
 """
 
 import logging
@@ -11,9 +18,48 @@ from datetime import datetime, timezone
 
 from app.core.redis_client import redis_client
 from app.core.structured_logging import get_iso_timestamp
+from app.utils.json_encoder import CustomJSONEncoder
 
 logger = logging.getLogger(__name__)
 
+HISTORY_ENTRY_TTL_SECONDS = 7 * 24 * 3600
+MAX_REDO_SIZE = 50
+
+# KEYS[1] entry key, KEYS[2] history list, KEYS[3] redo list
+# ARGV[1] entry JSON, ARGV[2] ttl, ARGV[3] entry id, ARGV[4] max history size
+_PUSH_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[2]))
+redis.call('LPUSH', KEYS[2], ARGV[3])
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[4]) - 1)
+redis.call('DEL', KEYS[3])
+return 1
+"""
+
+# KEYS[1] history list, KEYS[2] redo list; ARGV[1] max redo size
+# Returns false when there is nothing to undo, '' at the beginning of history,
+# otherwise the id of the entry that is now current
+_UNDO_LUA = """
+local eid = redis.call('LPOP', KEYS[1])
+if not eid then return false end
+redis.call('LPUSH', KEYS[2], eid)
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[1]) - 1)
+return redis.call('LINDEX', KEYS[1], 0) or ''
+"""
+
+# KEYS[1] redo list, KEYS[2] history list; ARGV[1] max history size
+# Returns false when there is nothing to redo, otherwise the re-applied entry id
+_REDO_LUA = """
+local eid = redis.call('LPOP', KEYS[1])
+if not eid then return false end
+redis.call('LPUSH', KEYS[2], eid)
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[1]) - 1)
+return eid
+"""
+
+
+def _entry_key(entry_id: str) -> str:
+    return f"history_entry:{entry_id}"
+
 
 class QueryHistoryService:
     """Service for query history and undo/redo stack"""
@@ -54,22 +100,21 @@ class QueryHistoryService:
         }
         
         try:
-            # Store entry
-            await redis_client.set(f"history_entry:{entry_id}", entry, ttl=7*24*3600)
-            
-            # Push to session history list (most recent first)
-            await redis_client._client.lpush(f"session:{session_id}:history", entry_id)
-            
-            # Trim to max size
-            await redis_client._client.ltrim(
-                f"session:{session_id}:history",
-                0,
-                QueryHistoryService.MAX_HISTORY_SIZE - 1
+            await redis_client.run_script(
+                _PUSH_LUA,
+                keys=[
+                    _entry_key(entry_id),
+                    f"session:{session_id}:history",
+                    f"session:{session_id}:redo",
+                ],
+                args=[
+                    json.dumps(entry, cls=CustomJSONEncoder),
+                    HISTORY_ENTRY_TTL_SECONDS,
+                    entry_id,
+                    QueryHistoryService.MAX_HISTORY_SIZE,
+                ],
             )
             
-            # Reset redo stack when new query is pushed
-            await redis_client._client.delete(f"session:{session_id}:redo")
-            
             logger.info(f"Pushed query to history stack: {entry_id}")
             return entry_id
             
@@ -89,19 +134,13 @@ class QueryHistoryService:
             List of history entries (most recent first)
         """
         try:
-            entry_ids = await redis_client._client.lrange(
-                f"session:{session_id}:history",
-                0,
-                limit - 1
-            )
-            
-            history = []
-            for eid in entry_ids:
-                entry = await redis_client.get(f"history_entry:{eid}")
-                if entry:
-                    history.append(entry)
-            
-            return history
+            entry_ids = await redis_client.lrange(f"session:{session_id}:history", 0, limit - 1)
+            payloads = await redis_client.mget([_entry_key(eid) for eid in entry_ids])
+            return [
+                entry for entry in (
+                    QueryHistoryService._decode_entry(p) for p in payloads or []
+                ) if entry
+            ]
             
         except Exception as e:
             logger.error(f"Failed to get session history: {e}")
@@ -116,23 +155,19 @@ class QueryHistoryService:
             Previous query state or None if nothing to undo
         """
         try:
-            # Pop from history
-            entry_id = await redis_client._client.lpop(f"session:{session_id}:history")
+            current_id = await redis_client.run_script(
+                _UNDO_LUA,
+                keys=[f"session:{session_id}:history", f"session:{session_id}:redo"],
+                args=[MAX_REDO_SIZE],
+            )
             
-            if not entry_id:
+            if current_id is None:
                 logger.info(f"Nothing to undo")
                 return None
             
-            # Push to redo stack
-            await redis_client._client.lpush(f"session:{session_id}:redo", entry_id)
-            await redis_client._client.ltrim(f"session:{session_id}:redo", 0, 49)
-            
-            # Get current state (new top of history)
-            current_id = await redis_client._client.lindex(f"session:{session_id}:history", 0)
-            
-            if current_id:
-                entry = await redis_client.get(f"history_entry:{current_id}")
-                logger.info(f"Undo successful: restored {current_id}")
+            entry = await QueryHistoryService._load_entry(current_id)
+            if entry:
+                logger.info(f"Undo successful: restored {entry.get('entry_id')}")
                 return entry
             
             logger.info(f"Reached beginning of history")
@@ -151,49 +186,75 @@ class QueryHistoryService:
             Next query state or None if nothing to redo
         """
         try:
-            # Pop from redo stack
-            entry_id = await redis_client._client.lpop(f"session:{session_id}:redo")
+            entry_id = await redis_client.run_script(
+                _REDO_LUA,
+                keys=[f"session:{session_id}:redo", f"session:{session_id}:history"],
+                args=[QueryHistoryService.MAX_HISTORY_SIZE],
+            )
             
-            if not entry_id:
+            if entry_id is None:
                 logger.info(f"Nothing to redo")
                 return None
             
-            # Push back to history
-            await redis_client._client.lpush(f"session:{session_id}:history", entry_id)
-            
             # Return the re-applied entry
-            entry = await redis_client.get(f"history_entry:{entry_id}")
-            logger.info(f"Redo successful: restored {entry_id}")
+            entry = await QueryHistoryService._load_entry(entry_id)
+            logger.info(f"Redo successful: restored {entry.get('entry_id') if entry else 'expired entry'}")
             return entry
             
         except Exception as e:
             logger.error(f"Redo failed: {e}")
             return None
     
+    @staticmethod
+    async def _load_entry(entry_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Fetch and parse one history entry by id ('' or expired entries give None)"""
+        if not entry_id:
+            return None
+        payloads = await redis_client.mget([_entry_key(entry_id)])
+        return QueryHistoryService._decode_entry(payloads[0])
+    
+    @staticmethod
+    def _decode_entry(payload: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Parse a stored history entry, returning None for missing or corrupt payloads"""
+        if not payload:
+            return None
+        try:
+            entry = json.loads(payload)
+        except (TypeError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) else None
+    
+    @staticmethod
+    async def get_undo_redo_status(session_id: str) -> Dict[str, bool]:
+        """Return can_undo/can_redo flags in a single pipelined round trip"""
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.llen(f"session:{session_id}:history")
+            pipe.llen(f"session:{session_id}:redo")
+            history_len, redo_len = await pipe.execute()
+            return {"can_undo": history_len > 1, "can_redo": redo_len > 0}
+        except Exception as e:
+            logger.warning(f"Failed to get undo/redo status for session {session_id}: {e}")
+            return {"can_undo": False, "can_redo": False}
+    
     @staticmethod
     async def can_undo(session_id: str) -> bool:
         """Check if undo is possible"""
-        try:
-            length = await redis_client._client.llen(f"session:{session_id}:history")
-            return length > 1  # Need at least 2 entries (current + previous)
-        except Exception:
-            return False
+        return await redis_client.llen(f"session:{session_id}:history") > 1  # Need at least 2 entries (current + previous)
     
     @staticmethod
     async def can_redo(session_id: str) -> bool:
         """Check if redo is possible"""
-        try:
-            length = await redis_client._client.llen(f"session:{session_id}:redo")
-            return length > 0
-        except Exception:
-            return False
+        return await redis_client.llen(f"session:{session_id}:redo") > 0
     
     @staticmethod
     async def clear_history(session_id: str):
         """Clear session history and redo stack"""
         try:
-            await redis_client._client.delete(f"session:{session_id}:history")
-            await redis_client._client.delete(f"session:{session_id}:redo")
+            await redis_client._client.delete(
+                f"session:{session_id}:history",
+                f"session:{session_id}:redo",
+            )
             logger.info(f"Cleared history for session: {session_id}")
         except Exception as e:
             logger.error(f"Failed to clear history: {e}")
@@ -6,11 +6,14 @@ Provides:
 - Persistent query metadata storage (user ownership, timestamps)
 - Real-time SSE streaming via async generators
 - Thread-safe singleton pattern
+- Cross-worker fan-out via Redis Streams (one stream per query) with an
+  in-process fast path for subscribers on the publishing worker
+- Replay from Last-Event-ID so SSE reconnects resume without gaps
 """
 
 import asyncio
 import logging
-from typing import Dict, Optional, Set, AsyncGenerator
+from typing import Dict, Optional, Set, AsyncGenerator, Tuple
 from enum import Enum
 from datetime import datetime, timezone
 from dataclasses import dataclass, asdict, field
@@ -18,9 +21,58 @@ import json
 
 from app.utils.json_encoder import CustomJSONEncoder
 from app.core.structured_logging import get_iso_timestamp
+from app.core.config import settings
+from app.core.redis_client import redis_client
 
 logger = logging.getLogger(__name__)
 
+STATE_KEY_PREFIX = "qsm:state:"
+METADATA_KEY_PREFIX = "qsm:meta:"
+STREAM_KEY_PREFIX = "qsm:events:"
+
+# KEYS[1] state key, KEYS[2] metadata key, KEYS[3] event stream
+# ARGV[1] state, ARGV[2] updated_at, ARGV[3] event JSON, ARGV[4] state TTL,
+# ARGV[5] stream max length, ARGV[6] stream TTL
+_PUBLISH_STATE_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[4]))
+local meta = redis.call('GET', KEYS[2])
+if meta then
+  local ok, m = pcall(cjson.decode, meta)
+  if ok and type(m) == 'table' then
+    m.status = ARGV[1]
+    m.updated_at = ARGV[2]
+    redis.call('SET', KEYS[2], cjson.encode(m), 'KEEPTTL')
+  end
+end
+local id = redis.call('XADD', KEYS[3], 'MAXLEN', '~', tonumber(ARGV[5]), '*', 'event', ARGV[3])
+redis.call('EXPIRE', KEYS[3], tonumber(ARGV[6]))
+return id
+"""
+
+# KEYS[1] metadata key; ARGV[1] field, ARGV[2] value
+_SET_METADATA_FIELD_LUA = """
+local meta = redis.call('GET', KEYS[1])
+if not meta then return 0 end
+local ok, m = pcall(cjson.decode, meta)
+if not ok or type(m) ~= 'table' then return 0 end
+m[ARGV[1]] = ARGV[2]
+redis.call('SET', KEYS[1], cjson.encode(m), 'KEEPTTL')
+return 1
+"""
+
+TERMINAL_STATES = frozenset({"finished", "error", "rejected"})
+
+
+def _parse_stream_id(entry_id: Optional[str]) -> Tuple[int, int]:
+    """Parse a Redis Stream ID ('<ms>-<seq>') into a comparable tuple"""
+    if not entry_id:
+        return (0, 0)
+    ms, _, seq = str(entry_id).partition("-")
+    try:
+        return (int(ms), int(seq or 0))
+    except ValueError:
+        return (0, 0)
+
 
 class QueryState(str, Enum):
     """Query execution lifecycle states"""
@@ -78,10 +130,30 @@ class QueryStateEvent:
     # Database context for frontend error handling
     database_type: Optional[str] = None
     
-    def to_sse_message(self) -> str:
-        """Convert to SSE message format"""
-        data = asdict(self)
-        return f"data: {json.dumps(data, cls=CustomJSONEncoder)}\n\n"
+    def to_json(self) -> str:
+        """Serialize for the shared event stream"""
+        return json.dumps(asdict(self), cls=CustomJSONEncoder)
+    
+    @classmethod
+    def from_json(cls, payload: str) -> Optional['QueryStateEvent']:
+        """Rebuild an event published by another worker"""
+        try:
+            data = json.loads(payload)
+            data["state"] = QueryState(data["state"])
+            known = {f for f in cls.__dataclass_fields__}
+            return cls(**{k: v for k, v in data.items() if k in known})
+        except Exception as e:
+            logger.warning(f"Dropping undecodable query state event: {e}")
+            return None
+    
+    def to_sse_message(self, event_id: Optional[str] = None) -> str:
+        """Convert to SSE message format (with an id line when the event is replayable)"""
+        data = self.to_json()
+        if event_id:
+            return f"id: {event_id}\ndata: {data}\n\n"
+        return f"data: {data}\n\n"
+
+
 class QueryStateManager:
     """
     Manages query execution states and enables SSE streaming
@@ -91,12 +163,21 @@ class QueryStateManager:
     - Persistent query metadata for authorization (user ownership)
     - Real-time SSE streaming via async generators
     - Automatic cleanup of expired queries
+    - Shared Redis tier so any API worker can serve status and SSE for a
+      query started on another worker; local dicts act as a write-through
+      cache and the in-process fast path
     """
     _instance: Optional['QueryStateManager'] = None
     _lock = asyncio.Lock()
     
     # TTL for query metadata (24 hours)
     METADATA_TTL_SECONDS = 86400
+    # Event streams are short-lived: long enough for SSE reconnects
+    STREAM_TTL_SECONDS = 3600
+    TERMINAL_STREAM_TTL_SECONDS = 600
+    STREAM_MAX_LENGTH = 500
+    # XREAD block window; bounds how long a new subscription waits to join the pump
+    STREAM_BLOCK_MS = 1000
     
     def __init__(self):
         # Query state storage: query_id -> current state
@@ -108,6 +189,10 @@ class QueryStateManager:
         # Event queues for SSE subscribers: query_id -> set of queues
         self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
         
+        # Last stream entry read per subscribed query (remote pump cursors)
+        self._stream_cursors: Dict[str, str] = {}
+        self._pump_task: Optional[asyncio.Task] = None
+        
         # Locks for thread-safe operations
         self._state_lock = asyncio.Lock()
         self._metadata_lock = asyncio.Lock()
@@ -124,6 +209,94 @@ class QueryStateManager:
                     cls._instance = cls()
         return cls._instance
     
+    # ==================== SHARED (REDIS) TIER ====================
+    
+    @staticmethod
+    def _shared_enabled() -> bool:
+        """Whether the Redis-backed shared tier should be used"""
+        return bool(getattr(settings, "QUERY_STATE_SHARED_BACKEND", True)) and redis_client.is_connected()
+    
+    @staticmethod
+    def _stream_key(query_id: str) -> str:
+        return f"{STREAM_KEY_PREFIX}{query_id}"
+    
+    async def _load_shared_metadata(self, query_id: str) -> Optional[QueryMetadata]:
+        """Read metadata written by any worker"""
+        if not self._shared_enabled():
+            return None
+        try:
+            payload = await redis_client._client.get(f"{METADATA_KEY_PREFIX}{query_id}")
+            if not payload:
+                return None
+            data = json.loads(payload)
+            known = {f for f in QueryMetadata.__dataclass_fields__}
+            return QueryMetadata(**{k: v for k, v in data.items() if k in known})
+        except Exception as e:
+            logger.warning(f"Shared metadata lookup failed for {query_id[:8]}: {e}")
+            return None
+    
+    async def _stream_tail(self, query_id: str) -> str:
+        """ID of the newest event in a query stream ('0-0' when empty)"""
+        try:
+            entries = await redis_client._client.xrevrange(self._stream_key(query_id), "+", "-", count=1)
+            if entries:
+                return entries[0][0]
+        except Exception as e:
+            logger.debug(f"Stream tail lookup failed for {query_id[:8]}: {e}")
+        return "0-0"
+    
+    async def _replay_events(self, query_id: str, after_id: str) -> list:
+        """Events strictly after after_id, for SSE reconnects"""
+        try:
+            entries = await redis_client._client.xrange(self._stream_key(query_id), f"({after_id}", "+")
+        except Exception as e:
+            logger.warning(f"Replay failed for {query_id[:8]} after {after_id}: {e}")
+            return []
+        replay = []
+        for entry_id, fields in entries:
+            event = QueryStateEvent.from_json(fields.get("event", ""))
+            if event:
+                replay.append((entry_id, event))
+        return replay
+    
+    def _ensure_pump(self) -> None:
+        """Start the per-worker stream reader if it is not running"""
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump_remote_events())
+    
+    async def _pump_remote_events(self) -> None:
+        """
+        Single XREAD loop per worker that forwards events published by other
+        workers to local subscriber queues. Exits when nobody is subscribed.
+        """
+        while True:
+            async with self._subscriber_lock:
+                streams = {
+                    self._stream_key(qid): self._stream_cursors[qid]
+                    for qid in self._subscribers
+                    if qid in self._stream_cursors
+                }
+            if not streams:
+                return
+            try:
+                response = await redis_client._client.xread(streams, count=100, block=self.STREAM_BLOCK_MS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Query event pump read failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            for stream_key, entries in response or []:
+                query_id = stream_key[len(STREAM_KEY_PREFIX):]
+                for entry_id, fields in entries:
+                    if query_id in self._stream_cursors:
+                        self._stream_cursors[query_id] = entry_id
+                    event = QueryStateEvent.from_json(fields.get("event", ""))
+                    if event:
+                        await self._notify_subscribers(query_id, event, entry_id)
+    
+    # ==================== LIFECYCLE ====================
+    
     async def register_query(
         self,
         query_id: str,
@@ -163,8 +336,19 @@ class QueryStateManager:
                 trace_id=trace_id,
             )
             self._query_metadata[query_id] = metadata
-            logger.info(f"Registered query {query_id[:8]}... for user {username}")
-            return metadata
+        
+        if self._shared_enabled():
+            try:
+                await redis_client._client.set(
+                    f"{METADATA_KEY_PREFIX}{query_id}",
+                    json.dumps(metadata.to_dict(), cls=CustomJSONEncoder),
+                    ex=self.METADATA_TTL_SECONDS,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to share metadata for {query_id[:8]}: {e}")
+        
+        logger.info(f"Registered query {query_id[:8]}... for user {username}")
+        return metadata
     
     async def get_query_metadata(self, query_id: str) -> Optional[Dict]:
         """
@@ -181,7 +365,25 @@ class QueryStateManager:
             metadata = self._query_metadata.get(query_id)
             if metadata:
                 return metadata.to_dict()
-            return None
+        
+        # Registered on another worker
+        metadata = await self._load_shared_metadata(query_id)
+        return metadata.to_dict() if metadata else None
+    
+    async def set_trace_id(self, query_id: str, trace_id: str) -> None:
+        """Attach a trace ID to an already registered query"""
+        async with self._metadata_lock:
+            if query_id in self._query_metadata:
+                self._query_metadata[query_id].trace_id = trace_id
+        if self._shared_enabled():
+            try:
+                await redis_client.run_script(
+                    _SET_METADATA_FIELD_LUA,
+                    keys=[f"{METADATA_KEY_PREFIX}{query_id}"],
+                    args=["trace_id", trace_id],
+                )
+            except Exception as e:
+                logger.debug(f"Failed to share trace_id for {query_id[:8]}: {e}")
     
     async def update_state(
         self,
@@ -206,10 +408,11 @@ class QueryStateManager:
             )
         
         # Update persistent metadata status
+        updated_at = get_iso_timestamp()
         async with self._metadata_lock:
             if query_id in self._query_metadata:
                 self._query_metadata[query_id].status = new_state.value
-                self._query_metadata[query_id].updated_at = get_iso_timestamp()
+                self._query_metadata[query_id].updated_at = updated_at
         
         # Create state change event
         # Attach trace_id if provided in metadata
@@ -265,13 +468,38 @@ class QueryStateManager:
             database_type=meta.get("database_type"),
         )
         
-        # Notify all subscribers for this query
-        await self._notify_subscribers(query_id, event)
+        # Publish to the shared stream (state + metadata + XADD in one round trip)
+        entry_id = None
+        if self._shared_enabled():
+            try:
+                is_terminal = new_state.value in TERMINAL_STATES
+                entry_id = await redis_client.run_script(
+                    _PUBLISH_STATE_LUA,
+                    keys=[
+                        f"{STATE_KEY_PREFIX}{query_id}",
+                        f"{METADATA_KEY_PREFIX}{query_id}",
+                        self._stream_key(query_id),
+                    ],
+                    args=[
+                        new_state.value,
+                        updated_at,
+                        event.to_json(),
+                        self.METADATA_TTL_SECONDS,
+                        self.STREAM_MAX_LENGTH,
+                        self.TERMINAL_STREAM_TTL_SECONDS if is_terminal else self.STREAM_TTL_SECONDS,
+                    ],
+                )
+            except Exception as e:
+                logger.warning(f"Failed to publish state for {query_id[:8]} to shared stream: {e}")
+        
+        # Fast path: notify subscribers on this worker immediately
+        await self._notify_subscribers(query_id, event, entry_id)
     
     async def _notify_subscribers(
         self,
         query_id: str,
-        event: QueryStateEvent
+        event: QueryStateEvent,
+        entry_id: Optional[str] = None,
     ) -> None:
         """Notify all SSE subscribers of state change"""
         async with self._subscriber_lock:
@@ -283,7 +511,7 @@ class QueryStateManager:
             for queue in self._subscribers[query_id]:
                 try:
                     await asyncio.wait_for(
-                        queue.put(event),
+                        queue.put((entry_id, event)),
                         timeout=1.0
                     )
                 except (asyncio.TimeoutError, asyncio.QueueFull):
@@ -300,53 +528,81 @@ class QueryStateManager:
                 self._subscribers[query_id] -= dead_queues
                 logger.info(f"Removed {len(dead_queues)} dead subscribers")
     
-    async def subscribe(self, query_id: str) -> AsyncGenerator[str, None]:
+    async def subscribe(
+        self,
+        query_id: str,
+        last_event_id: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
         """
         Subscribe to query state changes via SSE
         
         Args:
             query_id: Query ID to subscribe to
+            last_event_id: Stream ID from the SSE Last-Event-ID header; events
+                after it are replayed before live streaming resumes
             
         Yields:
             SSE-formatted state change messages
         """
         queue: asyncio.Queue = asyncio.Queue(maxsize=50)
+        shared = self._shared_enabled()
         
-        # Register subscriber
+        # Register subscriber before reading the stream tail so nothing falls in between
         async with self._subscriber_lock:
             if query_id not in self._subscribers:
                 self._subscribers[query_id] = set()
             self._subscribers[query_id].add(queue)
             logger.info(f"New SSE subscriber for query {query_id[:8]}...")
         
+        terminal = {QueryState.FINISHED, QueryState.ERROR, QueryState.REJECTED}
+        last_seen = _parse_stream_id(last_event_id)
+        
         try:
-            # Send current state immediately if available
-            current_state = self._query_states.get(query_id)
-            if current_state:
-                initial_event = QueryStateEvent(
-                    query_id=query_id,
-                    state=current_state,
-                    timestamp=get_iso_timestamp(),
-                    metadata={"initial": True}
-                )
-                yield initial_event.to_sse_message()
+            if shared:
+                cursor = last_event_id or await self._stream_tail(query_id)
+                async with self._subscriber_lock:
+                    current = self._stream_cursors.get(query_id)
+                    if current is None or _parse_stream_id(cursor) < _parse_stream_id(current):
+                        self._stream_cursors[query_id] = cursor
+                self._ensure_pump()
+            
+            if shared and last_event_id:
+                # Resume after reconnect: replay everything the client missed
+                for entry_id, event in await self._replay_events(query_id, last_event_id):
+                    last_seen = _parse_stream_id(entry_id)
+                    yield event.to_sse_message(entry_id)
+                    if event.state in terminal:
+                        return
+            else:
+                # Send current state immediately if available
+                current_state = await self.get_state(query_id)
+                if current_state:
+                    initial_event = QueryStateEvent(
+                        query_id=query_id,
+                        state=current_state,
+                        timestamp=get_iso_timestamp(),
+                        metadata={"initial": True}
+                    )
+                    yield initial_event.to_sse_message()
             
             # Stream state changes
             while True:
                 try:
                     # Wait for new events with timeout
-                    event = await asyncio.wait_for(
+                    entry_id, event = await asyncio.wait_for(
                         queue.get(),
                         timeout=30.0
                     )
-                    yield event.to_sse_message()
+                    if entry_id:
+                        # Same event may arrive via the local fast path and the stream pump
+                        parsed = _parse_stream_id(entry_id)
+                        if parsed <= last_seen:
+                            continue
+                        last_seen = parsed
+                    yield event.to_sse_message(entry_id)
                     
                     # Stop streaming after terminal states
-                    if event.state in {
-                        QueryState.FINISHED,
-                        QueryState.ERROR,
-                        QueryState.REJECTED
-                    }:
+                    if event.state in terminal:
                         logger.info(
                             f"Terminal state reached for {query_id[:8]}, closing stream"
                         )
@@ -367,12 +623,22 @@ class QueryStateManager:
                     self._subscribers[query_id].discard(queue)
                     if not self._subscribers[query_id]:
                         del self._subscribers[query_id]
+                        self._stream_cursors.pop(query_id, None)
                         logger.info(f"No more subscribers for {query_id[:8]}")
     
     async def get_state(self, query_id: str) -> Optional[QueryState]:
         """Get current state of a query"""
         async with self._state_lock:
-            return self._query_states.get(query_id)
+            state = self._query_states.get(query_id)
+        if state is not None or not self._shared_enabled():
+            return state
+        # Query may be running on another worker
+        try:
+            value = await redis_client._client.get(f"{STATE_KEY_PREFIX}{query_id}")
+            return QueryState(value) if value else None
+        except Exception as e:
+            logger.debug(f"Shared state lookup failed for {query_id[:8]}: {e}")
+            return None
     
     async def cleanup_query(self, query_id: str, preserve_metadata: bool = True) -> None:
         """
@@ -392,11 +658,17 @@ class QueryStateManager:
                 if query_id in self._query_metadata:
                     del self._query_metadata[query_id]
                     logger.info(f"Cleaned up metadata for query {query_id[:8]}")
+            if self._shared_enabled():
+                try:
+                    await redis_client._client.delete(f"{METADATA_KEY_PREFIX}{query_id}")
+                except Exception as e:
+                    logger.debug(f"Failed to delete shared metadata for {query_id[:8]}: {e}")
     
     async def cleanup_expired_metadata(self) -> int:
         """
         Remove metadata older than TTL.
         Should be called periodically by a background task.
+        Shared (Redis) copies expire on their own TTL.
         
         Returns:
             Number of entries cleaned up
@@ -452,6 +724,15 @@ class QueryStateManager:
             logger.info(f"Cleaned up {len(cleaned_ids)} terminal query states")
         
         return len(cleaned_ids)
+    
+    async def shutdown(self) -> None:
+        """Stop the remote event pump (called from application shutdown)"""
+        if self._pump_task and not self._pump_task.done():
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except (asyncio.CancelledError, Exception):
+                pass
 
 
 # Global instance accessor
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 # Feature flag
 REPORT_GENERATION_ENABLED = True
 
+# "Generated on" header stamp (minute resolution)
+GENERATED_ON_FORMAT = '%B %d, %Y at %I:%M %p'
+
 
 class ReportGenerationService:
     """
@@ -409,7 +412,7 @@ Your insights:"""
 <body>
     <div class="header">
         <h1>{report_data['title']}</h1>
-        <div class="date">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</div>
+        <div class="date">Generated on {cls._generated_on(report_data)}</div>
     </div>
     
     <div class="section">
@@ -490,9 +493,29 @@ Your insights:"""
         
         return html
     
+    @staticmethod
+    def _generated_on(report_data: Dict[str, Any]) -> str:
+        """Timestamp printed in the document header"""
+        return report_data.get("generated_on") or datetime.now().strftime(GENERATED_ON_FORMAT)
+    
+    @staticmethod
+    def _stamped(report_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Report data with the header timestamp fixed before rendering. The stamp
+        is part of the render cache key, so a cached document is only served
+        while its "Generated on" minute is still current.
+        """
+        return {**report_data, "generated_on": datetime.now().strftime(GENERATED_ON_FORMAT)}
+    
     @classmethod
     async def _generate_pdf(cls, report_data: Dict[str, Any]) -> bytes:
-        """Generate PDF report using weasyprint or reportlab"""
+        """Generate PDF report in the rendering process pool"""
+        from app.core.report_render_pool import report_render_pool
+        return await report_render_pool.render(render_report_document, "pdf", cls._stamped(report_data))
+    
+    @classmethod
+    def _render_pdf(cls, report_data: Dict[str, Any]) -> bytes:
+        """Render PDF using weasyprint (blocking; runs in a render process)"""
         try:
             # Try weasyprint first (better HTML rendering)
             from weasyprint import HTML
@@ -506,7 +529,13 @@ Your insights:"""
     
     @classmethod
     async def _generate_docx(cls, report_data: Dict[str, Any]) -> bytes:
-        """Generate DOCX report using python-docx"""
+        """Generate DOCX report in the rendering process pool"""
+        from app.core.report_render_pool import report_render_pool
+        return await report_render_pool.render(render_report_document, "docx", cls._stamped(report_data))
+    
+    @classmethod
+    def _render_docx(cls, report_data: Dict[str, Any]) -> bytes:
+        """Render DOCX using python-docx (blocking; runs in a render process)"""
         try:
             from docx import Document
             from docx.shared import Inches, Pt
@@ -518,7 +547,7 @@ Your insights:"""
             title = doc.add_heading(report_data['title'], 0)
             title.alignment = WD_ALIGN_PARAGRAPH.CENTER
             
-            doc.add_paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
+            doc.add_paragraph(f"Generated on {cls._generated_on(report_data)}")
             doc.add_paragraph()
             
             # Executive Summary
@@ -547,3 +576,12 @@ Your insights:"""
         except ImportError:
             logger.warning("python-docx not available")
             raise ValueError("DOCX generation requires python-docx package")
+
+
+def render_report_document(fmt: str, report_data: Dict[str, Any]) -> bytes:
+    """Render entry point for report render processes (must stay module-level to pickle)"""
+    if fmt == "pdf":
+        return ReportGenerationService._render_pdf(report_data)
+    if fmt == "docx":
+        return ReportGenerationService._render_docx(report_data)
+    raise ValueError(f"Unsupported render format: {fmt}")
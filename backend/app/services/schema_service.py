@@ -582,6 +582,10 @@ ORDER BY TABLE_NAME, COLUMN_ID
             from app.core.redis_client import redis_client as _redis_client
             count = await _redis_client.invalidate_schema_cache("schema:*")
             logger.info(f"Invalidated {count} schema cache entries")
+            
+            # Cost estimates depend on the schema they were planned against
+            from app.core.plan_estimate_cache import plan_estimate_cache
+            plan_estimate_cache.bump_schema_version()
             return count
             
         except Exception as e:
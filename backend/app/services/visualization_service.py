@@ -8,18 +8,23 @@ import logging
 from typing import Any, Dict, List, Optional, Tuple
 import json
 
+import numpy as np
+
+from app.core.config import settings
+from app.utils.downsampling import grid_bin, histogram_bins, lttb_indices, to_float_array
+from app.utils.lazy_imports import lazy_import, module_available
+
 logger = logging.getLogger(__name__)
 
 # Feature flag for Python visualizations
 PYTHON_VIZ_ENABLED = True
 
-try:
-    import plotly.express as px
-    import plotly.graph_objects as go
-    from plotly.utils import PlotlyJSONEncoder
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+# plotly.express alone costs ~30MB; loaded on the first chart
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+plotly_utils = lazy_import("plotly.utils")
+PLOTLY_AVAILABLE = module_available("plotly")
+if not PLOTLY_AVAILABLE:
     logger.warning("Plotly not installed. Python visualizations will be limited.")
 
 
@@ -138,12 +143,12 @@ class VisualizationService:
     
     @staticmethod
     def apply_professional_layout(
-        fig: go.Figure,
+        fig: "go.Figure",
         title: str,
         chart_type: str,
         show_legend: bool = True,
         palette: str = "default"
-    ) -> go.Figure:
+    ) -> "go.Figure":
         """
         Apply professional styling to Plotly figure
         
@@ -271,10 +276,58 @@ class VisualizationService:
         return fig
     
     @staticmethod
-    def detect_chart_type(columns: List[str], rows: List[List[Any]], hints: Optional[Dict] = None) -> str:
+    def to_columns(columns: List[str], rows: List[List[Any]]) -> Dict[str, List[Any]]:
+        """Transpose rows into a column dict in one pass"""
+        transposed = list(zip(*rows)) if rows else []
+        return {
+            col: list(transposed[i]) if i < len(transposed) else [None] * len(rows)
+            for i, col in enumerate(columns)
+        }
+    
+    @staticmethod
+    def _downsample_series(
+        data: Dict[str, List[Any]],
+        x_col: str,
+        metrics: List[str],
+        max_points: int
+    ) -> Tuple[Dict[str, List[Any]], Optional[Dict[str, Any]]]:
+        """
+        LTTB-downsample line/area series to the point budget
+
+        The union of per-metric selections is kept so every series keeps its
+        own peaks and all columns stay aligned.
+        """
+        n = len(data[x_col])
+        if n <= max_points or not metrics:
+            return data, None
+        first_x = data[x_col][0]
+        x = None
+        if isinstance(first_x, (int, float)) and not isinstance(first_x, bool):
+            x = to_float_array(data[x_col])
+            if not np.all(np.isfinite(x)) or np.any(np.diff(x) < 0):
+                x = None
+        if x is None:
+            x = np.arange(n, dtype=np.float64)  # ordered categorical/date axis
+        per_metric = max(3, max_points // len(metrics))
+        keep = np.unique(np.concatenate([
+            lttb_indices(x, to_float_array(data[m]), per_metric) for m in metrics
+        ]))
+        sampled = {col: [values[i] for i in keep] for col, values in data.items()}
+        return sampled, {"method": "lttb", "original_points": n, "rendered_points": int(keep.size)}
+    
+    @staticmethod
+    def detect_chart_type(
+        columns: List[str],
+        rows: List[List[Any]],
+        hints: Optional[Dict] = None,
+        data: Optional[Dict[str, List[Any]]] = None
+    ) -> str:
         """
         Auto-detect the best chart type based on data characteristics
         Enhanced with better heuristics for Issue 13
+
+        Args:
+            data: Optional column dict (from to_columns) to avoid re-reading rows
         """
         if not rows or not columns:
             return "table"
@@ -294,7 +347,8 @@ class VisualizationService:
         
         for i, col in enumerate(columns):
             col_lower = col.lower()
-            sample_values = [row[i] for row in rows[:min(50, num_rows)] if row[i] is not None]
+            head = data[col][:50] if data is not None else [row[i] for row in rows[:50]]
+            sample_values = [v for v in head if v is not None]
             
             if not sample_values:
                 continue
@@ -375,13 +429,19 @@ class VisualizationService:
         rows: List[List[Any]],
         chart_type: Optional[str] = None,
         title: Optional[str] = None,
-        hints: Optional[Dict] = None
+        hints: Optional[Dict] = None,
+        max_points: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Generate a Plotly chart from query results
         
+        Series larger than the point budget (max_points, default
+        VIZ_MAX_POINTS) are downsampled: LTTB for line/area, grid binning for
+        scatter, summary statistics for box, bins for histogram.
+        
         Returns:
-            Dict with 'plotly_json' (for frontend rendering) and 'chart_type'
+            Dict with 'plotly_json' (for frontend rendering), 'chart_type' and
+            'downsampling' details when the payload was reduced
         """
         if not VisualizationService.is_available():
             return {
@@ -397,19 +457,20 @@ class VisualizationService:
             }
         
         try:
-            # Convert to dict format for Plotly
-            data_dict = {col: [row[i] for row in rows] for i, col in enumerate(columns)}
+            # Convert to dict format for Plotly (single transpose, reused below)
+            data_dict = VisualizationService.to_columns(columns, rows)
+            full_data = data_dict
             
             # Auto-detect chart type if not specified
             if not chart_type:
-                chart_type = VisualizationService.detect_chart_type(columns, rows, hints)
+                chart_type = VisualizationService.detect_chart_type(columns, rows, hints, data=data_dict)
             
             # Identify dimension and metric columns
             numeric_cols = []
             categorical_cols = []
             
-            for i, col in enumerate(columns):
-                sample = [row[i] for row in rows[:50] if row[i] is not None]
+            for col in columns:
+                sample = [v for v in data_dict[col][:50] if v is not None]
                 if sample and all(isinstance(v, (int, float)) or (isinstance(v, str) and v.replace('.', '').replace('-', '').isdigit()) for v in sample):
                     numeric_cols.append(col)
                 else:
@@ -423,6 +484,16 @@ class VisualizationService:
             palette_name = hints.get("palette", "default") if hints else "default"
             colors = VisualizationService.get_color_palette(palette_name, max(len(numeric_cols), 8))
             
+            # Keep the browser payload within the point budget
+            point_budget = max_points or settings.VIZ_MAX_POINTS
+            downsampling = None
+            if chart_type in ("line", "area"):
+                data_dict, downsampling = VisualizationService._downsample_series(full_data, x_col, [y_col], point_budget)
+            elif chart_type == "multi_line":
+                data_dict, downsampling = VisualizationService._downsample_series(
+                    full_data, x_col, numeric_cols[:5], point_budget
+                )
+            
             # Generate chart based on type
             fig = None
             
@@ -618,43 +689,50 @@ class VisualizationService:
                 
                 fig = go.Figure()
                 
+                x_values = to_float_array(data_dict[x_scatter])
+                y_values = to_float_array(data_dict[y2_col])
                 if color_col:
-                    # Scatter with categories
-                    unique_categories = list(set(data_dict[color_col]))
-                    for idx, category in enumerate(unique_categories[:8]):
-                        mask = [i for i, v in enumerate(data_dict[color_col]) if v == category]
-                        fig.add_trace(go.Scatter(
-                            name=str(category),
-                            x=[data_dict[x_scatter][i] for i in mask],
-                            y=[data_dict[y2_col][i] for i in mask],
-                            mode='markers',
-                            marker=dict(
-                                size=10,
-                                color=colors[idx % len(colors)],
-                                line=dict(color='white', width=1),
-                                opacity=0.8
-                            ),
-                            hovertemplate=f"<b>{category}</b><br>" +
-                                          f"{x_scatter}: %{{x:,.2f}}<br>" +
-                                          f"{y2_col}: %{{y:,.2f}}<br>" +
-                                          "<extra></extra>"
-                        ))
+                    # Scatter with categories (first 8 distinct, in order of appearance)
+                    category_values = np.empty(len(rows), dtype=object)
+                    category_values[:] = data_dict[color_col]
+                    unique_categories = list(dict.fromkeys(data_dict[color_col]))[:8]
+                    groups = [(str(c), category_values == c) for c in unique_categories]
                 else:
-                    # Single scatter
+                    groups = [(None, np.ones(len(rows), dtype=bool))]
+                
+                group_budget = max(1, point_budget // len(groups))
+                binned_points = 0
+                for idx, (category, mask) in enumerate(groups):
+                    gx, gy = x_values[mask], y_values[mask]
+                    counts = None
+                    if gx.size > group_budget:
+                        gx, gy, counts = grid_bin(gx, gy, group_budget)
+                        binned_points += int(counts.sum())
+                    hover_prefix = f"<b>{category}</b><br>" if category is not None else ""
                     fig.add_trace(go.Scatter(
-                        x=data_dict[x_scatter],
-                        y=data_dict[y2_col],
+                        name=category,
+                        x=gx.tolist(),
+                        y=gy.tolist(),
+                        customdata=counts.tolist() if counts is not None else None,
                         mode='markers',
                         marker=dict(
                             size=10,
-                            color=colors[0],
+                            color=colors[idx % len(colors)],
                             line=dict(color='white', width=1),
                             opacity=0.8
                         ),
-                        hovertemplate=f"{x_scatter}: %{{x:,.2f}}<br>" +
+                        hovertemplate=hover_prefix +
+                                      f"{x_scatter}: %{{x:,.2f}}<br>" +
                                       f"{y2_col}: %{{y:,.2f}}<br>" +
+                                      ("Points: %{customdata}<br>" if counts is not None else "") +
                                       "<extra></extra>"
                     ))
+                if binned_points:
+                    downsampling = {
+                        "method": "grid_bin",
+                        "original_points": len(rows),
+                        "rendered_points": sum(len(t.x) for t in fig.data),
+                    }
                 
                 fig = VisualizationService.apply_professional_layout(
                     fig,
@@ -753,9 +831,24 @@ class VisualizationService:
                 # Box plot for distribution analysis
                 if len(numeric_cols) >= 1:
                     fig = go.Figure()
+                    summarize = len(rows) > point_budget
                     for idx, metric in enumerate(numeric_cols[:5]):
+                        box_data = {"y": data_dict[metric]}
+                        if summarize:
+                            # Ship the five-number summary instead of every value
+                            values = to_float_array(data_dict[metric])
+                            values = values[np.isfinite(values)]
+                            q1, median, q3 = np.percentile(values, [25, 50, 75])
+                            iqr = q3 - q1
+                            box_data = {
+                                "q1": [float(q1)], "median": [float(median)], "q3": [float(q3)],
+                                "lowerfence": [float(max(values.min(), q1 - 1.5 * iqr))],
+                                "upperfence": [float(min(values.max(), q3 + 1.5 * iqr))],
+                                "mean": [float(values.mean())], "sd": [float(values.std())],
+                                "x": [metric],
+                            }
                         fig.add_trace(go.Box(
-                            y=data_dict[metric],
+                            **box_data,
                             name=metric,
                             marker=dict(
                                 color=colors[idx % len(colors)],
@@ -777,11 +870,43 @@ class VisualizationService:
                     )
                     
                     fig.update_yaxes(title_text="Value")
+                    if summarize:
+                        downsampling = {
+                            "method": "summary",
+                            "original_points": len(rows),
+                            "rendered_points": min(len(numeric_cols), 5),
+                        }
                 else:
                     fig = go.Figure()
                     fig.add_trace(go.Bar(x=data_dict[x_col], y=data_dict[y_col], marker=dict(color=colors[0])))
                     fig = VisualizationService.apply_professional_layout(fig, title or "Data", "bar", False, palette_name)
             
+            elif chart_type == "histogram":
+                # Pre-binned on the server; the payload is one bar per bin
+                hist_col = numeric_cols[0] if numeric_cols else y_col
+                centers, counts = histogram_bins(to_float_array(data_dict[hist_col]), min(point_budget, 200))
+                fig = go.Figure()
+                fig.add_trace(go.Bar(
+                    x=centers.tolist(),
+                    y=counts.tolist(),
+                    name=hist_col,
+                    marker=dict(color=colors[0], opacity=0.9),
+                    hovertemplate=f"{hist_col}: %{{x:,.2f}}<br>" +
+                                  "Count: %{y:,}<br>" +
+                                  "<extra></extra>"
+                ))
+                fig = VisualizationService.apply_professional_layout(
+                    fig,
+                    title or f"{hist_col} Distribution",
+                    chart_type,
+                    show_legend=False,
+                    palette=palette_name
+                )
+                fig.update_xaxes(title_text=hist_col)
+                fig.update_yaxes(title_text="Count")
+                fig.update_layout(bargap=0.02)
+                downsampling = {"method": "histogram", "original_points": len(rows), "rendered_points": int(len(centers))}
+            
             else:
                 # Default to bar
                 fig = go.Figure()
@@ -801,23 +926,26 @@ class VisualizationService:
             if fig:
                 # Add statistical overlays if applicable
                 stats_info = {}
-                if chart_type in ["bar", "line", "scatter"] and y_col in data_dict:
-                    y_values = [v for v in data_dict[y_col] if v is not None]
+                if chart_type in ["bar", "line", "scatter"] and y_col in full_data:
                     try:
-                        numeric_y = [float(v) for v in y_values if isinstance(v, (int, float)) or (isinstance(v, str) and v.replace('.', '').replace('-', '').isdigit())]
-                        if numeric_y:
-                            mean_val = sum(numeric_y) / len(numeric_y)
-                            median_val = sorted(numeric_y)[len(numeric_y) // 2]
-                            std_dev = (sum((x - mean_val) ** 2 for x in numeric_y) / len(numeric_y)) ** 0.5
+                        # Statistics always use the full (not downsampled) column
+                        y_all = to_float_array(full_data[y_col])
+                        finite_idx = np.flatnonzero(np.isfinite(y_all))
+                        numeric_y = y_all[finite_idx]
+                        if numeric_y.size:
+                            mean_val = float(numeric_y.mean())
+                            median_val = float(np.sort(numeric_y)[numeric_y.size // 2])
+                            std_dev = float(numeric_y.std())
+                            max_val = float(numeric_y.max())
                             
                             stats_info = {
                                 "mean": mean_val,
                                 "median": median_val,
                                 "std_dev": std_dev,
-                                "min": min(numeric_y),
-                                "max": max(numeric_y),
-                                "count": len(numeric_y),
-                                "range": max(numeric_y) - min(numeric_y)
+                                "min": float(numeric_y.min()),
+                                "max": max_val,
+                                "count": int(numeric_y.size),
+                                "range": max_val - float(numeric_y.min())
                             }
                             
                             # Add mean line for bar and line charts (if enabled)
@@ -840,12 +968,12 @@ class VisualizationService:
                             
                             # Add peak annotation (if enabled)
                             if hints and hints.get("show_peaks", False) and chart_type in ["bar", "line"]:
-                                max_idx = numeric_y.index(max(numeric_y))
-                                if max_idx < len(data_dict[x_col]):
+                                max_idx = int(finite_idx[numeric_y.argmax()])
+                                if max_idx < len(full_data[x_col]):
                                     fig.add_annotation(
-                                        x=data_dict[x_col][max_idx],
-                                        y=max(numeric_y),
-                                        text=f"Peak: {VisualizationService.format_number(max(numeric_y))}",
+                                        x=full_data[x_col][max_idx],
+                                        y=max_val,
+                                        text=f"Peak: {VisualizationService.format_number(max_val)}",
                                         showarrow=True,
                                         arrowhead=2,
                                         arrowcolor="#EF4444",
@@ -862,7 +990,7 @@ class VisualizationService:
                         logger.debug(f"Could not calculate statistics: {e}")
                 
                 # Convert to JSON for frontend
-                plotly_json = json.loads(json.dumps(fig.to_dict(), cls=PlotlyJSONEncoder))
+                plotly_json = json.loads(json.dumps(fig.to_dict(), cls=plotly_utils.PlotlyJSONEncoder))
                 
                 return {
                     "status": "success",
@@ -873,7 +1001,9 @@ class VisualizationService:
                         "y": y_col
                     },
                     "statistics": stats_info,
-                    "palette": palette_name
+                    "palette": palette_name,
+                    "downsampled": downsampling is not None,
+                    "downsampling": {**downsampling, "point_budget": point_budget} if downsampling else None,
                 }
             
             return {
@@ -943,7 +1073,8 @@ class VisualizationService:
         
         for i, col in enumerate(columns):
             col_lower = col.lower()
-            sample_values = [row[i] for row in rows[:min(50, num_rows)] if row[i] is not None]
+            head = [row[i] for row in rows[:50]]
+            sample_values = [v for v in head if v is not None]
             
             if not sample_values:
                 continue
@@ -4,19 +4,59 @@ Query execution background tasks
 Handles long-running queries, caching, and cleanup
 """
 
-import asyncio
 import logging
 import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
 from app.core.celery_app import celery_app
-from app.core.redis_client import redis_client
+from app.core.celery_worker_runtime import get_worker_runtime
+from app.core.config import settings
 from app.core.client_registry import registry
 
 logger = logging.getLogger(__name__)
 
 
+async def _run_sql(sql_query: str) -> Dict[str, Any]:
+    """Execute on a worker-resident SQLcl process, or a one-off client if the pool is down"""
+    conn = settings.oracle_default_connection
+    pool = get_worker_runtime().sqlcl_pool
+    if pool is not None:
+        async with pool.acquire(timeout=30) as client:
+            return await client.execute_sql(sql_query, connection_name=conn)
+
+    from app.core.mcp_client import create_mcp_client
+    client = create_mcp_client()
+    try:
+        if not await client.initialize():
+            raise RuntimeError("Task SQLcl client failed to initialize")
+        connect_res = await client.connect_database(conn)
+        if connect_res.get("status") != "connected":
+            raise RuntimeError(f"Task DB connection failed: {connect_res.get('message')}")
+        return await client.execute_sql(sql_query, connection_name=conn)
+    finally:
+        await client.close()
+
+
+async def _execute_and_cache(query_id: str, sql_query: str, user_id: str) -> Dict[str, Any]:
+    result = await _run_sql(sql_query)
+    
+    # Add query metadata
+    result["query_id"] = query_id
+    result["user_id"] = user_id
+    result["timestamp"] = datetime.now(timezone.utc).isoformat()
+    
+    # Cache result in Redis
+    query_hash = hashlib.sha256(sql_query.encode()).hexdigest()
+    cache_data = {
+        "result": result,
+        "query": sql_query,
+        "cached_at": datetime.now(timezone.utc).isoformat()
+    }
+    await get_worker_runtime().redis.cache_query_result(query_hash, cache_data, ttl=300)
+    return result
+
+
 @celery_app.task(
     name="app.tasks.query_tasks.execute_query_async",
     bind=True,
@@ -37,34 +77,8 @@ def execute_query_async(self, query_id: str, sql_query: str, user_id: str) -> Di
     """
     try:
         logger.info(f"Executing async query: {query_id} for user {user_id}")
-        
-        # Create an isolated MCP client for the task to avoid relying on shared state
-        from app.core.mcp_client import create_mcp_client
-        from app.core.config import settings
-        client = create_mcp_client()
-        # Initialize and connect
-        asyncio.run(client.initialize())
-        conn = settings.oracle_default_connection
-        connect_res = asyncio.run(client.connect_database(conn))
-        if connect_res.get("status") != "connected":
-            raise RuntimeError(f"Task DB connection failed: {connect_res.get('message')}")
-        # Execute SQL query using MCP client with explicit connection
-        result = asyncio.run(client.execute_sql(sql_query, connection_name=conn))
-        
-        # Add query metadata
-        result["query_id"] = query_id
-        result["user_id"] = user_id
-        result["timestamp"] = datetime.now(timezone.utc).isoformat()
-        
-        # Cache result in Redis
-        query_hash = hashlib.sha256(sql_query.encode()).hexdigest()
-        cache_data = {
-            "result": result,
-            "query": sql_query,
-            "cached_at": datetime.now(timezone.utc).isoformat()
-        }
-        asyncio.run(redis_client.cache_query_result(query_hash, cache_data, ttl=300))
-        
+        # One hop onto the worker's persistent loop for execute + cache
+        result = get_worker_runtime().run(_execute_and_cache(query_id, sql_query, user_id))
         logger.info(f"Query {query_id} completed successfully")
         return result
         
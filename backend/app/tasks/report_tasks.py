@@ -7,6 +7,7 @@ from typing import Dict, Any
 from datetime import datetime, timezone
 
 from app.core.celery_app import celery_app
+from app.core.celery_worker_runtime import get_worker_runtime
 
 logger = logging.getLogger(__name__)
 
@@ -42,28 +43,20 @@ def generate_daily_report(self, user_id: str, report_config: Dict[str, Any]) ->
 
 
 @celery_app.task(name="app.tasks.report_tasks.export_query_results")
-def export_query_results(query_id: str, format: str, user_id: str) -> str:
+def export_query_results(export_id: str) -> Dict[str, Any]:
     """
-    Export query results to file format
+    Stream a registered export job to file (CSV, Parquet or XLSX)
     
     Args:
-        query_id: Query identifier
-        format: Export format (csv, excel, json)
-        user_id: User who requested export
+        export_id: Export job created by ExportService.create_job
         
     Returns:
-        File path or download URL
+        Final export job record
     """
-    try:
-        logger.info(f"Exporting query {query_id} to {format} for user {user_id}")
-        
-        # Export logic implementation pending
-        
-        file_path = f"/exports/{query_id}.{format}"
-        
-        logger.info(f"Export completed: {file_path}")
-        return file_path
-        
-    except Exception as e:
-        logger.error(f"Export failed: {e}")
-        return ""
\ No newline at end of file
+    from app.services.export_service import ExportService
+
+    logger.info(f"Running export {export_id}")
+    runtime = get_worker_runtime()
+    job = runtime.run(ExportService.run_export(export_id, runtime.redis))
+    logger.info(f"Export {export_id} {job.get('status')}: {job.get('rows_written')} rows")
+    return ExportService.public_view(job)
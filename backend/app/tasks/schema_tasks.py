@@ -7,11 +7,36 @@ import time
 from typing import Dict, Any
 
 from app.core.celery_app import celery_app
-from app.core.redis_client import redis_client
+from app.core.celery_worker_runtime import get_worker_runtime
 
 logger = logging.getLogger(__name__)
 
 
+async def _fetch_and_cache_schema() -> Dict[str, Any]:
+    """Fetch schema metadata with an isolated client and cache it via the runtime's Redis"""
+    from app.core.mcp_client import create_mcp_client
+    from app.core.config import settings
+
+    client = create_mcp_client()
+    try:
+        await client.initialize()
+        conn = settings.oracle_default_connection
+        connect_res = await client.connect_database(conn)
+        if connect_res.get("status") != "connected":
+            raise RuntimeError(f"Schema task DB connection failed: {connect_res.get('message')}")
+        schema_data = await client.get_schema(conn)
+    finally:
+        await client.close()
+
+    if schema_data:
+        await get_worker_runtime().redis.cache_schema_metadata(
+            "oracle_schema",
+            schema_data,
+            ttl=3600  # 1 hour TTL
+        )
+    return schema_data
+
+
 @celery_app.task(
     name="app.tasks.schema_tasks.refresh_schema_cache",
     bind=True,
@@ -25,32 +50,14 @@ def refresh_schema_cache(self) -> Dict[str, Any]:
     Returns:
         Statistics dict
     """
-    import asyncio
-    from app.core.mcp_client import mcp_client
-    
     try:
         logger.info(f"Starting schema cache refresh...")
         start_time = time.time()
         
-        # Fetch schema from MCP using isolated client with explicit connection
-        from app.core.mcp_client import create_mcp_client
-        from app.core.config import settings
-        client = create_mcp_client()
-        asyncio.run(client.initialize())
-        conn = settings.oracle_default_connection
-        connect_res = asyncio.run(client.connect_database(conn))
-        if connect_res.get("status") != "connected":
-            raise RuntimeError(f"Schema task DB connection failed: {connect_res.get('message')}")
-        schema_data = asyncio.run(client.get_schema(conn))
+        # Runs on the worker loop so Redis connections stay on one event loop
+        schema_data = get_worker_runtime().run(_fetch_and_cache_schema())
         
         if schema_data:
-            # Cache the schema metadata
-            asyncio.run(redis_client.cache_schema_metadata(
-                "oracle_schema",
-                schema_data,
-                ttl=3600  # 1 hour TTL
-            ))
-            
             tables_count = len(schema_data.get("tables", []))
             columns_count = sum(
                 len(table.get("columns", [])) 
@@ -84,12 +91,11 @@ def invalidate_schema_cache() -> int:
     Returns:
         Number of cache entries invalidated
     """
-    import asyncio
-    
     try:
         logger.info("Invalidating schema cache...")
         
-        count = asyncio.run(redis_client.invalidate_schema_cache("schema:*"))
+        runtime = get_worker_runtime()
+        count = runtime.run(runtime.redis.invalidate_schema_cache("schema:*"))
         
         logger.info(f"Invalidated {count} schema cache entries")
         return count
@@ -0,0 +1,109 @@
+"""
+Shape-preserving downsampling for chart payloads
+
+- lttb_indices: Largest-Triangle-Three-Buckets for line/area series; keeps
+  the points that preserve the visual shape (peaks, troughs, first/last)
+- grid_bin: 2-D binning for scatter plots; one point per occupied cell at
+  the cell's centroid, with the number of source points it represents
+- histogram_bins: 1-D binning for distributions
+"""
+
+from typing import Any, Sequence, Tuple
+
+import numpy as np
+
+
+def to_float_array(values: Sequence[Any]) -> np.ndarray:
+    """Float array from mixed values; non-numeric entries become NaN"""
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = list(values)
+    arr[arr == None] = np.nan  # noqa: E711 - elementwise null test
+    try:
+        return arr.astype(np.float64)
+    except (TypeError, ValueError):
+        out = np.full(len(values), np.nan)
+        for i, v in enumerate(values):
+            if isinstance(v, bool):
+                continue
+            try:
+                out[i] = float(v)
+            except (TypeError, ValueError):
+                pass
+        return out
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points LTTB keeps for a series
+
+    Args:
+        x: Monotonic x positions (use np.arange for ordered categorical/date axes)
+        y: Series values; NaN points are treated as 0 for selection only
+        threshold: Number of points to keep (>= 3)
+
+    Returns:
+        Sorted index array of length min(threshold, len(y))
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    # Bucket boundaries for the n - 2 interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        # Average of the next bucket is the third triangle vertex
+        avg_x = x[next_start:next_end].mean() if next_end > next_start else x[-1]
+        avg_y = y[next_start:next_end].mean() if next_end > next_start else y[-1]
+        ax, ay = x[a], y[a]
+        bx, by = x[start:end], y[start:end]
+        areas = np.abs((ax - avg_x) * (by - ay) - (ax - bx) * (avg_y - ay))
+        a = start + int(areas.argmax())
+        selected[bucket + 1] = a
+    return selected
+
+
+def grid_bin(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collapse a scatter cloud onto a square grid of at most max_points cells
+
+    Returns:
+        (centroid_x, centroid_y, counts) for each occupied cell
+    """
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if x.size <= max_points:
+        return x, y, np.ones(x.size, dtype=np.int64)
+
+    side = max(1, int(np.sqrt(max_points)))
+    x_span = np.ptp(x) or 1.0
+    y_span = np.ptp(y) or 1.0
+    ix = np.minimum(((x - x.min()) / x_span * side).astype(np.int64), side - 1)
+    iy = np.minimum(((y - y.min()) / y_span * side).astype(np.int64), side - 1)
+    cells, inverse, counts = np.unique(ix * side + iy, return_inverse=True, return_counts=True)
+    sum_x = np.bincount(inverse, weights=x, minlength=cells.size)
+    sum_y = np.bincount(inverse, weights=y, minlength=cells.size)
+    return sum_x / counts, sum_y / counts, counts
+
+
+def histogram_bins(values: np.ndarray, max_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Histogram of the finite values
+
+    Returns:
+        (bin_centers, counts)
+    """
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+    bins = int(min(max_bins, max(1, np.ceil(np.sqrt(values.size)))))
+    counts, edges = np.histogram(values, bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, counts
@@ -0,0 +1,93 @@
+"""
+Deferred imports for heavy optional dependencies
+
+Importing the application must not pull in libraries that only one feature
+needs (plotly for charts, pyarrow/openpyxl for exports, sqlglot for dialect
+conversion, graphiti_core for the knowledge graph, ...). Modules that use
+them bind a proxy instead:
+
+    go = lazy_import("plotly.graph_objects")
+    PLOTLY_AVAILABLE = module_available("plotly")
+
+module_available() checks the installed distribution without importing it,
+and the proxy imports the real module on first attribute access. Every first
+load is timed so diagnostics can show which heavy modules a process
+actually paid for.
+
+HEAVY_MODULES lists the top-level packages that must stay unimported after
+`import app.core.application`; tests/test_import_budget.py enforces it along
+with import-time and RSS budgets.
+"""
+
+import importlib
+import importlib.util
+import logging
+import time
+from types import ModuleType
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = (
+    "plotly",
+    "pyarrow",
+    "openpyxl",
+    "sqlglot",
+    "graphiti_core",
+    "sentence_transformers",
+    "weasyprint",
+    "docx",
+    "langchain_aws",
+    "langchain_google_genai",
+    "langchain_mistralai",
+    "langchain_openai",
+)
+
+_load_times_ms: Dict[str, float] = {}
+
+
+def module_available(name: str) -> bool:
+    """True if `name` can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.__dict__["_lazy_target"] = module
+            _load_times_ms.setdefault(self.__name__, elapsed_ms)
+            logger.info(f"Loaded {self.__name__} on first use in {elapsed_ms:.0f}ms")
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Proxy for `name` that defers the import until first use"""
+    return LazyModule(name)
+
+
+def lazy_load_times() -> Dict[str, float]:
+    """Milliseconds spent on the first import of each lazily loaded module"""
+    return {name: round(ms, 1) for name, ms in _load_times_ms.items()}
@@ -0,0 +1,139 @@
+"""
+Microbenchmark: result anomaly detection, row-wise Python vs columnar NumPy.
+
+The "legacy" functions below reproduce the previous
+AnomalyDetectionService implementation (per-row get_val closure, string
+isdigit() numeric parsing, statistics.mean/stdev and a Python z-score loop)
+so both paths run on identical synthetic results.
+
+Usage:
+    python scripts/benchmark_anomaly_detection.py [--rows 1000 10000 100000] [--columns 20] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def legacy_numeric_outliers(values, z_threshold=3.0):
+    numeric_values = [float(v) for v in values if v is not None and str(v).replace('.', '', 1).replace('-', '', 1).isdigit()]
+    if len(numeric_values) < 3:
+        return {"has_outliers": False}
+    mean = statistics.mean(numeric_values)
+    stdev = statistics.stdev(numeric_values)
+    if stdev == 0:
+        return {"has_outliers": False}
+    outliers = []
+    for idx, value in enumerate(numeric_values):
+        z_score = abs((value - mean) / stdev)
+        if z_score > z_threshold:
+            outliers.append({"row_index": idx, "value": value, "z_score": round(z_score, 2)})
+    return {"has_outliers": len(outliers) > 0, "outlier_count": len(outliers)}
+
+
+def legacy_distribution(values):
+    non_null_values = [v for v in values if v is not None]
+    if len(non_null_values) < 3:
+        return []
+    value_counts = {}
+    for v in non_null_values:
+        v_str = str(v)
+        value_counts[v_str] = value_counts.get(v_str, 0) + 1
+    max_count = max(value_counts.values())
+    anomalies = []
+    if max_count / len(non_null_values) > 0.8 and len(value_counts) > 1:
+        anomalies.append("high_concentration")
+    if (len(values) - len(non_null_values)) / len(values) > 0.5:
+        anomalies.append("high_null_ratio")
+    return anomalies
+
+
+def legacy_analyze(columns, rows):
+    def get_val(r, idx, name):
+        if isinstance(r, dict):
+            return r.get(name)
+        try:
+            return r[idx]
+        except (IndexError, TypeError):
+            return None
+
+    anomalies = 0
+    for col_idx, col_name in enumerate(columns):
+        values = [get_val(row, col_idx, col_name) for row in rows]
+        if legacy_numeric_outliers(values).get("has_outliers"):
+            anomalies += 1
+        anomalies += len(legacy_distribution(values))
+    return anomalies
+
+
+def make_result(row_count: int, column_count: int, seed: int = 7):
+    rng = random.Random(seed)
+    kinds = ["int", "float", "text", "date", "category", "sparse"]
+    columns = [f"{kinds[i % len(kinds)].upper()}_{i}" for i in range(column_count)]
+    start = date(2024, 1, 1)
+    rows = []
+    for r in range(row_count):
+        row = []
+        for i in range(column_count):
+            kind = kinds[i % len(kinds)]
+            if kind == "int":
+                row.append(rng.randint(0, 1000) if r % 997 else 250_000)
+            elif kind == "float":
+                row.append(round(rng.gauss(100, 15), 2))
+            elif kind == "text":
+                row.append(f"customer-{rng.randint(0, 50_000)}")
+            elif kind == "date":
+                row.append((start + timedelta(days=r % 365)).isoformat())
+            elif kind == "category":
+                row.append("EMEA" if rng.random() < 0.9 else "APAC")
+            else:
+                row.append(rng.random() if rng.random() < 0.3 else None)
+        rows.append(row)
+    return columns, rows
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples), statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.services.anomaly_detection_service import AnomalyDetectionService
+
+    print(f"{'rows':>8} {'cols':>5} {'legacy p50':>12} {'numpy p50':>12} {'speedup':>8}  numpy budget/sampled")
+    for row_count in args.rows:
+        columns, rows = make_result(row_count, args.columns)
+        _, legacy_ms = _time(lambda: legacy_analyze(columns, rows), args.repeat)
+        report = {}
+
+        def vectorized():
+            # Unlimited budget so both paths analyze every column
+            report.update(AnomalyDetectionService.analyze_query_results({}, columns, rows, time_budget=float("inf")))
+
+        _, numpy_ms = _time(vectorized, args.repeat)
+        print(
+            f"{row_count:>8} {args.columns:>5} {legacy_ms:>10.1f}ms {numpy_ms:>10.1f}ms "
+            f"{legacy_ms / numpy_ms:>7.1f}x  {report['columns_analyzed']}/{args.columns} cols, "
+            f"sampled={report['sampled']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
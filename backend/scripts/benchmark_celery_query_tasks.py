@@ -0,0 +1,125 @@
+"""
+Benchmark per-task overhead of Celery query execution.
+
+Compares the previous task path (fresh SQLcl client per task: spawn,
+initialize, connect, execute, close) against the worker-resident runtime
+(persistent event loop + SQLcl pool). A stub SQLcl executable stands in for
+the JVM: it sleeps --startup-ms before printing its banner, then answers the
+JSON-RPC calls the client makes.
+
+Redis caching is left out so the numbers isolate SQLcl/event-loop overhead.
+
+Usage:
+    python scripts/benchmark_celery_query_tasks.py [--tasks 20] [--startup-ms 1500]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+SQL = "SELECT 1 AS X FROM DUAL"
+
+
+def run_stub_sqlcl(startup_ms: int) -> None:
+    """Minimal SQLcl MCP stand-in speaking line-delimited JSON-RPC on stdio"""
+    time.sleep(startup_ms / 1000)
+    for i in range(4):
+        print(f"SQLcl stub banner line {i + 1}", flush=True)
+
+    for line in sys.stdin:
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if "id" not in message:
+            continue  # notifications
+        method = message.get("method")
+        if method == "initialize":
+            result = {"serverInfo": {"name": "sqlcl-stub"}, "capabilities": {}}
+        elif method == "tools/list":
+            result = {"tools": [{"name": "connect"}, {"name": "run-sql"}]}
+        else:
+            tool = message.get("params", {}).get("name")
+            text = "Connected" if tool == "connect" else '"X"\n1'
+            result = {"content": [{"type": "text", "text": text}]}
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+
+
+def _summarize(label: str, samples_ms: list) -> None:
+    ordered = sorted(samples_ms)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<22} mean={statistics.fmean(ordered):9.1f} ms  "
+        f"p50={statistics.median(ordered):9.1f} ms  p95={p95:9.1f} ms  n={len(ordered)}"
+    )
+
+
+async def _legacy_task() -> dict:
+    from app.core.config import settings
+    from app.core.mcp_client import create_mcp_client
+
+    client = create_mcp_client()
+    try:
+        await client.initialize()
+        await client.connect_database(settings.oracle_default_connection)
+        return await client.execute_sql(SQL, connection_name=settings.oracle_default_connection)
+    finally:
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--startup-ms", type=int, default=1500, help="Simulated JVM startup time")
+    parser.add_argument("--stub-sqlcl", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stub_sqlcl:
+        run_stub_sqlcl(args.startup_ms)
+        return
+
+    from app.core.config import settings
+    settings.sqlcl_path = sys.executable
+    settings.sqlcl_args = [os.path.abspath(__file__), "--stub-sqlcl", "--startup-ms", str(args.startup_ms)]
+
+    from app.core.celery_worker_runtime import get_worker_runtime
+    from app.tasks.query_tasks import _run_sql
+
+    # Previous path: one client (and one SQLcl process) per task
+    legacy = []
+    for _ in range(args.tasks):
+        start = time.perf_counter()
+        asyncio.run(_legacy_task())
+        legacy.append((time.perf_counter() - start) * 1000)
+
+    # Worker-resident path: pay startup once, then reuse loop + pool
+    runtime = get_worker_runtime()
+    start = time.perf_counter()
+    runtime.start()
+    startup_ms = (time.perf_counter() - start) * 1000
+    resident = []
+    try:
+        for _ in range(args.tasks):
+            start = time.perf_counter()
+            result = runtime.run(_run_sql(SQL))
+            resident.append((time.perf_counter() - start) * 1000)
+        assert result.get("status") == "success", result
+    finally:
+        runtime.stop()
+
+    print(f"Simulated SQLcl startup: {args.startup_ms} ms, tasks: {args.tasks}")
+    _summarize("per-task client", legacy)
+    _summarize("worker-resident", resident)
+    print(f"{'worker start (once)':<22} {startup_ms:9.1f} ms")
+    print(f"{'speedup (mean)':<22} {statistics.fmean(legacy) / statistics.fmean(resident):9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark QueryHistoryService latency for a full (50 entry) session.
+
+Requires a reachable Redis at settings.REDIS_URL. Seeds a throwaway session,
+then reports p50/p95 latency for listing, undo, redo and push. The session
+lists and every history_entry written are deleted afterwards.
+
+Usage:
+    python scripts/benchmark_history_latency.py [--iterations 200]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.redis_client import redis_client
+from app.services.query_history_service import QueryHistoryService
+
+
+def _summarize(label: str, samples_ms: list) -> None:
+    ordered = sorted(samples_ms)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<28} p50={statistics.median(ordered):7.3f} ms  p95={p95:7.3f} ms  n={len(ordered)}")
+
+
+async def _timed(samples: list, coro) -> None:
+    start = time.perf_counter()
+    await coro
+    samples.append((time.perf_counter() - start) * 1000)
+
+
+async def run(iterations: int) -> None:
+    await redis_client.connect()
+    session_id = f"bench-{uuid.uuid4()}"
+    size = QueryHistoryService.MAX_HISTORY_SIZE
+    entry_ids = []
+    try:
+        for i in range(size):
+            entry_ids.append(await QueryHistoryService.push_query_state(
+                session_id=session_id,
+                user_query=f"benchmark query {i}",
+                sql_query=f"SELECT {i} FROM DUAL",
+                result_summary={"row_count": i},
+            ))
+
+        listing, undo, redo, push = [], [], [], []
+        for _ in range(iterations):
+            await _timed(listing, QueryHistoryService.get_session_history(session_id, limit=size))
+            await _timed(undo, QueryHistoryService.undo(session_id))
+            await _timed(redo, QueryHistoryService.redo(session_id))
+
+        async def timed_push(i: int) -> None:
+            entry_ids.append(await QueryHistoryService.push_query_state(
+                session_id=session_id,
+                user_query=f"benchmark push {i}",
+                sql_query="SELECT 1 FROM DUAL",
+            ))
+
+        for i in range(iterations):
+            await _timed(push, timed_push(i))
+
+        print("\n" + "=" * 80)
+        print(f" QUERY HISTORY LATENCY ({size} entries per session)")
+        print("=" * 80)
+        _summarize(f"get_session_history({size})", listing)
+        _summarize("undo", undo)
+        _summarize("redo", redo)
+        _summarize("push_query_state", push)
+    finally:
+        await QueryHistoryService.clear_history(session_id)
+        pipe = redis_client.pipeline(transaction=False)
+        for entry_id in entry_ids:
+            pipe.delete(f"history_entry:{entry_id}")
+        await pipe.execute()
+        await redis_client.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
@@ -0,0 +1,170 @@
+"""
+Benchmark PersistentMemoryService round trips on 100-entry histories.
+
+Requires a reachable Redis at settings.REDIS_URL. Seeds a throwaway user with
+100 conversations and a concept with 100 learned mappings, then compares the
+previous per-key implementation (reproduced inline as "legacy") against the
+pipelined/Lua service. --rtt-ms adds an artificial network delay through a
+local TCP proxy so the round-trip savings are visible against a local Redis.
+
+Usage:
+    python scripts/benchmark_persistent_memory.py [--iterations 100] [--rtt-ms 1.0]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.services.persistent_memory_service import PersistentMemoryService
+
+HISTORY_SIZE = 100
+
+
+async def legacy_history(user_id: str, limit: int):
+    ids = await redis_client._client.lrange(f"user:{user_id}:conversations", 0, max(0, limit - 1))
+    out = []
+    for cid in ids:
+        conv = await redis_client.get(f"conv:{cid}")
+        if conv:
+            out.append(conv)
+    return out
+
+
+async def legacy_store(user_id: str, session_id: str, i: int):
+    conversation_id = str(uuid.uuid4())
+    await redis_client.set(f"conv:{conversation_id}", {"conversation_id": conversation_id, "user_query": f"q{i}"}, ttl=3600)
+    await redis_client._client.lpush(f"user:{user_id}:conversations", conversation_id)
+    await redis_client._client.ltrim(f"user:{user_id}:conversations", 0, 499)
+    await redis_client._client.lpush(f"session:{session_id}:conversations", conversation_id)
+    await redis_client._client.ltrim(f"session:{session_id}:conversations", 0, 499)
+
+
+async def legacy_mappings(concept: str, limit: int):
+    ids = list(await redis_client._client.smembers(f"mappings:concept:{concept.upper()}"))
+    out = []
+    for mid in ids[:limit]:
+        m = await redis_client.get(f"mapping:{mid}")
+        if m:
+            out.append(m)
+    return out
+
+
+async def legacy_update_usage(mapping_id: str):
+    key = f"mapping:{mapping_id}"
+    m = await redis_client.get(key)
+    if m:
+        m["usage_count"] = int(m.get("usage_count", 0)) + 1
+        await redis_client.set(key, m, ttl=3600)
+
+
+def _summarize(label: str, samples_ms: list) -> None:
+    ordered = sorted(samples_ms)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<36} p50={statistics.median(ordered):8.3f} ms  p95={p95:8.3f} ms  n={len(ordered)}")
+
+
+async def _timed(samples: list, coro) -> None:
+    start = time.perf_counter()
+    await coro
+    samples.append((time.perf_counter() - start) * 1000)
+
+
+async def _start_delay_proxy(target_host: str, target_port: int, delay_s: float):
+    """TCP proxy that delays each upstream chunk by delay_s (one simulated RTT)"""
+
+    async def pump(reader, writer, delay):
+        try:
+            while data := await reader.read(65536):
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        upstream_reader, upstream_writer = await asyncio.open_connection(target_host, target_port)
+        asyncio.create_task(pump(client_reader, upstream_writer, delay_s))
+        asyncio.create_task(pump(upstream_reader, client_writer, 0))
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def run(iterations: int, rtt_ms: float) -> None:
+    proxy = None
+    if rtt_ms > 0:
+        proxy = await _start_delay_proxy(settings.REDIS_HOST, settings.REDIS_PORT, rtt_ms / 1000)
+        settings.REDIS_HOST = "127.0.0.1"
+        settings.REDIS_PORT = proxy.sockets[0].getsockname()[1]
+    await redis_client.connect()
+
+    user_id = f"bench-{uuid.uuid4()}"
+    session_id = f"bench-{uuid.uuid4()}"
+    concept = f"BENCH_{uuid.uuid4().hex[:8]}"
+    mapping_ids = []
+    try:
+        for i in range(HISTORY_SIZE):
+            await PersistentMemoryService.store_conversation(
+                user_id=user_id, session_id=session_id, user_query=f"benchmark question {i}",
+                intent="query", sql_query=f"SELECT {i} FROM DUAL", execution_status="success",
+                result_summary={"row_count": i},
+            )
+            mapping_ids.append(await PersistentMemoryService.store_learned_mapping(concept, "BENCH", f"COL_{i}"))
+
+        results = {name: [] for name in (
+            "legacy history", "history", "legacy mappings", "mappings",
+            "legacy store", "store", "legacy usage update", "usage update",
+        )}
+        for i in range(iterations):
+            await _timed(results["legacy history"], legacy_history(user_id, HISTORY_SIZE))
+            await _timed(results["history"], PersistentMemoryService.get_user_conversation_history(user_id, limit=HISTORY_SIZE))
+            await _timed(results["legacy mappings"], legacy_mappings(concept, HISTORY_SIZE))
+            await _timed(results["mappings"], PersistentMemoryService.get_learned_mappings(concept=concept, limit=HISTORY_SIZE))
+            await _timed(results["legacy store"], legacy_store(user_id, session_id, i))
+            await _timed(results["store"], PersistentMemoryService.store_conversation(
+                user_id=user_id, session_id=session_id, user_query=f"q{i}", intent="query",
+                sql_query="SELECT 1 FROM DUAL", execution_status="success",
+            ))
+            await _timed(results["legacy usage update"], legacy_update_usage(mapping_ids[i % HISTORY_SIZE]))
+            await _timed(results["usage update"], PersistentMemoryService.update_mapping_usage(mapping_ids[i % HISTORY_SIZE]))
+
+        print("\n" + "=" * 80)
+        print(f" PERSISTENT MEMORY LATENCY ({HISTORY_SIZE} entries, simulated RTT {rtt_ms} ms)")
+        print("=" * 80)
+        for label in ("history", "mappings", "store", "usage update"):
+            _summarize(f"legacy {label}", results[f"legacy {label}"])
+            _summarize(f"pipelined {label}", results[label])
+    finally:
+        client = redis_client._client
+        conv_ids = await client.lrange(f"user:{user_id}:conversations", 0, -1)
+        await client.delete(
+            f"user:{user_id}:conversations", f"session:{session_id}:conversations",
+            f"mappings:concept:{concept}", "mappings:table:BENCH",
+            *[f"conv:{cid}" for cid in conv_ids],
+            *[f"mapping:{mid}" for mid in mapping_ids],
+            *[f"mapping:{mid}:usage" for mid in mapping_ids],
+        )
+        for mid in mapping_ids:
+            await client.lrem("mappings:index", 0, mid)
+        await redis_client.disconnect()
+        if proxy:
+            proxy.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Artificial round-trip delay added per request")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.rtt_ms))
@@ -0,0 +1,117 @@
+"""
+Benchmark PostgreSQL latency for small, frequent queries.
+
+Runs the same set of small lookup queries through two execution paths against
+the database configured by the POSTGRES_* settings:
+
+- per-query setup: SET TRANSACTION READ ONLY on checkout, SET statement_timeout
+  before every query, sqlglot validation on every call, a per-request marker
+  (so no statement text repeats), text rows copied with [list(row) ...]
+- configured pool: PostgreSQLClient.execute_query with session defaults from
+  the pool configure hook, cached validation, prepared statements for repeated
+  texts and binary rows built as lists
+
+Usage:
+    python scripts/benchmark_postgres_small_queries.py [--iterations 500] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import psycopg_pool
+
+from app.core.config import settings
+from app.core.postgres_client import PostgreSQLClient
+
+QUERIES = [
+    "SELECT 1",
+    "SELECT oid, typname FROM pg_type WHERE typname = 'int4'",
+    "SELECT n.nspname, count(*) FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace GROUP BY n.nspname",
+    "SELECT datname, numbackends, xact_commit FROM pg_stat_database WHERE datname = current_database()",
+    "SELECT now(), current_setting('statement_timeout'), 42::numeric * 1.5",
+]
+
+
+def _summarize(label: str, samples_ms: list, elapsed: float) -> None:
+    ordered = sorted(samples_ms)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<20} mean={statistics.fmean(ordered):7.3f} ms  p50={statistics.median(ordered):7.3f} ms  "
+        f"p95={p95:7.3f} ms  throughput={len(ordered) / elapsed:8.1f} q/s"
+    )
+
+
+async def _drive(run_one, iterations: int, concurrency: int) -> tuple:
+    samples = []
+
+    async def worker(worker_id: int):
+        for i in range(iterations):
+            sql = QUERIES[i % len(QUERIES)]
+            start = time.perf_counter()
+            await run_one(sql, f"bench-{worker_id}-{i}")
+            samples.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+async def run(iterations: int, concurrency: int) -> None:
+    client = PostgreSQLClient()
+    await client.initialize()
+
+    # Per-query setup path, on its own unconfigured pool
+    conninfo = (
+        f"host={settings.POSTGRES_HOST} port={settings.POSTGRES_PORT} dbname={settings.POSTGRES_DATABASE} "
+        f"user={settings.POSTGRES_USER} password={settings.POSTGRES_PASSWORD}"
+    )
+    legacy_pool = psycopg_pool.AsyncConnectionPool(
+        conninfo=conninfo, min_size=concurrency, max_size=concurrency, open=False
+    )
+    await legacy_pool.open()
+    await legacy_pool.wait()
+
+    async def per_query_setup(sql: str, request_id: str):
+        client._validate_readonly_query(sql)
+        async with legacy_pool.connection() as conn:
+            await conn.execute("SET TRANSACTION READ ONLY")
+            await conn.execute(f"SET statement_timeout = {settings.POSTGRES_QUERY_TIMEOUT * 1000}")
+            async with conn.cursor() as cur:
+                await cur.execute(f"/* LLM Query - User: bench, Request: {request_id} */\n{sql}")
+                rows = await cur.fetchall()
+                return [list(row) for row in rows]
+
+    async def configured_pool(sql: str, request_id: str):
+        return await client.execute_query(sql, "bench", request_id)
+
+    try:
+        # Warm up both pools (and the configured path's prepared statements)
+        await _drive(per_query_setup, 10, concurrency)
+        await _drive(configured_pool, 10, concurrency)
+
+        _summarize("per-query setup", *await _drive(per_query_setup, iterations, concurrency))
+        _summarize("configured pool", *await _drive(configured_pool, iterations, concurrency))
+        health = await client.health_check()
+        print(f"execution stats: {health.get('execution')}")
+    finally:
+        await legacy_pool.close()
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500, help="Queries per concurrent worker")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent workers")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark event loop lag while reports render concurrently.
+
+Renders N reports at once two ways and samples event loop lag throughout:
+- inline: the previous path, rendering inside the async method on the loop
+- pool: the rendering process pool (ReportRenderPool)
+
+Lag is what every concurrent API call / SSE stream in the worker would
+have waited. Uses WeasyPrint / python-docx when installed; pass
+--synthetic-ms to substitute a CPU-bound render of that length (useful when
+the rendering libraries are not installed).
+
+Usage:
+    python scripts/benchmark_report_rendering.py [--format pdf] [--renders 8] [--rows 2000] [--synthetic-ms 0]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def synthetic_render(fmt, report_data):
+    deadline = time.perf_counter() + report_data["synthetic_ms"] / 1000
+    while time.perf_counter() < deadline:
+        pass
+    return f"{fmt}:{report_data['title']}".encode()
+
+
+def _report_data(index: int, rows: int, synthetic_ms: int) -> dict:
+    from app.services.report_generation_service import ReportGenerationService
+
+    query_results = [{
+        "columns": ["REGION", "REVENUE", "UNITS"],
+        "rows": [[f"region-{i % 50}", i * 10.5, i] for i in range(rows)],
+        "row_count": rows,
+    }]
+    data = ReportGenerationService._build_report_data(query_results, f"Benchmark report {index}", None)
+    data["synthetic_ms"] = synthetic_ms
+    return data
+
+
+async def _measure(label: str, renders, interval: float) -> None:
+    from app.core.event_loop_monitor import EventLoopLagMonitor
+
+    monitor = EventLoopLagMonitor(interval=interval)
+    monitor.start()
+    await asyncio.sleep(interval * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*renders)
+    elapsed = (time.perf_counter() - start) * 1000
+    # Let the monitor record the wake-up that was delayed by blocking renders
+    await asyncio.sleep(interval * 2)
+    await monitor.stop()
+    lag = monitor.snapshot()
+    print(
+        f"{label:<8} wall={elapsed:8.0f} ms  lag p50={lag['p50_ms']:7.1f} ms  "
+        f"p99={lag['p99_ms']:7.1f} ms  max={lag['max_ms']:7.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=["pdf", "docx"], default="pdf")
+    parser.add_argument("--renders", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--synthetic-ms", type=int, default=0)
+    parser.add_argument("--interval-ms", type=int, default=10, help="Lag sampling interval")
+    args = parser.parse_args()
+
+    from app.core.report_render_pool import ReportRenderPool
+    from app.services.report_generation_service import render_report_document
+
+    render_fn = synthetic_render if args.synthetic_ms else render_report_document
+    interval = args.interval_ms / 1000
+
+    async def inline(data):
+        # Previous behaviour: blocking render inside the coroutine
+        return render_fn(args.format, data)
+
+    datasets = [_report_data(i, args.rows, args.synthetic_ms) for i in range(args.renders)]
+    print(f"{args.renders} concurrent {args.format} renders, {args.rows} rows each, "
+          f"renderer={'synthetic' if args.synthetic_ms else 'report_generation_service'}")
+
+    await _measure("inline", [inline(d) for d in datasets], interval)
+
+    pool = ReportRenderPool(max_workers=args.workers, queue_size=args.renders, cache_max_bytes=0)
+    try:
+        await pool.render(render_fn, args.format, {**datasets[0], "title": "warmup"})  # spawn workers
+        await _measure("pool", [pool.render(render_fn, args.format, d) for d in datasets], interval)
+        print(f"pool status: {pool.get_status()}")
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""
+Benchmark SQL dialect conversion CPU with and without the transpilation cache.
+
+Replays a query corpus through SQLDialectConverter (Oracle -> Doris and
+Oracle -> PostgreSQL) twice: once with the cache disabled and once enabled,
+reporting per-statement transpile CPU and the cache hit ratio. The corpus is
+either a file with one Oracle statement per line (--corpus) or a synthetic
+replay of recurring templates with varying literals.
+
+Usage:
+    python scripts/benchmark_sql_transpile.py [--corpus queries.sql] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.sql_dialect_converter import SQLDialectConverter
+from app.core.transpile_cache import transpile_cache
+
+TEMPLATES = [
+    "SELECT region, SUM(amount) FROM sales WHERE sale_date >= DATE '2024-{m:02d}-01' AND region = '{r}' GROUP BY region ORDER BY 2 DESC FETCH FIRST {n} ROWS ONLY",
+    "SELECT NVL(c.name, 'unknown'), COUNT(*) FROM customers c JOIN orders o ON o.customer_id = c.id WHERE o.amount > {n} GROUP BY c.name",
+    "SELECT * FROM orders WHERE status = '{s}' AND created_at > SYSDATE - {n} AND ROWNUM <= 100",
+    "SELECT product_id, AVG(price) OVER (PARTITION BY category ORDER BY sale_date ROWS BETWEEN {n} PRECEDING AND CURRENT ROW) FROM sales WHERE category = '{r}'",
+    "SELECT TO_CHAR(created_at, 'YYYY-MM'), COUNT(*) FROM events WHERE event_type = '{s}' GROUP BY TO_CHAR(created_at, 'YYYY-MM')",
+    "WITH recent AS (SELECT * FROM orders WHERE amount BETWEEN {n} AND {n2}) SELECT customer_id, MAX(amount) FROM recent GROUP BY customer_id",
+]
+REGIONS = ["EU", "US", "APAC", "LATAM", "MEA"]
+STATUSES = ["OPEN", "SHIPPED", "CANCELLED", "RETURNED"]
+
+
+def synthetic_corpus(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        n = rng.randint(1, 500)
+        corpus.append(rng.choice(TEMPLATES).format(
+            m=rng.randint(1, 12), r=rng.choice(REGIONS), s=rng.choice(STATUSES), n=n, n2=n + rng.randint(1, 500)
+        ))
+    return corpus
+
+
+def _summarize(label: str, samples_ms: list) -> None:
+    ordered = sorted(samples_ms)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<28} mean={statistics.fmean(ordered):7.3f} ms  p50={statistics.median(ordered):7.3f} ms  p95={p95:7.3f} ms  n={len(ordered)}")
+
+
+def replay(corpus: list, enabled: bool) -> list:
+    transpile_cache.clear()
+    transpile_cache.enabled = enabled
+    samples = []
+    for sql in corpus:
+        for convert in (SQLDialectConverter.convert_to_doris, SQLDialectConverter.convert_to_postgres):
+            start = time.thread_time()
+            convert(sql)
+            samples.append((time.thread_time() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="File with one Oracle statement per line")
+    parser.add_argument("--queries", type=int, default=2000, help="Synthetic corpus size")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus) as f:
+            corpus = [line.strip() for line in f if line.strip()]
+    else:
+        corpus = synthetic_corpus(args.queries)
+
+    # Warm up sqlglot's dialect tables so the first run is not penalized
+    replay(corpus[:20], enabled=False)
+
+    _summarize("uncached", replay(corpus, enabled=False))
+    cached = replay(corpus, enabled=True)
+    _summarize("cached", cached)
+
+    status = transpile_cache.get_status()
+    print(
+        f"hit ratio={status['hit_ratio']}  hits={status['hits']}  exact_hits={status['exact_hits']}  "
+        f"misses={status['misses']}  entries={status['entries']}  "
+        f"avg hit cpu={status['avg_hit_cpu_ms']} ms  avg miss cpu={status['avg_miss_cpu_ms']} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark chart build time and payload size with server-side downsampling.
+
+For each size, builds a line chart (time series) and a scatter chart twice:
+"full" ships every point (budget above the row count, the previous
+behaviour) and "budget" applies the VIZ_MAX_POINTS point budget (LTTB for
+lines, grid binning for scatter). Payload is the JSON-encoded plotly_json
+returned to the browser.
+
+Usage:
+    python scripts/benchmark_visualization_payload.py [--points 10000 100000 1000000] [--budget 5000]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def make_series(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    columns = ["EVENT_TIME", "LATENCY_MS"]
+    rows = [
+        [(start + timedelta(seconds=30 * i)).isoformat(), 100 + 40 * math.sin(i / 500) + rng.gauss(0, 5) + (400 if i % 9973 == 0 else 0)]
+        for i in range(n)
+    ]
+    return columns, rows
+
+
+def make_cloud(n: int, seed: int = 13):
+    rng = random.Random(seed)
+    columns = ["ORDER_VALUE", "DISCOUNT"]
+    rows = [[rng.lognormvariate(4, 0.6), rng.gauss(10, 3)] for _ in range(n)]
+    return columns, rows
+
+
+def build(columns, rows, chart_type, max_points):
+    from app.services.visualization_service import VisualizationService
+
+    start = time.perf_counter()
+    result = VisualizationService.generate_chart(columns, rows, chart_type=chart_type, max_points=max_points)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert result["status"] == "success", result
+    payload = len(json.dumps(result["plotly_json"]).encode("utf-8"))
+    return elapsed_ms, payload, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--budget", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'chart':<8} {'points':>9} {'mode':<7} {'build':>10} {'payload':>11} {'rendered':>9}")
+    for n in args.points:
+        for chart_type, maker in (("line", make_series), ("scatter", make_cloud)):
+            columns, rows = maker(n)
+            for mode, budget in (("full", n + 1), ("budget", args.budget)):
+                elapsed_ms, payload, result = build(columns, rows, chart_type, budget)
+                info = result.get("downsampling") or {}
+                rendered = info.get("rendered_points", n)
+                print(f"{chart_type:<8} {n:>9,} {mode:<7} {elapsed_ms:>8.0f}ms {payload / 1024:>9.0f}KB {rendered:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,8 +29,8 @@ import secrets
 import time
 import asyncio
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
 from ..utils.logger import get_logger
@@ -70,6 +70,28 @@ class TokenValidationResult:
     is_valid: bool
     token_info: Optional[TokenInfo] = None
     error_message: Optional[str] = None
+    resolved: Optional["ResolvedToken"] = None
+
+
+@dataclass(frozen=True)
+class ResolvedToken:
+    """Immutable authentication context precomputed for a token hash
+    
+    Built whenever the token table changes so request-time validation is a
+    single dictionary lookup plus an expiry comparison.
+    """
+    
+    token_hash: str
+    token_id: str
+    user_id: str
+    roles: Tuple[str, ...]
+    permissions: Tuple[str, ...]
+    security_level: SecurityLevel
+    is_active: bool
+    expires_at_ts: Optional[float]
+    database_config: Optional[DatabaseConfig]
+    token_info: TokenInfo
+    validation_result: TokenValidationResult
 
 
 class TokenManager:
@@ -91,6 +113,15 @@ class TokenManager:
         self._tokens: Dict[str, TokenInfo] = {}  # token_hash -> TokenInfo
         self._token_ids: Dict[str, str] = {}     # token_id -> token_hash
         
+        # Read-only resolution index (token_hash -> ResolvedToken), replaced as a whole on change
+        self._resolved: Dict[str, ResolvedToken] = {}
+        self._index_version = 0
+        
+        # Coalesced last_used updates (token_hash -> timestamp), applied in batches
+        self._pending_last_used: Dict[str, float] = {}
+        self.last_used_flush_interval = 5
+        self._last_used_flush_task = None
+        
         # Configuration
         self.token_file_path = getattr(config.security, 'token_file_path', 'tokens.json')
         self.enable_token_expiry = getattr(config.security, 'enable_token_expiry', True)
@@ -108,10 +139,12 @@ class TokenManager:
         
         # Load tokens from configuration
         self._load_tokens()
+        self._rebuild_index()
         
         # Start hot reload monitoring
         if self.enable_hot_reload:
             self._start_hot_reload()
+        self._start_last_used_flush()
         
         self.logger.info(f"TokenManager initialized with {len(self._tokens)} tokens, hot reload: {self.enable_hot_reload}")
     
@@ -320,41 +353,66 @@ class TokenManager:
             # Fallback to sha256
             return hashlib.sha256(token.encode('utf-8')).hexdigest()
     
+    def _build_resolved_token(self, token_hash: str, token_info: TokenInfo) -> ResolvedToken:
+        """Precompute the authentication context for a token"""
+        validation_result = TokenValidationResult(is_valid=True, token_info=token_info)
+        resolved = ResolvedToken(
+            token_hash=token_hash,
+            token_id=token_info.token_id,
+            user_id=token_info.token_id,  # Use token_id as user_id for token auth
+            roles=("token_user",),  # Default role for token users
+            permissions=("read", "write"),  # Default permissions for token users
+            security_level=SecurityLevel.INTERNAL,
+            is_active=token_info.is_active,
+            expires_at_ts=(
+                token_info.expires_at.replace(tzinfo=timezone.utc).timestamp()
+                if token_info.expires_at else None
+            ),
+            database_config=token_info.database_config,
+            token_info=token_info,
+            validation_result=validation_result
+        )
+        validation_result.resolved = resolved
+        return resolved
+    
+    def _rebuild_index(self):
+        """Rebuild the resolution index and publish it with a single reference swap"""
+        self._resolved = {
+            token_hash: self._build_resolved_token(token_hash, token_info)
+            for token_hash, token_info in self._tokens.items()
+        }
+        self._index_version += 1
+    
+    def resolve_token(self, token: str) -> Tuple[Optional[ResolvedToken], Optional[str]]:
+        """Resolve a raw token to its precomputed context in one lookup
+        
+        Returns:
+            (resolved, error_message): resolved is None when the token is rejected
+        """
+        resolved = self._resolved.get(self._hash_token(token))
+        if resolved is None:
+            return None, "Invalid token"
+        if not resolved.is_active:
+            return None, "Token is inactive"
+        now = time.time()
+        if resolved.expires_at_ts is not None and now > resolved.expires_at_ts:
+            return None, "Token has expired"
+        return resolved, None
+    
     async def validate_token(self, token: str) -> TokenValidationResult:
         """Validate token and return user information"""
         try:
-            # Hash the provided token
-            token_hash = self._hash_token(token)
-            
-            # Find token info
-            token_info = self._tokens.get(token_hash)
-            if not token_info:
+            resolved, error_message = self.resolve_token(token)
+            if resolved is None:
                 return TokenValidationResult(
                     is_valid=False,
-                    error_message="Invalid token"
+                    error_message=error_message
                 )
             
-            # Check if token is active
-            if not token_info.is_active:
-                return TokenValidationResult(
-                    is_valid=False,
-                    error_message="Token is inactive"
-                )
+            # Record usage; applied to TokenInfo.last_used in batches
+            self._pending_last_used[resolved.token_hash] = time.time()
             
-            # Check expiration
-            if token_info.expires_at and datetime.utcnow() > token_info.expires_at:
-                return TokenValidationResult(
-                    is_valid=False,
-                    error_message="Token has expired"
-                )
-            
-            # Update last used time
-            token_info.last_used = datetime.utcnow()
-            
-            return TokenValidationResult(
-                is_valid=True,
-                token_info=token_info
-            )
+            return resolved.validation_result
             
         except Exception as e:
             self.logger.error(f"Token validation error: {e}")
@@ -406,6 +464,7 @@ class TokenManager:
             token_hash = self._hash_token(raw_token)
             self._tokens[token_hash] = token_info
             self._token_ids[token_id] = token_hash
+            self._rebuild_index()
             
             self.logger.info(f"Created new token '{token_id}'")
             
@@ -430,6 +489,7 @@ class TokenManager:
             if token_hash in self._tokens:
                 del self._tokens[token_hash]
             del self._token_ids[token_id]
+            self._rebuild_index()
             
             self.logger.info(f"Revoked token '{token_id}'")
             
@@ -629,6 +689,7 @@ class TokenManager:
     
     async def list_tokens(self) -> List[Dict[str, Any]]:
         """List all tokens (without sensitive data)"""
+        self.flush_last_used()
         tokens = []
         
         for token_hash, token_info in self._tokens.items():
@@ -681,6 +742,7 @@ class TokenManager:
                 del self._token_ids[token_id]
         
         if expired_tokens:
+            self._rebuild_index()
             self.logger.info(f"Cleaned up {len(expired_tokens)} expired tokens")
         
         return len(expired_tokens)
@@ -717,17 +779,8 @@ class TokenManager:
             DatabaseConfig if token exists and has database binding, None otherwise
         """
         try:
-            token_hash = self._hash_token(token)
-            token_info = self._tokens.get(token_hash)
-            
-            if not token_info or not token_info.is_active:
-                return None
-                
-            # Check expiration
-            if token_info.expires_at and datetime.utcnow() > token_info.expires_at:
-                return None
-                
-            return token_info.database_config
+            resolved, _ = self.resolve_token(token)
+            return resolved.database_config if resolved else None
             
         except Exception as e:
             self.logger.error(f"Failed to get database config for token: {e}")
@@ -751,9 +804,46 @@ class TokenManager:
             'expiry_enabled': self.enable_token_expiry,
             'default_expiry_hours': self.default_token_expiry_hours,
             'hot_reload_enabled': self.enable_hot_reload,
+            'index_version': self._index_version,
+            'pending_last_used_updates': len(self._pending_last_used),
             'last_file_check': datetime.fromtimestamp(self._file_last_modified).isoformat() if self._file_last_modified else None
         }
     
+    def flush_last_used(self) -> int:
+        """Apply coalesced last_used updates to token records and return how many were applied"""
+        if not self._pending_last_used:
+            return 0
+        pending, self._pending_last_used = self._pending_last_used, {}
+        applied = 0
+        for token_hash, used_at in pending.items():
+            token_info = self._tokens.get(token_hash)
+            if token_info is not None:
+                token_info.last_used = datetime.fromtimestamp(used_at, timezone.utc).replace(tzinfo=None)
+                applied += 1
+        return applied
+    
+    def _start_last_used_flush(self):
+        """Start the periodic last_used flush task"""
+        if self._last_used_flush_task:
+            return
+        try:
+            self._last_used_flush_task = asyncio.create_task(self._last_used_flush_loop())
+        except RuntimeError:
+            # No running event loop; updates are flushed on read instead
+            self._last_used_flush_task = None
+    
+    async def _last_used_flush_loop(self):
+        """Background task applying batched last_used updates"""
+        while True:
+            try:
+                await asyncio.sleep(self.last_used_flush_interval)
+                self.flush_last_used()
+            except asyncio.CancelledError:
+                self.flush_last_used()
+                break
+            except Exception as e:
+                self.logger.error(f"Error flushing token last_used updates: {e}")
+    
     def _start_hot_reload(self):
         """Start hot reload monitoring task"""
         if self._hot_reload_task:
@@ -772,6 +862,10 @@ class TokenManager:
             self._hot_reload_task.cancel()
             self._hot_reload_task = None
             self.logger.info("Stopped hot reload monitoring")
+        if self._last_used_flush_task:
+            self._last_used_flush_task.cancel()
+            self._last_used_flush_task = None
+        self.flush_last_used()
     
     def _update_file_modified_time(self):
         """Update the last modified time of tokens file"""
@@ -781,6 +875,31 @@ class TokenManager:
         except Exception as e:
             self.logger.debug(f"Failed to get file modification time: {e}")
     
+    def _reload_tokens(self):
+        """Rebuild the token tables from configuration and swap them in atomically
+        
+        Readers keep resolving against the previous index until the new one is
+        published; on failure the previous tables are restored untouched.
+        """
+        self.flush_last_used()
+        old_tokens, old_token_ids = self._tokens, self._token_ids
+        
+        self._tokens, self._token_ids = {}, {}
+        try:
+            self._initialize_default_tokens()
+            self._load_tokens()
+        except Exception:
+            self._tokens, self._token_ids = old_tokens, old_token_ids
+            raise
+        
+        # Preserve usage history for tokens that survive the reload
+        for token_hash, token_info in self._tokens.items():
+            previous = old_tokens.get(token_hash)
+            if previous is not None and token_info.last_used is None:
+                token_info.last_used = previous.last_used
+        
+        self._rebuild_index()
+    
     async def _hot_reload_monitor(self):
         """Background task to monitor tokens.json file changes"""
         while True:
@@ -796,19 +915,7 @@ class TokenManager:
                     self.logger.info(f"Detected changes in {self.token_file_path}, reloading tokens...")
                     
                     try:
-                        # Backup current tokens
-                        old_tokens = self._tokens.copy()
-                        old_token_ids = self._token_ids.copy()
-                        
-                        # Clear and reload
-                        self._tokens.clear()
-                        self._token_ids.clear()
-                        
-                        # Reinitialize default tokens
-                        self._initialize_default_tokens()
-                        
-                        # Load from file
-                        self._load_tokens_from_file()
+                        self._reload_tokens()
                         
                         # Update modification time
                         self._file_last_modified = current_mtime
@@ -816,10 +923,7 @@ class TokenManager:
                         self.logger.info(f"Hot reload completed, {len(self._tokens)} tokens loaded")
                         
                     except Exception as reload_error:
-                        # Restore backup on failure
-                        self.logger.error(f"Hot reload failed, restoring previous tokens: {reload_error}")
-                        self._tokens = old_tokens
-                        self._token_ids = old_token_ids
+                        self.logger.error(f"Hot reload failed, keeping previous tokens: {reload_error}")
                 
             except asyncio.CancelledError:
                 self.logger.info("Hot reload monitor stopped")
@@ -26,6 +26,7 @@ import argparse
 import asyncio
 import json
 import logging
+import time
 from typing import Any
 
 # MCP version compatibility handling
@@ -530,7 +531,12 @@ class DorisServer:
             
             # Health check endpoint
             async def health_check(request):
-                return JSONResponse({"status": "healthy", "service": "doris-mcp-server"})
+                from .utils.logger import get_logging_stats
+                return JSONResponse({
+                    "status": "healthy",
+                    "service": "doris-mcp-server",
+                    "logging": get_logging_stats()
+                })
             
             # OAuth endpoints
             from .auth.oauth_handlers import OAuthHandlers
@@ -710,14 +716,22 @@ class DorisServer:
                 self.logger.info(f"Using multi-process mode with {workers} workers")
                 self.logger.info("Note: Multi-worker mode provides full MCP functionality with independent worker processes")
                 
-                # Use the dedicated multiworker app module with full MCP support
-                uvicorn.run(
-                    "doris_mcp_server.multiworker_app:app",
-                    host=host,
-                    port=port,
-                    workers=workers,
-                    log_level="info"
-                )
+                # Workers share caches and metadata through a shared tier and split the connection budget
+                from .utils.shared_state import prepare_shared_state, cleanup_shared_state
+                shared_state_dir = prepare_shared_state(workers)
+                await self._prewarm_shared_state()
+                
+                try:
+                    # Use the dedicated multiworker app module with full MCP support
+                    uvicorn.run(
+                        "doris_mcp_server.multiworker_app:app",
+                        host=host,
+                        port=port,
+                        workers=workers,
+                        log_level="info"
+                    )
+                finally:
+                    cleanup_shared_state(shared_state_dir)
                 
             else:
                 self.logger.info("Using single-process mode")
@@ -750,6 +764,35 @@ class DorisServer:
 
 
 
+    async def _prewarm_shared_state(self):
+        """Load database and table metadata into the shared tier before workers start
+        
+        Workers are separate processes and cannot inherit the parent's memory, so
+        the parent warms the shared tier once instead of every worker warming its
+        own cache. The parent's pool is released afterwards so workers get the
+        whole connection budget.
+        """
+        from .utils.schema_extractor import MetadataExtractor
+        
+        max_databases = int(os.getenv("SHARED_STATE_PREWARM_MAX_DATABASES", "50"))
+        try:
+            extractor = MetadataExtractor(connection_manager=self.connection_manager)
+            if extractor.tiered_cache.store is None:
+                return
+            
+            start_time = time.time()
+            databases = await extractor.get_all_databases_async()
+            for db_name in databases[:max_databases]:
+                await extractor.get_database_tables_async(db_name=db_name)
+            self.logger.info(
+                f"Pre-warmed shared metadata for {min(len(databases), max_databases)} databases "
+                f"in {time.time() - start_time:.2f}s"
+            )
+        except Exception as e:
+            self.logger.warning(f"Shared state pre-warm skipped: {e}")
+        finally:
+            await self.connection_manager.close()
+    
     async def shutdown(self):
         """Shutdown server"""
         self.logger.info("Shutting down Doris MCP Server")
@@ -20,7 +20,9 @@ Multi-worker application module for doris-mcp-server
 
 This module provides full MCP functionality with multi-worker support.
 Each worker process creates its own MCP server and session manager using the same
-robust architecture as the single-worker mode.
+robust architecture as the single-worker mode. Query results and schema metadata
+are shared between workers through the shared state tier, and each worker's
+connection pool is sized from a split of the global connection budget.
 """
 
 import os
@@ -220,12 +222,14 @@ from .tools.resources_manager import DorisResourcesManager
 from .utils.config import DorisConfig
 from .utils.db import DorisConnectionManager
 from .utils.security import DorisSecurityManager
+from .utils.shared_state import get_shared_store, get_worker_count, worker_connection_budget
 
 # Global variables for worker-specific instances
 _worker_server = None
 _worker_session_manager = None
 _worker_connection_manager = None
 _worker_security_manager = None
+_worker_tools_manager = None
 _worker_session_manager_context = None
 _worker_initialized = False
 
@@ -259,7 +263,7 @@ def get_mcp_capabilities():
 
 async def initialize_worker():
     """Initialize MCP server and managers for this worker process"""
-    global _worker_server, _worker_session_manager, _worker_connection_manager, _worker_security_manager, _worker_session_manager_context, _worker_initialized, _oauth_handlers, _token_handlers
+    global _worker_server, _worker_session_manager, _worker_connection_manager, _worker_security_manager, _worker_session_manager_context, _worker_initialized, _oauth_handlers, _token_handlers, _worker_tools_manager
     
     if _worker_initialized:
         return
@@ -279,6 +283,16 @@ async def initialize_worker():
         config_manager = ConfigManager(config)
         config_manager.setup_logging()
         
+        # DORIS_MAX_CONNECTIONS is the budget for the whole worker group
+        workers = get_worker_count()
+        if workers > 1:
+            total_connections = config.database.max_connections
+            config.database.max_connections = worker_connection_budget(total_connections, workers)
+            logger.info(
+                f"Worker {os.getpid()} connection budget: {config.database.max_connections} "
+                f"of {total_connections} shared by {workers} workers"
+            )
+        
         # Create security manager
         _worker_security_manager = DorisSecurityManager(config)
         
@@ -302,6 +316,7 @@ async def initialize_worker():
         resources_manager = DorisResourcesManager(_worker_connection_manager)
         tools_manager = DorisToolsManager(_worker_connection_manager)
         prompts_manager = DorisPromptsManager(_worker_connection_manager)
+        _worker_tools_manager = tools_manager
         
         # Setup MCP handlers
         @_worker_server.list_resources()
@@ -426,6 +441,18 @@ async def initialize_worker():
         logger.error(traceback.format_exc())
         raise
 
+def get_shared_state_stats() -> dict:
+    """Per-worker versus shared cache hit rates for this worker"""
+    store = get_shared_store()
+    stats = {
+        "workers": get_worker_count(),
+        "store": store.get_stats() if store else None,
+    }
+    if _worker_tools_manager:
+        stats["query_cache"] = _worker_tools_manager.query_executor.query_cache.get_stats()["tiers"]
+        stats["metadata_cache"] = _worker_tools_manager.metadata_extractor.tiered_cache.get_stats()
+    return stats
+
 async def health_check(request):
     """Health check endpoint that shows worker PID"""
     return JSONResponse({
@@ -434,7 +461,8 @@ async def health_check(request):
         "worker_pid": os.getpid(),
         "worker_mode": "multi-process-full-mcp",
         "mcp_initialized": _worker_initialized,
-        "mcp_version": MCP_VERSION
+        "mcp_version": MCP_VERSION,
+        "shared_state": get_shared_state_stats()
     })
 
 # OAuth and Token handlers (initialize after worker setup)
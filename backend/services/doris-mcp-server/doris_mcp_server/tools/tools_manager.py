@@ -21,11 +21,19 @@ Responsible for tool registration, management, scheduling and routing, does not
 
 import json
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from mcp.types import Tool
 
+try:
+    from jsonschema.validators import validator_for
+    JSONSCHEMA_AVAILABLE = True
+except ImportError:
+    validator_for = None
+    JSONSCHEMA_AVAILABLE = False
+
 from ..utils.db import DorisConnectionManager
 from ..utils.query_executor import DorisQueryExecutor
 from ..utils.analysis_tools import TableAnalyzer, SQLAnalyzer, MemoryTracker
@@ -42,6 +50,43 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Deprecated tool names, routed to their unified tool with a preset argument
+LEGACY_TOOL_ALIASES = {
+    "get_monitoring_metrics_info": ("get_monitoring_metrics", {"content_type": "definitions"}),
+    "get_monitoring_metrics_data": ("get_monitoring_metrics", {"content_type": "data"}),
+    "get_realtime_memory_stats": ("get_memory_stats", {"data_type": "realtime"}),
+    "get_historical_memory_stats": ("get_memory_stats", {"data_type": "historical"}),
+}
+
+
+@dataclass(frozen=True)
+class RegisteredTool:
+    """A tool entry in the dispatch registry, with its argument schema compiled once"""
+    name: str
+    handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    input_schema: Dict[str, Any]
+    validator: Any = None
+    required: tuple = ()
+    preset_arguments: Dict[str, Any] = field(default_factory=dict)
+
+    def validate(self, arguments: Dict[str, Any]) -> Optional[str]:
+        """Return the first validation error message, or None if the arguments are valid"""
+        if self.validator is not None:
+            error = next(self.validator.iter_errors(arguments), None)
+            return error.message if error is not None else None
+        missing = [key for key in self.required if key not in arguments]
+        return f"'{missing[0]}' is a required property" if missing else None
+
+
+def compile_input_schema(schema: Dict[str, Any]) -> Any:
+    """Build a reusable validator for a tool's input schema, or None if jsonschema is unavailable"""
+    if not JSONSCHEMA_AVAILABLE:
+        return None
+    try:
+        return validator_for(schema)(schema)
+    except Exception as e:
+        logger.warning(f"Failed to compile input schema, falling back to required-field checks: {e}")
+        return None
 
 
 class DorisToolsManager:
@@ -69,6 +114,10 @@ class DorisToolsManager:
         # Initialize ADBC query tools
         self.adbc_query_tools = DorisADBCQueryTools(connection_manager)
         
+        # Build tool definitions and the dispatch registry once
+        self._tool_list: List[Tool] = self._build_tool_definitions()
+        self._tool_registry: Dict[str, RegisteredTool] = self._build_tool_registry(self._tool_list)
+        
         logger.info("DorisToolsManager initialized with business logic processors, v0.5.0 analytics tools, and ADBC query tools")
     
     async def register_tools_with_mcp(self, mcp):
@@ -770,7 +819,15 @@ No parameters required. Returns connection status, configuration, and diagnostic
         logger.info("Successfully registered 25 tools to MCP server (14 basic + 9 advanced analytics + 2 ADBC tools)")
 
     async def list_tools(self) -> List[Tool]:
-        """List all available query tools (for stdio mode)"""
+        """List all available query tools (for stdio mode)
+
+        The definitions are built once when the registry is created, so every
+        tools/list request is served the same prebuilt list.
+        """
+        return self._tool_list
+    
+    def _build_tool_definitions(self) -> List[Tool]:
+        """Build the Tool definitions advertised to MCP clients"""
         # Get ADBC configuration defaults
         adbc_config = self.connection_manager.config.adbc
         
@@ -1378,6 +1435,40 @@ No parameters required. Returns connection status, configuration, and diagnostic
         
         return tools
         
+    def _build_tool_registry(self, tools: List[Tool]) -> Dict[str, RegisteredTool]:
+        """Map every tool name (including legacy aliases) to its handler and compiled schema"""
+        registry: Dict[str, RegisteredTool] = {}
+        for tool in tools:
+            handler = getattr(self, f"_{tool.name}_tool", None)
+            if handler is None:
+                logger.warning(f"Tool {tool.name} is listed but has no handler, it will not be dispatched")
+                continue
+            registry[tool.name] = RegisteredTool(
+                name=tool.name,
+                handler=handler,
+                input_schema=tool.inputSchema,
+                validator=compile_input_schema(tool.inputSchema),
+                required=tuple(tool.inputSchema.get("required", ())),
+            )
+        
+        for alias, (target, preset_arguments) in LEGACY_TOOL_ALIASES.items():
+            target_tool = registry.get(target)
+            if target_tool is not None:
+                registry[alias] = RegisteredTool(
+                    name=alias,
+                    handler=target_tool.handler,
+                    input_schema=target_tool.input_schema,
+                    validator=target_tool.validator,
+                    required=target_tool.required,
+                    preset_arguments=preset_arguments,
+                )
+        
+        return registry
+    
+    def get_registered_tool(self, name: str) -> Optional[RegisteredTool]:
+        """Get a registry entry by tool name"""
+        return self._tool_registry.get(name)
+    
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> str:
         """
         Call the specified query tool (tool routing and scheduling center)
@@ -1385,76 +1476,18 @@ No parameters required. Returns connection status, configuration, and diagnostic
         try:
             start_time = time.time()
             
-            # Tool routing - dispatch requests to corresponding business logic processors
-            if name == "exec_query":
-                result = await self._exec_query_tool(arguments)
-            elif name == "get_table_schema":
-                result = await self._get_table_schema_tool(arguments)
-            elif name == "get_db_table_list":
-                result = await self._get_db_table_list_tool(arguments)
-            elif name == "get_db_list":
-                result = await self._get_db_list_tool(arguments)
-            elif name == "get_table_comment":
-                result = await self._get_table_comment_tool(arguments)
-            elif name == "get_table_column_comments":
-                result = await self._get_table_column_comments_tool(arguments)
-            elif name == "get_table_indexes":
-                result = await self._get_table_indexes_tool(arguments)
-            elif name == "get_recent_audit_logs":
-                result = await self._get_recent_audit_logs_tool(arguments)
-            elif name == "get_catalog_list":
-                result = await self._get_catalog_list_tool(arguments)
-            elif name == "get_sql_explain":
-                result = await self._get_sql_explain_tool(arguments)
-            elif name == "get_sql_profile":
-                result = await self._get_sql_profile_tool(arguments)
-            elif name == "get_table_data_size":
-                result = await self._get_table_data_size_tool(arguments)
-            elif name == "get_monitoring_metrics":
-                result = await self._get_monitoring_metrics_tool(arguments)
-            elif name == "get_memory_stats":
-                result = await self._get_memory_stats_tool(arguments)
-            # Legacy support for old tool names (deprecated)
-            elif name == "get_monitoring_metrics_info":
-                arguments["content_type"] = "definitions"
-                result = await self._get_monitoring_metrics_tool(arguments)
-            elif name == "get_monitoring_metrics_data":
-                arguments["content_type"] = "data"
-                result = await self._get_monitoring_metrics_tool(arguments)
-            elif name == "get_realtime_memory_stats":
-                arguments["data_type"] = "realtime"
-                result = await self._get_memory_stats_tool(arguments)
-            elif name == "get_historical_memory_stats":
-                arguments["data_type"] = "historical"
-                result = await self._get_memory_stats_tool(arguments)
-            # v0.5.0 Advanced Analytics Tools - Atomic Data Quality Tools
-            elif name == "get_table_basic_info":
-                result = await self._get_table_basic_info_tool(arguments)
-            elif name == "analyze_columns":
-                result = await self._analyze_columns_tool(arguments)
-            elif name == "analyze_table_storage":
-                result = await self._analyze_table_storage_tool(arguments)
-            elif name == "trace_column_lineage":
-                result = await self._trace_column_lineage_tool(arguments)
-            elif name == "monitor_data_freshness":
-                result = await self._monitor_data_freshness_tool(arguments)
-            elif name == "analyze_data_access_patterns":
-                result = await self._analyze_data_access_patterns_tool(arguments)
-            elif name == "analyze_data_flow_dependencies":
-                result = await self._analyze_data_flow_dependencies_tool(arguments)
-            elif name == "analyze_slow_queries_topn":
-                result = await self._analyze_slow_queries_topn_tool(arguments)
-            elif name == "analyze_resource_growth_curves":
-                result = await self._analyze_resource_growth_curves_tool(arguments)
-            elif name == "kill_query":
-                result = await self._kill_query_tool(arguments)
-            # ADBC Query Tools
-            elif name == "exec_adbc_query":
-                result = await self._exec_adbc_query_tool(arguments)
-            elif name == "get_adbc_connection_info":
-                result = await self._get_adbc_connection_info_tool(arguments)
-            else:
+            registered = self._tool_registry.get(name)
+            if registered is None:
                 raise ValueError(f"Unknown tool: {name}")
+            
+            if registered.preset_arguments:
+                arguments = {**arguments, **registered.preset_arguments}
+            
+            validation_error = registered.validate(arguments)
+            if validation_error:
+                raise ValueError(f"Input validation error: {validation_error}")
+            
+            result = await registered.handler(arguments)
 
             execution_time = time.time() - start_time
             
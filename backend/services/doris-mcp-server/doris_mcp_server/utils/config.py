@@ -240,6 +240,13 @@ class DataQualityConfig:
     enable_distribution_analysis: bool = True  # Enable distribution analysis
     histogram_bins: int = 20  # Number of bins for histogram analysis
     percentile_levels: list[float] = field(default_factory=lambda: [0.25, 0.5, 0.75, 0.95, 0.99])  # Percentile levels to calculate
+    
+    # Large-table sampling and concurrent profiling
+    sampling_method: str = "tablesample"  # Sampling above medium_table_threshold: "tablesample", "partition" or "limit"
+    confidence_level: float = 0.95  # Confidence level of the reported sampling error bounds
+    profile_concurrency: int = 4  # Maximum connections used to profile one table
+    column_group_size: int = 5  # Columns profiled together on one connection
+    profile_cache_ttl: int = 3600  # Seconds a profile is reused while the table version is unchanged (0 disables)
 
 
 @dataclass
@@ -277,6 +284,12 @@ class LoggingConfig:
     max_age_days: int = 30
     cleanup_interval_hours: int = 24
 
+    # Asynchronous (queue-based) logging configuration
+    enable_async: bool = True
+    queue_size: int = 10000
+    queue_pressure_ratio: float = 0.8
+    queue_sample_every: int = 10
+
 
 @dataclass
 class MonitoringConfig:
@@ -527,6 +540,18 @@ class DorisConfig:
         config.logging.cleanup_interval_hours = int(
             os.getenv("LOG_CLEANUP_INTERVAL_HOURS", str(config.logging.cleanup_interval_hours))
         )
+        config.logging.enable_async = (
+            os.getenv("ENABLE_ASYNC_LOGGING", str(config.logging.enable_async).lower()).lower() == "true"
+        )
+        config.logging.queue_size = int(
+            os.getenv("LOG_QUEUE_SIZE", str(config.logging.queue_size))
+        )
+        config.logging.queue_pressure_ratio = float(
+            os.getenv("LOG_QUEUE_PRESSURE_RATIO", str(config.logging.queue_pressure_ratio))
+        )
+        config.logging.queue_sample_every = int(
+            os.getenv("LOG_QUEUE_SAMPLE_EVERY", str(config.logging.queue_sample_every))
+        )
 
         # Monitoring configuration
         config.monitoring.enable_metrics = (
@@ -589,6 +614,21 @@ class DorisConfig:
         config.data_quality.histogram_bins = int(
             os.getenv("DATA_QUALITY_HISTOGRAM_BINS", str(config.data_quality.histogram_bins))
         )
+        config.data_quality.sampling_method = os.getenv(
+            "DATA_QUALITY_SAMPLING_METHOD", config.data_quality.sampling_method
+        ).lower()
+        config.data_quality.confidence_level = float(
+            os.getenv("DATA_QUALITY_CONFIDENCE_LEVEL", str(config.data_quality.confidence_level))
+        )
+        config.data_quality.profile_concurrency = int(
+            os.getenv("DATA_QUALITY_PROFILE_CONCURRENCY", str(config.data_quality.profile_concurrency))
+        )
+        config.data_quality.column_group_size = int(
+            os.getenv("DATA_QUALITY_COLUMN_GROUP_SIZE", str(config.data_quality.column_group_size))
+        )
+        config.data_quality.profile_cache_ttl = int(
+            os.getenv("DATA_QUALITY_PROFILE_CACHE_TTL", str(config.data_quality.profile_cache_ttl))
+        )
 
         # Server configuration
         config.server_name = os.getenv("SERVER_NAME", config.server_name)
@@ -723,6 +763,11 @@ class DorisConfig:
                 "enable_distribution_analysis": self.data_quality.enable_distribution_analysis,
                 "histogram_bins": self.data_quality.histogram_bins,
                 "percentile_levels": self.data_quality.percentile_levels,
+                "sampling_method": self.data_quality.sampling_method,
+                "confidence_level": self.data_quality.confidence_level,
+                "profile_concurrency": self.data_quality.profile_concurrency,
+                "column_group_size": self.data_quality.column_group_size,
+                "profile_cache_ttl": self.data_quality.profile_cache_ttl,
             },
             "logging": {
                 "level": self.logging.level,
@@ -735,6 +780,10 @@ class DorisConfig:
                 "enable_cleanup": self.logging.enable_cleanup,
                 "max_age_days": self.logging.max_age_days,
                 "cleanup_interval_hours": self.logging.cleanup_interval_hours,
+                "enable_async": self.logging.enable_async,
+                "queue_size": self.logging.queue_size,
+                "queue_pressure_ratio": self.logging.queue_pressure_ratio,
+                "queue_sample_every": self.logging.queue_sample_every,
             },
             "monitoring": {
                 "enable_metrics": self.monitoring.enable_metrics,
@@ -826,6 +875,21 @@ class DorisConfig:
         if self.data_quality.small_table_threshold >= self.data_quality.medium_table_threshold:
             errors.append("Small table threshold must be less than medium table threshold")
 
+        if self.data_quality.sampling_method not in ["tablesample", "partition", "limit"]:
+            errors.append("Data quality sampling method must be one of: tablesample, partition, limit")
+
+        if not 0 < self.data_quality.confidence_level < 1:
+            errors.append("Data quality confidence level must be between 0 and 1")
+
+        if self.data_quality.profile_concurrency <= 0:
+            errors.append("Data quality profile concurrency must be greater than 0")
+
+        if self.data_quality.column_group_size <= 0:
+            errors.append("Data quality column group size must be greater than 0")
+
+        if self.data_quality.profile_cache_ttl < 0:
+            errors.append("Data quality profile cache TTL cannot be negative")
+
         if self.data_quality.batch_timeout <= 0:
             errors.append("Batch timeout must be greater than 0")
 
@@ -851,6 +915,15 @@ class DorisConfig:
         if self.logging.cleanup_interval_hours <= 0:
             errors.append("Log cleanup interval hours must be greater than 0")
 
+        if self.logging.queue_size <= 0:
+            errors.append("Log queue size must be greater than 0")
+
+        if not (0 < self.logging.queue_pressure_ratio <= 1):
+            errors.append("Log queue pressure ratio must be in the range (0, 1]")
+
+        if self.logging.queue_sample_every <= 0:
+            errors.append("Log queue sample interval must be greater than 0")
+
         # Validate monitoring configuration
         if not (1 <= self.monitoring.metrics_port <= 65535):
             errors.append("Monitoring port must be in the range 1-65535")
@@ -939,7 +1012,11 @@ class ConfigManager:
             backup_count=self.config.logging.backup_count,
             enable_cleanup=self.config.logging.enable_cleanup,
             max_age_days=self.config.logging.max_age_days,
-            cleanup_interval_hours=self.config.logging.cleanup_interval_hours
+            cleanup_interval_hours=self.config.logging.cleanup_interval_hours,
+            enable_async=self.config.logging.enable_async,
+            queue_size=self.config.logging.queue_size,
+            queue_pressure_ratio=self.config.logging.queue_pressure_ratio,
+            queue_sample_every=self.config.logging.queue_sample_every
         )
         
         # Update logger to use new system
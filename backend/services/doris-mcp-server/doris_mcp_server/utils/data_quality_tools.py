@@ -24,6 +24,7 @@ import re
 import time
 import math
 import statistics
+import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, cast
 from collections import Counter, defaultdict
@@ -31,16 +32,45 @@ from collections import Counter, defaultdict
 from .db import DorisConnectionManager
 from .logger import get_logger
 from .config import DorisConfig
+from .shared_state import MISS, TieredCache, get_shared_store
 
 logger = get_logger(__name__)
 
 
+def sampling_error_bounds(sample_rows: int, total_rows: int, confidence_level: float) -> Dict[str, Any]:
+    """Worst-case margin of error for rates (null rate, value shares) measured on a sample
+
+    Uses the normal approximation for a simple random sample with finite
+    population correction; block-level samples such as TABLESAMPLE are
+    clustered, so the true margin can be somewhat wider.
+    """
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence_level / 2)
+    return {
+        "confidence_level": confidence_level,
+        "z_score": round(z, 4),
+        "max_rate_margin": round(rate_margin(0.5, sample_rows, total_rows, z), 6),
+        "method": "normal approximation, finite population correction",
+    }
+
+
+def rate_margin(rate: float, sample_rows: int, total_rows: int, z: float) -> float:
+    """Margin of error of a rate observed on sample_rows out of total_rows"""
+    if sample_rows <= 0 or sample_rows >= total_rows:
+        return 0.0
+    fpc = math.sqrt((total_rows - sample_rows) / max(total_rows - 1, 1))
+    return z * math.sqrt(rate * (1 - rate) / sample_rows) * fpc
+
+
 class DataQualityTools:
     """Atomic data quality analysis tools"""
     
     def __init__(self, connection_manager: DorisConnectionManager, config: DorisConfig = None):
         self.connection_manager = connection_manager
         self.config = config or DorisConfig.from_env()
+        # Column profiles keyed by table version, shared between workers when a shared tier is configured
+        self.profile_cache = TieredCache(
+            "data_quality_profiles", self.config.data_quality.profile_cache_ttl, get_shared_store(), max_size=256
+        )
         logger.info("DataQualityTools initialized with atomic tools")
     
     async def get_table_basic_info(
@@ -153,8 +183,28 @@ class DataQualityTools:
                 # Build full table name
                 full_table_name = self._build_full_table_name(table_name, catalog_name, db_name)
                 
-                # Get basic table information
-                table_info = await self._get_table_basic_info(connection, full_table_name)
+                # Reuse a recent profile while the table has not changed
+                table_version = await self._get_table_version(connection, table_name, catalog_name, db_name)
+                cache_key = None
+                if table_version and table_version["update_time"] and self.config.data_quality.profile_cache_ttl > 0:
+                    cache_key = "|".join([
+                        full_table_name, table_version["version"], ",".join(sorted(columns)),
+                        ",".join(sorted(analysis_types)), str(sample_size), str(detailed_response),
+                        self.config.data_quality.sampling_method,
+                    ])
+                    cached = await self.profile_cache.aget(cache_key)
+                    if cached is not MISS:
+                        logger.info(f" Serving cached column profile for {full_table_name} (version {table_version['version']})")
+                        result = dict(cached)
+                        result["profile_cache"] = {"hit": True, "table_version": table_version["version"]}
+                        result["execution_time_seconds"] = round(time.time() - start_time, 3)
+                        return result
+                
+                # Get basic table information; very large tables use the metadata row estimate instead of COUNT(*)
+                if table_version and table_version["estimated_rows"] > self.config.data_quality.medium_table_threshold:
+                    table_info = {"row_count": table_version["estimated_rows"]}
+                else:
+                    table_info = await self._get_table_basic_info(connection, full_table_name)
                 if not table_info:
                     return {"error": f"Table {full_table_name} not found"}
                 
@@ -174,7 +224,8 @@ class DataQualityTools:
                 
                 # Determine sampling strategy (optimized version)
                 sampling_info = await self._determine_optimized_sampling_strategy(
-                    connection, full_table_name, table_info["row_count"], sample_size
+                    connection, full_table_name, table_info["row_count"], sample_size,
+                    base_table_name=table_name, catalog_name=catalog_name, db_name=db_name
                 )
                 
                 logger.info(f" Using {sampling_info['sampling_method']} sampling: {sampling_info['sample_size']:,} rows")
@@ -187,8 +238,16 @@ class DataQualityTools:
                     "sampling_info": sampling_info
                 }
                 
+                column_groups = self._split_column_groups(target_columns_info)
+                
+                # Fan column groups out across connections
+                if self.config.data_quality.enable_batch_analysis and len(column_groups) > 1:
+                    logger.info(f" Profiling {len(column_groups)} column groups concurrently...")
+                    result.update(await self._analyze_column_groups_concurrently(
+                        full_table_name, column_groups, sampling_info, analysis_types, detailed_response
+                    ))
                 # Batch analysis (optimized version)
-                if self.config.data_quality.enable_batch_analysis:
+                elif self.config.data_quality.enable_batch_analysis:
                     logger.info(" Using batch analysis for improved performance...")
                     batch_results = await self._analyze_columns_batch(
                         connection, full_table_name, target_columns_info, sampling_info, analysis_types, detailed_response
@@ -215,6 +274,13 @@ class DataQualityTools:
                         distribution_time = time.time() - distribution_start
                         logger.info(f" Distribution analysis completed in {distribution_time:.2f}s")
                 
+                self._attach_error_bounds(result, sampling_info)
+                
+                if cache_key is not None:
+                    await self.profile_cache.aset(cache_key, result)
+                    result = dict(result)
+                    result["profile_cache"] = {"hit": False, "table_version": table_version["version"]}
+                
                 execution_time = time.time() - start_time
                 result["execution_time_seconds"] = round(execution_time, 3)
                 
@@ -461,8 +527,15 @@ class DataQualityTools:
         """Determine sampling strategy (compatibility version)"""
         return await self._determine_optimized_sampling_strategy(connection, table_name, total_rows, sample_size)
     
-    async def _determine_optimized_sampling_strategy(self, connection, table_name: str, total_rows: int, sample_size: int) -> Dict[str, Any]:
-        """Determine optimized sampling strategy"""
+    async def _determine_optimized_sampling_strategy(self, connection, table_name: str, total_rows: int, sample_size: int,
+                                                     base_table_name: Optional[str] = None, catalog_name: Optional[str] = None,
+                                                     db_name: Optional[str] = None) -> Dict[str, Any]:
+        """Determine optimized sampling strategy
+        
+        Tables above medium_table_threshold are sampled with TABLESAMPLE (the
+        default), a spread of partitions, or LIMIT, depending on
+        data_quality.sampling_method. Sampled strategies report error bounds.
+        """
         # Use thresholds from configuration
         small_threshold = self.config.data_quality.small_table_threshold
         medium_threshold = self.config.data_quality.medium_table_threshold
@@ -499,18 +572,168 @@ class DataQualityTools:
                 "total_rows": total_rows
             }
         else:
-            # Large table: use simpler sampling strategy
-            # For very large tables, still use LIMIT but increase sample size to improve representativeness
-            adjusted_sample_size = min(sample_size * 2, total_rows // 100)  # At most 1% sampling
-            sample_table_expr = f"(SELECT * FROM {table_name} LIMIT {adjusted_sample_size}) AS sample_table"
+            # Large table: sample blocks of the table instead of reading its head
+            method = self.config.data_quality.sampling_method
+            is_internal = catalog_name in (None, "internal")
+            strategy = None
+            
+            if method == "partition" and base_table_name:
+                strategy = await self._partition_sampling_strategy(
+                    connection, table_name, base_table_name, db_name, total_rows, sample_size
+                )
+            if strategy is None and method in ("tablesample", "partition") and is_internal:
+                sample_table_expr = f"(SELECT * FROM {table_name} TABLESAMPLE({sample_size} ROWS)) AS sample_table"
+                strategy = {
+                    "sample_size": sample_size,
+                    "sample_rate": sample_size / total_rows,
+                    "sample_table_expression": sample_table_expr,
+                    "sampling_method": "tablesample",
+                    "total_rows": total_rows
+                }
+            if strategy is None:
+                # For very large tables, still use LIMIT but increase sample size to improve representativeness
+                adjusted_sample_size = min(sample_size * 2, total_rows // 100)  # At most 1% sampling
+                sample_table_expr = f"(SELECT * FROM {table_name} LIMIT {adjusted_sample_size}) AS sample_table"
+                strategy = {
+                    "sample_size": adjusted_sample_size,
+                    "sample_rate": adjusted_sample_size / total_rows,
+                    "sample_table_expression": sample_table_expr,
+                    "sampling_method": "enhanced_limit_sampling",
+                    "total_rows": total_rows,
+                    "original_sample_size": sample_size
+                }
+            
+            strategy["error_bounds"] = sampling_error_bounds(
+                strategy["sample_size"], total_rows, self.config.data_quality.confidence_level
+            )
+            if strategy["sampling_method"] == "enhanced_limit_sampling":
+                strategy["error_bounds"]["note"] = "LIMIT reads the first rows returned, so bounds assume they are representative"
+            return strategy
+    
+    async def _partition_sampling_strategy(self, connection, table_name: str, base_table_name: str, db_name: Optional[str],
+                                           total_rows: int, sample_size: int) -> Optional[Dict[str, Any]]:
+        """Sample whole partitions spread evenly across the table until sample_size rows are covered"""
+        partitions = [p for p in await self._get_table_partitions(connection, base_table_name, db_name) if p.get("table_rows")]
+        if len(partitions) < 2:
+            return None
+        
+        average_rows = sum(int(p["table_rows"]) for p in partitions) / len(partitions)
+        wanted = min(len(partitions) - 1, max(1, math.ceil(sample_size / max(average_rows, 1))))
+        step = len(partitions) / wanted
+        chosen = [partitions[int(i * step)] for i in range(wanted)]
+        sampled_rows = sum(int(p["table_rows"]) for p in chosen)
+        partition_list = ", ".join(p["partition_name"] for p in chosen)
+        return {
+            "sample_size": sampled_rows,
+            "sample_rate": sampled_rows / total_rows if total_rows else 1.0,
+            "sample_table_expression": f"(SELECT * FROM {table_name} PARTITION ({partition_list})) AS sample_table",
+            "sampling_method": "partition_sampling",
+            "sampled_partitions": [p["partition_name"] for p in chosen],
+            "total_partitions": len(partitions),
+            "total_rows": total_rows
+        }
+    
+    async def _get_table_version(self, connection, table_name: str, catalog_name: Optional[str], db_name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get the table's metadata row estimate and a version string that changes when data is loaded"""
+        try:
+            tables_view = f"{catalog_name}.information_schema.tables" if catalog_name else "information_schema.tables"
+            schema_filter = f"'{db_name}'" if db_name else "DATABASE()"
+            version_sql = f"""
+            SELECT TABLE_ROWS, DATA_LENGTH, UPDATE_TIME
+            FROM {tables_view}
+            WHERE TABLE_SCHEMA = {schema_filter} AND TABLE_NAME = '{table_name}'
+            """
+            result = await connection.execute(version_sql)
+            if not result.data:
+                return None
+            row = result.data[0]
+            update_time = row.get("UPDATE_TIME")
             return {
-                "sample_size": adjusted_sample_size,
-                "sample_rate": adjusted_sample_size / total_rows,
-                "sample_table_expression": sample_table_expr,
-                "sampling_method": "enhanced_limit_sampling",
-                "total_rows": total_rows,
-                "original_sample_size": sample_size
+                "estimated_rows": int(row.get("TABLE_ROWS") or 0),
+                "update_time": str(update_time) if update_time else None,
+                "version": f"{update_time}:{row.get('TABLE_ROWS')}:{row.get('DATA_LENGTH')}"
             }
+        except Exception as e:
+            logger.warning(f"Failed to get table version: {str(e)}")
+            return None
+    
+    def _split_column_groups(self, columns_info: List[Dict]) -> List[List[Dict]]:
+        """Split columns into groups profiled together on one connection"""
+        group_size = self.config.data_quality.column_group_size
+        return [columns_info[i:i + group_size] for i in range(0, len(columns_info), group_size)]
+    
+    async def _analyze_column_groups_concurrently(self, table_name: str, column_groups: List[List[Dict]], sampling_info: Dict,
+                                                  analysis_types: List[str], detailed_response: bool) -> Dict[str, Any]:
+        """Profile column groups on separate connections, at most profile_concurrency at a time"""
+        semaphore = asyncio.Semaphore(self.config.data_quality.profile_concurrency)
+        run_id = uuid.uuid4().hex[:8]
+        
+        async def profile_group(index: int, group: List[Dict]) -> Dict[str, Any]:
+            async with semaphore:
+                # Distinct session ids so each group gets its own pooled connection
+                async with self.connection_manager.get_connection_context(f"data_quality_{run_id}_{index}") as connection:
+                    return await self._analyze_columns_batch(
+                        connection, table_name, group, sampling_info, analysis_types, detailed_response
+                    )
+        
+        group_results = await asyncio.gather(
+            *(profile_group(i, group) for i, group in enumerate(column_groups)), return_exceptions=True
+        )
+        
+        merged: Dict[str, Any] = {}
+        for group, group_result in zip(column_groups, group_results):
+            if isinstance(group_result, Exception):
+                logger.warning(f"Failed to profile column group {[c['column_name'] for c in group]}: {str(group_result)}")
+                for section in ("completeness_analysis", "distribution_analysis"):
+                    if section in analysis_types or "both" in analysis_types:
+                        merged.setdefault(section, {}).update({c["column_name"]: {"error": str(group_result)} for c in group})
+                continue
+            
+            # Groups that fell back to sequential analysis report nested sections; flatten them to per-column entries
+            completeness = group_result.get("completeness_analysis")
+            if completeness is not None:
+                merged.setdefault("completeness_analysis", {}).update(completeness.get("column_completeness", completeness))
+            distribution = group_result.get("distribution_analysis")
+            if distribution is not None:
+                target = merged.setdefault("distribution_analysis", {})
+                if "distribution_by_type" in distribution:
+                    for by_column in distribution["distribution_by_type"].values():
+                        target.update(by_column)
+                else:
+                    target.update(distribution)
+        
+        merged["column_groups"] = {
+            "group_count": len(column_groups),
+            "group_size": self.config.data_quality.column_group_size,
+            "max_concurrency": self.config.data_quality.profile_concurrency
+        }
+        return merged
+    
+    def _attach_error_bounds(self, result: Dict[str, Any], sampling_info: Dict) -> None:
+        """Add per-column margins of error to sampled completeness and numeric results"""
+        bounds = sampling_info.get("error_bounds")
+        if not bounds:
+            return
+        z = bounds["z_score"]
+        total_rows = sampling_info["total_rows"]
+        
+        completeness = result.get("completeness_analysis") or {}
+        for stats in completeness.get("column_completeness", completeness).values():
+            if isinstance(stats, dict) and "null_rate" in stats:
+                sample_rows = stats.get("total_rows", stats.get("total_count", 0))
+                stats["null_rate_margin"] = round(rate_margin(stats["null_rate"], sample_rows, total_rows, z), 6)
+        
+        distribution = result.get("distribution_analysis") or {}
+        by_column = {}
+        for values in distribution.get("distribution_by_type", {"": distribution}).values():
+            if isinstance(values, dict):
+                by_column.update(values)
+        for stats in by_column.values():
+            if isinstance(stats, dict) and stats.get("std_dev") is not None:
+                sample_rows = stats.get("non_null_count") or sampling_info["sample_size"]
+                if 0 < sample_rows < total_rows:
+                    fpc = math.sqrt((total_rows - sample_rows) / max(total_rows - 1, 1))
+                    stats["mean_margin"] = round(z * stats["std_dev"] / math.sqrt(sample_rows) * fpc, 6)
     
     async def _analyze_columns_batch(self, connection, table_name: str, columns_info: List[Dict], 
                                    sampling_info: Dict, analysis_types: List[str], detailed_response: bool) -> Dict[str, Any]:
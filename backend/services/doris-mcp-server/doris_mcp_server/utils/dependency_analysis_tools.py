@@ -17,11 +17,25 @@
 """
 Dependency Analysis Tools Module
 Provides data flow dependency analysis and impact assessment capabilities
+
+The lineage graph is cached per (catalog, database, include_views) scope:
+- Table, view and foreign-key metadata come from set-based information_schema
+  queries and are reloaded after METADATA_CACHE_TTL seconds
+- Runtime (INSERT ... SELECT / CREATE TABLE AS SELECT) edges come from the
+  audit log. Each scan reads the window (watermark, NOW() - lag], with the
+  upper bound fixed as a literal before the scan, and then advances the
+  watermark to that bound. The first call bootstraps from the last year
+  (top statements only); later calls read every row in their window, at
+  most every DEPENDENCY_AUDIT_REFRESH_INTERVAL seconds. Edges not seen for
+  RUNTIME_EDGE_RETENTION are pruned
 """
 
+import asyncio
+import os
 import time
 import re
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Set, Tuple
 from collections import defaultdict, deque
 
@@ -30,16 +44,43 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Runtime edges not seen in the audit log for this long are dropped
+RUNTIME_EDGE_RETENTION = timedelta(days=365)
+
+
+@dataclass
+class DependencyGraphState:
+    """Cached lineage for one (catalog, database, include_views) scope"""
+    tables_metadata: List[Dict]
+    loaded_at: float
+    view_edges: List[Tuple[str, str]] = field(default_factory=list)
+    foreign_keys: List[Dict[str, str]] = field(default_factory=list)
+    view_definitions_source: str = "none"
+    graph: Optional[Dict[str, Dict]] = None
+    runtime_version: int = -1
+
 
 class DependencyAnalysisTools:
     """Dependency analysis tools for data flow and impact assessment"""
     
     def __init__(self, connection_manager: DorisConnectionManager):
         self.connection_manager = connection_manager
+        self.metadata_ttl = int(os.getenv("METADATA_CACHE_TTL", "3600"))
+        self.audit_refresh_interval = int(os.getenv("DEPENDENCY_AUDIT_REFRESH_INTERVAL", "60"))
+        # Audit rows are loaded in batches; rows younger than this may still be in flight
+        self.audit_lag_seconds = int(os.getenv("DEPENDENCY_AUDIT_LAG_SECONDS", "120"))
+        self._graphs: Dict[Tuple[str, str, bool], DependencyGraphState] = {}
+        self._graph_lock = asyncio.Lock()
+        # Audit-log lineage is not scoped to a database, so it is shared by all scopes:
+        # (target, referenced, pattern_type) -> [frequency, last_seen]
+        self._runtime_edges: Dict[Tuple[str, str, str], List[Any]] = {}
+        self._runtime_version = 0
+        self._audit_watermark: Optional[str] = None
+        self._audit_checked_at = 0.0
         logger.info("DependencyAnalysisTools initialized")
     
     async def analyze_data_flow_dependencies(
-        self, 
+        self,
         target_table: Optional[str] = None,
         analysis_depth: int = 3,
         include_views: bool = True,
@@ -63,17 +104,19 @@ class DependencyAnalysisTools:
             start_time = time.time()
             connection = await self.connection_manager.get_connection("query")
             
-            # 1. Get table metadata and relationships
-            tables_metadata = await self._get_tables_metadata(connection, catalog_name, db_name, include_views)
+            # 1-2. Get table metadata and the (cached, incrementally refreshed) dependency graph
+            state, refreshed = await self._get_dependency_graph(
+                connection, catalog_name, db_name, include_views, analysis_depth
+            )
             
-            if not tables_metadata:
+            if state is None:
                 return {
                     "error": "No tables found for dependency analysis",
                     "analysis_timestamp": datetime.now().isoformat()
                 }
             
-            # 2. Build dependency graph from SQL analysis
-            dependency_graph = await self._build_dependency_graph(connection, tables_metadata, analysis_depth)
+            tables_metadata = state.tables_metadata
+            dependency_graph = state.graph
             
             # 3. Analyze specific table or all tables
             if target_table:
@@ -104,12 +147,19 @@ class DependencyAnalysisTools:
                 "execution_time_seconds": round(execution_time, 3),
                 "tables_analyzed": len(tables_metadata),
                 "dependency_graph_stats": self._get_dependency_graph_stats(dependency_graph),
+                "dependency_graph_cache": {
+                    "refreshed": refreshed,
+                    "metadata_age_seconds": round(time.time() - state.loaded_at, 1),
+                    "view_definitions_source": state.view_definitions_source,
+                    "runtime_edges": len(self._runtime_edges),
+                    "audit_watermark": self._audit_watermark
+                },
                 "table_dependencies": table_analysis,
                 "impact_analysis": impact_analysis,
                 "dependency_insights": dependency_insights,
                 "recommendations": self._generate_dependency_recommendations(dependency_insights)
             }
-            
+        
         except Exception as e:
             logger.error(f"Data flow dependency analysis failed: {str(e)}")
             return {
@@ -117,8 +167,56 @@ class DependencyAnalysisTools:
                 "analysis_timestamp": datetime.now().isoformat()
             }
     
+    def invalidate_dependency_graph(self) -> None:
+        """Drop cached lineage so the next analysis reloads metadata and rescans the audit log"""
+        self._graphs.clear()
+        self._runtime_edges.clear()
+        self._runtime_version += 1
+        self._audit_watermark = None
+        self._audit_checked_at = 0.0
+    
     # ==================== Private Helper Methods ====================
     
+    async def _get_dependency_graph(
+        self,
+        connection,
+        catalog_name: Optional[str],
+        db_name: Optional[str],
+        include_views: bool,
+        analysis_depth: int
+    ) -> Tuple[Optional[DependencyGraphState], List[str]]:
+        """
+        Return the cached graph for a scope, refreshing whatever is stale
+        
+        Returns:
+            (state, refreshed) where refreshed lists the parts that were reloaded
+            ("metadata", "audit_log"); state is None when no tables were found
+        """
+        key = (catalog_name or "", db_name or "", include_views)
+        refreshed = []
+        async with self._graph_lock:
+            now = time.time()
+            state = self._graphs.get(key)
+            if state is None or now - state.loaded_at >= self.metadata_ttl:
+                tables_metadata = await self._get_tables_metadata(connection, catalog_name, db_name, include_views)
+                if not tables_metadata:
+                    return None, refreshed
+                state = DependencyGraphState(tables_metadata=tables_metadata, loaded_at=now)
+                await self._analyze_view_dependencies(connection, state)
+                await self._analyze_foreign_key_dependencies(connection, state)
+                self._graphs[key] = state
+                refreshed.append("metadata")
+            
+            if now - self._audit_checked_at >= self.audit_refresh_interval:
+                await self._analyze_runtime_dependencies(connection, analysis_depth)
+                self._audit_checked_at = now
+                refreshed.append("audit_log")
+            
+            if state.graph is None or "metadata" in refreshed or state.runtime_version != self._runtime_version:
+                state.graph = self._build_dependency_graph(state)
+                state.runtime_version = self._runtime_version
+        return state, refreshed
+    
     async def _get_tables_metadata(self, connection, catalog_name: Optional[str], db_name: Optional[str], include_views: bool) -> List[Dict]:
         """Get metadata for all tables and views"""
         try:
@@ -136,7 +234,7 @@ class DependencyAnalysisTools:
             where_conditions.append(f"table_type IN ({','.join(table_types)})")
             
             metadata_sql = f"""
-            SELECT 
+            SELECT
                 table_schema as schema_name,
                 table_name,
                 table_type,
@@ -150,13 +248,13 @@ class DependencyAnalysisTools:
             
             result = await connection.execute(metadata_sql)
             return result.data if result.data else []
-            
+        
         except Exception as e:
             logger.warning(f"Failed to get tables metadata: {str(e)}")
             return []
     
-    async def _build_dependency_graph(self, connection, tables_metadata: List[Dict], analysis_depth: int) -> Dict[str, Dict]:
-        """Build dependency graph by analyzing SQL statements and DDL"""
+    def _build_dependency_graph(self, state: DependencyGraphState) -> Dict[str, Dict]:
+        """Build the dependency graph from cached view, runtime and foreign key edges"""
         dependency_graph = defaultdict(lambda: {
             "upstream_dependencies": set(),
             "downstream_dependencies": set(),
@@ -166,118 +264,213 @@ class DependencyAnalysisTools:
         })
         
         # Initialize graph with table metadata
-        for table in tables_metadata:
+        for table in state.tables_metadata:
             table_name = table["table_name"]
             schema_name = table.get("schema_name", "")
             full_table_name = f"{schema_name}.{table_name}" if schema_name else table_name
             
             dependency_graph[full_table_name]["table_type"] = table["table_type"]
         
-        # 1. Analyze view definitions for dependencies
-        await self._analyze_view_dependencies(connection, dependency_graph, tables_metadata)
+        # 1. View definitions
+        for full_view_name, ref_table in state.view_edges:
+            # Add upstream dependency
+            dependency_graph[full_view_name]["upstream_dependencies"].add(ref_table)
+            dependency_graph[full_view_name]["dependency_strength"][ref_table] = "direct"
+            
+            # Add downstream dependency for referenced table
+            dependency_graph[ref_table]["downstream_dependencies"].add(full_view_name)
+            
+            dependency_graph[full_view_name]["sql_patterns"].append({
+                "pattern_type": "view_definition",
+                "referenced_table": ref_table,
+                "confidence": 1.0
+            })
         
-        # 2. Analyze audit logs for runtime dependencies
-        await self._analyze_runtime_dependencies(connection, dependency_graph, analysis_depth)
+        # 2. Runtime dependencies observed more than once in the audit log
+        for (target_table, ref_table, pattern_type), (frequency, last_seen) in self._runtime_edges.items():
+            if frequency <= 1:
+                continue
+            dependency_graph[target_table]["upstream_dependencies"].add(ref_table)
+            dependency_graph[ref_table]["downstream_dependencies"].add(target_table)
+            
+            if pattern_type == "insert_select":
+                # Calculate confidence based on frequency
+                confidence = min(0.9, 0.3 + (frequency / 100))
+            else:
+                confidence = 0.95
+            dependency_graph[target_table]["sql_patterns"].append({
+                "pattern_type": pattern_type,
+                "referenced_table": ref_table,
+                "confidence": confidence,
+                "frequency": frequency
+            })
         
-        # 3. Analyze foreign key relationships
-        await self._analyze_foreign_key_dependencies(connection, dependency_graph, tables_metadata)
+        # 3. Foreign key relationships
+        for fk in state.foreign_keys:
+            full_table_name = fk["table"]
+            full_ref_table = fk["referenced_table"]
+            
+            # Add foreign key dependency
+            dependency_graph[full_table_name]["upstream_dependencies"].add(full_ref_table)
+            dependency_graph[full_table_name]["dependency_strength"][full_ref_table] = "foreign_key"
+            dependency_graph[full_ref_table]["downstream_dependencies"].add(full_table_name)
+            
+            dependency_graph[full_table_name]["sql_patterns"].append({
+                "pattern_type": "foreign_key",
+                "referenced_table": full_ref_table,
+                "confidence": 1.0,
+                "column": fk["column"],
+                "ref_column": fk["ref_column"]
+            })
         
         return dict(dependency_graph)
     
-    async def _analyze_view_dependencies(self, connection, dependency_graph: Dict, tables_metadata: List[Dict]) -> None:
-        """Analyze view definitions to extract table dependencies"""
+    async def _analyze_view_dependencies(self, connection, state: DependencyGraphState) -> None:
+        """Extract table dependencies from all view definitions with one information_schema query"""
+        views = [table for table in state.tables_metadata if table["table_type"] == "VIEW"]
+        if not views:
+            return
+        
+        definitions: Dict[Tuple[str, str], str] = {}
         try:
-            for table in tables_metadata:
-                if table["table_type"] == "VIEW":
-                    table_name = table["table_name"]
-                    schema_name = table.get("schema_name", "")
-                    
-                    # Get view definition
-                    view_def_sql = f"SHOW CREATE VIEW {schema_name}.{table_name}" if schema_name else f"SHOW CREATE VIEW {table_name}"
-                    
-                    try:
-                        result = await connection.execute(view_def_sql)
-                        if result.data and len(result.data) > 0:
-                            # Extract view definition from result
-                            view_definition = ""
-                            for row in result.data:
-                                for key, value in row.items():
-                                    if "create" in key.lower() and value:
-                                        view_definition = str(value)
-                                        break
-                            
-                            if view_definition:
-                                # Extract table dependencies from view definition
-                                referenced_tables = self._extract_table_references(view_definition)
-                                
-                                full_view_name = f"{schema_name}.{table_name}" if schema_name else table_name
-                                
-                                for ref_table in referenced_tables:
-                                    # Add upstream dependency
-                                    dependency_graph[full_view_name]["upstream_dependencies"].add(ref_table)
-                                    dependency_graph[full_view_name]["dependency_strength"][ref_table] = "direct"
-                                    
-                                    # Add downstream dependency for referenced table
-                                    dependency_graph[ref_table]["downstream_dependencies"].add(full_view_name)
-                                    
-                                    dependency_graph[full_view_name]["sql_patterns"].append({
-                                        "pattern_type": "view_definition",
-                                        "referenced_table": ref_table,
-                                        "confidence": 1.0
-                                    })
-                    
-                    except Exception as e:
-                        logger.warning(f"Failed to analyze view {table_name}: {str(e)}")
-                        continue
+            schemas = sorted({table.get("schema_name", "") for table in views})
+            schema_list = ", ".join("'" + schema.replace("'", "''") + "'" for schema in schemas)
+            views_sql = f"""
+            SELECT
+                table_schema as schema_name,
+                table_name,
+                view_definition
+            FROM information_schema.views
+            WHERE table_schema IN ({schema_list})
+            """
+            result = await connection.execute(views_sql)
+            for row in result.data or []:
+                if row.get("view_definition"):
+                    definitions[(row.get("schema_name", ""), row["table_name"])] = str(row["view_definition"])
+            state.view_definitions_source = "information_schema.views"
+        except Exception as e:
+            logger.warning(f"Failed to load view definitions from information_schema.views: {str(e)}")
         
+        for table in views:
+            table_name = table["table_name"]
+            schema_name = table.get("schema_name", "")
+            view_definition = definitions.get((schema_name, table_name))
+            
+            if not view_definition:
+                # Not exposed by information_schema (older versions, privileges): ask for this view only
+                view_definition = await self._show_create_view(connection, schema_name, table_name)
+                if view_definition:
+                    state.view_definitions_source = "show_create_view" if not definitions else "mixed"
+            
+            if view_definition:
+                full_view_name = f"{schema_name}.{table_name}" if schema_name else table_name
+                for ref_table in self._extract_table_references(view_definition):
+                    state.view_edges.append((full_view_name, ref_table))
+    
+    async def _show_create_view(self, connection, schema_name: str, table_name: str) -> str:
+        """Fetch one view definition with SHOW CREATE VIEW"""
+        view_def_sql = f"SHOW CREATE VIEW {schema_name}.{table_name}" if schema_name else f"SHOW CREATE VIEW {table_name}"
+        try:
+            result = await connection.execute(view_def_sql)
+            for row in result.data or []:
+                for key, value in row.items():
+                    if "create" in key.lower() and value:
+                        return str(value)
         except Exception as e:
-            logger.warning(f"Failed to analyze view dependencies: {str(e)}")
+            logger.warning(f"Failed to analyze view {table_name}: {str(e)}")
+        return ""
     
-    async def _analyze_runtime_dependencies(self, connection, dependency_graph: Dict, analysis_depth: int) -> None:
-        """Analyze audit logs to discover runtime table dependencies"""
+    async def _analyze_runtime_dependencies(self, connection, analysis_depth: int) -> None:
+        """Fold audit log rows in (watermark, NOW() - lag] into the runtime edges"""
         try:
-            # Get recent SQL statements from audit logs
-            audit_sql = """
-            SELECT 
+            # Fix the window's upper bound first so rows arriving during the scan
+            # fall into the next window instead of being skipped
+            bound_result = await connection.execute(
+                f"SELECT DATE_SUB(NOW(), INTERVAL {self.audit_lag_seconds} SECOND) AS upper_bound"
+            )
+            bound_rows = bound_result.data or []
+            if not bound_rows or bound_rows[0].get("upper_bound") is None:
+                logger.warning("Audit log scan skipped: could not read the server clock")
+                return
+            upper_bound = self._format_watermark(bound_rows[0]["upper_bound"])
+            
+            if self._audit_watermark:
+                since_condition = f"`time` > '{self._audit_watermark}'"
+                # Incremental windows are small; every statement in them must be read
+                limit_clause = ""
+            else:
+                since_condition = "`time` >= DATE_SUB(NOW(), INTERVAL 1 YEAR)"
+                # Bootstrap from the most frequent statements of the last year
+                limit_clause = "ORDER BY frequency DESC\n            LIMIT 1000"
+            
+            # Only statements that can create lineage (INSERT ... SELECT, CREATE TABLE AS SELECT)
+            audit_sql = f"""
+            SELECT
                 `stmt` as sql_statement,
-                `user` as user_name,
-                COUNT(*) as frequency
-            FROM internal.__internal_schema.audit_log 
-            WHERE `stmt` IS NOT NULL 
+                COUNT(*) as frequency,
+                MAX(`time`) as last_seen
+            FROM internal.__internal_schema.audit_log
+            WHERE `stmt` IS NOT NULL
                 AND `stmt` != ''
-                AND `time` >= DATE_SUB(NOW(), INTERVAL 1 YEAR)
-            GROUP BY `stmt`, `user`
-            HAVING frequency > 1
-            ORDER BY frequency DESC
-            LIMIT 1000
+                AND {since_condition}
+                AND `time` <= '{upper_bound}'
+                AND UPPER(`stmt`) LIKE '%SELECT%'
+                AND (UPPER(`stmt`) LIKE '%INSERT%' OR UPPER(`stmt`) LIKE '%CREATE%')
+            GROUP BY `stmt`
+            {limit_clause}
             """
             
             result = await connection.execute(audit_sql)
             
-            if result.data:
-                for row in result.data:
-                    sql_statement = row.get("sql_statement", "")
-                    frequency = row.get("frequency", 1)
+            changed = False
+            for row in result.data or []:
+                sql_statement = row.get("sql_statement", "")
+                frequency = int(row.get("frequency", 1) or 1)
+                last_seen = row.get("last_seen")
+                
+                if sql_statement:
+                    # Extract table references from SQL
+                    referenced_tables = self._extract_table_references(sql_statement)
                     
-                    if sql_statement:
-                        # Extract table references from SQL
-                        referenced_tables = self._extract_table_references(sql_statement)
-                        
-                        if len(referenced_tables) > 1:
-                            # Infer dependencies from multi-table queries
-                            self._infer_dependencies_from_sql(
-                                dependency_graph, sql_statement, referenced_tables, frequency
-                            )
+                    if len(referenced_tables) > 1:
+                        # Infer dependencies from multi-table queries
+                        changed |= self._infer_dependencies_from_sql(
+                            sql_statement, referenced_tables, frequency, last_seen
+                        )
+            
+            # The whole window has been read, even when it held no rows
+            self._audit_watermark = upper_bound
+            changed |= self._prune_runtime_edges()
+            if changed:
+                self._runtime_version += 1
         
         except Exception as e:
             logger.warning(f"Failed to analyze runtime dependencies: {str(e)}")
     
-    async def _analyze_foreign_key_dependencies(self, connection, dependency_graph: Dict, tables_metadata: List[Dict]) -> None:
+    def _prune_runtime_edges(self) -> bool:
+        """Drop runtime edges last seen before the retention cutoff; returns True if any were dropped"""
+        cutoff = datetime.now() - RUNTIME_EDGE_RETENTION
+        expired = [
+            key for key, (_, last_seen) in self._runtime_edges.items()
+            if isinstance(last_seen, datetime) and last_seen < cutoff
+        ]
+        for key in expired:
+            del self._runtime_edges[key]
+        return bool(expired)
+    
+    @staticmethod
+    def _format_watermark(value: Any) -> str:
+        """Audit log time as a literal usable in the next incremental query"""
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        return str(value).replace("'", "")
+    
+    async def _analyze_foreign_key_dependencies(self, connection, state: DependencyGraphState) -> None:
         """Analyze foreign key constraints for explicit dependencies"""
         try:
             # Get foreign key information
             fk_sql = """
-            SELECT 
+            SELECT
                 TABLE_SCHEMA as schema_name,
                 TABLE_NAME as table_name,
                 COLUMN_NAME as column_name,
@@ -298,18 +491,9 @@ class DependencyAnalysisTools:
                     ref_table_name = row["ref_table_name"]
                     
                     # Build full table names
-                    full_table_name = f"{schema_name}.{table_name}" if schema_name else table_name
-                    full_ref_table = f"{ref_schema}.{ref_table_name}" if ref_schema else ref_table_name
-                    
-                    # Add foreign key dependency
-                    dependency_graph[full_table_name]["upstream_dependencies"].add(full_ref_table)
-                    dependency_graph[full_table_name]["dependency_strength"][full_ref_table] = "foreign_key"
-                    dependency_graph[full_ref_table]["downstream_dependencies"].add(full_table_name)
-                    
-                    dependency_graph[full_table_name]["sql_patterns"].append({
-                        "pattern_type": "foreign_key",
-                        "referenced_table": full_ref_table,
-                        "confidence": 1.0,
+                    state.foreign_keys.append({
+                        "table": f"{schema_name}.{table_name}" if schema_name else table_name,
+                        "referenced_table": f"{ref_schema}.{ref_table_name}" if ref_schema else ref_table_name,
                         "column": row["column_name"],
                         "ref_column": row["ref_column_name"]
                     })
@@ -360,50 +544,40 @@ class DependencyAnalysisTools:
         }
         return word.upper() in keywords
     
-    def _infer_dependencies_from_sql(self, dependency_graph: Dict, sql: str, referenced_tables: List[str], frequency: int) -> None:
-        """Infer table dependencies from SQL patterns"""
+    def _infer_dependencies_from_sql(self, sql: str, referenced_tables: List[str], frequency: int, last_seen: Any = None) -> bool:
+        """Infer table dependencies from SQL patterns; returns True if runtime edges changed"""
         # Analyze SQL pattern to determine dependency relationships
         sql_upper = sql.upper()
         
         # Look for INSERT ... SELECT patterns
         if 'INSERT' in sql_upper and 'SELECT' in sql_upper:
             # Find target table (after INSERT INTO)
-            insert_match = re.search(r'INSERT\s+INTO\s+([a-zA-Z_][a-zA-Z0-9_.]*)', sql_upper)
-            if insert_match:
-                target_table = insert_match.group(1).lower()
-                
-                # All other tables are dependencies
-                for ref_table in referenced_tables:
-                    if ref_table != target_table:
-                        dependency_graph[target_table]["upstream_dependencies"].add(ref_table)
-                        dependency_graph[ref_table]["downstream_dependencies"].add(target_table)
-                        
-                        # Calculate confidence based on frequency
-                        confidence = min(0.9, 0.3 + (frequency / 100))
-                        dependency_graph[target_table]["sql_patterns"].append({
-                            "pattern_type": "insert_select",
-                            "referenced_table": ref_table,
-                            "confidence": confidence,
-                            "frequency": frequency
-                        })
+            target_match = re.search(r'INSERT\s+INTO\s+([a-zA-Z_][a-zA-Z0-9_.]*)', sql_upper)
+            pattern_type = "insert_select"
         
         # Look for CREATE TABLE AS SELECT patterns
         elif 'CREATE' in sql_upper and 'SELECT' in sql_upper:
-            create_match = re.search(r'CREATE\s+TABLE\s+([a-zA-Z_][a-zA-Z0-9_.]*)', sql_upper)
-            if create_match:
-                target_table = create_match.group(1).lower()
-                
-                for ref_table in referenced_tables:
-                    if ref_table != target_table:
-                        dependency_graph[target_table]["upstream_dependencies"].add(ref_table)
-                        dependency_graph[ref_table]["downstream_dependencies"].add(target_table)
-                        
-                        dependency_graph[target_table]["sql_patterns"].append({
-                            "pattern_type": "create_table_as_select",
-                            "referenced_table": ref_table,
-                            "confidence": 0.95,
-                            "frequency": frequency
-                        })
+            target_match = re.search(r'CREATE\s+TABLE\s+([a-zA-Z_][a-zA-Z0-9_.]*)', sql_upper)
+            pattern_type = "create_table_as_select"
+        
+        else:
+            return False
+        
+        if not target_match:
+            return False
+        
+        target_table = target_match.group(1).lower()
+        changed = False
+        
+        # All other tables are dependencies
+        for ref_table in referenced_tables:
+            if ref_table != target_table:
+                edge = self._runtime_edges.setdefault((target_table, ref_table, pattern_type), [0, None])
+                edge[0] += frequency
+                if last_seen is not None and (edge[1] is None or last_seen > edge[1]):
+                    edge[1] = last_seen
+                changed = True
+        return changed
     
     async def _analyze_single_table_dependencies(self, target_table: str, dependency_graph: Dict, tables_metadata: List[Dict]) -> Dict[str, Any]:
         """Analyze dependencies for a specific table"""
@@ -20,12 +20,15 @@ Features:
 - Log level-based file separation
 - Timestamped log entries
 - Automatic log rotation
+- Non-blocking queue-based delivery to a dedicated writer thread
 - Comprehensive logging coverage
 """
 
+import atexit
 import logging
 import logging.config
 import logging.handlers
+import queue
 import sys
 import os
 import asyncio
@@ -128,6 +131,120 @@ class LevelBasedFileHandler(logging.Handler):
         super().close()
 
 
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps disk I/O and rotation off the calling thread
+
+    Records go to a bounded in-memory queue drained by a QueueListener thread.
+    When the queue is above its pressure threshold only one in ``sample_every``
+    records at or below ``droppable_level`` is kept, and once it is full those
+    records are dropped. Higher levels wait up to ``block_timeout`` seconds for
+    space before being counted as dropped.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, droppable_level: int = logging.INFO,
+                 pressure_ratio: float = 0.8, sample_every: int = 10, block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        self.droppable_level = droppable_level
+        self.pressure_threshold = max(1, int(log_queue.maxsize * pressure_ratio)) if log_queue.maxsize > 0 else 0
+        self.sample_every = max(1, sample_every)
+        self.block_timeout = block_timeout
+        self._sample_counter = 0
+        
+        # Counters (updated under the handler lock held by Handler.handle)
+        self.enqueued = 0
+        self.sampled_out = 0
+        self.dropped = {}
+        self.max_depth = 0
+        self.emit_count = 0
+        self.emit_seconds = 0.0
+        self.max_emit_seconds = 0.0
+    
+    def emit(self, record):
+        """Admit, prepare and enqueue a record, measuring the time spent by the caller"""
+        start = time.perf_counter()
+        try:
+            if self._admit(record):
+                self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.emit_count += 1
+            self.emit_seconds += elapsed
+            if elapsed > self.max_emit_seconds:
+                self.max_emit_seconds = elapsed
+    
+    def _admit(self, record) -> bool:
+        """Apply the sampling policy for droppable records under pressure"""
+        if record.levelno > self.droppable_level or not self.pressure_threshold:
+            return True
+        if self.queue.qsize() < self.pressure_threshold:
+            return True
+        self._sample_counter += 1
+        if self._sample_counter % self.sample_every == 0:
+            return True
+        self.sampled_out += 1
+        return False
+    
+    def enqueue(self, record):
+        """Put a record on the queue without waiting on droppable levels"""
+        try:
+            if record.levelno <= self.droppable_level:
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+            return
+        self.enqueued += 1
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+    
+    def get_stats(self) -> dict:
+        """Get queue and caller-side latency statistics"""
+        return {
+            "queue_capacity": self.queue.maxsize,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "sampled_out": self.sampled_out,
+            "dropped": dict(self.dropped),
+            "dropped_total": sum(self.dropped.values()),
+            "emit_count": self.emit_count,
+            "avg_emit_us": round(self.emit_seconds / self.emit_count * 1e6, 2) if self.emit_count else 0.0,
+            "max_emit_ms": round(self.max_emit_seconds * 1000, 3),
+        }
+
+
+class MonitoredQueueListener(logging.handlers.QueueListener):
+    """Queue listener that tracks how long records wait before being written"""
+    
+    def __init__(self, log_queue: queue.Queue, *handlers, respect_handler_level: bool = True):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.handled = 0
+        self.delay_seconds = 0.0
+        self.max_delay_seconds = 0.0
+    
+    def handle(self, record):
+        """Write a record and record its queueing delay"""
+        delay = max(0.0, time.time() - record.created)
+        self.handled += 1
+        self.delay_seconds += delay
+        if delay > self.max_delay_seconds:
+            self.max_delay_seconds = delay
+        super().handle(record)
+    
+    def get_stats(self) -> dict:
+        """Get writer-side delivery statistics"""
+        return {
+            "writer_running": self._thread is not None,
+            "written": self.handled,
+            "avg_delivery_delay_ms": round(self.delay_seconds / self.handled * 1000, 3) if self.handled else 0.0,
+            "max_delivery_delay_ms": round(self.max_delay_seconds * 1000, 3),
+        }
+
+
 class LogCleanupManager:
     """Log file cleanup manager for automatic maintenance"""
     
@@ -286,6 +403,9 @@ class DorisLoggerManager:
         self.config = None
         self.loggers = {}
         self.cleanup_manager = None
+        self.queue_handlers = {}
+        self.queue_listeners = {}
+        self._atexit_registered = False
     
     def setup_logging(self, 
                      level: str = "INFO",
@@ -298,7 +418,11 @@ class DorisLoggerManager:
                      backup_count: int = 5,
                      enable_cleanup: bool = True,
                      max_age_days: int = 30,
-                     cleanup_interval_hours: int = 24) -> None:
+                     cleanup_interval_hours: int = 24,
+                     enable_async: bool = True,
+                     queue_size: int = 10000,
+                     queue_pressure_ratio: float = 0.8,
+                     queue_sample_every: int = 10) -> None:
         """
         Setup comprehensive logging configuration.
         
@@ -314,6 +438,10 @@ class DorisLoggerManager:
             enable_cleanup: Enable automatic log cleanup
             max_age_days: Maximum age of log files in days (default: 30)
             cleanup_interval_hours: Cleanup interval in hours (default: 24)
+            enable_async: Write records from a dedicated thread via a bounded queue
+            queue_size: Maximum number of records waiting to be written
+            queue_pressure_ratio: Queue fill ratio above which DEBUG/INFO records are sampled
+            queue_sample_every: Keep one in N DEBUG/INFO records under pressure
         """
         if self.is_initialized:
             return
@@ -401,9 +529,22 @@ class DorisLoggerManager:
                 datefmt="%Y-%m-%d %H:%M:%S"
             )
             audit_handler.setFormatter(audit_formatter)
+            if enable_async:
+                # Audit records are never sampled or dropped without waiting
+                audit_handler = self._start_queue(
+                    "audit", [audit_handler], queue_size,
+                    droppable_level=logging.NOTSET - 1, block_timeout=0.5
+                )
             audit_logger.addHandler(audit_handler)
             audit_logger.propagate = False  # Don't propagate to root logger
         
+        # Route root handlers through the writer thread so callers never wait on disk I/O
+        if enable_async and handlers:
+            handlers = [self._start_queue(
+                "root", handlers, queue_size,
+                pressure_ratio=queue_pressure_ratio, sample_every=queue_sample_every
+            )]
+        
         # Add all handlers to root logger
         for handler in handlers:
             root_logger.addHandler(handler)
@@ -434,6 +575,7 @@ class DorisLoggerManager:
         logger.info(f"Console Logging: {'Enabled' if enable_console else 'Disabled'}")
         logger.info(f"File Logging: {'Enabled' if enable_file else 'Disabled (fallback mode)'}")
         logger.info(f"Audit Logging: {'Enabled' if enable_audit else 'Disabled (fallback mode)'}")
+        logger.info(f"Async Logging: {f'Enabled (queue size {queue_size})' if self.queue_listeners else 'Disabled'}")
         logger.info(f"Log Cleanup: {'Enabled' if enable_cleanup and enable_file else 'Disabled (fallback mode)'}")
         if enable_cleanup and enable_file:
             logger.info(f"Cleanup Settings: Max age {max_age_days} days, interval {cleanup_interval_hours}h")
@@ -442,6 +584,38 @@ class DorisLoggerManager:
             logger.warning(f"Could not create log directory '{log_dir}' - stdio mode fallback enabled")
         logger.info("=" * 80)
     
+    def _start_queue(self, name: str, handlers: list, queue_size: int,
+                     droppable_level: int = logging.INFO, pressure_ratio: float = 0.8,
+                     sample_every: int = 10, block_timeout: float = 0.05) -> NonBlockingQueueHandler:
+        """Start a writer thread for the given handlers and return the queue handler feeding it"""
+        log_queue = queue.Queue(maxsize=max(1, queue_size))
+        listener = MonitoredQueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        queue_handler = NonBlockingQueueHandler(
+            log_queue,
+            droppable_level=droppable_level,
+            pressure_ratio=pressure_ratio,
+            sample_every=sample_every,
+            block_timeout=block_timeout
+        )
+        self.queue_handlers[name] = queue_handler
+        self.queue_listeners[name] = listener
+        
+        # Flush queued records if the interpreter exits without an explicit shutdown
+        if not self._atexit_registered:
+            atexit.register(self._stop_queue_listeners)
+            self._atexit_registered = True
+        
+        return queue_handler
+    
+    def _stop_queue_listeners(self):
+        """Drain the queues and stop the writer threads"""
+        for listener in self.queue_listeners.values():
+            try:
+                listener.stop()
+            except Exception as e:
+                print(f"Error stopping log queue listener: {e}")
+    
     def _setup_package_loggers(self, level: str):
         """Setup specific loggers for different modules"""
         package_loggers = [
@@ -477,6 +651,19 @@ class DorisLoggerManager:
         """Get the audit logger"""
         return logging.getLogger("audit")
     
+    def get_queue_stats(self) -> dict:
+        """Get queue, drop and latency statistics for asynchronous logging"""
+        if not self.queue_handlers:
+            return {"enabled": False}
+        
+        stats = {"enabled": True}
+        for name, queue_handler in self.queue_handlers.items():
+            stats[name] = {
+                **queue_handler.get_stats(),
+                **self.queue_listeners[name].get_stats()
+            }
+        return stats
+    
     def log_system_info(self):
         """Log system information for debugging"""
         logger = self.get_logger("doris_mcp_server.system")
@@ -519,6 +706,17 @@ class DorisLoggerManager:
         if self.cleanup_manager:
             self.cleanup_manager.stop_cleanup_scheduler()
         
+        # Flush queued records before closing the handlers behind the writer threads
+        self._stop_queue_listeners()
+        for listener in self.queue_listeners.values():
+            for handler in listener.handlers:
+                try:
+                    handler.close()
+                except Exception as e:
+                    print(f"Error closing handler: {e}")
+        self.queue_handlers = {}
+        self.queue_listeners = {}
+        
         # Close all handlers
         root_logger = logging.getLogger()
         for handler in root_logger.handlers[:]:
@@ -552,7 +750,11 @@ def setup_logging(level: str = "INFO",
                  backup_count: int = 5,
                  enable_cleanup: bool = True,
                  max_age_days: int = 30,
-                 cleanup_interval_hours: int = 24) -> None:
+                 cleanup_interval_hours: int = 24,
+                 enable_async: bool = True,
+                 queue_size: int = 10000,
+                 queue_pressure_ratio: float = 0.8,
+                 queue_sample_every: int = 10) -> None:
     """
     Setup logging configuration (convenience function).
     
@@ -568,6 +770,10 @@ def setup_logging(level: str = "INFO",
         enable_cleanup: Enable automatic log cleanup
         max_age_days: Maximum age of log files in days (default: 30)
         cleanup_interval_hours: Cleanup interval in hours (default: 24)
+        enable_async: Write records from a dedicated thread via a bounded queue
+        queue_size: Maximum number of records waiting to be written
+        queue_pressure_ratio: Queue fill ratio above which DEBUG/INFO records are sampled
+        queue_sample_every: Keep one in N DEBUG/INFO records under pressure
     """
     _logger_manager.setup_logging(
         level=level,
@@ -580,7 +786,11 @@ def setup_logging(level: str = "INFO",
         backup_count=backup_count,
         enable_cleanup=enable_cleanup,
         max_age_days=max_age_days,
-        cleanup_interval_hours=cleanup_interval_hours
+        cleanup_interval_hours=cleanup_interval_hours,
+        enable_async=enable_async,
+        queue_size=queue_size,
+        queue_pressure_ratio=queue_pressure_ratio,
+        queue_sample_every=queue_sample_every
     )
 
 
@@ -612,6 +822,11 @@ def get_cleanup_stats() -> dict:
     return _logger_manager.get_cleanup_stats()
 
 
+def get_logging_stats() -> dict:
+    """Get asynchronous logging queue statistics"""
+    return _logger_manager.get_queue_stats()
+
+
 def manual_cleanup() -> dict:
     """Manually trigger log cleanup and return statistics"""
     return _logger_manager.manual_cleanup()
@@ -19,6 +19,9 @@ Performance Analytics Tools Module
 Provides slow query analysis and resource growth monitoring capabilities
 """
 
+import asyncio
+import json
+import os
 import time
 import statistics
 from datetime import datetime, timedelta
@@ -28,6 +31,11 @@ from collections import defaultdict, Counter
 from .db import DorisConnectionManager
 from .logger import get_logger
 
+try:
+    import fcntl
+except ImportError:  # Windows: snapshots are only merged within one process
+    fcntl = None
+
 logger = get_logger(__name__)
 
 
@@ -36,6 +44,18 @@ class PerformanceAnalyticsTools:
     
     def __init__(self, connection_manager: DorisConnectionManager):
         self.connection_manager = connection_manager
+        # Per-table growth probes that cannot be answered from metadata run this many at a time
+        self.probe_concurrency = max(1, int(os.getenv("STORAGE_GROWTH_PROBE_CONCURRENCY", "4")))
+        # Daily table size snapshots, the preferred source for storage growth curves
+        temp_files_dir = getattr(getattr(connection_manager, "config", None), "temp_files_dir", "tmp")
+        if not isinstance(temp_files_dir, str):
+            temp_files_dir = "tmp"
+        self.snapshot_file = os.getenv(
+            "STORAGE_SNAPSHOT_FILE", os.path.join(temp_files_dir, "storage_snapshots.json")
+        )
+        self.snapshot_retention_days = int(os.getenv("STORAGE_SNAPSHOT_RETENTION_DAYS", "400"))
+        self._snapshots: Optional[Dict[str, Dict[str, List]]] = None
+        self._snapshot_lock = asyncio.Lock()
         logger.info("PerformanceAnalyticsTools initialized")
     
     async def analyze_slow_queries_topn(
@@ -182,7 +202,7 @@ class PerformanceAnalyticsTools:
                 "recommendations": self._generate_enhanced_growth_recommendations(growth_insights, predictions),
                 "data_quality": {
                     "historical_data_available": True,
-                    "analysis_methods": ["partition_based", "timestamp_based", "audit_log_based"],
+                    "analysis_methods": ["daily_snapshot", "partition_based", "timestamp_based", "audit_log_based"],
                     "confidence_level": "high"
                 }
             }
@@ -627,26 +647,19 @@ class PerformanceAnalyticsTools:
             
             logger.info(f" Analyzing {len(selected_tables)} high-impact tables (covering {selected_tables['coverage_percentage']:.1f}% of total data)")
             
-            # Step 3: Detailed analysis only for selected tables
-            table_growth_data = []
-            total_current_size = selected_tables["total_selected_size_mb"]
-            total_historical_data_points = 0
+            # Step 3: Record today's size snapshot; stored snapshots are the preferred growth history
+            snapshots = await self._record_storage_snapshot(all_tables_sizes)
             
-            for table_info in selected_tables["tables"]:
-                table_name = table_info["table_name"]
-                schema_name = table_info["schema_name"]
-                full_table_name = f"{schema_name}.{table_name}" if schema_name else table_name
-                
-                logger.info(f" Analyzing table: {full_table_name} ({table_info['size_mb']:.1f}MB)")
-                
-                # Analyze historical growth for single table
-                table_growth = await self._analyze_single_table_storage_growth(
-                    connection, full_table_name, table_name, schema_name, days
+            # Step 4: Detailed analysis only for selected tables
+            total_current_size = selected_tables["total_selected_size_mb"]
+            table_growth_data = [
+                table_growth
+                for table_growth in await self._analyze_tables_storage_growth(
+                    connection, selected_tables["tables"], days, snapshots
                 )
-                
-                if table_growth and table_growth.get("current_size_mb", 0) > 0:
-                    table_growth_data.append(table_growth)
-                    total_historical_data_points += len(table_growth.get("historical_data", []))
+                if table_growth.get("current_size_mb", 0) > 0
+            ]
+            total_historical_data_points = sum(len(table.get("historical_data", [])) for table in table_growth_data)
             
             # Calculate overall storage growth trends
             overall_growth = await self._calculate_overall_storage_growth(table_growth_data, days)
@@ -750,16 +763,9 @@ class PerformanceAnalyticsTools:
             logger.info(" Stage 2: Getting table-level details for selected databases...")
             all_tables_sizes = []
             
-            for db_info in selected_dbs['databases']:
-                db_name = db_info['db_name']
-                try:
-                    # Get table details for this database using information_schema
-                    table_details = await self._get_database_table_details_from_schema(connection, db_name)
-                    all_tables_sizes.extend(table_details)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to get table details for database {db_name}: {str(e)}")
-                    continue
+            db_names = [db_info['db_name'] for db_info in selected_dbs['databases']]
+            # One information_schema query covers every selected database
+            all_tables_sizes.extend(await self._get_database_table_details_from_schema(connection, db_names))
             
             # Sort by size descending, handle None values
             all_tables_sizes.sort(key=lambda x: x.get("size_mb", 0) or 0, reverse=True)
@@ -802,8 +808,11 @@ class PerformanceAnalyticsTools:
             "coverage_percentage": coverage_percentage
         }
     
-    async def _get_database_table_details_from_schema(self, connection, db_name: str) -> List[Dict]:
-        """Get table details for a specific database using information_schema"""
+    async def _get_database_table_details_from_schema(self, connection, db_names: List[str]) -> List[Dict]:
+        """Get table details for the given databases with one information_schema query"""
+        if not db_names:
+            return []
+        db_list = self._sql_string_list(db_names)
         try:
             table_details_sql = f"""
             SELECT 
@@ -814,7 +823,7 @@ class PerformanceAnalyticsTools:
                 CREATE_TIME as create_time,
                 UPDATE_TIME as update_time
             FROM information_schema.tables 
-            WHERE TABLE_SCHEMA = '{db_name}'
+            WHERE TABLE_SCHEMA IN ({db_list})
                 AND TABLE_TYPE = 'BASE TABLE'
                 AND (COALESCE(DATA_LENGTH, 0) + COALESCE(INDEX_LENGTH, 0)) > 0
             ORDER BY size_mb DESC
@@ -823,7 +832,7 @@ class PerformanceAnalyticsTools:
             result = await connection.execute(table_details_sql)
             
             if not result.data:
-                logger.warning(f"No table details found for database {db_name}")
+                logger.warning(f"No table details found for databases {', '.join(db_names)}")
                 return []
             
             table_details = []
@@ -857,11 +866,11 @@ class PerformanceAnalyticsTools:
                         "update_time": str(row.get("update_time", ""))
                     })
             
-            logger.info(f" Found {len(table_details)} tables in database {db_name}")
+            logger.info(f" Found {len(table_details)} tables in {len(db_names)} databases")
             return table_details
             
         except Exception as e:
-            logger.error(f"Failed to get table details for database {db_name}: {str(e)}")
+            logger.error(f"Failed to get table details for databases {', '.join(db_names)}: {str(e)}")
             return []
     
     async def _get_database_table_details(self, connection, db_name: str) -> List[Dict]:
@@ -1060,125 +1069,182 @@ class PerformanceAnalyticsTools:
             logger.warning(f"Failed to get tables info: {str(e)}")
             return []
     
-    async def _analyze_single_table_storage_growth(
-        self, connection, full_table_name: str, table_name: str, schema_name: str, days: int
-    ) -> Optional[Dict]:
-        """Analyze storage growth for a single table"""
-        try:
-            # Get current table size
-            current_size = await self._get_current_table_size(connection, full_table_name)
-            if not current_size:
-                return None
-            
-            # Try multiple methods to get historical data
-            historical_data = []
-            data_source = "unknown"
-            
-            # Method 1: Partition-based historical data
-            partition_data = await self._get_partition_based_growth_data(
-                connection, table_name, schema_name, days
-            )
-            if partition_data:
-                historical_data = partition_data
-                data_source = "partition_based"
-            
-            # Method 2: Timestamp field-based historical data
-            if not historical_data:
-                timestamp_data = await self._get_timestamp_based_growth_data(
-                    connection, full_table_name, table_name, schema_name, days
-                )
-                if timestamp_data:
-                    historical_data = timestamp_data
-                    data_source = "timestamp_based"
-            
-            # Method 3: Audit log-based growth estimation
-            if not historical_data:
-                audit_data = await self._get_audit_based_growth_estimation(
-                    connection, table_name, days
-                )
-                if audit_data:
-                    historical_data = audit_data
-                    data_source = "audit_log_based"
-            
-            # Calculate growth rate
-            growth_metrics = self._calculate_table_growth_metrics(historical_data, current_size)
-            
-            return {
-                "table_name": full_table_name,
+    async def _analyze_tables_storage_growth(
+        self, connection, tables: List[Dict], days: int, snapshots: Dict[str, Dict[str, List]]
+    ) -> List[Dict]:
+        """Analyze storage growth for the selected tables with set-based metadata queries"""
+        histories: Dict[str, Tuple[List[Dict], str]] = {}
+            
+        # Method 1: Stored daily size snapshots
+        pending = []
+        for table in tables:
+            snapshot_data = self._get_snapshot_growth_data(snapshots, table["full_table_name"], days)
+            if len(snapshot_data) >= 2:
+                histories[table["full_table_name"]] = (snapshot_data, "daily_snapshot")
+            else:
+                pending.append(table)
+            
+        # Method 2: Partition-based historical data, one query for all tables
+        if pending:
+            partition_data = await self._get_partition_based_growth_data(connection, pending, days)
+            for table in pending:
+                if partition_data.get(table["full_table_name"]):
+                    histories[table["full_table_name"]] = (partition_data[table["full_table_name"]], "partition_based")
+            pending = [table for table in pending if table["full_table_name"] not in histories]
+            
+        # Methods 3-4: per-table probes (timestamp scan, audit log) with bounded concurrency
+        if pending:
+            timestamp_columns = await self._find_timestamp_columns(connection, pending)
+            semaphore = asyncio.Semaphore(self.probe_concurrency)
+            
+            async def probe(table: Dict) -> Tuple[List[Dict], str]:
+                async with semaphore:
+                    columns = timestamp_columns.get(table["full_table_name"])
+                    if columns:
+                        timestamp_data = await self._get_timestamp_based_growth_data(
+                            table["full_table_name"], columns[0], days
+                        )
+                        if timestamp_data:
+                            return timestamp_data, "timestamp_based"
+                    audit_data = await self._get_audit_based_growth_estimation(table["full_table_name"], days)
+                    if audit_data:
+                        return audit_data, "audit_log_based"
+                    return [], "unknown"
+            
+            results = await asyncio.gather(*(probe(table) for table in pending))
+            for table, history in zip(pending, results):
+                histories[table["full_table_name"]] = history
+            
+        table_growth_data = []
+        for table in tables:
+            historical_data, data_source = histories[table["full_table_name"]]
+            current_size = {"size_mb": table.get("size_mb", 0), "rows": table.get("row_count", 0)}
+            table_growth_data.append({
+                "table_name": table["full_table_name"],
                 "current_size_mb": current_size["size_mb"],
                 "current_rows": current_size["rows"],
                 "data_source": data_source,
                 "historical_data": historical_data,
-                "growth_metrics": growth_metrics,
+                "growth_metrics": self._calculate_table_growth_metrics(historical_data, current_size),
                 "analysis_period_days": days
-            }
-            
-        except Exception as e:
-            logger.warning(f"Failed to analyze growth for table {full_table_name}: {str(e)}")
-            return None
+            })
+        
+        return table_growth_data
+    
+    async def _record_storage_snapshot(self, all_tables_sizes: List[Dict]) -> Dict[str, Dict[str, List]]:
+        """Store today's table sizes and return all retained snapshots ({date: {table: [size_mb, rows]}})"""
+        today = datetime.now().date().isoformat()
+        entry = {
+            table["full_table_name"]: [round(table.get("size_mb", 0) or 0, 2), table.get("row_count", 0) or 0]
+            for table in all_tables_sizes
+            if table.get("full_table_name")
+        }
+        cutoff = (datetime.now() - timedelta(days=self.snapshot_retention_days)).date().isoformat()
+        
+        async with self._snapshot_lock:
+            try:
+                self._snapshots = await asyncio.to_thread(self._merge_snapshot, today, entry, cutoff)
+            except Exception as e:
+                logger.warning(f"Failed to save storage snapshots to {self.snapshot_file}: {str(e)}")
+                # Keep serving growth curves from this process's copy
+                snapshots = self._snapshots if self._snapshots is not None else {}
+                snapshots[today] = entry
+                self._snapshots = self._prune_snapshots(snapshots, cutoff)
+            
+            return self._snapshots
+    
+    def _merge_snapshot(self, today: str, entry: Dict[str, List], cutoff: str) -> Dict[str, Dict[str, List]]:
+        """
+        Merge today's entry into the snapshot file under an inter-process lock.
+        The file is re-read every time, so days written by other workers are
+        never overwritten from a stale copy.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_file)), exist_ok=True)
+        with open(f"{self.snapshot_file}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            snapshots = self._load_snapshots()
+            snapshots[today] = entry
+            snapshots = self._prune_snapshots(snapshots, cutoff)
+            self._save_snapshots(snapshots)
+            return snapshots
     
-    async def _get_current_table_size(self, connection, full_table_name: str) -> Optional[Dict]:
-        """Get current table size"""
+    @staticmethod
+    def _prune_snapshots(snapshots: Dict[str, Dict[str, List]], cutoff: str) -> Dict[str, Dict[str, List]]:
+        """Drop days older than the retention cutoff"""
+        return {date_key: tables for date_key, tables in snapshots.items() if date_key >= cutoff}
+    
+    def _load_snapshots(self) -> Dict[str, Dict[str, List]]:
+        """Load stored daily snapshots, starting empty if the file is missing or unreadable"""
         try:
-            # Try to query table size directly
-            size_sql = f"""
-            SELECT 
-                COALESCE(ROUND((COALESCE(data_length, 0) + COALESCE(index_length, 0)) / 1024 / 1024, 2), 0) as size_mb,
-                COALESCE(table_rows, 0) as `rows`
-            FROM information_schema.tables
-            WHERE CONCAT(table_schema, '.', table_name) = '{full_table_name}'
-                OR table_name = '{full_table_name.split('.')[-1]}'
-            """
-            
-            result = await connection.execute(size_sql)
-            if result.data and result.data[0]:
-                return result.data[0]
-            
-            # If information_schema has no data, try COUNT query
-            count_sql = f"SELECT COUNT(*) as rows FROM {full_table_name}"
-            count_result = await connection.execute(count_sql)
-            if count_result.data:
-                return {
-                    "size_mb": 0,  # Cannot get exact size
-                    "rows": count_result.data[0]["rows"]
-                }
-            
-            return None
-            
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
         except Exception as e:
-            logger.warning(f"Failed to get current size for {full_table_name}: {str(e)}")
-            return None
+            logger.warning(f"Ignoring unreadable storage snapshot file {self.snapshot_file}: {str(e)}")
+            return {}
+    
+    def _save_snapshots(self, snapshots: Dict[str, Dict[str, List]]) -> None:
+        """Write snapshots atomically so concurrent readers never see a partial file"""
+        temp_file = f"{self.snapshot_file}.{os.getpid()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshots, f, separators=(',', ':'))
+        os.replace(temp_file, self.snapshot_file)
+            
+    def _get_snapshot_growth_data(self, snapshots: Dict[str, Dict[str, List]], full_table_name: str, days: int) -> List[Dict]:
+        """Growth history for one table from stored daily snapshots"""
+        since = (datetime.now() - timedelta(days=days)).date().isoformat()
+        historical_data = []
+        for date_key in sorted(snapshots):
+            if date_key < since or full_table_name not in snapshots[date_key]:
+                continue
+            size_mb, rows = snapshots[date_key][full_table_name]
+            historical_data.append({
+                "date": date_key,
+                "rows": rows,
+                "size_mb": size_mb,
+                "data_source": "daily_snapshot"
+            })
+        return historical_data
     
     async def _get_partition_based_growth_data(
-        self, connection, table_name: str, schema_name: str, days: int
-    ) -> List[Dict]:
-        """Get historical growth data based on partitions"""
+        self, connection, tables: List[Dict], days: int
+    ) -> Dict[str, List[Dict]]:
+        """Get historical growth data based on partitions for all given tables at once"""
         try:
+            wanted = {(table["schema_name"] or "", table["table_name"]): table["full_table_name"] for table in tables}
+            
             # Query partition information
             partition_sql = f"""
             SELECT 
+                table_schema as schema_name,
+                table_name,
                 partition_name,
                 partition_description,
                 table_rows,
                 data_length,
                 create_time
             FROM information_schema.partitions
-            WHERE table_schema = '{schema_name or ""}'
-                AND table_name = '{table_name}'
+            WHERE table_schema IN ({self._sql_string_list(schema for schema, _ in wanted)})
+                AND table_name IN ({self._sql_string_list(name for _, name in wanted)})
                 AND partition_name IS NOT NULL
                 AND create_time IS NOT NULL
                 AND create_time >= DATE_SUB(NOW(), INTERVAL {days} DAY)
-            ORDER BY create_time DESC
             """
             
             result = await connection.execute(partition_sql)
             if not result.data:
-                return []
+                return {}
             
-            # Process partition data, aggregate by date
-            daily_data = defaultdict(lambda: {"rows": 0, "size_mb": 0})
+            # Process partition data, aggregate by table and date
+            daily_data = defaultdict(lambda: defaultdict(lambda: {"rows": 0, "size_mb": 0}))
             
             for partition in result.data:
+                full_table_name = wanted.get((partition.get("schema_name") or "", partition.get("table_name")))
+                if not full_table_name:
+                    continue
+                
                 create_date = partition["create_time"]
                 if isinstance(create_date, str):
                     create_date = datetime.fromisoformat(create_date.replace('Z', '+00:00'))
@@ -1186,38 +1252,33 @@ class PerformanceAnalyticsTools:
                 date_key = create_date.date().isoformat()
                 table_rows = partition.get("table_rows", 0) or 0
                 data_length = partition.get("data_length", 0) or 0
-                daily_data[date_key]["rows"] += table_rows
-                daily_data[date_key]["size_mb"] += (data_length / 1024 / 1024)
+                daily_data[full_table_name][date_key]["rows"] += table_rows
+                daily_data[full_table_name][date_key]["size_mb"] += (data_length / 1024 / 1024)
             
             # Convert to list format
-            historical_data = []
-            for date_str, data in sorted(daily_data.items()):
-                historical_data.append({
-                    "date": date_str,
-                    "rows": data["rows"],
-                    "size_mb": round(data["size_mb"], 2),
-                    "data_source": "partition_create_time"
-                })
+            growth_data = {}
+            for full_table_name, table_days in daily_data.items():
+                growth_data[full_table_name] = [
+                    {
+                        "date": date_str,
+                        "rows": data["rows"],
+                        "size_mb": round(data["size_mb"], 2),
+                        "data_source": "partition_create_time"
+                    }
+                    for date_str, data in sorted(table_days.items())
+                ]
             
-            return historical_data
+            return growth_data
             
         except Exception as e:
             logger.warning(f"Failed to get partition-based growth data: {str(e)}")
-            return []
+            return {}
     
     async def _get_timestamp_based_growth_data(
-        self, connection, full_table_name: str, table_name: str, schema_name: str, days: int
+        self, full_table_name: str, time_column: str, days: int
     ) -> List[Dict]:
-        """Get historical growth data based on timestamp fields"""
+        """Get historical growth data based on a timestamp field (runs on its own pooled connection)"""
         try:
-            # Find possible timestamp fields
-            timestamp_columns = await self._find_timestamp_columns(connection, table_name, schema_name)
-            if not timestamp_columns:
-                return []
-            
-            # Use best timestamp field for analysis
-            time_column = timestamp_columns[0]
-            
             # Aggregate data by date
             growth_sql = f"""
             SELECT 
@@ -1231,7 +1292,7 @@ class PerformanceAnalyticsTools:
             ORDER BY date DESC
             """
             
-            result = await connection.execute(growth_sql)
+            result = await self.connection_manager.execute_query("query", growth_sql)
             if not result.data:
                 return []
             
@@ -1254,14 +1315,15 @@ class PerformanceAnalyticsTools:
             logger.warning(f"Failed to get timestamp-based growth data: {str(e)}")
             return []
     
-    async def _find_timestamp_columns(self, connection, table_name: str, schema_name: str) -> List[str]:
-        """Find timestamp fields in table"""
+    async def _find_timestamp_columns(self, connection, tables: List[Dict]) -> Dict[str, List[str]]:
+        """Find timestamp fields for all given tables with one information_schema query"""
         try:
+            wanted = {(table["schema_name"] or "", table["table_name"]): table["full_table_name"] for table in tables}
             timestamp_sql = f"""
-            SELECT column_name, data_type
+            SELECT table_schema as schema_name, table_name, column_name, data_type
             FROM information_schema.columns
-            WHERE table_schema = '{schema_name or ""}'
-                AND table_name = '{table_name}'
+            WHERE table_schema IN ({self._sql_string_list(schema for schema, _ in wanted)})
+                AND table_name IN ({self._sql_string_list(name for _, name in wanted)})
                 AND (
                     data_type IN ('datetime', 'timestamp', 'date')
                     OR column_name REGEXP '(create|insert|update|modify).*time'
@@ -1269,6 +1331,8 @@ class PerformanceAnalyticsTools:
                     OR column_name REGEXP '(created|updated|modified)_(at|on)'
                 )
             ORDER BY 
+                table_schema,
+                table_name,
                 CASE 
                     WHEN column_name REGEXP '(create|insert).*time' THEN 1
                     WHEN column_name REGEXP 'update.*time' THEN 2
@@ -1279,16 +1343,21 @@ class PerformanceAnalyticsTools:
             """
             
             result = await connection.execute(timestamp_sql)
-            return [row["column_name"] for row in result.data] if result.data else []
+            columns = defaultdict(list)
+            for row in result.data or []:
+                full_table_name = wanted.get((row.get("schema_name") or "", row.get("table_name")))
+                if full_table_name:
+                    columns[full_table_name].append(row["column_name"])
+            return dict(columns)
             
         except Exception as e:
             logger.warning(f"Failed to find timestamp columns: {str(e)}")
-            return []
+            return {}
     
     async def _get_audit_based_growth_estimation(
-        self, connection, table_name: str, days: int
+        self, table_name: str, days: int
     ) -> List[Dict]:
-        """Estimate growth data based on audit logs"""
+        """Estimate growth data based on audit logs (runs on its own pooled connection)"""
         try:
             # Analyze operation history for this table
             audit_sql = f"""
@@ -1309,7 +1378,7 @@ class PerformanceAnalyticsTools:
             ORDER BY operation_date DESC
             """
             
-            result = await connection.execute(audit_sql)
+            result = await self.connection_manager.execute_query("query", audit_sql)
             if not result.data:
                 return []
             
@@ -1333,6 +1402,11 @@ class PerformanceAnalyticsTools:
             logger.warning(f"Failed to get audit-based growth estimation: {str(e)}")
             return []
     
+    @staticmethod
+    def _sql_string_list(values) -> str:
+        """Quoted, de-duplicated SQL string list for IN (...) filters"""
+        return ", ".join("'" + str(value).replace("'", "''") + "'" for value in sorted(set(values)))
+    
     def _calculate_table_growth_metrics(self, historical_data: List[Dict], current_size: Dict) -> Dict[str, Any]:
         """Calculate table growth metrics"""
         if not historical_data or len(historical_data) < 2:
@@ -35,6 +35,7 @@ from decimal import Decimal
 
 from .db import DorisConnectionManager, QueryResult
 from .logger import get_logger
+from .shared_state import MISS, SharedStateStore, get_shared_store, tier_hit_stats
 
 
 @dataclass
@@ -89,33 +90,49 @@ class QueryMetrics:
 
 
 class QueryCache:
-    """Query result cache manager"""
+    """Query result cache manager
 
-    def __init__(self, max_size: int = 1000, default_ttl: int = 300):
+    Results are kept in a per-worker dictionary and, when a shared store is
+    configured (multi-worker mode), also published to the shared tier so other
+    workers can answer the same query without executing it.
+
+    Keys include a scope naming the database configuration and caller token
+    the result was produced with, so token-bound tenants never read each
+    other's results.
+    """
+
+    SHARED_NAMESPACE = "query_results"
+
+    def __init__(self, max_size: int = 1000, default_ttl: int = 300, shared_store: SharedStateStore | None = None):
         self.max_size = max_size
         self.default_ttl = default_ttl
         self.cache: dict[str, CachedQuery] = {}
+        self.shared_store = shared_store
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
         self.logger = get_logger(__name__)
 
     def _generate_cache_key(
-        self, sql: str, parameters: dict[str, Any] | None = None
+        self, sql: str, parameters: dict[str, Any] | None = None, scope: str = ""
     ) -> str:
         """Generate cache key"""
-        cache_data = {"sql": sql.strip().lower(), "parameters": parameters or {}}
+        cache_data = {"sql": sql.strip().lower(), "parameters": parameters or {}, "scope": scope}
         cache_string = json.dumps(cache_data, sort_keys=True)
         return hashlib.md5(cache_string.encode()).hexdigest()
 
     async def get(
-        self, sql: str, parameters: dict[str, Any] | None = None
+        self, sql: str, parameters: dict[str, Any] | None = None, scope: str = ""
     ) -> CachedQuery | None:
         """Get cached query result"""
-        cache_key = self._generate_cache_key(sql, parameters)
+        cache_key = self._generate_cache_key(sql, parameters, scope)
 
         if cache_key in self.cache:
             cached_query = self.cache[cache_key]
 
             if not cached_query.is_expired():
                 cached_query.access()
+                self.local_hits += 1
                 self.logger.debug(f"Cache hit: {cache_key}")
                 return cached_query
             else:
@@ -123,6 +140,20 @@ class QueryCache:
                 del self.cache[cache_key]
                 self.logger.debug(f"Cache expired, cleaned up: {cache_key}")
 
+        # Fall back to results published by other workers
+        if self.shared_store is not None:
+            shared = await self.shared_store.aget(self.SHARED_NAMESPACE, cache_key)
+            if shared is not MISS:
+                result, created_at, ttl = shared
+                cached_query = CachedQuery(result=result, created_at=created_at, ttl=ttl)
+                if not cached_query.is_expired():
+                    cached_query.access()
+                    self.shared_hits += 1
+                    await self._store_local(cache_key, cached_query)
+                    self.logger.debug(f"Shared cache hit: {cache_key}")
+                    return cached_query
+
+        self.misses += 1
         return None
 
     async def set(
@@ -131,23 +162,35 @@ class QueryCache:
         result: QueryResult,
         parameters: dict[str, Any] | None = None,
         ttl: int | None = None,
+        scope: str = "",
     ) -> str:
         """Set query result cache"""
-        cache_key = self._generate_cache_key(sql, parameters)
-
-        # Check cache size limit
-        if len(self.cache) >= self.max_size:
-            await self._evict_oldest()
+        cache_key = self._generate_cache_key(sql, parameters, scope)
 
         cached_query = CachedQuery(
             result=result, created_at=datetime.utcnow(), ttl=ttl or self.default_ttl
         )
 
-        self.cache[cache_key] = cached_query
+        await self._store_local(cache_key, cached_query)
+        if self.shared_store is not None:
+            await self.shared_store.aset(
+                self.SHARED_NAMESPACE,
+                cache_key,
+                (result, cached_query.created_at, cached_query.ttl),
+                cached_query.ttl if cached_query.ttl > 0 else None,
+            )
         self.logger.debug(f"Cache set: {cache_key}")
 
         return cache_key
 
+    async def _store_local(self, cache_key: str, cached_query: CachedQuery):
+        """Store an entry in the per-worker cache, evicting if full"""
+        # Check cache size limit
+        if len(self.cache) >= self.max_size and cache_key not in self.cache:
+            await self._evict_oldest()
+
+        self.cache[cache_key] = cached_query
+
     async def _evict_oldest(self):
         """Clean up oldest cache item"""
         if not self.cache:
@@ -175,6 +218,8 @@ class QueryCache:
         """Clean up all cache"""
         cache_count = len(self.cache)
         self.cache.clear()
+        if self.shared_store is not None:
+            await self.shared_store.aclear(self.SHARED_NAMESPACE)
         self.logger.info(f"Cleaned up all cache, total {cache_count} items")
 
     def get_stats(self) -> dict[str, Any]:
@@ -189,6 +234,9 @@ class QueryCache:
             if total_access == 0
             else sum(cached.access_count for cached in self.cache.values())
             / total_access,
+            "tiers": tier_hit_stats(
+                self.local_hits, self.shared_hits, self.misses, self.shared_store, len(self.cache)
+            ),
         }
 
 
@@ -332,7 +380,9 @@ class DorisQueryExecutor:
             cache_size = 1000
             cache_ttl = 300
 
-        self.query_cache = QueryCache(max_size=cache_size, default_ttl=cache_ttl)
+        self.query_cache = QueryCache(
+            max_size=cache_size, default_ttl=cache_ttl, shared_store=get_shared_store()
+        )
         self.query_optimizer = QueryOptimizer(self.config)
         self.metrics = QueryMetrics()
 
@@ -391,9 +441,10 @@ class DorisQueryExecutor:
 
         try:
             # Check cache first
+            cache_scope = self._cache_scope(auth_context)
             if query_request.cache_enabled:
                 cached_result = await self.query_cache.get(
-                    query_request.sql, query_request.parameters
+                    query_request.sql, query_request.parameters, cache_scope
                 )
                 if cached_result:
                     self.metrics.cache_hits += 1
@@ -408,7 +459,7 @@ class DorisQueryExecutor:
             # Cache result if enabled
             if query_request.cache_enabled and result.row_count > 0:
                 await self.query_cache.set(
-                    query_request.sql, result, query_request.parameters
+                    query_request.sql, result, query_request.parameters, scope=cache_scope
                 )
 
             self.metrics.successful_queries += 1
@@ -424,6 +475,13 @@ class DorisQueryExecutor:
             self.metrics.concurrent_queries -= 1
             self._update_execution_metrics(execution_time)
 
+    def _cache_scope(self, auth_context) -> str:
+        """Identity a cached result is valid for: database configuration and caller token"""
+        db_config = getattr(self.connection_manager, "active_db_config", None) or {}
+        token = getattr(auth_context, "token", "") or ""
+        identity = "|".join(str(db_config.get(field, "")) for field in ("host", "port", "user", "database"))
+        return hashlib.sha256(f"{identity}|{token}".encode()).hexdigest()
+
     async def _execute_query_internal(
         self, query_request: QueryRequest, auth_context
     ) -> QueryResult:
@@ -32,6 +32,7 @@ from datetime import datetime, timedelta
 
 # Import unified logging configuration
 from .logger import get_logger
+from .shared_state import MISS, TieredCache, get_shared_store
 
 # Configure logging
 logger = get_logger(__name__)
@@ -66,6 +67,9 @@ class MetadataExtractor:
         self.metadata_cache_time = {}
         self.cache_ttl = int(os.getenv("METADATA_CACHE_TTL", "3600"))  # Default cache 1 hour
         
+        # Two-level cache for the async MCP paths: per-worker dict plus the shared tier in multi-worker mode
+        self.tiered_cache = TieredCache("metadata", self.cache_ttl, get_shared_store())
+        
         # Refresh time
         self.last_refresh_time = None
         
@@ -1188,6 +1192,10 @@ class MetadataExtractor:
         try:
             # Use async query method
             effective_catalog = catalog_name or self.catalog_name
+            cache_key = f"schema_{effective_catalog or 'default'}_{db_name or self.db_name}_{table_name}"
+            cached = await self.tiered_cache.aget(cache_key)
+            if cached is not MISS:
+                return cached
             
             # Build query statement
             if effective_catalog and effective_catalog != "internal":
@@ -1215,6 +1223,8 @@ class MetadataExtractor:
                         'extra': row.get('Extra', '')
                     })
             
+            if schema:
+                await self.tiered_cache.aset(cache_key, schema)
             return schema
             
         except Exception as e:
@@ -1225,6 +1235,10 @@ class MetadataExtractor:
         """Asynchronously get all database list"""
         try:
             effective_catalog = catalog_name or self.catalog_name
+            cache_key = f"databases_{effective_catalog or 'default'}"
+            cached = await self.tiered_cache.aget(cache_key)
+            if cached is not MISS:
+                return cached
             
             if effective_catalog and effective_catalog != "internal":
                 query = f"SHOW DATABASES FROM `{effective_catalog}`"
@@ -1245,6 +1259,8 @@ class MetadataExtractor:
                     if db_name:
                         databases.append(db_name)
             
+            if databases:
+                await self.tiered_cache.aset(cache_key, databases)
             return databases
             
         except Exception as e:
@@ -1256,6 +1272,10 @@ class MetadataExtractor:
         try:
             effective_catalog = catalog_name or self.catalog_name
             effective_db = db_name or self.db_name
+            cache_key = f"tables_{effective_catalog or 'default'}_{effective_db}"
+            cached = await self.tiered_cache.aget(cache_key)
+            if cached is not MISS:
+                return cached
             
             if effective_catalog and effective_catalog != "internal":
                 query = f"SHOW TABLES FROM `{effective_catalog}`.`{effective_db}`"
@@ -1276,6 +1296,8 @@ class MetadataExtractor:
                     if table_name:
                         tables.append(table_name)
             
+            if tables:
+                await self.tiered_cache.aset(cache_key, tables)
             return tables
             
         except Exception as e:
@@ -628,21 +628,23 @@ class AuthenticationProvider:
                 raise ValueError(f"Token validation failed: {validation_result.error_message}")
             
             token_info = validation_result.token_info
+            resolved = validation_result.resolved
             
             # Immediately validate database configuration for this token
             if self.security_manager:
                 await self.security_manager._validate_token_database_config(token, token_info)
             
+            now = datetime.utcnow()
             return AuthContext(
-                token_id=token_info.token_id,
-                user_id=token_info.token_id,  # Use token_id as user_id for token auth
-                roles=["token_user"],  # Default role for token users
-                permissions=["read", "write"],  # Default permissions for token users
-                security_level=SecurityLevel.INTERNAL,
+                token_id=resolved.token_id,
+                user_id=resolved.user_id,
+                roles=list(resolved.roles),
+                permissions=list(resolved.permissions),
+                security_level=resolved.security_level,
                 client_ip=auth_info.get("client_ip", "unknown"),
-                session_id=auth_info.get("session_id", f"session_{token_info.token_id}"),
-                login_time=datetime.utcnow(),
-                last_activity=token_info.last_used,
+                session_id=auth_info.get("session_id", f"session_{resolved.token_id}"),
+                login_time=now,
+                last_activity=now,
                 token=token  # Store raw token for token-bound database configuration
             )
             
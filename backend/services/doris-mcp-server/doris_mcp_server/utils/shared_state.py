@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Shared State Tier for Multi-Worker Deployments
+
+Worker processes started by uvicorn do not share memory, so caches and metadata
+would otherwise be loaded once per worker. This module provides a small
+cross-process key/value tier (a tmpfs-backed directory by default, or a local
+Redis when SHARED_STATE_REDIS_URL is set), a two-level cache that puts a
+per-worker dictionary in front of it, and helpers for splitting the global
+connection budget between workers.
+
+Store methods are synchronous; async callers use the a-prefixed variants,
+which run them in a worker thread so Redis round trips and large pickles do
+not block the event loop.
+"""
+
+import asyncio
+import hashlib
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .logger import get_logger
+
+try:
+    import redis as redis_lib
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis_lib = None
+    REDIS_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# Environment variables shared between the parent process and its workers
+SHARED_STATE_DIR_ENV = "DORIS_MCP_SHARED_STATE_DIR"
+SHARED_STATE_REDIS_URL_ENV = "SHARED_STATE_REDIS_URL"
+WORKER_COUNT_ENV = "DORIS_MCP_WORKERS"
+
+# Sentinel for cache misses, so falsy values can be cached
+MISS = object()
+
+# Default budget for the shared-memory store (all namespaces, all workers)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_SWEEP_INTERVAL = 60.0
+
+# Entry files start with the expiry time (0 = never) so sweeps need not unpickle values
+_EXPIRY_HEADER = struct.Struct("<d")
+
+
+class SharedStateStore(ABC):
+    """Cross-process key/value store interface"""
+
+    backend = "none"
+
+    def __init__(self):
+        self.stats = {"gets": 0, "hits": 0, "sets": 0, "errors": 0}
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Any:
+        """Return the stored value or MISS"""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, optionally expiring after ttl seconds"""
+
+    @abstractmethod
+    def add(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store a value only if the key is absent; returns True if stored"""
+
+    @abstractmethod
+    def clear(self, namespace: str) -> None:
+        """Remove every key in a namespace"""
+
+    async def aget(self, namespace: str, key: str) -> Any:
+        """Async get, run off the event loop"""
+        return await asyncio.to_thread(self.get, namespace, key)
+
+    async def aset(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Async set, run off the event loop"""
+        await asyncio.to_thread(self.set, namespace, key, value, ttl)
+
+    async def aclear(self, namespace: str) -> None:
+        """Async clear, run off the event loop"""
+        await asyncio.to_thread(self.clear, namespace)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        return {"backend": self.backend, **self.stats}
+
+
+class FileSharedStore(SharedStateStore):
+    """Store backed by one file per key, intended for a tmpfs directory such as /dev/shm
+
+    Writes go to a temporary file and are published with os.replace, so readers
+    in other processes see either the previous or the new value.
+
+    tmpfs is RAM, so the store is bounded: values larger than max_bytes are not
+    stored, and every sweep_interval seconds (or after writing a tenth of the
+    budget) a sweep removes expired entries and then the oldest entries until
+    the directory is within max_bytes and max_entries. Sweeps run in whichever
+    worker writes, so the budget holds for the whole worker group.
+    """
+
+    backend = "shared_memory"
+
+    def __init__(
+        self,
+        root: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+    ):
+        super().__init__()
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self.stats.update({"rejected": 0, "expired": 0, "evicted": 0, "sweeps": 0})
+        self._last_sweep = time.monotonic()
+        self._bytes_since_sweep = 0
+
+    def _path(self, namespace: str, key: str) -> Path:
+        return self.root / namespace / hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _encode(key: str, value: Any, ttl: Optional[float]) -> bytes:
+        expires_at = time.time() + ttl if ttl else 0.0
+        return _EXPIRY_HEADER.pack(expires_at) + pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _read(self, path: Path, key: str) -> Any:
+        try:
+            with open(path, "rb") as f:
+                (expires_at,) = _EXPIRY_HEADER.unpack(f.read(_EXPIRY_HEADER.size))
+                if expires_at and expires_at < time.time():
+                    path.unlink(missing_ok=True)
+                    return MISS
+                stored_key, value = pickle.load(f)
+        except FileNotFoundError:
+            return MISS
+        except Exception:
+            self.stats["errors"] += 1
+            return MISS
+        if stored_key != key:
+            return MISS
+        return value
+
+    def _accept(self, data: bytes, namespace: str, key: str) -> bool:
+        if len(data) > self.max_bytes:
+            self.stats["rejected"] += 1
+            logger.debug(f"Shared state value for {namespace}/{key} exceeds the {self.max_bytes} byte budget")
+            return False
+        return True
+
+    def _written(self, size: int) -> None:
+        self.stats["sets"] += 1
+        self._bytes_since_sweep += size
+        if (time.monotonic() - self._last_sweep >= self.sweep_interval
+                or self._bytes_since_sweep >= self.max_bytes // 10):
+            self.sweep()
+
+    def sweep(self) -> Dict[str, int]:
+        """Remove expired entries, then the oldest entries until within budget"""
+        self._last_sweep = time.monotonic()
+        self._bytes_since_sweep = 0
+        now = time.time()
+        live = []  # (mtime, size, path)
+        expired = 0
+        for path in self.root.glob("*/*"):
+            try:
+                stat = path.stat()
+                if path.suffix == ".tmp":
+                    # Left behind by a writer that died mid-write
+                    if now - stat.st_mtime > 60:
+                        path.unlink(missing_ok=True)
+                    continue
+                with open(path, "rb") as f:
+                    header = f.read(_EXPIRY_HEADER.size)
+                (expires_at,) = _EXPIRY_HEADER.unpack(header)
+            except (OSError, struct.error):
+                # Gone, or an add() still writing it
+                continue
+            if expires_at and expires_at < now:
+                path.unlink(missing_ok=True)
+                expired += 1
+            else:
+                live.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in live)
+        evicted = 0
+        if total_bytes > self.max_bytes or len(live) > self.max_entries:
+            live.sort(key=lambda entry: entry[0])
+            remaining = len(live)
+            for _, size, path in live:
+                if total_bytes <= self.max_bytes and remaining <= self.max_entries:
+                    break
+                path.unlink(missing_ok=True)
+                total_bytes -= size
+                remaining -= 1
+                evicted += 1
+
+        self.stats["sweeps"] += 1
+        self.stats["expired"] += expired
+        self.stats["evicted"] += evicted
+        if expired or evicted:
+            logger.debug(f"Shared state sweep removed {expired} expired and {evicted} evicted entries")
+        return {"expired": expired, "evicted": evicted, "entries": len(live) - evicted, "bytes": total_bytes}
+
+    def get(self, namespace: str, key: str) -> Any:
+        self.stats["gets"] += 1
+        value = self._read(self._path(namespace, key), key)
+        if value is not MISS:
+            self.stats["hits"] += 1
+        return value
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        path = self._path(namespace, key)
+        try:
+            data = self._encode(key, value, ttl)
+            if not self._accept(data, namespace, key):
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._written(len(data))
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.debug(f"Shared state write failed for {namespace}/{key}: {e}")
+
+    def add(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        path = self._path(namespace, key)
+        data = self._encode(key, value, ttl)
+        if not self._accept(data, namespace, key):
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                if self._read(path, key) is not MISS:
+                    return False
+                # Expired or unreadable entry: remove it and retry once
+                path.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            self._written(len(data))
+            return True
+        return False
+
+    def clear(self, namespace: str) -> None:
+        shutil.rmtree(self.root / namespace, ignore_errors=True)
+
+
+class RedisSharedStore(SharedStateStore):
+    """Store backed by a local Redis instance"""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "doris_mcp"):
+        super().__init__()
+        self.client = redis_lib.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.prefix = prefix
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> Optional[int]:
+        # Millisecond expiry: int(ttl) seconds would round sub-second TTLs to 0, which Redis rejects
+        return max(1, int(ttl * 1000)) if ttl else None
+
+    def get(self, namespace: str, key: str) -> Any:
+        self.stats["gets"] += 1
+        try:
+            raw = self.client.get(self._key(namespace, key))
+        except Exception:
+            self.stats["errors"] += 1
+            return MISS
+        if raw is None:
+            return MISS
+        try:
+            value = pickle.loads(raw)
+        except Exception:
+            self.stats["errors"] += 1
+            return MISS
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            self.client.set(self._key(namespace, key), pickle.dumps(value), px=self._px(ttl))
+            self.stats["sets"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.debug(f"Shared state write failed for {namespace}/{key}: {e}")
+
+    def add(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        try:
+            stored = bool(self.client.set(self._key(namespace, key), pickle.dumps(value), nx=True, px=self._px(ttl)))
+        except Exception:
+            self.stats["errors"] += 1
+            return False
+        if stored:
+            self.stats["sets"] += 1
+        return stored
+
+    def clear(self, namespace: str) -> None:
+        try:
+            for redis_key in self.client.scan_iter(match=f"{self.prefix}:{namespace}:*"):
+                self.client.delete(redis_key)
+        except Exception as e:
+            logger.warning(f"Failed to clear shared state namespace {namespace}: {e}")
+
+
+class TieredCache:
+    """Per-worker dictionary in front of the shared tier
+
+    Lookups try the worker's own dictionary first, then the shared store; a
+    shared hit is copied into the local tier. Hit counters are kept per tier so
+    the benefit of sharing is visible in the stats.
+    """
+
+    def __init__(self, namespace: str, ttl: float, store: Optional[SharedStateStore] = None, max_size: int = 10000):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.store = store
+        self.max_size = max_size
+        self._local: Dict[str, tuple] = {}  # key -> (expires_at, value)
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def _get_local(self, key: str) -> Any:
+        entry = self._local.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.local_hits += 1
+                return entry[1]
+            del self._local[key]
+        return MISS
+
+    def _shared_result(self, key: str, value: Any) -> Any:
+        if value is not MISS:
+            self.shared_hits += 1
+            self._set_local(key, value)
+            return value
+        self.misses += 1
+        return MISS
+
+    def get(self, key: str) -> Any:
+        """Return the cached value or MISS"""
+        value = self._get_local(key)
+        if value is not MISS:
+            return value
+        shared = self.store.get(self.namespace, key) if self.store is not None else MISS
+        return self._shared_result(key, shared)
+
+    async def aget(self, key: str) -> Any:
+        """Async get; the shared tier is read off the event loop"""
+        value = self._get_local(key)
+        if value is not MISS:
+            return value
+        shared = await self.store.aget(self.namespace, key) if self.store is not None else MISS
+        return self._shared_result(key, shared)
+
+    def set(self, key: str, value: Any) -> None:
+        """Cache a value in both tiers"""
+        self._set_local(key, value)
+        if self.store is not None:
+            self.store.set(self.namespace, key, value, self.ttl)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Async set; the shared tier is written off the event loop"""
+        self._set_local(key, value)
+        if self.store is not None:
+            await self.store.aset(self.namespace, key, value, self.ttl)
+
+    def _set_local(self, key: str, value: Any) -> None:
+        if len(self._local) >= self.max_size and key not in self._local:
+            # Drop the entry closest to expiry
+            oldest_key = min(self._local, key=lambda k: self._local[k][0])
+            del self._local[oldest_key]
+        self._local[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        """Clear the local tier and this namespace in the shared tier"""
+        self._local.clear()
+        if self.store is not None:
+            self.store.clear(self.namespace)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-tier hit statistics"""
+        return tier_hit_stats(self.local_hits, self.shared_hits, self.misses, self.store, len(self._local))
+
+
+def tier_hit_stats(local_hits: int, shared_hits: int, misses: int,
+                   store: Optional[SharedStateStore], local_size: int) -> Dict[str, Any]:
+    """Summarize hit rates of a two-level cache"""
+    lookups = local_hits + shared_hits + misses
+    return {
+        "local_size": local_size,
+        "local_hits": local_hits,
+        "shared_hits": shared_hits,
+        "misses": misses,
+        "worker_hit_rate": round(local_hits / lookups, 4) if lookups else 0.0,
+        "shared_hit_rate": round(shared_hits / lookups, 4) if lookups else 0.0,
+        "shared_backend": store.backend if store is not None else None,
+    }
+
+
+_shared_store: Optional[SharedStateStore] = None
+_shared_store_resolved = False
+
+
+def get_shared_store() -> Optional[SharedStateStore]:
+    """Get the process-wide shared store, or None when no shared tier is configured"""
+    global _shared_store, _shared_store_resolved
+    if _shared_store_resolved:
+        return _shared_store
+
+    _shared_store_resolved = True
+    if os.getenv("SHARED_STATE_ENABLED", "true").lower() != "true":
+        return None
+
+    redis_url = os.getenv(SHARED_STATE_REDIS_URL_ENV)
+    if redis_url:
+        if REDIS_AVAILABLE:
+            _shared_store = RedisSharedStore(redis_url)
+            return _shared_store
+        logger.warning("SHARED_STATE_REDIS_URL is set but redis is not installed, falling back to shared memory")
+
+    state_dir = os.getenv(SHARED_STATE_DIR_ENV)
+    if state_dir:
+        _shared_store = FileSharedStore(
+            state_dir,
+            max_bytes=int(os.getenv("SHARED_STATE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+            max_entries=int(os.getenv("SHARED_STATE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))),
+            sweep_interval=float(os.getenv("SHARED_STATE_SWEEP_INTERVAL", str(DEFAULT_SWEEP_INTERVAL))),
+        )
+    return _shared_store
+
+
+def prepare_shared_state(workers: int) -> Optional[str]:
+    """Create the shared-memory directory for a worker group and export it to child processes
+
+    Returns the directory path, or None when Redis is used instead.
+    """
+    os.environ[WORKER_COUNT_ENV] = str(workers)
+    if os.getenv(SHARED_STATE_REDIS_URL_ENV):
+        return None
+
+    base_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    state_dir = tempfile.mkdtemp(prefix="doris-mcp-", dir=base_dir)
+    os.environ[SHARED_STATE_DIR_ENV] = state_dir
+
+    global _shared_store_resolved
+    _shared_store_resolved = False
+    return state_dir
+
+
+def cleanup_shared_state(state_dir: Optional[str]) -> None:
+    """Remove a shared-memory directory created by prepare_shared_state"""
+    if state_dir:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+
+def get_worker_count() -> int:
+    """Number of worker processes sharing this host's connection budget"""
+    try:
+        return max(1, int(os.getenv(WORKER_COUNT_ENV, "1")))
+    except ValueError:
+        return 1
+
+
+def worker_connection_budget(total_connections: int, workers: Optional[int] = None) -> int:
+    """Split a global connection budget evenly between workers (at least one each)"""
+    workers = workers or get_worker_count()
+    return max(1, total_connections // workers)
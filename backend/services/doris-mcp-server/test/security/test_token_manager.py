@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Token manager tests
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from doris_mcp_server.auth.token_manager import TokenManager
+from doris_mcp_server.utils.security import SecurityLevel
+
+
+def write_tokens(path, tokens):
+    path.write_text(json.dumps({"tokens": tokens}))
+
+
+class TestTokenManager:
+    """Token manager resolution and reload tests"""
+
+    @pytest.fixture
+    def token_file(self, tmp_path, monkeypatch):
+        for key in list(__import__("os").environ):
+            if key.startswith("TOKEN_"):
+                monkeypatch.delenv(key)
+        path = tmp_path / "tokens.json"
+        write_tokens(path, [
+            {"token_id": "analyst", "token": "analyst-secret", "expires_hours": None,
+             "database_config": {"host": "doris-a", "user": "analyst"}},
+            {"token_id": "expired", "token": "expired-secret", "expires_hours": -1},
+        ])
+        return path
+
+    @pytest.fixture
+    async def token_manager(self, token_file):
+        config = SimpleNamespace(security=SimpleNamespace(token_file_path=str(token_file)))
+        manager = TokenManager(config)
+        yield manager
+        manager.stop_hot_reload()
+
+    @pytest.mark.asyncio
+    async def test_validation_uses_precomputed_context(self, token_manager):
+        """Test that validation returns the cached result with the resolved context"""
+        first = await token_manager.validate_token("analyst-secret")
+        second = await token_manager.validate_token("analyst-secret")
+
+        assert first.is_valid and first is second
+        assert first.resolved.roles == ("token_user",)
+        assert first.resolved.security_level == SecurityLevel.INTERNAL
+        assert token_manager.get_database_config_by_token("analyst-secret").host == "doris-a"
+
+        expired = await token_manager.validate_token("expired-secret")
+        assert not expired.is_valid and expired.error_message == "Token has expired"
+        assert token_manager.get_database_config_by_token("expired-secret") is None
+        assert (await token_manager.validate_token("unknown")).error_message == "Invalid token"
+
+    @pytest.mark.asyncio
+    async def test_last_used_updates_are_coalesced(self, token_manager):
+        """Test that repeated validations produce one pending update applied on flush"""
+        for _ in range(5):
+            await token_manager.validate_token("analyst-secret")
+
+        token_info = (await token_manager.validate_token("analyst-secret")).token_info
+        assert token_info.last_used is None
+        assert token_manager.get_token_stats()["pending_last_used_updates"] == 1
+
+        assert token_manager.flush_last_used() == 1
+        assert token_info.last_used is not None
+        assert token_manager.get_token_stats()["pending_last_used_updates"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reload_swaps_index_atomically(self, token_manager, token_file):
+        """Test that reload publishes a new index without mutating the one readers hold"""
+        await token_manager.validate_token("analyst-secret")
+        token_manager.flush_last_used()
+        old_index = token_manager._resolved
+        version = token_manager.get_token_stats()["index_version"]
+
+        write_tokens(token_file, [
+            {"token_id": "analyst", "token": "analyst-secret", "expires_hours": None},
+            {"token_id": "ops", "token": "ops-secret", "expires_hours": None},
+        ])
+        token_manager._reload_tokens()
+
+        assert token_manager._resolved is not old_index
+        assert len(old_index) == 2 and token_manager.get_token_stats()["index_version"] == version + 1
+        assert (await token_manager.validate_token("ops-secret")).is_valid
+        assert not (await token_manager.validate_token("expired-secret")).is_valid
+
+        analyst = await token_manager.validate_token("analyst-secret")
+        assert analyst.resolved.database_config is None
+        assert analyst.token_info.last_used is not None
@@ -267,4 +267,39 @@ class TestDorisToolsManager:
             
             # Required fields should be defined
             if 'required' in tool.inputSchema:
-                assert isinstance(tool.inputSchema['required'], list) 
+                assert isinstance(tool.inputSchema['required'], list)
+
+    @pytest.mark.asyncio
+    async def test_tool_list_is_built_once(self, tools_manager):
+        """Test that every tools/list request is served the same prebuilt list"""
+        first = await tools_manager.list_tools()
+        second = await tools_manager.list_tools()
+
+        assert first is second
+        for tool in first:
+            assert tools_manager.get_registered_tool(tool.name) is not None
+
+    @pytest.mark.asyncio
+    async def test_arguments_validated_against_cached_schema(self, tools_manager):
+        """Test that invalid arguments are rejected before the handler runs"""
+        registered = tools_manager.get_registered_tool("exec_query")
+        assert registered.validate({"sql": "SELECT 1"}) is None
+        assert "sql" in registered.validate({})
+
+        with patch.object(tools_manager.metadata_extractor, 'exec_query_for_mcp', new_callable=AsyncMock) as mock_exec:
+            result = json.loads(await tools_manager.call_tool("exec_query", {"sql": "SELECT 1", "max_rows": "ten"}))
+            assert "Input validation error" in result["error"]
+            mock_exec.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_legacy_aliases_dispatch_with_preset_arguments(self, tools_manager):
+        """Test that deprecated tool names route to the unified tool with their preset"""
+        with patch.object(tools_manager.monitoring_tools, 'get_monitoring_metrics', new_callable=AsyncMock) as mock_metrics:
+            mock_metrics.return_value = {"success": True}
+            arguments = {}
+            result = json.loads(await tools_manager.call_tool("get_monitoring_metrics_info", arguments))
+
+            assert result["success"] is True
+            assert mock_metrics.call_args.kwargs["info_only"] is True
+            assert arguments == {}
+
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Data quality tools tests
+"""
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from doris_mcp_server.utils.config import DorisConfig
+from doris_mcp_server.utils.data_quality_tools import DataQualityTools
+
+COLUMNS = [f"c{i}" for i in range(12)]
+TOTAL_ROWS = 2_000_000_000
+
+
+class FakeDoris:
+    """Answers the metadata and profiling queries issued by column analysis"""
+
+    def __init__(self):
+        self.statements = []
+        self.sessions = set()
+        self.active = 0
+        self.max_active = 0
+        self.update_time = "2026-10-17 02:00:00"
+
+    async def execute(self, sql):
+        self.statements.append(sql)
+        if "information_schema.tables" in sql:
+            return SimpleNamespace(data=[{"TABLE_ROWS": TOTAL_ROWS, "DATA_LENGTH": 10 ** 12, "UPDATE_TIME": self.update_time}])
+        if sql.startswith("DESCRIBE"):
+            return SimpleNamespace(data=[
+                {"Field": name, "Type": "bigint", "Null": "YES", "Default": None} for name in COLUMNS
+            ])
+        if "information_schema.PARTITIONS" in sql:
+            return SimpleNamespace(data=[
+                {"PARTITION_NAME": f"p{i}", "PARTITION_DESCRIPTION": "", "TABLE_ROWS": 10_000_000,
+                 "DATA_LENGTH": 0, "INDEX_LENGTH": 0}
+                for i in range(200)
+            ])
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+
+        row = {}
+        if "COUNT(*) as total_rows" in sql:
+            row["total_rows"] = 10000
+            for name in re.findall(r"COUNT\((\w+)\) as \w+_non_null", sql):
+                row[f"{name}_non_null"] = 9000
+                row[f"{name}_distinct"] = 500
+        for func, alias in re.findall(r"(MIN|MAX|AVG|STDDEV)\(\w+\) as (\w+)", sql):
+            row[alias] = 40.0 if func == "STDDEV" else 1
+        return SimpleNamespace(data=[row])
+
+
+class TestDataQualityTools:
+    """Column profiling tests"""
+
+    @pytest.fixture
+    def doris(self):
+        return FakeDoris()
+
+    @pytest.fixture
+    def quality_tools(self, doris):
+        @asynccontextmanager
+        async def get_connection_context(session_id):
+            doris.sessions.add(session_id)
+            yield doris
+
+        config = DorisConfig()
+        config.data_quality.column_group_size = 3
+        config.data_quality.profile_concurrency = 2
+        connection_manager = SimpleNamespace(get_connection_context=get_connection_context)
+        return DataQualityTools(connection_manager, config)
+
+    @pytest.mark.asyncio
+    async def test_large_table_profiled_on_tablesample_across_connections(self, quality_tools, doris):
+        """Test that a billion-row table is sampled with error bounds and column groups fan out"""
+        result = await quality_tools.analyze_columns("events", COLUMNS, ["completeness"], sample_size=10000, db_name="ods")
+
+        assert not any(sql.startswith("SELECT COUNT(*) as row_count") for sql in doris.statements)
+        sampling = result["sampling_info"]
+        assert sampling["sampling_method"] == "tablesample"
+        assert "TABLESAMPLE(10000 ROWS)" in sampling["sample_table_expression"]
+        assert sampling["error_bounds"]["max_rate_margin"] == pytest.approx(0.0098, abs=1e-4)
+
+        assert len(result["completeness_analysis"]) == len(COLUMNS)
+        assert result["completeness_analysis"]["c7"]["null_rate_margin"] == pytest.approx(0.00588, abs=1e-4)
+        assert result["column_groups"]["group_count"] == 4
+        # One session for metadata plus one per column group, never more than two profiling at once
+        assert len(doris.sessions) == 5
+        assert doris.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_profiles_reused_until_table_version_changes(self, quality_tools, doris):
+        """Test that a repeat request is served from cache and a new load invalidates it"""
+        first = await quality_tools.analyze_columns("events", ["c0", "c1"], ["both"], db_name="ods")
+        profiled = len(doris.statements)
+
+        second = await quality_tools.analyze_columns("events", ["c0", "c1"], ["both"], db_name="ods")
+        assert len(doris.statements) == profiled + 1
+        assert first["profile_cache"]["hit"] is False and second["profile_cache"]["hit"] is True
+        assert second["distribution_analysis"]["c0"]["mean_margin"] > 0
+
+        doris.update_time = "2026-10-18 02:00:00"
+        third = await quality_tools.analyze_columns("events", ["c0", "c1"], ["both"], db_name="ods")
+        assert third["profile_cache"]["hit"] is False
+        assert len(doris.statements) > profiled + 2
+
+    @pytest.mark.asyncio
+    async def test_partition_sampling_spreads_across_partitions(self, quality_tools, doris):
+        """Test that partition sampling picks evenly spaced partitions covering the sample size"""
+        quality_tools.config.data_quality.sampling_method = "partition"
+
+        result = await quality_tools.analyze_columns("events", ["c0"], ["completeness"], sample_size=25_000_000, db_name="ods")
+
+        sampling = result["sampling_info"]
+        assert sampling["sampling_method"] == "partition_sampling"
+        assert sampling["sampled_partitions"] == ["p0", "p66", "p133"]
+        assert "PARTITION (p0, p66, p133)" in sampling["sample_table_expression"]
+        assert sampling["sample_size"] == 30_000_000
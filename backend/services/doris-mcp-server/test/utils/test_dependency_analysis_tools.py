@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Dependency analysis tools tests
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from doris_mcp_server.utils.dependency_analysis_tools import DependencyAnalysisTools
+
+FIRST_SEEN = datetime.now().replace(microsecond=0) - timedelta(days=2)
+SECOND_SEEN = FIRST_SEEN + timedelta(hours=22, minutes=30)
+# Server clock minus the audit lag, as returned for each scan
+FIRST_BOUND = FIRST_SEEN + timedelta(hours=1)
+SECOND_BOUND = SECOND_SEEN + timedelta(hours=1)
+THIRD_BOUND = SECOND_BOUND + timedelta(minutes=1)
+
+
+def _literal(value):
+    return f"{value:%Y-%m-%d %H:%M:%S}.000"
+
+
+class FakeConnection:
+    """Answers the metadata and audit-log queries issued by DependencyAnalysisTools"""
+
+    def __init__(self):
+        self.statements = []
+        self.audit_batches = [
+            [
+                {"sql_statement": "INSERT INTO sales_daily SELECT * FROM sales JOIN stores ON 1=1",
+                 "frequency": 3, "last_seen": FIRST_SEEN},
+            ],
+            [
+                {"sql_statement": "INSERT INTO sales_summary SELECT * FROM sales_daily JOIN regions ON 1=1",
+                 "frequency": 2, "last_seen": SECOND_SEEN},
+            ],
+        ]
+        self.upper_bounds = [FIRST_BOUND, SECOND_BOUND, THIRD_BOUND]
+
+    async def execute(self, sql):
+        self.statements.append(sql)
+        if "information_schema.tables" in sql:
+            data = [
+                {"schema_name": "", "table_name": "sales", "table_type": "BASE TABLE"},
+                {"schema_name": "", "table_name": "stores", "table_type": "BASE TABLE"},
+                {"schema_name": "", "table_name": "v_sales", "table_type": "VIEW"},
+                {"schema_name": "", "table_name": "v_stores", "table_type": "VIEW"},
+            ]
+        elif "information_schema.views" in sql:
+            data = [
+                {"schema_name": "", "table_name": "v_sales", "view_definition": "SELECT * FROM sales"},
+                {"schema_name": "", "table_name": "v_stores", "view_definition": "SELECT * FROM stores"},
+            ]
+        elif "AS upper_bound" in sql:
+            data = [{"upper_bound": self.upper_bounds.pop(0)}]
+        elif "audit_log" in sql:
+            data = self.audit_batches.pop(0) if self.audit_batches else []
+        else:
+            data = []
+        return SimpleNamespace(data=data)
+
+
+class TestDependencyAnalysisTools:
+    """Dependency analysis tools tests"""
+
+    @pytest.fixture
+    def connection(self):
+        return FakeConnection()
+
+    @pytest.fixture
+    def dependency_tools(self, connection):
+        connection_manager = Mock()
+        connection_manager.get_connection = AsyncMock(return_value=connection)
+        tools = DependencyAnalysisTools(connection_manager)
+        tools.audit_refresh_interval = 0
+        return tools
+
+    @pytest.mark.asyncio
+    async def test_views_loaded_with_one_query(self, dependency_tools, connection):
+        """Test that view definitions come from a single information_schema.views query"""
+        result = await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+
+        assert not any("SHOW CREATE VIEW" in sql for sql in connection.statements)
+        assert sum("information_schema.views" in sql for sql in connection.statements) == 1
+        assert set(result["table_dependencies"]["direct_downstream_dependencies"]) == {"v_sales", "sales_daily"}
+        assert result["dependency_graph_cache"]["view_definitions_source"] == "information_schema.views"
+
+    @pytest.mark.asyncio
+    async def test_graph_is_cached_and_audit_log_read_incrementally(self, dependency_tools, connection):
+        """Test that later calls reuse metadata and only read audit rows after the watermark"""
+        first = await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+        second = await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+
+        assert first["dependency_graph_cache"]["refreshed"] == ["metadata", "audit_log"]
+        assert second["dependency_graph_cache"]["refreshed"] == ["audit_log"]
+        assert sum("information_schema.tables" in sql for sql in connection.statements) == 1
+
+        audit_queries = [sql for sql in connection.statements if "audit_log" in sql]
+        assert "INTERVAL 1 YEAR" in audit_queries[0] and "LIMIT 1000" in audit_queries[0]
+        assert f"`time` <= '{_literal(FIRST_BOUND)}'" in audit_queries[0]
+        # Incremental windows start at the previous bound and read every statement
+        assert f"`time` > '{_literal(FIRST_BOUND)}'" in audit_queries[1]
+        assert f"`time` <= '{_literal(SECOND_BOUND)}'" in audit_queries[1]
+        assert "LIMIT" not in audit_queries[1]
+
+        # The new audit rows extend the cached graph
+        chain = second["table_dependencies"]["downstream_dependency_chain"]["all_dependencies"]
+        assert "sales_summary" in chain
+        assert second["dependency_graph_cache"]["audit_watermark"] == _literal(SECOND_BOUND)
+
+    @pytest.mark.asyncio
+    async def test_empty_scan_still_advances_watermark(self, dependency_tools, connection):
+        """Test that a window without lineage rows is not rescanned"""
+        connection.audit_batches = []
+
+        first = await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+        await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+
+        assert first["dependency_graph_cache"]["audit_watermark"] == _literal(FIRST_BOUND)
+        audit_queries = [sql for sql in connection.statements if "audit_log" in sql]
+        assert "INTERVAL 1 YEAR" not in audit_queries[1]
+        assert f"`time` > '{_literal(FIRST_BOUND)}'" in audit_queries[1]
+
+    @pytest.mark.asyncio
+    async def test_expired_runtime_edges_are_pruned(self, dependency_tools, connection):
+        """Test that edges last seen before the retention cutoff are dropped from memory"""
+        dependency_tools._runtime_edges[("old_target", "old_source", "insert_select")] = [
+            5, datetime.now() - timedelta(days=400)
+        ]
+
+        result = await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+
+        assert ("old_target", "old_source", "insert_select") not in dependency_tools._runtime_edges
+        assert result["dependency_graph_cache"]["runtime_edges"] == len(dependency_tools._runtime_edges)
+
+    @pytest.mark.asyncio
+    async def test_audit_refresh_is_rate_limited(self, dependency_tools, connection):
+        """Test that calls within the refresh interval answer from the cached graph"""
+        dependency_tools.audit_refresh_interval = 3600
+
+        await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+        result = await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+
+        assert result["dependency_graph_cache"]["refreshed"] == []
+        assert sum("audit_log" in sql for sql in connection.statements) == 1
+
+        dependency_tools.invalidate_dependency_graph()
+        result = await dependency_tools.analyze_data_flow_dependencies(target_table="sales")
+        assert result["dependency_graph_cache"]["refreshed"] == ["metadata", "audit_log"]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Logger tests
+"""
+
+import logging
+import queue
+
+import pytest
+
+from doris_mcp_server.utils.logger import DorisLoggerManager, NonBlockingQueueHandler
+
+
+def make_record(level: int, message: str = "message") -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+
+class TestNonBlockingQueueHandler:
+    """Queue handler drop and sampling policy tests"""
+
+    def test_info_records_sampled_then_dropped_under_pressure(self):
+        """Test that DEBUG/INFO records are sampled above the threshold and dropped when full"""
+        log_queue = queue.Queue(maxsize=10)
+        handler = NonBlockingQueueHandler(log_queue, pressure_ratio=0.5, sample_every=2)
+
+        for i in range(30):
+            handler.handle(make_record(logging.INFO, f"info {i}"))
+
+        stats = handler.get_stats()
+        assert log_queue.qsize() == 10
+        assert stats["enqueued"] == 10
+        assert stats["sampled_out"] == 13
+        assert stats["dropped"] == {"INFO": 7}
+        assert stats["emit_count"] == 30
+
+    def test_warning_records_bypass_sampling_and_wait_for_space(self):
+        """Test that records above the droppable level are not sampled and are counted when lost"""
+        log_queue = queue.Queue(maxsize=4)
+        handler = NonBlockingQueueHandler(log_queue, pressure_ratio=0.25, sample_every=1000, block_timeout=0.01)
+
+        for i in range(5):
+            handler.handle(make_record(logging.WARNING, f"warning {i}"))
+
+        stats = handler.get_stats()
+        assert stats["sampled_out"] == 0
+        assert stats["enqueued"] == 4
+        assert stats["dropped"] == {"WARNING": 1}
+        assert stats["max_emit_ms"] >= 10
+
+
+class TestDorisLoggerManager:
+    """Logger manager asynchronous logging tests"""
+
+    @pytest.fixture
+    def manager(self):
+        root_logger = logging.getLogger()
+        saved_handlers = root_logger.handlers[:]
+        saved_level = root_logger.level
+        audit_logger = logging.getLogger("audit")
+        saved_audit = (audit_logger.handlers[:], audit_logger.propagate, audit_logger.level)
+
+        manager = DorisLoggerManager()
+        yield manager
+
+        manager.shutdown()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        for handler in saved_handlers:
+            root_logger.addHandler(handler)
+        root_logger.setLevel(saved_level)
+        for handler in audit_logger.handlers[:]:
+            audit_logger.removeHandler(handler)
+        for handler in saved_audit[0]:
+            audit_logger.addHandler(handler)
+        audit_logger.propagate, audit_logger.level = saved_audit[1], saved_audit[2]
+
+    def test_records_written_by_writer_thread(self, manager, tmp_path):
+        """Test that root and audit records reach their files through the queues"""
+        manager.setup_logging(log_dir=str(tmp_path), enable_console=False, enable_cleanup=False, queue_size=100)
+
+        root_handlers = logging.getLogger().handlers
+        assert len(root_handlers) == 1 and isinstance(root_handlers[0], NonBlockingQueueHandler)
+
+        manager.get_logger("doris_mcp_server.test").warning("queued warning")
+        manager.get_audit_logger().info("queued audit")
+        stats = manager.get_queue_stats()
+        manager.shutdown()
+
+        assert stats["enabled"] is True
+        assert stats["root"]["enqueued"] > 0 and stats["audit"]["enqueued"] == 1
+        assert "queued warning" in (tmp_path / "doris_mcp_server_all.log").read_text()
+        assert "queued warning" in (tmp_path / "doris_mcp_server_warning.log").read_text()
+        assert "queued audit" in (tmp_path / "doris_mcp_server_audit.log").read_text()
+
+    def test_async_logging_can_be_disabled(self, manager, tmp_path):
+        """Test that disabling async logging attaches the file handlers directly"""
+        manager.setup_logging(log_dir=str(tmp_path), enable_console=False, enable_cleanup=False, enable_async=False)
+
+        assert not any(isinstance(h, NonBlockingQueueHandler) for h in logging.getLogger().handlers)
+        assert manager.get_queue_stats() == {"enabled": False}
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Performance analytics tools tests
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from doris_mcp_server.utils.performance_analytics_tools import PerformanceAnalyticsTools
+
+TABLE_COUNT = 12
+
+
+class FakeConnection:
+    """Answers the cluster-wide metadata queries used by storage growth analysis"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, sql):
+        self.statements.append(sql)
+        if "GROUP BY TABLE_SCHEMA" in sql:
+            data = [{"db_name": "sales", "size_mb": 1200.0, "table_count": TABLE_COUNT}]
+        elif "information_schema.tables" in sql:
+            data = [
+                {"schema_name": "sales", "table_name": f"t{i}", "size_mb": 100.0, "row_count": 1000 * (i + 1)}
+                for i in range(TABLE_COUNT)
+            ]
+        elif "information_schema.partitions" in sql:
+            # Only t0 is partitioned
+            data = [
+                {"schema_name": "sales", "table_name": "t0", "table_rows": 10, "data_length": 1024 * 1024,
+                 "create_time": datetime.now() - timedelta(days=d)}
+                for d in (1, 2, 3)
+            ]
+        elif "information_schema.columns" in sql:
+            data = [
+                {"schema_name": "sales", "table_name": f"t{i}", "column_name": "created_time", "data_type": "datetime"}
+                for i in range(1, TABLE_COUNT)
+            ]
+        else:
+            data = []
+        return SimpleNamespace(data=data)
+
+
+class TestPerformanceAnalyticsTools:
+    """Performance analytics tools tests"""
+
+    @pytest.fixture
+    def connection(self):
+        return FakeConnection()
+
+    @pytest.fixture
+    def analytics_tools(self, connection, tmp_path, monkeypatch):
+        monkeypatch.setenv("STORAGE_SNAPSHOT_FILE", str(tmp_path / "snapshots.json"))
+        monkeypatch.setenv("STORAGE_GROWTH_PROBE_CONCURRENCY", "3")
+        self.active_probes = 0
+        self.max_active_probes = 0
+        self.probes = []
+
+        async def execute_query(session_id, sql):
+            self.probes.append(sql)
+            self.active_probes += 1
+            self.max_active_probes = max(self.max_active_probes, self.active_probes)
+            await asyncio.sleep(0.01)
+            self.active_probes -= 1
+            if "audit_log" in sql:
+                return SimpleNamespace(data=[])
+            return SimpleNamespace(data=[
+                {"date": (datetime.now() - timedelta(days=d)).date(), "daily_records": 100}
+                for d in (1, 2, 3)
+            ])
+
+        connection_manager = Mock()
+        connection_manager.config = SimpleNamespace(temp_files_dir=str(tmp_path))
+        connection_manager.get_connection = AsyncMock(return_value=connection)
+        connection_manager.execute_query = execute_query
+        return PerformanceAnalyticsTools(connection_manager)
+
+    @pytest.mark.asyncio
+    async def test_storage_growth_uses_set_based_metadata_and_bounded_probes(self, analytics_tools, connection):
+        """Test that metadata queries do not scale with table count and probes are bounded"""
+        result = await analytics_tools._analyze_storage_growth_with_real_data(connection, 30, detailed_response=True)
+
+        assert len(connection.statements) == 4
+        assert sum("information_schema.partitions" in sql for sql in connection.statements) == 1
+        assert sum("information_schema.columns" in sql for sql in connection.statements) == 1
+
+        # t0 is answered from partitions; only the remaining tables need a scan
+        sources = {table["table_name"]: table["data_source"] for table in result["table_level_analysis"]}
+        assert len(self.probes) == len(sources) - 1
+        assert self.max_active_probes <= 3
+
+        assert sources["sales.t0"] == "partition_based"
+        assert sources["sales.t5"] == "timestamp_based"
+
+    @pytest.mark.asyncio
+    async def test_growth_curves_come_from_daily_snapshots(self, analytics_tools, connection, tmp_path):
+        """Test that stored daily snapshots replace per-table probes once history exists"""
+        snapshot_file = tmp_path / "snapshots.json"
+        yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+        snapshot_file.write_text(json.dumps({
+            yesterday: {f"sales.t{i}": [90.0, 900 * (i + 1)] for i in range(TABLE_COUNT)}
+        }))
+
+        result = await analytics_tools._analyze_storage_growth_with_real_data(connection, 30, detailed_response=True)
+
+        assert self.probes == []
+        assert not any("information_schema.partitions" in sql for sql in connection.statements)
+        tables = {table["table_name"]: table for table in result["table_level_analysis"]}
+        assert tables["sales.t0"]["data_source"] == "daily_snapshot"
+        assert tables["sales.t0"]["growth_metrics"]["growth_rate_mb_per_day"] == 10.0
+
+        stored = json.loads(snapshot_file.read_text())
+        assert set(stored) == {yesterday, datetime.now().date().isoformat()}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_merge_keeps_days_written_by_other_workers(self, analytics_tools, tmp_path):
+        """Test that recording re-reads the file instead of overwriting it from a cached copy"""
+        snapshot_file = tmp_path / "snapshots.json"
+        tables = [{"full_table_name": "sales.t0", "size_mb": 100.0, "row_count": 1000}]
+        await analytics_tools._record_storage_snapshot(tables)
+
+        # Another worker records a day after this instance has cached the file
+        two_days_ago = (datetime.now() - timedelta(days=2)).date().isoformat()
+        stored = json.loads(snapshot_file.read_text())
+        stored[two_days_ago] = {"sales.t0": [80.0, 800]}
+        snapshot_file.write_text(json.dumps(stored))
+
+        snapshots = await analytics_tools._record_storage_snapshot(tables)
+
+        today = datetime.now().date().isoformat()
+        assert set(snapshots) == {two_days_ago, today}
+        assert set(json.loads(snapshot_file.read_text())) == {two_days_ago, today}
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Shared state tier tests
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from doris_mcp_server.utils.db import QueryResult
+from doris_mcp_server.utils.query_executor import QueryCache
+from doris_mcp_server.utils.shared_state import (
+    MISS,
+    FileSharedStore,
+    RedisSharedStore,
+    SharedStateStore,
+    TieredCache,
+    worker_connection_budget,
+)
+
+
+class RecordingRedis:
+    """Minimal in-memory stand-in for the redis client calls RedisSharedStore makes"""
+
+    def __init__(self):
+        self.values = {}
+        self.calls = []
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False, ex=None, px=None):
+        self.calls.append({"ex": ex, "px": px})
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+def _publish_from_worker(root: str):
+    store = FileSharedStore(root)
+    store.set("metadata", "databases_default", ["sales", "ops"], ttl=60)
+    store.add("warmup", "leader", "worker")
+
+
+class TestSharedState:
+    """Shared state tier tests"""
+
+    def test_values_visible_across_processes(self, tmp_path):
+        """Test that a value written by another process is read back and add() elects one writer"""
+        process = multiprocessing.get_context("spawn").Process(target=_publish_from_worker, args=(str(tmp_path),))
+        process.start()
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+        store = FileSharedStore(str(tmp_path))
+        assert store.get("metadata", "databases_default") == ["sales", "ops"]
+        assert store.add("warmup", "leader", "parent") is False
+        assert store.get("warmup", "leader") == "worker"
+
+    def test_expired_values_are_misses(self, tmp_path):
+        """Test that expired entries are treated as absent and can be re-added"""
+        store = FileSharedStore(str(tmp_path))
+        store.set("metadata", "key", "value", ttl=-1)
+        assert store.get("metadata", "key") is MISS
+        assert store.add("metadata", "key", "fresh", ttl=60) is True
+        assert store.get("metadata", "key") == "fresh"
+
+    def test_tiered_cache_reports_worker_and_shared_hits(self, tmp_path):
+        """Test that a second worker is served from the shared tier, then from its own"""
+        store = FileSharedStore(str(tmp_path))
+        worker_a = TieredCache("metadata", 60, store)
+        worker_b = TieredCache("metadata", 60, store)
+
+        assert worker_a.get("tables_default_sales") is MISS
+        worker_a.set("tables_default_sales", ["orders"])
+
+        assert worker_b.get("tables_default_sales") == ["orders"]
+        assert worker_b.get("tables_default_sales") == ["orders"]
+
+        stats = worker_b.get_stats()
+        assert stats["shared_hits"] == 1 and stats["local_hits"] == 1 and stats["misses"] == 0
+        assert stats["worker_hit_rate"] == 0.5 and stats["shared_hit_rate"] == 0.5
+        assert stats["shared_backend"] == "shared_memory"
+
+    @pytest.mark.asyncio
+    async def test_query_cache_shares_results_between_workers(self, tmp_path):
+        """Test that a result cached by one worker is a shared hit for another"""
+        store = FileSharedStore(str(tmp_path))
+        worker_a = QueryCache(shared_store=store)
+        worker_b = QueryCache(shared_store=store)
+        result = QueryResult(data=[{"n": 1}], metadata={}, execution_time=0.1, row_count=1)
+
+        await worker_a.set("SELECT 1", result)
+        cached = await worker_b.get("SELECT 1")
+
+        assert cached.result.data == [{"n": 1}]
+        assert worker_b.get_stats()["tiers"]["shared_hits"] == 1
+        assert await worker_b.get("SELECT 2") is None
+        assert worker_b.get_stats()["tiers"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_query_cache_keys_include_caller_identity(self, tmp_path):
+        """Test that results cached for one token or database are not served to another"""
+        store = FileSharedStore(str(tmp_path))
+        worker_a = QueryCache(shared_store=store)
+        worker_b = QueryCache(shared_store=store)
+        result = QueryResult(data=[{"tenant": "a"}], metadata={}, execution_time=0.1, row_count=1)
+
+        await worker_a.set("SELECT * FROM t", result, scope="tenant-a")
+
+        assert await worker_b.get("SELECT * FROM t", scope="tenant-b") is None
+        assert await worker_b.get("SELECT * FROM t") is None
+        assert (await worker_b.get("SELECT * FROM t", scope="tenant-a")).result.data == [{"tenant": "a"}]
+
+    def test_sweep_removes_expired_then_oldest_entries(self, tmp_path):
+        """Test that the shared-memory store stays within its entry and byte budget"""
+        store = FileSharedStore(str(tmp_path), max_entries=3, sweep_interval=3600)
+        store.set("metadata", "stale", "value", ttl=0.01)
+        for i in range(4):
+            store.set("metadata", f"key{i}", "value", ttl=60)
+            time.sleep(0.01)
+        time.sleep(0.02)
+
+        swept = store.sweep()
+
+        assert swept["expired"] == 1 and swept["evicted"] == 1
+        assert len(os.listdir(tmp_path / "metadata")) == 3
+        assert store.get("metadata", "key0") is MISS
+        assert store.get("metadata", "key3") == "value"
+
+    def test_values_over_budget_are_not_stored(self, tmp_path):
+        """Test that one oversized value cannot fill the shared-memory budget"""
+        store = FileSharedStore(str(tmp_path), max_bytes=1024)
+        store.set("query_results", "big", "x" * 4096)
+        assert store.get("query_results", "big") is MISS
+        assert store.add("query_results", "big", "x" * 4096) is False
+        assert store.get_stats()["rejected"] == 2
+
+    def test_store_interface_is_abstract(self):
+        """Test that a store must implement the whole interface"""
+        class PartialStore(SharedStateStore):
+            def get(self, namespace, key):
+                return MISS
+
+        with pytest.raises(TypeError):
+            PartialStore()
+
+    @pytest.mark.asyncio
+    async def test_async_access_runs_off_the_event_loop(self, tmp_path):
+        """Test that async cache paths call the (blocking) store from a worker thread"""
+        callers = []
+
+        class RecordingStore(FileSharedStore):
+            def get(self, namespace, key):
+                callers.append(threading.current_thread())
+                return super().get(namespace, key)
+
+        cache = TieredCache("metadata", 60, RecordingStore(str(tmp_path)))
+        assert await cache.aget("databases_default") is MISS
+        assert callers and callers[0] is not threading.main_thread()
+
+    def test_connection_budget_split(self):
+        """Test that the global connection budget is split between workers"""
+        assert worker_connection_budget(20, 4) == 5
+        assert worker_connection_budget(20, 1) == 20
+        assert worker_connection_budget(3, 8) == 1
+
+    def test_redis_store_treats_undecodable_values_as_misses(self):
+        """Test that a corrupt value is a counted error, not an exception"""
+        pytest.importorskip("redis")
+        store = RedisSharedStore("redis://localhost:6379/0")
+        store.client = RecordingRedis()
+        store.client.values[store._key("metadata", "bad")] = b"not a pickle"
+
+        assert store.get("metadata", "bad") is MISS
+        assert store.get_stats()["errors"] == 1 and store.get_stats()["hits"] == 0
+
+    def test_redis_store_keeps_sub_second_ttls(self):
+        """Test that TTLs are sent in milliseconds so short TTLs still expire"""
+        pytest.importorskip("redis")
+        store = RedisSharedStore("redis://localhost:6379/0")
+        store.client = RecordingRedis()
+
+        store.set("metadata", "short", "value", ttl=0.25)
+        assert store.add("metadata", "tiny", "value", ttl=0.0001) is True
+        store.set("metadata", "forever", "value")
+
+        assert [call["px"] for call in store.client.calls] == [250, 1, None]
+        assert all(call["ex"] is None for call in store.client.calls)
+        assert store.get("metadata", "short") == "value"
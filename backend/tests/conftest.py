@@ -2,6 +2,24 @@
 import sys
 from pathlib import Path
 
+import pytest
+import pytest_asyncio
+
 # Add backend root to path for imports
 backend_root = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_root))
\ No newline at end of file
+sys.path.insert(0, str(backend_root))
+
+
+@pytest_asyncio.fixture
+async def connected_redis():
+    """Global redis_client connected to the local Redis (settings.REDIS_URL); skips when unavailable"""
+    from app.core.redis_client import redis_client
+
+    try:
+        await redis_client.connect(max_retries=1)
+        await redis_client.ping()
+    except Exception as e:
+        pytest.skip(f"Local Redis not available: {e}")
+    yield redis_client
+    await redis_client.disconnect()
+    redis_client._client = None
@@ -0,0 +1,73 @@
+"""Tests for the columnar (NumPy) anomaly detection engine."""
+
+from decimal import Decimal
+
+from app.services.anomaly_detection_service import (
+    AnomalyDetectionService,
+    dominant_value,
+    numeric_view,
+    to_columnar,
+)
+
+
+def test_to_columnar_handles_ragged_and_dict_rows():
+    ragged = to_columnar(["A", "B", "C"], [[1, "x", 3], [2, "y"]])
+    assert [list(col) for col in ragged] == [[1, 2], ["x", "y"], [3, None]]
+
+    dicts = to_columnar(["A", "B"], [{"A": 1, "B": 2}, {"A": 3}])
+    assert [list(col) for col in dicts] == [[1, 3], [2, None]]
+
+
+def test_numeric_view_infers_type_from_sample():
+    mixed = to_columnar(["V"], [[Decimal("1.5")], ["2"], [3], ["n/a"]])[0]
+    values = numeric_view(mixed)
+    assert values[:3].tolist() == [1.5, 2.0, 3.0]
+    assert values.size == 4 and str(values[3]) == "nan"
+
+    assert numeric_view(to_columnar(["T"], [["north"], ["south"], ["1"]])[0]) is None
+    assert numeric_view(to_columnar(["B"], [[True], [False], [True]])[0]) is None
+
+
+def test_outliers_report_source_row_index_and_iqr():
+    values = [10.0] * 40 + [11.0] * 40 + [None] * 5 + [500.0]
+
+    result = AnomalyDetectionService.detect_numeric_outliers("AMOUNT", values)
+
+    assert result["has_outliers"] is True
+    assert result["outlier_count"] == 1
+    # Index into the original column, nulls included
+    assert result["outliers"][0] == {"row_index": 85, "value": 500.0, "z_score": result["outliers"][0]["z_score"]}
+    assert result["iqr"]["outlier_count"] == 1
+
+
+def test_dominant_value_counts_exactly():
+    column = to_columnar(["R"], [["EMEA"]] * 900 + [["APAC"]] * 100)[0]
+    assert dominant_value(column) == ("EMEA", 900)
+
+
+def test_analyze_query_results_columnar_report():
+    columns = ["ID", "REGION", "NOTE", "AMOUNT"]
+    rows = [
+        [i, "EMEA" if i % 10 else "APAC", None if i % 3 else "x", 100.0 + (i % 7)]
+        for i in range(300)
+    ]
+    rows[150][3] = 100_000.0
+
+    report = AnomalyDetectionService.analyze_query_results({}, columns, rows)
+
+    by_type = {(a["column"], a["type"]) for a in report["anomalies"]}
+    assert ("AMOUNT", "numeric_outliers") in by_type
+    assert ("REGION", "high_concentration") in by_type
+    assert ("NOTE", "high_null_ratio") in by_type
+    assert report["columns_analyzed"] == 4
+    assert report["sampled"] is False
+
+
+def test_time_budget_skips_remaining_columns():
+    columns = [f"C{i}" for i in range(5)]
+    rows = [[j] * 5 for j in range(100)]
+
+    report = AnomalyDetectionService.analyze_query_results({}, columns, rows, time_budget=0)
+
+    assert report["columns_analyzed"] == 0
+    assert "time budget" in report["warnings"][0]
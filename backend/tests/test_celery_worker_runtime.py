@@ -0,0 +1,102 @@
+"""Tests for the Celery worker-resident event loop runtime."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.celery_worker_runtime import CeleryWorkerRuntime
+from app.core.redis_client import RedisClient, redis_client
+
+
+@pytest.fixture
+def runtime(monkeypatch):
+    async def _noop(*args, **kwargs):
+        return None
+
+    # Keep the test independent of a live Redis
+    monkeypatch.setattr(RedisClient, "connect", _noop)
+    monkeypatch.setattr(RedisClient, "disconnect", _noop)
+    rt = CeleryWorkerRuntime(init_pool=False)
+    yield rt
+    rt.stop()
+
+
+def test_tasks_share_one_persistent_loop(runtime):
+    async def current_loop():
+        await asyncio.sleep(0)
+        return asyncio.get_running_loop()
+
+    first = runtime.run(current_loop())
+    second = runtime.run(current_loop())
+
+    assert first is second
+    assert first.is_running()
+    assert runtime.tasks_run == 2
+    assert runtime.get_status()["sqlcl_pool"] is None
+
+
+def test_loop_bound_state_survives_between_tasks(runtime):
+    state = {}
+
+    async def start_background():
+        queue = asyncio.Queue()
+        state["queue"] = queue
+        state["pump"] = asyncio.create_task(queue.put("ready"))
+
+    async def consume():
+        return await asyncio.wait_for(state["queue"].get(), timeout=1)
+
+    runtime.run(start_background())
+    # With asyncio.run per call the queue's loop would already be closed
+    assert runtime.run(consume()) == "ready"
+
+
+def test_timeout_cancels_coroutine_and_stop_is_idempotent(runtime):
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        runtime.run(slow(), timeout=0.1)
+    assert runtime.run(asyncio.wait_for(cancelled.wait(), timeout=1)) is True
+
+    runtime.stop()
+    assert not runtime.started
+    runtime.stop()
+
+
+def test_background_start_returns_before_resources_are_ready(runtime, monkeypatch):
+    release = threading.Event()
+    connected_on = {}
+
+    async def slow_connect(self, *args, **kwargs):
+        connected_on["loop"] = asyncio.get_running_loop()
+        await asyncio.to_thread(release.wait, 5)
+
+    monkeypatch.setattr(RedisClient, "connect", slow_connect)
+
+    began = time.monotonic()
+    runtime.start(wait=False)
+    assert time.monotonic() - began < 1
+    assert runtime.started and not runtime.get_status()["ready"]
+
+    threading.Timer(0.2, release.set).start()
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    # The first task waits for startup, then runs on the same loop
+    assert runtime.run(current_loop()) is connected_on["loop"]
+    assert runtime.get_status()["ready"]
+
+
+def test_runtime_owns_its_redis_client(runtime):
+    assert runtime.redis is not redis_client
+    assert isinstance(runtime.redis, RedisClient)
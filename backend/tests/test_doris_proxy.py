@@ -0,0 +1,144 @@
+"""Tests for the Doris MCP proxy relay and the shared proxy client pool."""
+
+import asyncio
+
+import anyio
+import httpx
+import pytest
+from starlette.requests import Request
+
+from app.api.v1.endpoints import doris_proxy
+from app.core.proxy_http_client import ProxyHTTPClientPool
+
+UPSTREAM_URL = "http://doris-mcp:3000/sse"
+
+
+class FakeUpstreamResponse:
+    """Streams fixed chunks, optionally failing or blocking after them"""
+
+    def __init__(self, chunks, error=None, block=False):
+        self.chunks = chunks
+        self.error = error
+        self.block = block
+        self.closed = False
+
+    async def aiter_raw(self):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+        if self.block:
+            await asyncio.Event().wait()
+
+    async def aclose(self):
+        await asyncio.sleep(0.01)
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    proxy_pool = ProxyHTTPClientPool()
+    monkeypatch.setattr(doris_proxy, "get_proxy_http_pool", lambda: proxy_pool)
+    return proxy_pool
+
+
+async def _collect(agen):
+    return [chunk async for chunk in agen]
+
+
+def _refuse(request):
+    raise httpx.ConnectError("connection refused", request=request)
+
+
+@pytest.mark.asyncio
+async def test_relay_passes_bytes_through_and_releases_request(pool):
+    upstream = pool.request_started(UPSTREAM_URL)
+    resp = FakeUpstreamResponse([b"event: ping\n", b"data: 1\n\n"])
+
+    chunks = await _collect(doris_proxy._relay(upstream, resp))
+
+    assert chunks == [b"event: ping\n", b"data: 1\n\n"]
+    assert resp.closed
+    assert pool._in_flight[upstream] == 0
+    assert pool._requests[upstream] == 1
+    assert pool._errors.get(upstream, 0) == 0
+
+
+@pytest.mark.asyncio
+async def test_relay_error_emits_event_and_counts_error(pool):
+    upstream = pool.request_started(UPSTREAM_URL)
+    resp = FakeUpstreamResponse([b"data: 1\n\n"], error=httpx.ReadError("upstream reset"))
+
+    chunks = await _collect(doris_proxy._relay(upstream, resp, on_error_event=True))
+
+    assert chunks[-1] == b"event: error\ndata: upstream reset\n\n"
+    assert resp.closed
+    assert pool._in_flight[upstream] == 0
+    assert pool._errors[upstream] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_relay_still_releases_in_flight(pool):
+    upstream = pool.request_started(UPSTREAM_URL)
+    resp = FakeUpstreamResponse([b"data: 1\n\n"], block=True)
+
+    # Starlette cancels disconnected streams through an anyio scope, which
+    # also cancels every await in the generator's cleanup
+    with anyio.move_on_after(0.05):
+        await _collect(doris_proxy._relay(upstream, resp))
+
+    assert pool._in_flight[upstream] == 0
+    # The shielded close still completes after the cancellation
+    await asyncio.sleep(0.05)
+    assert resp.closed
+
+    # Shutdown no longer waits out the grace period for a leaked stream
+    began = asyncio.get_running_loop().time()
+    await pool.aclose(timeout=5.0)
+    assert asyncio.get_running_loop().time() - began < 1
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_one_client_per_upstream_and_tracks_requests():
+    proxy_pool = ProxyHTTPClientPool()
+
+    sse_client = await proxy_pool.get_client("http://doris-mcp:3000/sse")
+    messages_client = await proxy_pool.get_client("http://doris-mcp:3000/messages?session_id=1")
+    other_client = await proxy_pool.get_client("http://other:3000/sse")
+    assert sse_client is messages_client
+    assert other_client is not sse_client
+
+    first = proxy_pool.request_started(UPSTREAM_URL)
+    proxy_pool.request_started(UPSTREAM_URL)
+    proxy_pool.request_finished(first, "success", 10)
+    proxy_pool.request_finished(first, "error")
+    proxy_pool.request_finished(first, "error")
+
+    stats = proxy_pool.get_stats()["http://doris-mcp:3000"]
+    assert stats["in_flight"] == 0
+    assert stats["requests_total"] == 2
+    assert stats["errors_total"] == 2
+
+    await proxy_pool.aclose()
+    assert sse_client.is_closed and other_client.is_closed
+    assert proxy_pool.get_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_sse_connect_failure_streams_error_event(pool, monkeypatch):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_refuse))
+
+    async def get_client(target_url):
+        return client
+
+    monkeypatch.setattr(pool, "get_client", get_client)
+    monkeypatch.setattr(doris_proxy.settings, "DORIS_MCP_ENABLED", True)
+    request = Request({"type": "http", "method": "GET", "path": "/sse", "query_string": b"", "headers": []})
+
+    response = await doris_proxy.proxy_sse(request)
+    chunks = await _collect(response.body_iterator)
+
+    assert chunks == ["event: error\ndata: connection refused\n\n"]
+    upstream = next(iter(pool._errors))
+    assert pool._errors[upstream] == 1 and pool._in_flight[upstream] == 0
+    await client.aclose()
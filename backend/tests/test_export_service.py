@@ -0,0 +1,176 @@
+"""Tests for streaming CSV / Parquet / XLSX exports."""
+
+import csv
+import os
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.services import export_service
+from app.services.export_service import ExportColumn, ExportService
+
+COLUMNS = ["ID", "NAME", "CREATED"]
+TYPED_COLUMNS = [ExportColumn("ID", "int"), ExportColumn("NAME", "string"), ExportColumn("CREATED", "timestamp")]
+QUERIES = {
+    "q_alice": {"user_id": "alice", "database_type": "postgresql", "sql_query": "SELECT id, name, created FROM t",
+                "execution_result": {"status": "success", "row_count": 10}},
+    "q_pending": {"user_id": "alice", "database_type": "postgres", "sql_query": "SELECT * FROM t",
+                  "execution_result": {}},
+    "q_delete": {"user_id": "alice", "database_type": "postgres", "sql_query": "DELETE FROM t",
+                 "execution_result": {"status": "success"}},
+}
+
+
+def _batches(total: int, batch_size: int):
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for start in range(0, total, batch_size):
+        yield [(i, f"name-{i}", created) for i in range(start, min(start + batch_size, total))]
+
+
+@pytest.fixture
+def job_store(monkeypatch, tmp_path):
+    store = {}
+
+    async def _set(key, value, ttl=None):
+        store[key] = value
+        return True
+
+    async def _get(key):
+        return store.get(key)
+
+    monkeypatch.setattr(redis_client, "set", _set)
+    monkeypatch.setattr(redis_client, "get", _get)
+    monkeypatch.setattr(settings, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 100)
+
+    async def _load_query_state(query_id):
+        return QUERIES.get(query_id)
+
+    monkeypatch.setattr(ExportService, "_load_query_state", _load_query_state)
+    return store
+
+
+@pytest.fixture
+def fake_postgres(monkeypatch):
+    seen_batches = []
+
+    async def _stream(job, batch_size):
+        for rows in _batches(250, batch_size):
+            seen_batches.append(len(rows))
+            yield TYPED_COLUMNS, rows
+
+    monkeypatch.setattr(export_service, "_stream_postgres", _stream)
+    return seen_batches
+
+
+@pytest.mark.asyncio
+async def test_csv_export_streams_in_batches(job_store, fake_postgres):
+    job = await ExportService.create_job("q_alice", "csv", "alice", "analyst")
+    assert job["database_type"] == "postgres"
+    assert job["sql"] == "SELECT id, name, created FROM t"
+
+    result = await ExportService.run_export(job["export_id"])
+
+    assert result["status"] == "completed"
+    assert result["rows_written"] == 250
+    assert fake_postgres == [100, 100, 50]
+    with open(result["file_path"], newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == COLUMNS
+    assert len(rows) == 251
+    assert "sql" not in ExportService.public_view(result)
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_writes_row_group_per_batch(job_store, fake_postgres):
+    pq = pytest.importorskip("pyarrow.parquet")
+    job = await ExportService.create_job("q_alice", "parquet", "alice", "analyst")
+
+    result = await ExportService.run_export(job["export_id"])
+
+    parquet_file = pq.ParquetFile(result["file_path"])
+    assert parquet_file.metadata.num_rows == 250
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.schema_arrow.names == COLUMNS
+
+
+@pytest.mark.asyncio
+async def test_max_rows_truncates_export(job_store, fake_postgres, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_MAX_ROWS", 120)
+    job = await ExportService.create_job("q_alice", "csv", "alice", "analyst")
+
+    result = await ExportService.run_export(job["export_id"])
+
+    assert result["status"] == "completed"
+    assert result["rows_written"] == 120
+    assert result["truncated"] is True
+    assert fake_postgres == [100, 100]
+
+
+def test_xlsx_writer_rolls_over_sheets(tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    monkeypatch.setattr(export_service, "XLSX_MAX_ROWS_PER_SHEET", 100)
+    path = str(tmp_path / "out.xlsx")
+
+    writer = export_service._XLSXExportWriter(path, TYPED_COLUMNS)
+    for rows in _batches(250, 60):
+        writer.write_rows(rows)
+    writer.close()
+
+    workbook = openpyxl.load_workbook(path)
+    assert [ws.max_row for ws in workbook.worksheets] == [101, 101, 51]
+    assert workbook.worksheets[1]["A1"].value == "ID"
+    assert workbook.worksheets[0]["C2"].value == datetime(2025, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_create_job_only_replays_owned_executed_selects(job_store):
+    from app.core.exceptions import AuthorizationException, ValidationException
+
+    with pytest.raises(AuthorizationException):
+        await ExportService.create_job("q_alice", "csv", "mallory", "analyst")
+    assert (await ExportService.create_job("q_alice", "csv", "root", "admin"))["user_id"] == "root"
+    for query_id in ("q_pending", "q_delete", "q_unknown"):
+        with pytest.raises(ValidationException):
+            await ExportService.create_job(query_id, "csv", "alice", "analyst")
+    with pytest.raises(ValidationException):
+        await ExportService.create_job("q_alice", "json", "alice", "analyst")
+
+
+def test_parquet_schema_comes_from_column_types(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "out.parquet")
+    columns = [ExportColumn("AMOUNT", "decimal", 2), ExportColumn("RATIO", "float"), ExportColumn("NOTE", "string")]
+
+    writer = export_service._ParquetExportWriter(path, columns)
+    # First batch alone would infer int64 / null; later batches change shape
+    writer.write_rows([(Decimal("1.00"), 1, None)])
+    writer.write_rows([(Decimal("2.50"), 0.5, {"k": 1})])
+    writer.close()
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("AMOUNT").type) == "decimal128(38, 2)"
+    assert table.column("RATIO").to_pylist() == [1.0, 0.5]
+    assert table.column("NOTE").to_pylist() == [None, "{'k': 1}"]
+
+
+def test_buffered_columns_are_typed_from_all_values():
+    assert export_service._infer_kind([1, None, 2.5]) == "float"
+    assert export_service._infer_kind([None, None]) == "string"
+    assert export_service._infer_kind([1, "a"]) == "string"
+
+
+def test_expired_export_files_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "EXPORT_TTL_SECONDS", 600)
+    old, fresh = tmp_path / "exp_old.csv", tmp_path / "exp_new.csv"
+    old.write_text("ID\n")
+    fresh.write_text("ID\n")
+    os.utime(old, (time.time() - 601, time.time() - 601))
+
+    assert ExportService.cleanup_expired_files() == 1
+    assert not old.exists() and fresh.exists()
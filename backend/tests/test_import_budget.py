@@ -0,0 +1,85 @@
+"""Import-time and memory budgets for the application module.
+
+Each check imports in a fresh interpreter so earlier tests cannot pre-warm
+sys.modules. Heavy optional dependencies (app.utils.lazy_imports.HEAVY_MODULES)
+must not be loaded by importing the app; they load on first feature use.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.utils.lazy_imports import HEAVY_MODULES, lazy_import, lazy_load_times
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Regression thresholds for `import app.core.application` (cold, no .pyc
+# rebuild); raise deliberately when a new eager dependency is justified
+APP_IMPORT_TIME_BUDGET_S = 6.0
+APP_IMPORT_RSS_BUDGET_MB = 350
+
+LAZY_CONSUMERS = (
+    "app.services.visualization_service",
+    "app.services.export_service",
+    "app.core.sql_dialect_converter",
+    "app.core.postgres_client",
+    "app.core.graphiti_client",
+)
+
+_PROBE = """
+import json, resource, sys, time
+baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+for name in sys.argv[2:]:
+    __import__(name)
+elapsed = time.perf_counter() - start
+heavy = json.loads(sys.argv[1])
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "rss_delta_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024,
+    "heavy_loaded": sorted(m for m in heavy if m in sys.modules),
+}))
+"""
+
+
+def _probe(*modules: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, json.dumps(HEAVY_MODULES), *modules],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        missing = "ModuleNotFoundError" in proc.stderr
+        if missing:
+            pytest.skip(f"Application dependencies not installed: {proc.stderr.strip().splitlines()[-1]}")
+        pytest.fail(proc.stderr)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_app_import_within_budget():
+    result = _probe("app.core.application")
+
+    assert result["heavy_loaded"] == []
+    assert result["seconds"] < APP_IMPORT_TIME_BUDGET_S, result
+    assert result["rss_mb"] < APP_IMPORT_RSS_BUDGET_MB, result
+
+
+def test_feature_modules_defer_heavy_dependencies():
+    result = _probe(*LAZY_CONSUMERS)
+
+    assert result["heavy_loaded"] == []
+
+
+def test_lazy_module_loads_on_first_attribute_access():
+    module = lazy_import("json.decoder")
+
+    assert "not loaded" in repr(module)
+    assert module.JSONDecodeError is json.JSONDecodeError
+    assert "json.decoder" in lazy_load_times()
+    assert "(loaded)" in repr(module)
@@ -0,0 +1,104 @@
+"""Tests for the pipelined Redis PersistentMemoryService.
+
+Requires a local Redis (settings.REDIS_URL); skipped otherwise.
+"""
+
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.services.persistent_memory_service import PersistentMemoryService
+
+
+@pytest.mark.asyncio
+async def test_conversation_history_round_trip(connected_redis):
+    user_id = f"user-{uuid.uuid4()}"
+    stored = []
+    for i in range(5):
+        stored.append(await PersistentMemoryService.store_conversation(
+            user_id=user_id,
+            session_id="s1",
+            user_query=f"question {i}",
+            intent="query",
+            sql_query=f"SELECT {i} FROM DUAL",
+            execution_status="success" if i % 2 == 0 else "error",
+        ))
+    try:
+        history = await PersistentMemoryService.get_user_conversation_history(user_id, limit=4)
+        assert [c["conversation_id"] for c in history] == stored[::-1][:4]
+
+        errors = await PersistentMemoryService.get_user_conversation_history(user_id, status_filter="error")
+        assert {c["user_query"] for c in errors} == {"question 1", "question 3"}
+    finally:
+        await connected_redis._client.delete(
+            f"user:{user_id}:conversations", "session:s1:conversations", *[f"conv:{cid}" for cid in stored]
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_usage_updates_are_not_lost(connected_redis):
+    concept = f"REVENUE_{uuid.uuid4().hex[:8]}"
+    mapping_id = await PersistentMemoryService.store_learned_mapping(concept, "SALES", "AMOUNT")
+    try:
+        await asyncio.gather(*[
+            PersistentMemoryService.update_mapping_usage(mapping_id, success=i % 4 != 0) for i in range(8)
+        ])
+
+        [mapping] = await PersistentMemoryService.get_learned_mappings(concept=concept)
+        assert mapping["usage_count"] == 9
+        # 1 initial success + 6 of the 8 updates
+        assert mapping["success_rate"] == pytest.approx(7 / 9 * 100)
+    finally:
+        await connected_redis._client.delete(
+            f"mapping:{mapping_id}", f"mapping:{mapping_id}:usage",
+            f"mappings:concept:{concept}", "mappings:table:SALES",
+        )
+        await connected_redis._client.lrem("mappings:index", 0, mapping_id)
+
+
+@pytest.mark.asyncio
+async def test_usage_update_seeds_counters_from_legacy_document(connected_redis):
+    mapping_id = str(uuid.uuid4())
+    legacy = {"mapping_id": mapping_id, "concept": "X", "usage_count": 4, "success_rate": 50.0}
+    await connected_redis._client.set(f"mapping:{mapping_id}", json.dumps(legacy))
+    try:
+        await PersistentMemoryService.update_mapping_usage(mapping_id, success=True)
+
+        usage = await connected_redis._client.hgetall(f"mapping:{mapping_id}:usage")
+        assert usage["usage_count"] == "5" and usage["successes"] == "3"
+        # Missing mappings are left alone
+        await PersistentMemoryService.update_mapping_usage(str(uuid.uuid4()))
+    finally:
+        await connected_redis._client.delete(f"mapping:{mapping_id}", f"mapping:{mapping_id}:usage")
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_run_scripts_and_skip_expired_documents(connected_redis, monkeypatch):
+    table = f"ORDERS_{uuid.uuid4().hex[:8]}"
+    kept = await PersistentMemoryService.store_learned_mapping("TOTAL", table, "AMOUNT", confidence=90.0)
+    dropped = await PersistentMemoryService.store_learned_mapping("COUNT", table, "ID")
+    await connected_redis._client.delete(f"mapping:{dropped}")
+    scripts = []
+
+    async def recording(script, keys=None, args=None):
+        scripts.append(script)
+
+    monkeypatch.setattr(connected_redis, "run_script", recording)
+    try:
+        by_table = await PersistentMemoryService.get_learned_mappings(table_name=table)
+        assert [m["mapping_id"] for m in by_table] == [kept]
+        assert by_table[0]["usage_count"] == 1 and by_table[0]["success_rate"] == 100.0
+
+        recent = await PersistentMemoryService.get_learned_mappings(limit=2)
+        assert [m["mapping_id"] for m in recent] == [kept]
+        await PersistentMemoryService.get_user_conversation_history(f"user-{uuid.uuid4()}")
+        assert scripts == []
+    finally:
+        await connected_redis._client.delete(
+            f"mapping:{kept}", f"mapping:{kept}:usage", f"mapping:{dropped}:usage",
+            "mappings:concept:TOTAL", "mappings:concept:COUNT", f"mappings:table:{table}",
+        )
+        for mapping_id in (kept, dropped):
+            await connected_redis._client.lrem("mappings:index", 0, mapping_id)
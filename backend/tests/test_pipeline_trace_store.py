@@ -0,0 +1,89 @@
+"""Tests for the diagnostic pipeline trace ring buffer and stage latency stats."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import diagnostic_service
+from app.services.diagnostic_service import PipelineTraceStore, StageLatencyTracker
+
+
+def _trace(stage: str) -> dict:
+    return {"stage": stage, "status": "completed"}
+
+
+def test_ring_evicts_oldest_query_not_smallest_id():
+    store = PipelineTraceStore(capacity=3)
+    for query_id in ("q_c", "q_a", "q_b"):
+        store.append(query_id, _trace("understand"))
+
+    # A later stage for an existing query must not claim a new slot
+    store.append("q_c", _trace("execute"))
+    store.append("q_0", _trace("understand"))
+
+    assert len(store) == 3
+    assert store.get("q_c") == []  # oldest started query evicted
+    assert [t["stage"] for t in store.get("q_a")] == ["understand"]
+    assert [qid for qid, _ in store.recent(10)] == ["q_a", "q_b", "q_0"]
+
+
+def test_per_query_stage_list_is_bounded():
+    store = PipelineTraceStore(capacity=2, max_stages=4)
+    for i in range(10):
+        store.append("q", _trace(f"stage_{i}"))
+    assert [t["stage"] for t in store.get("q")] == ["stage_6", "stage_7", "stage_8", "stage_9"]
+
+
+def test_stage_latency_percentiles():
+    tracker = StageLatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.observe("execute", float(ms), "completed")
+    tracker.observe("execute", 500.0, "failed")  # pushes 1ms out of the window
+
+    stats = tracker.snapshot()["execute"]
+    assert stats["count"] == 101
+    assert stats["failures"] == 1
+    assert stats["window"] == 100
+    assert stats["p50_ms"] == pytest.approx(51.5)
+    assert stats["p99_ms"] == pytest.approx(104.0)
+    assert stats["max_ms"] == 500.0
+
+
+@pytest.mark.asyncio
+async def test_record_stage_feeds_traces_and_latency(monkeypatch):
+    monkeypatch.setattr(diagnostic_service, "_query_pipeline_traces", PipelineTraceStore(capacity=8))
+    monkeypatch.setattr(diagnostic_service, "_stage_latencies", StageLatencyTracker())
+
+    entered = datetime.now(timezone.utc)
+    await diagnostic_service.record_query_pipeline_stage(
+        query_id="q_1", stage="generate_sql", status="completed",
+        entered_at=entered, exited_at=entered + timedelta(milliseconds=250),
+    )
+    await diagnostic_service.record_query_pipeline_stage(
+        query_id="q_1", stage="execute", status="started", entered_at=entered,
+    )
+
+    traces = await diagnostic_service.get_query_pipeline_traces("q_1")
+    assert [t["stage"] for t in traces] == ["generate_sql", "execute"]
+
+    stats = await diagnostic_service.get_stage_latency_stats()
+    assert set(stats) == {"generate_sql"}
+    assert stats["generate_sql"]["p50_ms"] == pytest.approx(250.0)
+
+
+@pytest.mark.asyncio
+async def test_node_history_records_each_stage_once(monkeypatch):
+    from app.orchestrator.utils import update_node_history
+
+    monkeypatch.setattr(diagnostic_service, "_query_pipeline_traces", PipelineTraceStore(capacity=8))
+    monkeypatch.setattr(diagnostic_service, "_stage_latencies", StageLatencyTracker())
+
+    state = {"query_id": "q_2"}
+    for node in ("understand", "execute"):
+        await update_node_history(state, node, "in-progress")
+        await update_node_history(state, node, "completed")
+
+    # execute records its own stage (with metadata), so node history skips it
+    traces = await diagnostic_service.get_query_pipeline_traces("q_2")
+    assert [t["stage"] for t in traces] == ["understand"]
+    assert [n["status"] for n in state["node_history"]] == ["completed", "completed"]
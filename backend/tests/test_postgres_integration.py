@@ -106,6 +106,173 @@ class TestPostgreSQLClient:
         assert "TRUNCATE" in str(exc_info.value)
 
 
+class FakeColumn(tuple):
+    """Minimal stand-in for psycopg's Column: indexable name plus type_code"""
+
+    def __new__(cls, name, type_code):
+        column = super().__new__(cls, (name,))
+        column.type_code = type_code
+        return column
+
+
+@pytest.mark.asyncio
+class TestPostgreSQLExecutionPath:
+    """Test pooled connection configuration and the per-query execution path"""
+
+    @pytest.fixture
+    def execution_settings(self, mock_settings):
+        mock_settings.POSTGRES_PREPARE_THRESHOLD = 5
+        mock_settings.POSTGRES_BINARY_RESULTS = True
+        mock_settings.POSTGRES_VALIDATION_CACHE_SIZE = 2
+        mock_settings.POSTGRES_FETCH_BATCH_SIZE = 4
+        return mock_settings
+
+    @pytest.fixture
+    def client(self, execution_settings):
+        import psycopg
+
+        client = PostgreSQLClient()
+        client._initialized = True
+        self.executed = []
+        self.request_settings = []
+        self.cursor_kwargs = []
+
+        cursor = MagicMock()
+        cursor.adapters = psycopg.adapters
+        cursor.description = [FakeColumn("id", 23), FakeColumn("status", 99999)]
+        cursor.execute = AsyncMock(side_effect=lambda sql: self.executed.append(sql))
+        cursor.fetchall = AsyncMock(side_effect=lambda: [[1, b"active"], [2, b"closed"]])
+        server_rows = [[i, b"active"] for i in range(25)]
+        self.fetch_sizes = []
+
+        async def fetchmany(size):
+            self.fetch_sizes.append(size)
+            batch = server_rows[:size]
+            del server_rows[:size]
+            return batch
+        cursor.fetchmany = fetchmany
+        cursor.__aenter__ = AsyncMock(return_value=cursor)
+        cursor.__aexit__ = AsyncMock(return_value=False)
+
+        def conn_execute(sql, params=None):
+            if params is None:
+                self.executed.append(sql)
+            else:
+                self.request_settings.append((sql, params))
+
+        conn = MagicMock()
+        conn.execute = AsyncMock(side_effect=conn_execute)
+        conn.commit = AsyncMock()
+
+        def make_cursor(**kwargs):
+            self.cursor_kwargs.append(kwargs)
+            return cursor
+        conn.cursor = make_cursor
+        self.conn = conn
+
+        pool_connection = MagicMock()
+        pool_connection.__aenter__ = AsyncMock(return_value=conn)
+        pool_connection.__aexit__ = AsyncMock(return_value=False)
+        client._pool = MagicMock()
+        client._pool.connection = MagicMock(return_value=pool_connection)
+        return client
+
+    async def test_configure_hook_sets_prepare_threshold(self, client):
+        """Test that opening a connection only sets psycopg-side options (no SET round trips)"""
+        await client._configure_connection(self.conn)
+
+        assert self.executed == []
+        assert self.conn.prepare_threshold == 5
+
+    async def test_session_defaults_are_restored_on_every_checkin(self, client):
+        """Test that timeout and read-only defaults are startup options the pool's RESET ALL restores"""
+        pool = MagicMock(open=AsyncMock(), wait=AsyncMock())
+        with patch("app.core.postgres_client.psycopg_pool") as pool_module:
+            pool_module.AsyncConnectionPool.return_value = pool
+            await PostgreSQLClient().initialize()
+
+        kwargs = pool_module.AsyncConnectionPool.call_args.kwargs
+        assert "options='-c statement_timeout=600000 -c default_transaction_read_only=on'" in kwargs["conninfo"]
+        # A checkout running SELECT set_config('default_transaction_read_only', 'off', false)
+        # passes read-only validation; returning the connection undoes it
+        await kwargs["reset"](self.conn)
+        assert self.executed == ["RESET ALL"]
+        self.conn.commit.assert_awaited_once()
+
+    async def test_repeated_queries_share_text_and_skip_session_setup(self, client):
+        """Test that repeated statements keep a stable text and carry the request id in application_name"""
+        with patch.object(client, "_validate_readonly_query") as validate:
+            first = await client.execute_query("SELECT id, status FROM orders", "alice", "req-1")
+            await client.execute_query("SELECT id, status FROM orders", "alice", "req-2")
+
+        assert validate.call_count == 1
+        assert len(self.executed) == 2 and self.executed[0] == self.executed[1]
+        assert not any(sql.startswith("SET") for sql in self.executed)
+        assert self.request_settings == [
+            ("SELECT set_config('application_name', %s, true)", ["LLM Request req-1"]),
+            ("SELECT set_config('application_name', %s, true)", ["LLM Request req-2"]),
+        ]
+        assert self.cursor_kwargs[0]["binary"] is True
+        # Types without a binary loader (e.g. enums) are decoded to text
+        assert first["rows"] == [[1, "active"], [2, "closed"]]
+
+    async def test_row_cap_enforced_while_fetching(self, client):
+        """Test that capped queries stream from a named cursor and stop at the cap"""
+        result = await client.execute_query("SELECT id, status FROM orders", "alice", "req-1", max_rows=10)
+
+        assert self.cursor_kwargs[0]["name"] == "stream_req_1"
+        # Batches never ask for more than the remaining budget (cap plus one truncation probe)
+        assert self.fetch_sizes == [4, 4, 3]
+        assert result["row_count"] == 10 and result["truncated"] is True
+        assert result["rows"][0] == [0, "active"]
+
+    async def test_full_stream_reads_until_exhausted(self, client):
+        """Test that streaming without a cap fetches every batch"""
+        batches = [rows async for _, rows in client.stream_query("SELECT id FROM orders", "alice", "exp-1", batch_size=10)]
+
+        assert [len(rows) for rows in batches] == [10, 10, 5]
+        assert self.fetch_sizes == [10, 10, 10, 10]
+
+    async def test_capped_non_select_uses_regular_cursor(self, client):
+        """Test that statements DECLARE CURSOR rejects run on the prepared path with the cap applied"""
+        result = await client.execute_query("EXPLAIN SELECT * FROM orders", "alice", "req-1", max_rows=10)
+
+        assert "name" not in self.cursor_kwargs[0]
+        assert not any("DECLARE" in sql for sql in self.executed)
+        assert self.fetch_sizes == [4, 4, 3]
+        assert result["row_count"] == 10 and result["truncated"] is True
+
+    async def test_stream_rejects_non_cursor_statements(self, client):
+        """Test that only SELECT/VALUES statements are streamed through named cursors"""
+        with pytest.raises(ValidationException):
+            async for _ in client.stream_query("SHOW search_path", "alice", "exp-1"):
+                pass
+        assert client._is_cursor_query("/* c */ (WITH x AS (SELECT 1) SELECT * FROM x)")
+        assert client._is_cursor_query("values (1)")
+
+    async def test_service_runs_show_and_explain(self, client):
+        """Test that SHOW and EXPLAIN run through the query service under the display limit"""
+        with patch("app.services.postgres_query_service.postgres_client", client), \
+             patch("app.services.postgres_query_service.log_audit_event", AsyncMock()), \
+             patch("app.services.postgres_query_service.settings") as service_settings:
+            service_settings.POSTGRES_ENABLED = True
+            service_settings.POSTGRES_MAX_RESULT_ROWS = 100
+            for sql in ("SHOW search_path", "EXPLAIN SELECT * FROM orders"):
+                result = await PostgresQueryService.execute_sql_query(sql, user_id="alice", request_id="req-1")
+                assert result["status"] == "success"
+
+        assert all("name" not in kwargs for kwargs in self.cursor_kwargs)
+
+    async def test_timeout_override_is_transaction_local(self, client):
+        """Test that a non-default timeout is set for the current transaction only"""
+        await client.execute_query("SELECT 1", "alice", "req-1", timeout=30)
+
+        assert self.request_settings == [(
+            "SELECT set_config('application_name', %s, true), set_config('statement_timeout', %s, true)",
+            ["LLM Request req-1", "30000"],
+        )]
+
+
 @pytest.mark.asyncio
 class TestPostgresQueryService:
     """Test PostgreSQL query service"""
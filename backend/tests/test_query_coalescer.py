@@ -0,0 +1,94 @@
+"""Tests for singleflight coalescing of identical SQL executions.
+
+The cross-worker test needs a local Redis (settings.REDIS_URL) and is
+skipped otherwise.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.query_coalescer import QueryCoalescer, coalesce_key
+from app.core.redis_client import redis_client
+
+
+def _counting_query(calls, delay=0.05, status="success"):
+    async def execute():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return {"status": status, "results": {"row_count": 1, "rows": [[1]], "columns": ["X"]}}
+    return execute
+
+
+def test_key_separates_database_and_connection():
+    sql = "select * from orders where id = 1"
+    assert coalesce_key("oracle", "PROD", sql) == coalesce_key("oracle", "PROD", sql)
+    assert coalesce_key("oracle", "PROD", sql) != coalesce_key("oracle", "DEV", sql)
+    assert coalesce_key("oracle", None, sql) != coalesce_key("doris", None, sql)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_execution(monkeypatch):
+    monkeypatch.setattr(redis_client, "_client", None)
+    coalescer = QueryCoalescer(enabled=True)
+    calls = []
+
+    outcomes = await asyncio.gather(*[
+        coalescer.run("k1", _counting_query(calls), database_type="oracle") for _ in range(5)
+    ])
+
+    assert len(calls) == 1
+    assert sorted(str(c) for _, c in outcomes) == ["None", "local", "local", "local", "local"]
+    assert all(r["status"] == "success" for r, _ in outcomes)
+    assert coalescer.get_status()["local_hits"] == 4
+
+
+@pytest.mark.asyncio
+async def test_leader_errors_reach_waiters_and_are_not_cached(monkeypatch):
+    monkeypatch.setattr(redis_client, "_client", None)
+    coalescer = QueryCoalescer(enabled=True)
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("ORA-00942")
+
+    results = await asyncio.gather(*[coalescer.run("k2", failing) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    calls = []
+    result, coalesced = await coalescer.run("k2", _counting_query(calls, delay=0))
+    assert coalesced is None and len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_workers_share_result_through_redis_lease(connected_redis):
+    key = uuid.uuid4().hex
+    worker_a, worker_b = QueryCoalescer(enabled=True), QueryCoalescer(enabled=True)
+    calls = []
+
+    (result_a, coalesced_a), (result_b, coalesced_b) = await asyncio.gather(
+        worker_a.run(key, _counting_query(calls, delay=0.2), database_type="doris"),
+        worker_b.run(key, _counting_query(calls, delay=0.2), database_type="doris"),
+    )
+
+    assert len(calls) == 1
+    assert {coalesced_a, coalesced_b} == {None, "redis"}
+    assert result_a == result_b
+    await connected_redis._client.delete(f"sqlflight:result:{key}")
+
+
+@pytest.mark.asyncio
+async def test_follower_executes_when_leader_shares_nothing(connected_redis):
+    key = uuid.uuid4().hex
+    worker_a, worker_b = QueryCoalescer(enabled=True), QueryCoalescer(enabled=True)
+    calls = []
+
+    outcomes = await asyncio.gather(
+        worker_a.run(key, _counting_query(calls, delay=0.1, status="error")),
+        worker_b.run(key, _counting_query(calls, delay=0.1, status="error")),
+    )
+
+    # Error results are not handed across workers, so both execute
+    assert len(calls) == 2
+    assert [c for _, c in outcomes] == [None, None]
@@ -0,0 +1,136 @@
+"""Tests for the Redis-backed query corrections store.
+
+Needs a local Redis (settings.REDIS_URL) with Lua scripting and is skipped
+otherwise. Every test writes under its own index keys.
+"""
+
+import time
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from app.services import query_corrections_service as corrections
+from app.services.query_corrections_service import QueryCorrectionsService
+
+
+@pytest_asyncio.fixture
+async def store(connected_redis, monkeypatch):
+    prefix = f"test:corrections:{uuid.uuid4().hex}"
+    monkeypatch.setattr(corrections, "RECENT_INDEX_KEY", f"{prefix}:recent")
+    monkeypatch.setattr(corrections, "APPLIED_INDEX_KEY", f"{prefix}:applied")
+    monkeypatch.setattr(corrections, "KEYWORD_INDEX_PREFIX", f"{prefix}:kw:")
+    user_id = f"test-{uuid.uuid4().hex}"
+    stored = []
+
+    async def add(original_query, intent=None):
+        correction_id = await QueryCorrectionsService.store_correction(
+            user_id=user_id,
+            session_id="s1",
+            original_query=original_query,
+            generated_sql="SELECT * FROM orders",
+            corrected_sql="SELECT id FROM orders",
+            intent=intent,
+        )
+        stored.append(correction_id)
+        return correction_id
+
+    yield add
+    for key in await connected_redis.keys(f"{prefix}:*"):
+        await connected_redis.delete(key)
+    for correction_id in stored:
+        await connected_redis.delete(f"correction:{correction_id}")
+    await connected_redis.delete(f"user:{user_id}:corrections")
+
+
+@pytest.mark.asyncio
+async def test_relevant_corrections_match_keywords_and_rank_by_applied_count(store):
+    first = await store("total revenue by region")
+    second = await store("revenue trend by month")
+    await store("list active customers")
+
+    await QueryCorrectionsService.increment_applied_count(first)
+    await QueryCorrectionsService.increment_applied_count(first)
+    await QueryCorrectionsService.increment_applied_count(second)
+
+    found = await QueryCorrectionsService.get_relevant_corrections("monthly revenue", limit=5)
+
+    assert [c["correction_id"] for c in found] == [first, second]
+    assert [c["applied_count"] for c in found] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_intent_filter_keeps_matching_and_untagged_corrections(store):
+    tagged = await store("revenue by region", intent="aggregation")
+    untagged = await store("revenue by product")
+    await store("revenue by store", intent="lookup")
+
+    found = await QueryCorrectionsService.get_relevant_corrections("revenue", intent="aggregation")
+
+    assert {c["correction_id"] for c in found} == {tagged, untagged}
+
+
+@pytest.mark.asyncio
+async def test_documents_are_declared_as_script_keys(store, connected_redis, monkeypatch):
+    ids = [await store("revenue by region"), await store("revenue by product")]
+    calls = []
+    run_script = connected_redis.run_script
+
+    async def recording(script, keys=None, args=None):
+        calls.append((script, keys))
+        return await run_script(script, keys=keys, args=args)
+
+    monkeypatch.setattr(connected_redis, "run_script", recording)
+    await QueryCorrectionsService.get_relevant_corrections("revenue")
+    await QueryCorrectionsService.increment_applied_count(ids[0])
+
+    ranking_keys = next(keys for script, keys in calls if script == corrections._RELEVANT_CORRECTIONS_LUA)
+    assert {f"correction:{cid}" for cid in ids} <= set(ranking_keys)
+    increment_keys = next(keys for script, keys in calls if script == corrections._INCREMENT_APPLIED_LUA)
+    assert f"correction:{ids[0]}" in increment_keys
+
+
+@pytest.mark.asyncio
+async def test_missing_documents_are_pruned_from_indexes(store, connected_redis):
+    kept = await store("revenue by region")
+    dropped = await store("revenue by product")
+    await QueryCorrectionsService.increment_applied_count(dropped)
+    await connected_redis.delete(f"correction:{dropped}")
+
+    found = await QueryCorrectionsService.get_relevant_corrections("revenue")
+
+    assert [c["correction_id"] for c in found] == [kept]
+    recent = await connected_redis.zrange(corrections.RECENT_INDEX_KEY, 0, -1)
+    applied = await connected_redis.zrange(corrections.APPLIED_INDEX_KEY, 0, -1)
+    assert dropped not in recent and dropped not in applied
+
+
+@pytest.mark.asyncio
+async def test_increment_skips_unknown_and_evicted_corrections(store, connected_redis):
+    await QueryCorrectionsService.increment_applied_count(uuid.uuid4().hex)
+    evicted = await store("revenue by region")
+    await connected_redis.zremrangebyscore(corrections.RECENT_INDEX_KEY, "-inf", "+inf")
+
+    await QueryCorrectionsService.increment_applied_count(evicted)
+
+    assert await connected_redis.zcard(corrections.APPLIED_INDEX_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_store_trims_applied_counts_by_size_and_age(store, connected_redis, monkeypatch):
+    monkeypatch.setattr(corrections, "MAX_RECENT_ENTRIES", 2)
+    expired = "expired-correction"
+    old_score = time.time() - corrections.CORRECTION_TTL_SECONDS - 60
+    await connected_redis.zadd(corrections.RECENT_INDEX_KEY, {expired: old_score})
+    await connected_redis.zadd(corrections.APPLIED_INDEX_KEY, {expired: 3})
+
+    oldest = await store("revenue by region")
+    await QueryCorrectionsService.increment_applied_count(oldest)
+    assert expired not in await connected_redis.zrange(corrections.APPLIED_INDEX_KEY, 0, -1)
+
+    newer = [await store("revenue by product"), await store("revenue by store")]
+    for correction_id in newer:
+        await QueryCorrectionsService.increment_applied_count(correction_id)
+
+    assert set(await connected_redis.zrange(corrections.RECENT_INDEX_KEY, 0, -1)) == set(newer)
+    assert set(await connected_redis.zrange(corrections.APPLIED_INDEX_KEY, 0, -1)) == set(newer)
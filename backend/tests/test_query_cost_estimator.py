@@ -0,0 +1,133 @@
+"""Tests for cached, statement-isolated query cost estimation."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+
+from app.core.plan_estimate_cache import PlanEstimateCache, normalize_statement
+from app.services.query_cost_estimator import CostLevel, QueryCostEstimator
+
+
+class FakeSQLcl:
+    """Records statements and answers PLAN_TABLE reads with a fixed plan"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute_sql(self, sql, connection_name=None, query_id=None):
+        self.statements.append(sql)
+        if "FROM PLAN_TABLE" in sql and sql.lstrip().startswith("SELECT"):
+            return {"status": "success", "results": {"rows": [
+                ["SELECT STATEMENT", "", "", 20000, 10],
+                ["TABLE ACCESS FULL", "", "ORDERS", 20000, 10],
+            ]}}
+        if "DBMS_XPLAN" in sql:
+            return {"status": "success", "results": {"rows": [["Plan hash value: 1"]]}}
+        return {"status": "success"}
+
+
+class FakePool:
+    def __init__(self, client):
+        self.client = client
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self, timeout=30):
+        self.acquired += 1
+        yield self.client
+
+
+@pytest.fixture
+def sqlcl():
+    client = FakeSQLcl()
+    pool = FakePool(client)
+    cache = PlanEstimateCache(max_entries=8, ttl_seconds=60, enabled=True)
+    with patch("app.services.query_cost_estimator.plan_estimate_cache", cache), \
+         patch("app.services.query_cost_estimator.registry") as registry:
+        registry.get_sqlcl_pool.return_value = pool
+        registry.get_mcp_client.return_value = None
+        client.pool = pool
+        client.cache = cache
+        yield client
+
+
+def test_statement_key_normalizes_whitespace_but_keeps_literals():
+    assert normalize_statement("SELECT *\n  FROM t WHERE id = 1;") == "SELECT * FROM t WHERE id = 1"
+    assert normalize_statement("SELECT * FROM t WHERE id = 1") != normalize_statement("SELECT * FROM t WHERE id = 42")
+    assert normalize_statement("SELECT * FROM t WHERE s = 'a  b'") == "SELECT * FROM t WHERE s = 'a  b'"
+
+
+@pytest.mark.asyncio
+async def test_estimate_uses_own_statement_id_and_cleans_up(sqlcl):
+    estimate = await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders WHERE id = 1", "conn")
+
+    explain, select, delete = sqlcl.statements
+    statement_id = explain.split("'")[1]
+    assert explain.startswith(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR")
+    assert f"statement_id = '{statement_id}'" in select
+    assert delete == f"DELETE FROM PLAN_TABLE WHERE statement_id = '{statement_id}'"
+    assert not any(sql == "DELETE FROM PLAN_TABLE" for sql in sqlcl.statements)
+    assert sqlcl.pool.acquired == 1
+    assert estimate.cost_level == CostLevel.HIGH
+    assert estimate.full_scan_tables == ["ORDERS"]
+    assert estimate.source == "explain"
+
+
+@pytest.mark.asyncio
+async def test_same_statement_is_served_from_cache_until_schema_changes(sqlcl):
+    first = await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders WHERE id = 1", "conn")
+    first.warnings.append("caller mutation")
+    second = await QueryCostEstimator.estimate_query_cost("SELECT *\n FROM orders WHERE id = 1;", "conn")
+
+    assert len(sqlcl.statements) == 3
+    assert second.source == "cache"
+    assert "caller mutation" not in second.warnings
+    # Other connections and schema versions have their own entries
+    await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders WHERE id = 1", "other")
+    assert len(sqlcl.statements) == 6
+    sqlcl.cache.bump_schema_version()
+    third = await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders WHERE id = 1", "conn")
+    assert third.source == "explain"
+    assert len(sqlcl.statements) == 9
+
+
+@pytest.mark.asyncio
+async def test_different_literals_are_estimated_separately(sqlcl):
+    await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders FETCH FIRST 10 ROWS ONLY", "conn")
+    wide = await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders FETCH FIRST 10000000 ROWS ONLY", "conn")
+
+    assert wide.source == "explain"
+    assert sum(sql.startswith("EXPLAIN PLAN") for sql in sqlcl.statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_plan_request_refreshes_entries_cached_without_plan(sqlcl):
+    await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders", "conn")
+    with_plan = await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders", "conn", include_plan=True)
+    again = await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders", "conn", include_plan=True)
+
+    assert with_plan.execution_plan == "Plan hash value: 1"
+    assert again.source == "cache" and again.execution_plan == with_plan.execution_plan
+    assert sum("DBMS_XPLAN" in sql for sql in sqlcl.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_estimates_are_not_cached(sqlcl):
+    async def failing(sql, connection_name=None, query_id=None):
+        sqlcl.statements.append(sql)
+        return {"status": "error"}
+    sqlcl.execute_sql = failing
+
+    estimate = await QueryCostEstimator.estimate_query_cost("SELECT * FROM orders", "conn")
+    assert estimate.source == "default"
+    assert sqlcl.cache.get_status()["entries"] == 0
+
+
+def test_cache_expires_entries():
+    cache = PlanEstimateCache(max_entries=8, ttl_seconds=0.0, enabled=True)
+    key = cache.key("SELECT 1 FROM dual", "conn")
+    cache.put(key, "estimate")
+
+    assert cache.get(key) is None
+    assert cache.get_status()["expired"] == 1
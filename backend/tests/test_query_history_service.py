@@ -0,0 +1,116 @@
+"""Tests for the Redis-backed query history and undo/redo stacks.
+
+Needs a local Redis (settings.REDIS_URL) with Lua scripting and is skipped
+otherwise. Every test uses its own session id.
+"""
+
+import logging
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from app.services import query_history_service as history
+from app.services.query_history_service import QueryHistoryService
+
+
+@pytest_asyncio.fixture
+async def session(connected_redis):
+    session_id = f"test-{uuid.uuid4()}"
+    pushed = []
+
+    async def push(user_query):
+        entry_id = await QueryHistoryService.push_query_state(
+            session_id=session_id,
+            user_query=user_query,
+            sql_query=f"SELECT '{user_query}' FROM DUAL",
+        )
+        pushed.append(entry_id)
+        return entry_id
+
+    yield session_id, push
+    await QueryHistoryService.clear_history(session_id)
+    for entry_id in pushed:
+        await connected_redis.delete(f"history_entry:{entry_id}")
+
+
+@pytest.mark.asyncio
+async def test_push_list_undo_redo_round_trip(session):
+    session_id, push = session
+    first, second, third = [await push(q) for q in ("first", "second", "third")]
+
+    listed = await QueryHistoryService.get_session_history(session_id, limit=2)
+    assert [e["entry_id"] for e in listed] == [third, second]
+
+    assert (await QueryHistoryService.undo(session_id))["entry_id"] == second
+    assert (await QueryHistoryService.undo(session_id))["entry_id"] == first
+    assert await QueryHistoryService.get_undo_redo_status(session_id) == {"can_undo": False, "can_redo": True}
+
+    # Undoing the last entry reaches the beginning of history
+    assert await QueryHistoryService.undo(session_id) is None
+    assert await QueryHistoryService.undo(session_id) is None
+
+    assert (await QueryHistoryService.redo(session_id))["entry_id"] == first
+    assert (await QueryHistoryService.redo(session_id))["entry_id"] == second
+    assert await QueryHistoryService.can_undo(session_id)
+    assert await QueryHistoryService.can_redo(session_id)
+
+
+@pytest.mark.asyncio
+async def test_push_clears_redo_stack(session):
+    session_id, push = session
+    await push("first")
+    await push("second")
+    await QueryHistoryService.undo(session_id)
+
+    await push("third")
+
+    assert await QueryHistoryService.redo(session_id) is None
+    assert not await QueryHistoryService.can_redo(session_id)
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_skipped(session, connected_redis):
+    session_id, push = session
+    first = await push("first")
+    second = await push("second")
+    await connected_redis.delete(f"history_entry:{first}")
+
+    listed = await QueryHistoryService.get_session_history(session_id)
+    assert [e["entry_id"] for e in listed] == [second]
+    assert await QueryHistoryService.undo(session_id) is None
+
+
+@pytest.mark.asyncio
+async def test_scripts_only_receive_session_keys(session, connected_redis, monkeypatch):
+    session_id, push = session
+    calls = []
+    run_script = connected_redis.run_script
+
+    async def recording(script, keys=None, args=None):
+        calls.append((script, keys))
+        return await run_script(script, keys=keys, args=args)
+
+    monkeypatch.setattr(connected_redis, "run_script", recording)
+    entry_id = await push("first")
+    await push("second")
+    await QueryHistoryService.undo(session_id)
+    await QueryHistoryService.redo(session_id)
+
+    # Entry documents are only written by the push script, which declares the key
+    assert not any("history_entry" in script or "'GET'" in script for script, _ in calls)
+    assert calls[0][1][0] == f"history_entry:{entry_id}"
+    assert {script for script, _ in calls} == {history._PUSH_LUA, history._UNDO_LUA, history._REDO_LUA}
+
+
+@pytest.mark.asyncio
+async def test_status_failures_are_logged(monkeypatch, caplog):
+    def broken_pipeline(transaction=True):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(history.redis_client, "pipeline", broken_pipeline)
+    with caplog.at_level(logging.WARNING, logger=history.__name__):
+        status = await QueryHistoryService.get_undo_redo_status("any-session")
+
+    assert status == {"can_undo": False, "can_redo": False}
+    assert "redis down" in caplog.text
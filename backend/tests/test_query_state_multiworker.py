@@ -0,0 +1,121 @@
+"""Multi-process tests for the Redis-backed QueryStateManager.
+
+A publisher process (worker A) registers a query and drives its lifecycle;
+the pytest process (worker B) reads metadata, streams SSE events and replays
+from a Last-Event-ID. Requires a local Redis (settings.REDIS_URL); skipped
+otherwise.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import uuid
+
+import pytest
+
+from app.core.redis_client import redis_client
+from app.services.query_state_manager import QueryState, QueryStateManager
+
+
+def _run_publisher(query_id: str, subscribed) -> None:
+    asyncio.run(_publish(query_id, subscribed))
+
+
+async def _publish(query_id: str, subscribed) -> None:
+    from app.core.redis_client import redis_client as worker_redis
+    from app.services.query_state_manager import QueryState as State, QueryStateManager as Manager
+
+    await worker_redis.connect(max_retries=1)
+    manager = Manager()
+    await manager.register_query(query_id, user_id="worker-a-user", username="alice")
+    await manager.update_state(query_id, State.RECEIVED, {"sql": "SELECT 1 FROM DUAL"})
+
+    # Wait until worker B is streaming before emitting the rest of the lifecycle
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, subscribed.wait, 15)
+
+    for state in (State.PLANNING, State.EXECUTING, State.FINISHED):
+        await asyncio.sleep(0.05)
+        meta = {"result": {"row_count": 1}} if state == State.FINISHED else {}
+        await manager.update_state(query_id, state, meta)
+    await worker_redis.disconnect()
+
+
+def _parse_sse(message: str) -> tuple[str | None, dict | None]:
+    event_id, payload = None, None
+    for line in message.strip().splitlines():
+        if line.startswith("id: "):
+            event_id = line[len("id: "):]
+        elif line.startswith("data: "):
+            payload = json.loads(line[len("data: "):])
+    return event_id, payload
+
+
+@pytest.mark.asyncio
+async def test_query_streams_across_worker_processes(connected_redis):
+    query_id = f"mw-{uuid.uuid4()}"
+    ctx = multiprocessing.get_context("spawn")
+    subscribed = ctx.Event()
+    publisher = ctx.Process(target=_run_publisher, args=(query_id, subscribed))
+    publisher.start()
+
+    manager = QueryStateManager()
+    try:
+        # Metadata registered on worker A is visible to worker B. Wait for the
+        # RECEIVED state too, so it is resolved as the initial state rather
+        # than streamed
+        metadata = None
+        for _ in range(200):
+            metadata = await manager.get_query_metadata(query_id)
+            if metadata and await manager.get_state(query_id) == QueryState.RECEIVED:
+                break
+            await asyncio.sleep(0.05)
+        assert metadata is not None
+        assert metadata["user_id"] == "worker-a-user"
+
+        states: list[str] = []
+        event_ids: list[str] = []
+
+        async def consume() -> None:
+            async for message in manager.subscribe(query_id):
+                if message.startswith(":"):
+                    continue
+                event_id, payload = _parse_sse(message)
+                states.append(payload["state"])
+                if event_id:
+                    event_ids.append(event_id)
+                subscribed.set()
+                if payload["state"] in {"finished", "error", "rejected"}:
+                    break
+
+        await asyncio.wait_for(consume(), timeout=20)
+
+        assert states[0] == "received"  # initial state resolved from the shared tier
+        assert states[-3:] == ["planning", "executing", "finished"]
+        assert len(event_ids) == 3
+        assert await manager.get_state(query_id) == QueryState.FINISHED
+
+        # SSE reconnect: replay everything after the first streamed event
+        replayed: list[str] = []
+
+        async def reconnect() -> None:
+            async for message in manager.subscribe(query_id, last_event_id=event_ids[0]):
+                if message.startswith(":"):
+                    continue
+                _, payload = _parse_sse(message)
+                replayed.append(payload["state"])
+                if payload["state"] in {"finished", "error", "rejected"}:
+                    break
+
+        await asyncio.wait_for(reconnect(), timeout=10)
+        assert replayed == ["executing", "finished"]
+    finally:
+        publisher.join(timeout=20)
+        if publisher.is_alive():
+            publisher.terminate()
+        await manager.shutdown()
+        await redis_client._client.delete(
+            f"qsm:state:{query_id}", f"qsm:meta:{query_id}", f"qsm:events:{query_id}"
+        )
+
+    assert publisher.exitcode == 0
@@ -0,0 +1,135 @@
+"""Tests for the process-pool report renderer and event loop lag monitor."""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from app.core.event_loop_monitor import EventLoopLagMonitor
+from app.core.exceptions import ExternalServiceException
+from app.core.report_render_pool import ReportRenderPool
+
+
+def _render(fmt, report_data):
+    # CPU-bound like WeasyPrint: would block the loop if run inline
+    deadline = time.perf_counter() + report_data.get("busy_seconds", 0)
+    while time.perf_counter() < deadline:
+        pass
+    return f"{fmt}:{report_data['title']}".encode()
+
+
+def _render_stamp(fmt, report_data):
+    return report_data["generated_on"].encode()
+
+
+def _hang(fmt, report_data):
+    time.sleep(30)
+    return b""
+
+
+@pytest.fixture
+def pool():
+    render_pool = ReportRenderPool(max_workers=2, queue_size=1, timeout=10, cache_max_bytes=1024)
+    yield render_pool
+    render_pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cache_ignores_generated_at_and_coalesces_concurrent_renders(pool):
+    data = {"title": "Sales", "metrics": [1, 2], "generated_at": "2025-01-01T00:00:00"}
+
+    first, second = await asyncio.gather(
+        pool.render(_render, "pdf", data),
+        pool.render(_render, "pdf", data),
+    )
+    again = await pool.render(_render, "pdf", {**data, "generated_at": "2025-06-01T00:00:00"})
+
+    assert first == second == again == b"pdf:Sales"
+    status = pool.get_status()
+    assert status["renders"] == 1
+    assert status["coalesced"] == 1
+    assert status["cache_hits"] == 1
+    # Format is part of the cache key
+    assert await pool.render(_render, "docx", data) == b"docx:Sales"
+
+
+@pytest.mark.asyncio
+async def test_renders_keep_event_loop_responsive(pool):
+    monitor = EventLoopLagMonitor(interval=0.02)
+    # Spawn both workers outside the measurement
+    await asyncio.gather(*(pool.render(_render, "pdf", {"title": f"warmup{i}"}) for i in range(2)))
+
+    monitor.start()
+    await asyncio.gather(*(
+        pool.render(_render, "pdf", {"title": f"r{i}", "busy_seconds": 0.4}) for i in range(3)
+    ))
+    await monitor.stop()
+
+    lag = monitor.snapshot()
+    assert lag["samples"] > 10
+    assert lag["max_ms"] < 200
+
+
+@pytest.mark.asyncio
+async def test_queue_bound_and_timeout_recovery():
+    pool = ReportRenderPool(max_workers=1, queue_size=0, timeout=1, cache_max_bytes=0)
+    try:
+        hung = asyncio.create_task(pool.render(_hang, "pdf", {"title": "stuck"}))
+        await asyncio.sleep(0.1)
+        with pytest.raises(ExternalServiceException, match="busy"):
+            await pool.render(_render, "pdf", {"title": "other"})
+
+        with pytest.raises(ExternalServiceException, match="timed out"):
+            await hung
+        # Stuck process was replaced; the pool keeps serving
+        assert await pool.render(_render, "pdf", {"title": "after"}) == b"pdf:after"
+        assert pool.get_status()["timeouts"] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_recycles_only_the_stuck_worker():
+    pool = ReportRenderPool(max_workers=2, queue_size=1, timeout=2, cache_max_bytes=0)
+    try:
+        await asyncio.gather(*(pool.render(_render, "pdf", {"title": f"warmup{i}"}) for i in range(2)))
+        hung = asyncio.create_task(pool.render(_hang, "pdf", {"title": "stuck"}))
+        await asyncio.sleep(1.5)
+        # Still running on the other worker when the stuck render times out
+        survivor = asyncio.create_task(pool.render(_render, "pdf", {"title": "survivor", "busy_seconds": 1.0}))
+
+        with pytest.raises(ExternalServiceException, match="timed out"):
+            await hung
+        assert await survivor == b"pdf:survivor"
+        status = pool.get_status()
+        assert status["timeouts"] == 1 and status["failures"] == 0
+        assert status["workers_started"] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cached_documents_keep_a_current_generated_on_stamp(pool, monkeypatch):
+    from app.services import report_generation_service as reports
+
+    class Clock:
+        minute = 0
+
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2025, 1, 1, 9, cls.minute)
+
+    monkeypatch.setattr("app.core.report_render_pool.report_render_pool", pool)
+    monkeypatch.setattr(reports, "render_report_document", _render_stamp)
+    monkeypatch.setattr(reports, "datetime", Clock)
+    data = {"title": "Sales", "generated_at": "2025-01-01T09:00:00"}
+
+    first = await reports.ReportGenerationService._generate_pdf(data)
+    again = await reports.ReportGenerationService._generate_pdf(data)
+    Clock.minute = 1
+    later = await reports.ReportGenerationService._generate_pdf(data)
+
+    assert first == again == b"January 01, 2025 at 09:00 AM"
+    assert later == b"January 01, 2025 at 09:01 AM"
+    assert pool.get_status()["cache_hits"] == 1
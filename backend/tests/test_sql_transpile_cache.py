@@ -0,0 +1,97 @@
+"""Tests for the SQL dialect transpilation cache."""
+
+import re
+
+import pytest
+
+from app.core.transpile_cache import SLOT, TranspileCache, fingerprint
+
+
+def test_fingerprint_normalizes_values_but_keeps_formats():
+    fp, literals, bindable = fingerprint(
+        "SELECT TO_CHAR(d, 'YYYY') FROM t1 WHERE region = 'EU' AND amount > 10.5 -- note 7"
+    )
+
+    assert fp == f"SELECT TO_CHAR(d, 'YYYY') FROM t1 WHERE region = {SLOT} AND amount > {SLOT} -- note 7"
+    assert [text for _, _, text in literals] == ["'YYYY'", "'EU'", "10.5"]
+    assert bindable == [False, True, True]
+    assert fingerprint("SELECT * FROM t WHERE a = 'it''s'")[0] == "SELECT * FROM t WHERE a = 'it''s'"
+
+
+def test_hit_rebinds_literals_without_transpiling():
+    cache = TranspileCache(max_entries=16, enabled=True)
+    calls = []
+
+    def convert(sql):
+        calls.append(sql)
+        return sql.replace("NVL(", "COALESCE(")
+
+    first = cache.transpile("SELECT NVL(a, 'x') FROM t WHERE id = 1", "oracle", "postgres", convert)
+    second = cache.transpile("SELECT NVL(a, 'y') FROM t WHERE id = 42", "oracle", "postgres", convert)
+
+    assert first == "SELECT COALESCE(a, 'x') FROM t WHERE id = 1"
+    assert second == "SELECT COALESCE(a, 'y') FROM t WHERE id = 42"
+    assert len(calls) == 1
+    # Other dialect pairs have their own entries
+    cache.transpile("SELECT NVL(a, 'y') FROM t WHERE id = 42", "oracle", "mysql", convert)
+    assert len(calls) == 2
+    assert cache.get_status()["hits"] == 1
+
+
+def test_rewritten_literals_are_cached_per_statement_only():
+    cache = TranspileCache(max_entries=16, enabled=True)
+    calls = []
+
+    def convert(sql):
+        calls.append(sql)
+        # ROWNUM <= n becomes LIMIT n - 1: the literal itself changes
+        return re.sub(r"WHERE ROWNUM <= (\d+)", lambda m: f"LIMIT {int(m.group(1)) - 1}", sql)
+
+    assert cache.transpile("SELECT * FROM t WHERE ROWNUM <= 10", "oracle", "mysql", convert) == "SELECT * FROM t LIMIT 9"
+    assert cache.transpile("SELECT * FROM t WHERE ROWNUM <= 20", "oracle", "mysql", convert) == "SELECT * FROM t LIMIT 19"
+    assert cache.transpile("SELECT * FROM t WHERE ROWNUM <= 10", "oracle", "mysql", convert) == "SELECT * FROM t LIMIT 9"
+
+    assert len(calls) == 2
+    assert cache.get_status()["exact_hits"] == 1
+
+
+def test_cache_is_bounded_and_errors_are_not_cached():
+    cache = TranspileCache(max_entries=2, enabled=True)
+    for table in ("a", "b", "c"):
+        cache.transpile(f"SELECT * FROM {table}", "oracle", "mysql", lambda sql: sql)
+
+    def fail(sql):
+        raise ValueError("unparseable")
+
+    with pytest.raises(ValueError):
+        cache.transpile("SELECT FROM", "oracle", "mysql", fail)
+
+    status = cache.get_status()
+    assert status["entries"] == 2
+    assert status["evictions"] == 1
+    assert status["misses"] == 3
+
+
+def test_converter_cached_output_matches_sqlglot():
+    sqlglot = pytest.importorskip("sqlglot")
+    from app.core.sql_dialect_converter import SQLDialectConverter
+    from app.core.transpile_cache import transpile_cache
+
+    transpile_cache.clear()
+    corpus = [
+        "SELECT NVL(name, 'x'), amount * 2 FROM sales WHERE region = '{r}' AND amount > {n} FETCH FIRST {n} ROWS ONLY",
+        "SELECT TO_CHAR(d, '{f}') FROM t WHERE d > TO_DATE('2024-01-0{n}', '{f}')",
+        "SELECT TRUNC(d, '{u}'), SYSDATE - {n} FROM t",
+    ]
+    params = [("EU", 5, "YYYY-MM-DD", "MM"), ("US", 7, "DD/MM/YYYY", "YEAR"), ("APAC", 9, "YYYY", "DD")]
+    for template in corpus:
+        for r, n, f, u in params:
+            sql = template.format(r=r, n=n, f=f, u=u)
+            for convert, target in (
+                (SQLDialectConverter.convert_to_doris, "mysql"),
+                (SQLDialectConverter.convert_to_postgres, "postgres"),
+            ):
+                expected = sqlglot.parse_one(sql, read="oracle").sql(dialect=target, pretty=False)
+                assert convert(sql).sql == expected
+
+    assert transpile_cache.get_status()["hits"] > 0
@@ -88,6 +88,9 @@ async def test_sse_streams_state_changes(async_client: AsyncClient):
             if line.startswith(":"):
                 # keep-alive comment
                 continue
+            if line.startswith("id: "):
+                # stream position for Last-Event-ID resume (shared backend only)
+                continue
             assert line.startswith("data: ")
             payload = json.loads(line[len("data: ") :])
             events.append(payload)
@@ -0,0 +1,87 @@
+"""Tests for the dependency-aware startup scheduler."""
+
+import asyncio
+
+import pytest
+
+from app.core.startup_scheduler import StartupScheduler
+
+
+def _sleeper(name, log, delay=0.05, result=(True, None)):
+    async def run():
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        return result
+    return run
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently_after_dependencies():
+    log = []
+    scheduler = StartupScheduler()
+    scheduler.add("redis", _sleeper("redis", log))
+    scheduler.add("graphiti", _sleeper("graphiti", log))
+    scheduler.add("sqlcl_pool", _sleeper("sqlcl_pool", log))
+    scheduler.add("celery", _sleeper("celery", log), depends_on=("redis",))
+
+    await scheduler.run()
+
+    report = scheduler.report()
+    # Three 50ms roots in parallel plus one 50ms dependent: ~100ms, not 200ms
+    assert report["critical_ms"] < 180
+    assert report["serial_ms"] >= 190
+    assert log.index(("start", "celery")) > log.index(("end", "redis"))
+    assert {s["status"] for s in report["steps"].values()} == {"success"}
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_skips_dependents_and_errors_are_recorded():
+    log = []
+
+    async def boom():
+        raise RuntimeError("connection refused")
+
+    scheduler = StartupScheduler()
+    scheduler.add("redis", _sleeper("redis", log, result=(False, "Redis down")))
+    scheduler.add("semantic_index", _sleeper("semantic_index", log), depends_on=("redis",))
+    scheduler.add("celery", _sleeper("celery", log), depends_on=("redis",), requires_success=False)
+    scheduler.add("graphiti", boom)
+
+    await scheduler.run()
+
+    steps = scheduler.report()["steps"]
+    assert steps["redis"] == {**steps["redis"], "status": "error", "error": "Redis down"}
+    assert steps["semantic_index"]["status"] == "skipped"
+    assert steps["celery"]["status"] == "success"
+    assert steps["graphiti"]["status"] == "error"
+    assert "connection refused" in steps["graphiti"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_deferred_steps_wait_for_second_phase():
+    log = []
+    scheduler = StartupScheduler()
+    scheduler.add("redis", _sleeper("redis", log, delay=0))
+    scheduler.add("semantic_index", _sleeper("semantic_index", log, delay=0), depends_on=("redis",), deferred=True)
+
+    await scheduler.run()
+    assert scheduler.has_deferred()
+    assert scheduler.report()["steps"]["semantic_index"]["status"] == "pending"
+
+    await scheduler.run(deferred=True)
+    assert not scheduler.has_deferred()
+    assert scheduler.succeeded("semantic_index")
+
+
+def test_invalid_dependencies_are_rejected():
+    scheduler = StartupScheduler()
+
+    async def noop():
+        return True, None
+
+    with pytest.raises(ValueError):
+        scheduler.add("semantic_index", noop, depends_on=("redis",))
+    scheduler.add("graphiti", noop, deferred=True)
+    with pytest.raises(ValueError):
+        scheduler.add("langgraph", noop, depends_on=("graphiti",))
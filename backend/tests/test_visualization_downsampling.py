@@ -0,0 +1,97 @@
+"""Tests for server-side chart downsampling."""
+
+import numpy as np
+import pytest
+
+from app.utils.downsampling import grid_bin, histogram_bins, lttb_indices, to_float_array
+
+pytest.importorskip("plotly")
+from app.services.visualization_service import VisualizationService  # noqa: E402
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.sin(np.arange(10_000) / 300.0)
+    y[4321] = 25.0
+
+    keep = lttb_indices(np.arange(y.size), y, 500)
+
+    assert keep.size == 500
+    assert keep[0] == 0 and keep[-1] == y.size - 1
+    assert 4321 in keep
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_grid_bin_conserves_point_counts():
+    rng = np.random.default_rng(3)
+    x, y = rng.normal(size=50_000), rng.normal(size=50_000)
+
+    cx, cy, counts = grid_bin(x, y, 400)
+
+    assert cx.size <= 400
+    assert counts.sum() == 50_000
+    assert cx.min() >= x.min() and cx.max() <= x.max()
+
+
+def test_to_float_array_and_histogram_bins():
+    values = to_float_array([1, "2.5", None, "n/a", True])
+    assert values[:2].tolist() == [1.0, 2.5]
+    assert np.isnan(values[2:]).all()
+
+    centers, counts = histogram_bins(np.arange(10_000, dtype=float), 50)
+    assert centers.size == 50 and counts.sum() == 10_000
+
+
+def test_line_chart_downsampled_with_full_statistics():
+    rows = [[f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}", float(i % 100)] for i in range(20_000)]
+    rows[777][1] = 9_999.0
+
+    result = VisualizationService.generate_chart(
+        ["EVENT_TIME", "VALUE"], rows, chart_type="line", max_points=1000
+    )
+
+    assert result["status"] == "success"
+    assert result["downsampled"] is True
+    assert result["downsampling"]["method"] == "lttb"
+    assert result["downsampling"]["point_budget"] == 1000
+    trace = result["plotly_json"]["data"][0]
+    assert len(trace["y"]) <= 1000
+    assert 9_999.0 in trace["y"]
+    # Statistics describe every row, not the rendered sample
+    assert result["statistics"]["count"] == 20_000
+    assert result["statistics"]["max"] == 9_999.0
+
+
+def test_small_charts_are_not_downsampled():
+    rows = [[f"r{i}", i] for i in range(50)]
+
+    result = VisualizationService.generate_chart(["REGION", "TOTAL"], rows, chart_type="bar")
+
+    assert result["downsampled"] is False
+    assert result["downsampling"] is None
+    assert len(result["plotly_json"]["data"][0]["y"]) == 50
+
+
+def test_scatter_chart_bins_per_category():
+    rng = np.random.default_rng(5)
+    rows = [[float(a), float(b), "A" if i % 2 else "B"] for i, (a, b) in enumerate(rng.normal(size=(10_000, 2)))]
+
+    result = VisualizationService.generate_chart(
+        ["X_VALUE", "Y_VALUE", "GROUP"], rows, chart_type="scatter", max_points=500
+    )
+
+    assert result["downsampling"]["method"] == "grid_bin"
+    traces = result["plotly_json"]["data"]
+    assert {t["name"] for t in traces} == {"A", "B"}
+    assert sum(len(t["x"]) for t in traces) <= 500
+    assert sum(sum(t["customdata"]) for t in traces) == 10_000
+
+
+def test_chart_recommendations_classify_columns():
+    rows = [[f"2024-01-{d:02d}", d * 10.5] for d in range(1, 29)]
+
+    result = VisualizationService.get_chart_recommendations(["order_date", "revenue"], rows)
+
+    assert result["status"] == "success"
+    assert result["primary_recommendation"]["chart_type"] == "line"
+    assert result["primary_recommendation"]["columns"] == {"x": "order_date", "y": ["revenue"]}
+    assert result["data_characteristics"]["date_columns"] == 1
@@ -53,7 +53,9 @@ export function getStageLabel(stage: string | undefined): string {
     'context': 'Gathering Context',
     'hypothesis': 'Forming Hypothesis',
     'generate_sql': 'Generating SQL',
+    'validate': 'Validating Query',
     'validation': 'Validating Query',
+    'execute': 'Executing Query',
     'execution': 'Executing Query',
     'results': 'Processing Results',
     'planning': 'Planning Execution',